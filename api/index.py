@@ -26,15 +26,39 @@ def create_serverless_app() -> Flask:
     # Configuration for serverless
     app.config.update(
         SECRET_KEY=os.environ.get("SECRET_KEY", "prod-secret-key"),
-        DATABASE="/tmp/sixdegrees.db",  # Vercel writable directory
+        # Shared PostgreSQL when DATABASE_URL is set; otherwise a
+        # per-instance SQLite file in Vercel's writable directory
+        DATABASE=os.environ.get("DATABASE_URL", "/tmp/sixdegrees.db"),
+        # Optional read-only word graph bundled with the deployment; the
+        # database above then only takes game history
+        GRAPH_DATABASE=os.environ.get("GRAPH_DATABASE"),
+        # SQLite is served from memory, loaded at cold start from a bundled
+        # snapshot (or the seeded file) and copied back to /tmp each minute
+        IN_MEMORY_DATABASE="DATABASE_URL" not in os.environ,
+        DATABASE_SNAPSHOT=os.environ.get("DATABASE_SNAPSHOT"),
+        CHECKPOINT_INTERVAL=60.0,
+        # Game sessions evicted from memory spill next to the database
+        SESSION_SPILL="/tmp/sixdegrees-sessions.db",
         TESTING=False,
     )
     
+    # Fast JSON serialization when orjson is installed
+    from app.json_provider import init_json
+    init_json(app)
+    
     # Enable CORS for all origins in production
     CORS(app, origins="*")
     
-    # Initialize database on cold start
-    init_database(app.config["DATABASE"])
+    # Initialize database on cold start, unless a bundled snapshot
+    # already holds it
+    snapshot = app.config["DATABASE_SNAPSHOT"]
+    if not (app.config["IN_MEMORY_DATABASE"] and snapshot and os.path.exists(snapshot)):
+        init_database(app.config["DATABASE"])
+    
+    from app import open_app_storage
+    if app.config["IN_MEMORY_DATABASE"]:
+        from app.services.checkpoints import DatabaseCheckpoints
+        DatabaseCheckpoints(open_app_storage(app)).start(app.config["CHECKPOINT_INTERVAL"])
     
     # Register blueprints
     from app.routes.game_routes import game_bp
@@ -46,9 +70,9 @@ def create_serverless_app() -> Flask:
     # Health check endpoint
     @app.route("/api/health")
     def health_check():
-        from app.services.game_engine import GameEngine
-        engine = GameEngine(db_path=app.config["DATABASE"])
-        total_games = engine.get_total_games()
+        # The stats routes' engine, so a probe doesn't load the graph again
+        from app.routes.stats_routes import get_engine
+        total_games = get_engine().get_total_games()
         return {
             "status": "healthy", 
             "game": "Six Degrees",
@@ -64,53 +88,27 @@ def create_serverless_app() -> Flask:
 
 
 def init_database(db_path: str):
-    """Initialize the SQLite database with word associations."""
+    """Initialize the database (SQLite path or PostgreSQL URL) with word associations."""
     import sqlite3
     
-    # Check if database already exists
-    if os.path.exists(db_path):
-        return
-    
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    
-    # Create tables
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS words (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            word TEXT UNIQUE NOT NULL
-        )
-    """)
-    
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS connections (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            word1_id INTEGER NOT NULL,
-            word2_id INTEGER NOT NULL,
-            FOREIGN KEY (word1_id) REFERENCES words(id),
-            FOREIGN KEY (word2_id) REFERENCES words(id),
-            UNIQUE(word1_id, word2_id)
-        )
-    """)
+    from app.models.database import Database
+    from app.models.storage import is_database_url, open_storage
     
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS games (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            start_word TEXT NOT NULL,
-            end_word TEXT NOT NULL,
-            player_path TEXT,
-            optimal_path TEXT,
-            player_length INTEGER,
-            optimal_length INTEGER,
-            score INTEGER,
-            completed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
-    
-    # Create indexes
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_words_word ON words(word)")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_conn_word1 ON connections(word1_id)")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_conn_word2 ON connections(word2_id)")
+    storage = None
+    if is_database_url(db_path):
+        # Shared database: create tables, seed only if no instance has yet
+        storage = open_storage(db_path)
+        storage.init_schema()
+        if storage.load_words():
+            storage.close()
+            return
+    else:
+        # Check if database already exists
+        if os.path.exists(db_path):
+            return
+        
+        # Create tables
+        Database(db_path).init_schema()
     
     # Word associations - comprehensive list
     WORD_ASSOCIATIONS = [
@@ -483,21 +481,35 @@ def init_database(db_path: str):
         words.add(word1)
         words.add(word2)
     
+    if storage is not None:
+        for word in words:
+            storage.add_word(word.upper())
+        for word1, word2 in WORD_ASSOCIATIONS:
+            storage.add_connection(word1.upper(), word2.upper())
+        storage.close()
+        logging.info(f"Database initialized at {db_path} with {len(words)} words")
+        return
+    
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    
     for word in words:
         cursor.execute("INSERT OR IGNORE INTO words (word) VALUES (?)", (word.upper(),))
     
     conn.commit()
     
-    # Insert connections
+    # Insert connections once per pair, as (smaller id, larger id)
     for word1, word2 in WORD_ASSOCIATIONS:
         cursor.execute("SELECT id FROM words WHERE word = ?", (word1.upper(),))
         id1 = cursor.fetchone()[0]
         cursor.execute("SELECT id FROM words WHERE word = ?", (word2.upper(),))
         id2 = cursor.fetchone()[0]
         
-        # Add bidirectional connections
-        cursor.execute("INSERT OR IGNORE INTO connections (word1_id, word2_id) VALUES (?, ?)", (id1, id2))
-        cursor.execute("INSERT OR IGNORE INTO connections (word1_id, word2_id) VALUES (?, ?)", (id2, id1))
+        if id1 != id2:
+            cursor.execute(
+                "INSERT OR IGNORE INTO connections (word1_id, word2_id) VALUES (?, ?)",
+                (min(id1, id2), max(id1, id2))
+            )
     
     conn.commit()
     conn.close()
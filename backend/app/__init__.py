@@ -32,9 +32,36 @@ def create_app(config_name: str = "development") -> Flask:
     app.config.update(
         SECRET_KEY="dev-secret-key-change-in-production",
         DATABASE="data/sixdegrees.db",
+        # Read-only word graph file; None keeps the graph in DATABASE,
+        # otherwise DATABASE only holds game history
+        GRAPH_DATABASE=None,
+        # Worker processes for expensive pathfinding (0 = inline only)
+        SEARCH_PROCESSES=0,
+        # Seconds between stats rollup compactions (0 disables the job)
+        ROLLUP_INTERVAL=60.0,
+        # Seconds between checks for a stale graph analytics run (0
+        # recomputes it inside /api/stats/graph requests instead)
+        ANALYTICS_INTERVAL=60.0,
+        # Serve a SQLite DATABASE from a shared in-memory copy, loaded at
+        # startup from DATABASE or, if that does not exist, DATABASE_SNAPSHOT.
+        # Single process only: run one worker (threaded), since checkpoints
+        # replace DATABASE whole and other writers would lose their games
+        IN_MEMORY_DATABASE=False,
+        DATABASE_SNAPSHOT=None,
+        # Seconds between copies of the in-memory database back to
+        # DATABASE (0 disables the job)
+        CHECKPOINT_INTERVAL=0,
+        # Save new games' paths as packed word ids instead of text
+        PACK_PATHS=False,
+        # SQLite file for game sessions evicted from memory (None drops them)
+        SESSION_SPILL=None,
         TESTING=config_name == "testing",
     )
     
+    # Fast JSON serialization when orjson is installed
+    from app.json_provider import init_json
+    init_json(app)
+    
     # Enable CORS for frontend (allow all localhost ports in development)
     # In production, update this to your actual domain
     CORS(app, origins=[
@@ -55,12 +82,26 @@ def create_app(config_name: str = "development") -> Flask:
     app.register_blueprint(game_bp, url_prefix="/api/game")
     app.register_blueprint(stats_bp, url_prefix="/api/stats")
     
+    # Background compaction of games into the time-series rollups
+    if app.config["ROLLUP_INTERVAL"] and not app.config["TESTING"]:
+        from app.services.rollups import StatsRollups
+        StatsRollups(open_app_storage(app)).start(app.config["ROLLUP_INTERVAL"])
+    
+    # Background checkpoints of an in-memory database
+    if (
+        app.config["IN_MEMORY_DATABASE"]
+        and app.config["CHECKPOINT_INTERVAL"]
+        and not app.config["TESTING"]
+    ):
+        from app.services.checkpoints import DatabaseCheckpoints
+        DatabaseCheckpoints(open_app_storage(app)).start(app.config["CHECKPOINT_INTERVAL"])
+    
     # Health check endpoint
     @app.route("/api/health")
     def health_check():
-        from app.services.game_engine import GameEngine
-        engine = GameEngine()
-        total_games = engine.get_total_games()
+        # The stats routes' engine, so this reads the configured DATABASE
+        from app.routes.stats_routes import get_engine
+        total_games = get_engine().get_total_games()
         return {
             "status": "healthy", 
             "game": "Six Degrees",
@@ -69,3 +110,21 @@ def create_app(config_name: str = "development") -> Flask:
     
     return app
 
+
+def open_app_storage(app: Flask):
+    """
+    Open the history storage an app's config describes.
+    
+    Args:
+        app: Flask app with DATABASE, IN_MEMORY_DATABASE and
+            DATABASE_SNAPSHOT settings
+    
+    Returns:
+        Storage instance
+    """
+    from app.models.storage import open_storage
+    return open_storage(
+        app.config["DATABASE"],
+        in_memory=app.config.get("IN_MEMORY_DATABASE", False),
+        snapshot=app.config.get("DATABASE_SNAPSHOT")
+    )
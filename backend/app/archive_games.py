@@ -0,0 +1,37 @@
+"""
+Archive old games for Six Degrees.
+
+Moves games older than the retention window into monthly archive files.
+Run periodically, e.g. from cron:
+
+    python -m app.archive_games --db data/sixdegrees.db --retention-days 90
+"""
+
+import argparse
+import logging
+from app.models.database import Database
+from app.services.archive import GameArchive
+from app.services.rollups import StatsRollups
+
+
+def main() -> None:
+    """Archive old games from the command line."""
+    parser = argparse.ArgumentParser(description="Archive old Six Degrees games")
+    parser.add_argument("--db", default="data/sixdegrees.db", help="Database path")
+    parser.add_argument("--archive-dir", help="Directory for monthly archive files")
+    parser.add_argument(
+        "--retention-days", type=int, default=GameArchive.RETENTION_DAYS,
+        help="Keep games younger than this many days in the hot table"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
+    db = Database(args.db)
+    # Adds the rollup tables to databases that predate them
+    db.init_schema()
+    archive = GameArchive(db, StatsRollups(db), args.archive_dir, args.retention_days)
+    print(f"Archived {archive.archive()} games")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,595 @@
+"""
+Six Degrees - ASGI Application
+
+Async serving mode for the game API. Serves the same endpoints as the
+Flask app, but handlers never block the event loop: SQLite work runs on
+a dedicated executor and BFS runs on a separate search pool, so a single
+worker can hold many concurrent connections.
+"""
+
+import asyncio
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+from urllib.parse import parse_qs
+
+from app.json_provider import dumps_bytes
+from app.models.database import AsyncDatabase
+from app.models.storage import open_storage
+from app.services.checkpoints import DatabaseCheckpoints
+from app.services.export import GameExport
+from app.services.game_engine import GameEngine
+from app.services.search_pool import SearchTimeout
+from app.services.sessions import SessionNotFound, SessionStore
+
+# Handlers return a JSON payload, or a GameExport to stream
+Response = Tuple[int, Union[Dict[str, Any], GameExport]]
+
+# Same development origins as the Flask app
+DEFAULT_ORIGINS = [
+    "http://localhost:5173",
+    "http://localhost:5174",
+    "http://localhost:3000",
+    "http://127.0.0.1:5173",
+    "http://127.0.0.1:5174",
+    "http://127.0.0.1:3000",
+]
+
+
+class Request:
+    """Minimal HTTP request passed to ASGI handlers."""
+
+    def __init__(self, method: str, path: str, query_string: bytes, body: bytes):
+        """
+        Initialize request.
+
+        Args:
+            method: HTTP method
+            path: Request path
+            query_string: Raw query string
+            body: Full request body
+        """
+        self.method = method
+        self.path = path
+        self.args = {
+            key: values[0]
+            for key, values in parse_qs(query_string.decode("latin-1")).items()
+        }
+        self.body = body
+
+    def get_json(self) -> Optional[Any]:
+        """
+        Parse the request body as JSON.
+
+        Returns:
+            Decoded JSON, or None for an empty or malformed body
+        """
+        if not self.body:
+            return None
+        try:
+            return json.loads(self.body)
+        except ValueError:
+            return None
+
+
+class AsgiApp:
+    """
+    ASGI application serving the Six Degrees API.
+
+    Handlers mirror app.routes.game_routes and app.routes.stats_routes.
+    """
+
+    def __init__(
+        self,
+        db_path: str = "data/sixdegrees.db",
+        search_workers: int = 4,
+        sqlite_workers: int = 4,
+        search_processes: int = 0,
+        rollup_interval: float = 60.0,
+        analytics_interval: float = 60.0,
+        origins: Optional[List[str]] = None,
+        session_spill: Optional[str] = None,
+        graph_db_path: Optional[str] = None,
+        in_memory: bool = False,
+        snapshot: Optional[str] = None,
+        checkpoint_interval: float = 0.0,
+        pack_paths: bool = False,
+    ):
+        """
+        Initialize ASGI app.
+
+        Args:
+            db_path: Path to SQLite database
+            search_workers: Threads available for BFS work
+            sqlite_workers: Threads available for SQLite work
+            search_processes: Worker processes for expensive searches
+            rollup_interval: Seconds between stats rollup compactions
+                (0 disables the job)
+            analytics_interval: Seconds between checks for a stale graph
+                analytics run (0 recomputes it inside requests instead)
+            origins: Allowed CORS origins ("*" allows all)
+            session_spill: SQLite file for sessions evicted from memory
+            graph_db_path: Read-only word graph file (None keeps the
+                graph in db_path)
+            in_memory: Serve db_path from a shared in-memory copy
+            snapshot: File the in-memory copy is loaded from when
+                db_path does not exist yet
+            checkpoint_interval: Seconds between copies of the in-memory
+                database back to db_path (0 disables the job)
+            pack_paths: Save new games' paths as packed word ids
+        """
+        storage = open_storage(db_path, in_memory=True, snapshot=snapshot) if in_memory else None
+        self.engine = GameEngine(
+            db_path=db_path,
+            graph_db_path=graph_db_path,
+            storage=storage,
+            pack_paths=pack_paths,
+            search_processes=search_processes,
+            sessions=SessionStore(spill_path=session_spill)
+        )
+        self.db = AsyncDatabase(self.engine.db, max_workers=sqlite_workers)
+        self._search = ThreadPoolExecutor(
+            max_workers=search_workers, thread_name_prefix="search"
+        )
+        self.rollup_interval = rollup_interval
+        self.analytics_interval = analytics_interval
+        self.checkpoints = (
+            DatabaseCheckpoints(self.engine.db) if in_memory and checkpoint_interval else None
+        )
+        self.checkpoint_interval = checkpoint_interval
+        self.origins = set(origins if origins is not None else DEFAULT_ORIGINS)
+        self.routes: Dict[Tuple[str, str], Callable[[Request], Awaitable[Response]]] = {
+            ("GET", "/api/health"): self.health_check,
+            ("GET", "/api/game/new"): self.new_game,
+            ("POST", "/api/game/validate"): self.validate_word,
+            ("POST", "/api/game/validate-chain"): self.validate_chain,
+            ("POST", "/api/game/undo"): self.undo_move,
+            ("POST", "/api/game/submit"): self.submit_solution,
+            ("POST", "/api/game/hint"): self.get_hint,
+            ("POST", "/api/game/check-connection"): self.check_connection,
+            ("GET", "/api/stats"): self.get_stats,
+            ("GET", "/api/stats/graph"): self.get_graph_info,
+            ("GET", "/api/stats/games"): self.get_game_history,
+            ("GET", "/api/stats/leaderboard"): self.get_leaderboard,
+            ("GET", "/api/stats/puzzle"): self.get_puzzle_stats,
+            ("GET", "/api/stats/timeseries"): self.get_timeseries,
+            ("GET", "/api/stats/export"): self.export_games,
+        }
+
+    async def search(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Run CPU-bound engine work on the search pool.
+
+        Args:
+            fn: Callable to run
+            *args: Positional arguments for fn
+            **kwargs: Keyword arguments for fn
+
+        Returns:
+            Result of fn
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._search, partial(fn, *args, **kwargs))
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        """ASGI entry point."""
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+        elif scope["type"] == "http":
+            await self._http(scope, receive, send)
+
+    async def _lifespan(self, receive: Callable, send: Callable) -> None:
+        """Warm the graph and start background jobs; release them on shutdown."""
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await self.db.run(self.engine.graph.load)
+                if self.rollup_interval:
+                    self.engine.rollups.start(self.rollup_interval)
+                if self.analytics_interval:
+                    self.engine.analytics.start(self.analytics_interval)
+                if self.checkpoints is not None:
+                    self.checkpoints.start(self.checkpoint_interval)
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                self.engine.rollups.stop()
+                self.engine.analytics.stop()
+                if self.checkpoints is not None:
+                    self.checkpoints.stop()
+                self.db.close()
+                self._search.shutdown(wait=False)
+                self.engine.close()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _http(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        """Read the request, dispatch it and write the JSON response."""
+        body = b""
+        more_body = True
+        while more_body:
+            message = await receive()
+            body += message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+        method = scope["method"]
+        path = scope["path"].rstrip("/") or "/"
+        headers = {k.decode("latin-1"): v.decode("latin-1") for k, v in scope["headers"]}
+
+        if method == "OPTIONS":
+            await self._send(send, 204, None, headers)
+            return
+
+        handler = self.routes.get((method, path))
+        if handler is None:
+            if any(route_path == path for _, route_path in self.routes):
+                await self._send(send, 405, {"error": "Method not allowed"}, headers)
+            else:
+                await self._send(send, 404, {"error": "Not found"}, headers)
+            return
+
+        request = Request(method, path, scope.get("query_string", b""), body)
+        try:
+            # Pick up graph edits made by other workers (throttled)
+            await self.db.run(self.engine.graph.refresh)
+            status, payload = await handler(request)
+        except SearchTimeout as e:
+            # Also covers SearchBudgetExceeded
+            status, payload = 503, {"error": str(e), "degraded": True}
+        except SessionNotFound as e:
+            status, payload = 404, {"error": str(e)}
+        except Exception:
+            logging.exception(f"Unhandled error for {method} {path}")
+            status, payload = 500, {"error": "Internal server error"}
+
+        if isinstance(payload, GameExport):
+            await self._stream(send, payload, headers)
+        else:
+            await self._send(send, status, payload, headers)
+
+    async def _send(
+        self,
+        send: Callable,
+        status: int,
+        payload: Optional[Dict[str, Any]],
+        request_headers: Dict[str, str],
+    ) -> None:
+        """Send a JSON response with CORS headers."""
+        body = b"" if payload is None else dumps_bytes(payload)
+        headers = [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode("latin-1")),
+        ] + self._cors_headers(request_headers)
+
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+    async def _stream(
+        self,
+        send: Callable,
+        export: GameExport,
+        request_headers: Dict[str, str],
+    ) -> None:
+        """Send an export as a chunked response, reading batches on the SQLite pool."""
+        disposition = f'attachment; filename="games.{export.format}"'
+        headers = [
+            (b"content-type", export.content_type.encode("latin-1")),
+            (b"content-disposition", disposition.encode("latin-1")),
+        ] + self._cors_headers(request_headers)
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+
+        chunks = export.chunks()
+        try:
+            while True:
+                chunk = await self.db.run(next, chunks, None)
+                if chunk is None:
+                    break
+                await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        except Exception:
+            # Too late for an error status; the client sees a truncated body
+            logging.exception("Export failed")
+        finally:
+            await self.db.run(chunks.close)
+        await send({"type": "http.response.body", "body": b""})
+
+    def _cors_headers(self, request_headers: Dict[str, str]) -> List[Tuple[bytes, bytes]]:
+        """CORS headers for an allowed origin (none otherwise)."""
+        origin = request_headers.get("origin")
+        if not origin or ("*" not in self.origins and origin not in self.origins):
+            return []
+        return [
+            (b"access-control-allow-origin", origin.encode("latin-1")),
+            (b"access-control-allow-headers", b"Content-Type"),
+            (b"access-control-allow-methods", b"GET, POST, OPTIONS"),
+            (b"vary", b"Origin"),
+        ]
+
+    async def health_check(self, request: Request) -> Response:
+        """Health check endpoint."""
+        total_games = await self.db.run(self.engine.get_total_games)
+        return 200, {
+            "status": "healthy",
+            "game": "Six Degrees",
+            "total_games_played": total_games
+        }
+
+    async def new_game(self, request: Request) -> Response:
+        """Generate a new puzzle."""
+        difficulty = request.args.get("difficulty", "medium")
+
+        if difficulty not in ["easy", "medium", "hard"]:
+            return 400, {"error": "Invalid difficulty"}
+
+        try:
+            seed = int(request.args["seed"]) if "seed" in request.args else None
+        except ValueError:
+            return 400, {"error": "seed must be an integer"}
+
+        try:
+            puzzle = await self.search(self.engine.generate_puzzle, difficulty, seed)
+        except ValueError as e:
+            return 500, {"error": str(e)}
+
+        return 200, puzzle.to_dict()
+
+    async def validate_word(self, request: Request) -> Response:
+        """Validate a word addition to the chain."""
+        data = request.get_json()
+
+        if not data or "word" not in data:
+            return 400, {"error": "Missing 'word' in request"}
+
+        if data.get("puzzle_id"):
+            try:
+                return 200, await self.search(
+                    self.engine.validate_move, data["puzzle_id"], data["word"]
+                )
+            except SessionNotFound:
+                if "chain" not in data:
+                    raise
+
+        result = await self.search(
+            self.engine.validate_word, data["word"], data.get("chain", [])
+        )
+        return 200, result
+
+    async def validate_chain(self, request: Request) -> Response:
+        """Validate a whole chain in one call."""
+        data = request.get_json()
+
+        if not data or not isinstance(data.get("chain"), list) or \
+                not all(isinstance(word, str) for word in data["chain"]):
+            return 400, {"error": "'chain' must be a list of words"}
+
+        required = ["start_word", "end_word"]
+        legacy = all(key in data for key in required)
+        if not (legacy or data.get("puzzle_id")):
+            return 400, {"error": f"Missing required fields: {required} or puzzle_id"}
+
+        if data.get("puzzle_id"):
+            try:
+                return 200, await self.search(
+                    self.engine.replay_chain, data["puzzle_id"], data["chain"]
+                )
+            except SessionNotFound:
+                if not legacy:
+                    raise
+
+        report = await self.search(
+            self.engine.validate_chain, data["start_word"], data["end_word"], data["chain"]
+        )
+        return 200, report
+
+    async def undo_move(self, request: Request) -> Response:
+        """Remove the last word from a session's chain."""
+        data = request.get_json()
+
+        if not data or "puzzle_id" not in data:
+            return 400, {"error": "Missing 'puzzle_id' in request"}
+
+        return 200, await self.search(self.engine.undo_move, data["puzzle_id"])
+
+    async def submit_solution(self, request: Request) -> Response:
+        """Score a completed solution and record it."""
+        data = request.get_json()
+
+        required = ["start_word", "end_word", "path"]
+        legacy = bool(data) and all(key in data for key in required)
+        if not data or not (legacy or data.get("puzzle_id")):
+            return 400, {"error": f"Missing required fields: {required} or puzzle_id"}
+
+        if data.get("puzzle_id"):
+            try:
+                result = await self.search(
+                    self.engine.score_session, data["puzzle_id"], data.get("path")
+                )
+            except SessionNotFound:
+                if not legacy:
+                    raise
+            else:
+                await self.db.run(self.engine.record_session, data["puzzle_id"], result)
+                return 200, result.to_dict()
+
+        result = await self.search(
+            self.engine.score_solution,
+            start_word=data["start_word"],
+            end_word=data["end_word"],
+            player_path=data["path"]
+        )
+        await self.db.run(self.engine.record_game, result)
+
+        return 200, result.to_dict()
+
+    async def get_hint(self, request: Request) -> Response:
+        """Get a hint for current puzzle state."""
+        data = request.get_json()
+
+        required = ["start_word", "end_word"]
+        legacy = bool(data) and all(key in data for key in required)
+        if not data or not (legacy or data.get("puzzle_id")):
+            return 400, {"error": f"Missing required fields: {required} or puzzle_id"}
+
+        if data.get("puzzle_id"):
+            try:
+                return 200, await self.search(
+                    self.engine.session_hint, data["puzzle_id"], data.get("hint_level", 1)
+                )
+            except SessionNotFound:
+                if not legacy:
+                    raise
+
+        hint = await self.search(
+            self.engine.get_hint,
+            start_word=data["start_word"],
+            end_word=data["end_word"],
+            current_chain=data.get("chain", []),
+            hint_level=data.get("hint_level", 1)
+        )
+        return 200, hint
+
+    async def check_connection(self, request: Request) -> Response:
+        """Check if two words are connected."""
+        data = request.get_json()
+
+        if not data or "word1" not in data or "word2" not in data:
+            return 400, {"error": "Missing word1 or word2"}
+
+        connected = self.engine.graph.are_connected(data["word1"], data["word2"])
+
+        return 200, {
+            "word1": data["word1"].upper(),
+            "word2": data["word2"].upper(),
+            "connected": connected
+        }
+
+    async def get_stats(self, request: Request) -> Response:
+        """Get overall game statistics."""
+        stats = await self.db.run(self.engine.get_statistics)
+        return 200, stats
+
+    async def get_graph_info(self, request: Request) -> Response:
+        """Get word graph information."""
+        analytics = await self.search(self.engine.analytics.summary)
+        return 200, {
+            "total_words": self.engine.graph.word_count(),
+            "total_connections": self.engine.graph.connection_count(),
+            "analytics": analytics,
+            "searches": self.engine.pathfinder.flights.stats()
+        }
+
+    async def get_game_history(self, request: Request) -> Response:
+        """Page through game history, newest first."""
+        args = request.args
+        try:
+            limit = int(args.get("limit", 20))
+            min_score = int(args["min_score"]) if "min_score" in args else None
+            max_score = int(args["max_score"]) if "max_score" in args else None
+        except ValueError:
+            return 400, {"error": "limit and score bounds must be integers"}
+
+        if not 1 <= limit <= 100:
+            return 400, {"error": "limit must be between 1 and 100"}
+
+        try:
+            page = await self.db.run(partial(
+                self.engine.get_game_history,
+                limit=limit,
+                cursor=args.get("cursor"),
+                word=args.get("word"),
+                min_score=min_score,
+                max_score=max_score,
+                since=args.get("since"),
+                until=args.get("until"),
+                include_archived=args.get("include_archived", "").lower() in ("1", "true")
+            ))
+        except ValueError as e:
+            return 400, {"error": str(e)}
+
+        return 200, page
+
+    async def get_leaderboard(self, request: Request) -> Response:
+        """Get the best games overall."""
+        try:
+            limit = int(request.args.get("limit", 10))
+        except ValueError:
+            return 400, {"error": "limit must be an integer"}
+
+        if not 1 <= limit <= 100:
+            return 400, {"error": "limit must be between 1 and 100"}
+
+        top = await self.db.run(self.engine.leaderboard.top, limit)
+        return 200, {"leaderboard": top}
+
+    async def get_puzzle_stats(self, request: Request) -> Response:
+        """Get the score histogram for one puzzle."""
+        start = request.args.get("start")
+        end = request.args.get("end")
+        if not start or not end:
+            return 400, {"error": "Missing start or end"}
+
+        try:
+            score = int(request.args["score"]) if "score" in request.args else None
+        except ValueError:
+            return 400, {"error": "score must be an integer"}
+
+        stats = await self.db.run(self.engine.leaderboard.puzzle_stats, start, end, score)
+        return 200, stats
+
+    async def get_timeseries(self, request: Request) -> Response:
+        """Get game stats per hour or day, read from the rollup tables."""
+        granularity = request.args.get("granularity", "day")
+        try:
+            limit = int(request.args.get("limit", 30))
+        except ValueError:
+            return 400, {"error": "limit must be an integer"}
+
+        if not 1 <= limit <= 1000:
+            return 400, {"error": "limit must be between 1 and 1000"}
+
+        try:
+            points = await self.db.run(partial(
+                self.engine.rollups.timeseries,
+                granularity,
+                since=request.args.get("since"),
+                until=request.args.get("until"),
+                limit=limit
+            ))
+        except ValueError as e:
+            return 400, {"error": str(e)}
+
+        return 200, {"granularity": granularity, "points": points}
+
+    async def export_games(self, request: Request) -> Response:
+        """Stream the whole game history, oldest first, as a chunked download."""
+        try:
+            after_id = int(request.args.get("after_id", 0))
+        except ValueError:
+            return 400, {"error": "after_id must be an integer"}
+
+        try:
+            export = GameExport(self.engine, request.args.get("format", "jsonl"), after_id=after_id)
+        except ValueError as e:
+            return 400, {"error": str(e)}
+
+        return 200, export
+
+
+def create_asgi_app(db_path: str = "data/sixdegrees.db", **kwargs: Any) -> AsgiApp:
+    """
+    Factory for the ASGI application.
+
+    Args:
+        db_path: Path to SQLite database
+        **kwargs: Extra AsgiApp options (worker counts, origins,
+            graph_db_path, in-memory mode)
+
+    Returns:
+        Configured ASGI application
+    """
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s [%(levelname)s] %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    )
+    return AsgiApp(db_path=db_path, **kwargs)
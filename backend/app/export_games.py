@@ -0,0 +1,49 @@
+"""
+Export game history for Six Degrees.
+
+Streams every game, oldest first, to CSV, JSON Lines or Parquet (with
+pyarrow installed) in constant memory. Pass --after-id with the last id
+of a previous export to fetch only newer games:
+
+    python -m app.export_games --db data/sixdegrees.db --format csv --output games.csv
+"""
+
+import argparse
+import logging
+import sys
+from app.models.storage import open_storage
+from app.services.export import FORMATS, GameExport
+from app.services.game_engine import GameEngine
+
+
+def main() -> None:
+    """Export games from the command line."""
+    parser = argparse.ArgumentParser(description="Export Six Degrees game history")
+    parser.add_argument("--db", default="data/sixdegrees.db", help="Database path or URL")
+    parser.add_argument("--format", choices=list(FORMATS), default="jsonl", help="Output format")
+    parser.add_argument("--output", default="-", help="Output file (- for stdout)")
+    parser.add_argument("--after-id", type=int, default=0, help="Only games with a larger id")
+    parser.add_argument(
+        "--batch-size", type=int, default=5000, help="Games read and written per batch"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
+    # The graph loads lazily, so this touches only the games table
+    engine = GameEngine(storage=open_storage(args.db))
+    try:
+        export = GameExport(engine, args.format, after_id=args.after_id, batch_size=args.batch_size)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.output == "-":
+        count = export.write(sys.stdout.buffer)
+    else:
+        with open(args.output, "wb") as out:
+            count = export.write(out)
+    logging.info(f"Exported {count} games")
+    engine.close()
+
+
+if __name__ == "__main__":
+    main()
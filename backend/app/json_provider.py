@@ -0,0 +1,72 @@
+"""
+JSON serialization for Six Degrees API responses.
+
+Uses orjson when it is installed and falls back to the standard library
+otherwise. Both the Flask app (via its JSON provider) and the ASGI app
+(via dumps_bytes) serialize through this module.
+"""
+
+import json
+from typing import Any, Union
+
+from flask import Flask, Response
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+HAS_ORJSON = orjson is not None
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider backed by orjson.
+
+    Keys are not sorted: API clients never rely on key order and sorting
+    is a large share of serialization time.
+    """
+
+    sort_keys = False
+    _options = orjson.OPT_NON_STR_KEYS if HAS_ORJSON else 0
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        """Serialize to a JSON string."""
+        return orjson.dumps(obj, default=self.default, option=self._options).decode("utf-8")
+
+    def loads(self, s: Union[str, bytes], **kwargs: Any) -> Any:
+        """Deserialize a JSON string or bytes."""
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        """Build a JSON response without an intermediate str."""
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=self.default, option=self._options)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+def init_json(app: Flask) -> None:
+    """
+    Register the fastest available JSON provider on an app.
+
+    Args:
+        app: Flask application
+    """
+    if HAS_ORJSON:
+        app.json = OrjsonProvider(app)
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    """
+    Serialize a response payload to UTF-8 JSON bytes.
+
+    Args:
+        obj: JSON-compatible object
+
+    Returns:
+        Encoded JSON
+    """
+    if HAS_ORJSON:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj).encode("utf-8")
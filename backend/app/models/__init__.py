@@ -1,7 +1,19 @@
 """Database models for Six Degrees game."""
 
-from app.models.database import Database
-from app.models.word_graph import WordGraph
-
-__all__ = ["Database", "WordGraph"]
+from app.models.database import AsyncDatabase, Database, DatabaseInUse
+from app.models.memory import MemoryStorage
+from app.models.postgres import PostgresStorage
+from app.models.storage import Storage, open_storage
+from app.models.word_graph import GraphChange, WordGraph
 
+__all__ = [
+    "AsyncDatabase",
+    "Database",
+    "DatabaseInUse",
+    "GraphChange",
+    "MemoryStorage",
+    "PostgresStorage",
+    "Storage",
+    "WordGraph",
+    "open_storage",
+]
@@ -4,28 +4,245 @@ Database connection and management for Six Degrees.
 Handles SQLite connections and provides a clean interface for data operations.
 """
 
+import asyncio
+import json
+import os
 import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
-from typing import Optional, List, Dict, Any
-from contextlib import contextmanager
+from typing import Optional, List, Dict, Any, Callable, Iterator, Tuple
+from contextlib import contextmanager, nullcontext
+from urllib.parse import quote
+from app.models.storage import GamePath, HistoryKey, Storage, path_columns
 
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
 
-class Database:
+
+class DatabaseInUse(RuntimeError):
+    """Raised when another process serves a database file from memory."""
+
+
+class _MemoryInstance:
+    """A shared-cache in-memory database kept alive by an anchor connection."""
+    
+    __slots__ = ("anchor", "lock", "users", "owner", "pid")
+    
+    def __init__(self, anchor: sqlite3.Connection, owner: Optional[Any]):
+        self.anchor = anchor
+        # Shared-cache table locks fail with SQLITE_LOCKED instead of
+        # waiting, so transactions on one instance take turns
+        self.lock = threading.RLock()
+        self.users = 0
+        # Lock file held while this process is the file's only writer
+        self.owner = owner
+        self.pid = os.getpid()
+    
+    def check_process(self, db_path: Path) -> None:
+        """Refuse use from a forked child, which would checkpoint its own diverging copy."""
+        if self.pid != os.getpid():
+            raise DatabaseInUse(f"{db_path} was opened in memory before this worker forked")
+
+
+def _memory_lock_path(db_path: Path) -> Path:
+    """Lock file marking db_path as served from memory."""
+    return db_path.with_name(db_path.name + ".memory-lock")
+
+
+def _claim_memory_owner(db_path: Path) -> Optional[Any]:
+    """
+    Take the exclusive lock on db_path's lock file, without waiting.
+    
+    Returns:
+        Open lock file, which holds the lock until closed (None where
+        file locks are unsupported)
+    
+    Raises:
+        DatabaseInUse: If another process holds the lock
+    """
+    if fcntl is None:  # pragma: no cover - not available on Windows
+        return None
+    owner = open(_memory_lock_path(db_path), "a")
+    try:
+        fcntl.flock(owner, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        owner.close()
+        raise DatabaseInUse(
+            f"{db_path} is served from memory by another process; its checkpoints "
+            "would overwrite changes made here"
+        ) from None
+    return owner
+
+
+def _check_not_served_in_memory(db_path: Path) -> None:
+    """
+    Raise DatabaseInUse if a live process serves db_path from memory.
+    
+    A lock file left behind by a stopped server is not held, so it does
+    not block anything.
+    """
+    if fcntl is None or not _memory_lock_path(db_path).exists():
+        return
+    _claim_memory_owner(db_path).close()
+
+
+# In-memory databases by URI, shared by every Database opened on the same path
+_MEMORY_INSTANCES: Dict[str, _MemoryInstance] = {}
+_MEMORY_GUARD = threading.Lock()
+
+
+class Database(Storage):
     """
     SQLite database manager with context management support.
     
-    Provides connection pooling and clean query interfaces.
+    Provides connection pooling and clean query interfaces, and
+    implements the Storage interface on top of them.
     """
     
-    def __init__(self, db_path: str = "data/sixdegrees.db"):
+    ARCHIVABLE = True
+    
+    # Bytes of a read-only file mapped into memory instead of read()
+    MMAP_SIZE = 256 * 1024 * 1024
+    
+    def __init__(
+        self,
+        db_path: str = "data/sixdegrees.db",
+        read_only: bool = False,
+        tune_writes: bool = False,
+        in_memory: bool = False,
+        snapshot: Optional[str] = None
+    ):
         """
         Initialize database connection.
         
         Args:
             db_path: Path to SQLite database file
+            read_only: Open the file as immutable: no locks, no journal,
+                memory-mapped reads. The file must not change while open
+                (replace it instead), and every write raises.
+            tune_writes: Use WAL with synchronous=NORMAL, so inserts
+                neither block readers nor fsync on every commit
+            in_memory: Serve queries from a shared-cache in-memory copy,
+                shared by every in-memory Database on db_path in this
+                process. Only checkpoint() writes db_path, replacing it
+                whole, so this mode is single-process: a second process
+                serving db_path from memory, or opening it for writes
+                (other workers, archive_games, pack_paths), is refused
+                with DatabaseInUse while this copy is open. Run one
+                worker process (threads or the ASGI app) in this mode.
+            snapshot: File the in-memory copy is loaded from when db_path
+                does not exist yet (e.g. one bundled with the deployment)
         """
+        if read_only and in_memory:
+            raise ValueError("read_only and in_memory cannot be combined")
         self.db_path = Path(db_path)
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.read_only = read_only
+        self.in_memory = in_memory
+        self.tune_writes = tune_writes and not read_only and not in_memory
+        self._wal_ready = False
+        self._memory: Optional[_MemoryInstance] = None
+        if not read_only:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        if not read_only and not in_memory:
+            _check_not_served_in_memory(self.db_path)
+        if in_memory:
+            # Monthly archives attach db_path, which holds only checkpoints
+            self.ARCHIVABLE = False
+            name = quote(str(self.db_path.resolve()))
+            self._memory_uri = f"file:{name}?mode=memory&cache=shared"
+            self._memory = self._open_memory(snapshot)
+    
+    def _open_memory(self, snapshot: Optional[str]) -> _MemoryInstance:
+        """Join this path's in-memory instance, hydrating it on first use."""
+        with _MEMORY_GUARD:
+            instance = _MEMORY_INSTANCES.get(self._memory_uri)
+            if instance is not None:
+                instance.check_process(self.db_path)
+            if instance is None:
+                owner = _claim_memory_owner(self.db_path)
+                try:
+                    anchor = sqlite3.connect(self._memory_uri, uri=True, check_same_thread=False)
+                    source = self.db_path if self.db_path.exists() else snapshot
+                    if source is not None:
+                        # Page-level copy; far faster than replaying SQL
+                        uri = f"{Path(source).resolve().as_uri()}?mode=ro"
+                        disk = sqlite3.connect(uri, uri=True)
+                        try:
+                            disk.backup(anchor)
+                        finally:
+                            disk.close()
+                except BaseException:
+                    if owner is not None:
+                        owner.close()
+                    raise
+                instance = _MEMORY_INSTANCES[self._memory_uri] = _MemoryInstance(anchor, owner)
+            instance.users += 1
+            return instance
+    
+    def close(self) -> None:
+        """Leave the in-memory instance, dropping it after its last user."""
+        if self._memory is None:
+            return
+        with _MEMORY_GUARD:
+            self._memory.users -= 1
+            if self._memory.users == 0:
+                _MEMORY_INSTANCES.pop(self._memory_uri, None)
+                self._memory.anchor.close()
+                if self._memory.owner is not None:
+                    self._memory.owner.close()
+        self._memory = None
+    
+    def location(self) -> Optional[str]:
+        """Get the file path, or None while served from memory (the file lags it)."""
+        return None if self.in_memory else str(self.db_path)
+    
+    def checkpoint(self) -> None:
+        """
+        Copy the in-memory database to db_path.
+        
+        Writes a temporary file and renames it over db_path, so a crash
+        mid-copy leaves the previous checkpoint intact. Queries wait for
+        the copy, which takes milliseconds for this game's databases.
+        """
+        if self._memory is None:
+            raise RuntimeError("checkpoint() requires an in-memory database")
+        partial_path = self.db_path.with_name(self.db_path.name + ".checkpoint")
+        disk = sqlite3.connect(partial_path)
+        try:
+            with self._memory.lock:
+                conn = sqlite3.connect(self._memory_uri, uri=True)
+                try:
+                    conn.backup(disk)
+                finally:
+                    conn.close()
+        finally:
+            disk.close()
+        os.replace(partial_path, self.db_path)
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection configured for this database's role."""
+        if self._memory is not None:
+            self._memory.check_process(self.db_path)
+            return sqlite3.connect(self._memory_uri, uri=True)
+        
+        if self.read_only:
+            uri = f"{self.db_path.resolve().as_uri()}?mode=ro&immutable=1"
+            conn = sqlite3.connect(uri, uri=True)
+            conn.execute(f"PRAGMA mmap_size = {self.MMAP_SIZE}")
+            return conn
+        
+        conn = sqlite3.connect(self.db_path)
+        if self.tune_writes:
+            if not self._wal_ready:
+                # Persistent in the file; only needs setting once
+                conn.execute("PRAGMA journal_mode = WAL")
+                self._wal_ready = True
+            conn.execute("PRAGMA synchronous = NORMAL")
+        return conn
     
     @contextmanager
     def get_connection(self):
@@ -35,16 +252,17 @@ class Database:
         Yields:
             SQLite connection with row factory
         """
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        try:
-            yield conn
-            conn.commit()
-        except Exception:
-            conn.rollback()
-            raise
-        finally:
-            conn.close()
+        with self._memory.lock if self._memory is not None else nullcontext():
+            conn = self._connect()
+            conn.row_factory = sqlite3.Row
+            try:
+                yield conn
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                conn.close()
     
     def execute(self, query: str, params: tuple = ()) -> List[Dict[str, Any]]:
         """
@@ -91,7 +309,7 @@ class Database:
             return cursor.lastrowid
     
     def init_schema(self):
-        """Initialize database schema."""
+        """Initialize database schema, migrating legacy connection tables."""
         with self.get_connection() as conn:
             conn.executescript("""
                 -- Words table
@@ -101,16 +319,17 @@ class Database:
                     category TEXT
                 );
                 
-                -- Word connections (edges in graph)
+                -- Word connections (edges in graph), stored once per
+                -- undirected pair as (smaller id, larger id)
                 CREATE TABLE IF NOT EXISTS connections (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
                     word1_id INTEGER NOT NULL,
                     word2_id INTEGER NOT NULL,
                     strength REAL DEFAULT 1.0,
+                    PRIMARY KEY (word1_id, word2_id),
                     FOREIGN KEY (word1_id) REFERENCES words(id),
                     FOREIGN KEY (word2_id) REFERENCES words(id),
-                    UNIQUE(word1_id, word2_id)
-                );
+                    CHECK (word1_id < word2_id)
+                ) WITHOUT ROWID;
                 
                 -- Game history
                 CREATE TABLE IF NOT EXISTS games (
@@ -122,12 +341,710 @@ class Database:
                     player_length INTEGER,
                     optimal_length INTEGER,
                     score INTEGER,
-                    completed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    completed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    -- Packed word ids replacing the text paths (see PathCodec)
+                    player_ids BLOB,
+                    optimal_ids BLOB
+                );
+                
+                -- Dictionary for packed paths; ids are never reused
+                CREATE TABLE IF NOT EXISTS path_words (
+                    id INTEGER PRIMARY KEY,
+                    word TEXT UNIQUE NOT NULL
+                );
+                
+                -- Score histograms per puzzle ('*', '*' holds the global one)
+                CREATE TABLE IF NOT EXISTS puzzle_scores (
+                    start_word TEXT NOT NULL,
+                    end_word TEXT NOT NULL,
+                    score INTEGER NOT NULL,
+                    count INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (start_word, end_word, score)
+                ) WITHOUT ROWID;
+                
+                -- Bounded top-N games for the global leaderboard
+                CREATE TABLE IF NOT EXISTS leaderboard (
+                    game_id INTEGER PRIMARY KEY,
+                    start_word TEXT NOT NULL,
+                    end_word TEXT NOT NULL,
+                    score INTEGER NOT NULL,
+                    player_length INTEGER NOT NULL,
+                    completed_at TIMESTAMP
+                );
+                
+                -- Hourly and daily game aggregates, filled by compaction.
+                -- Sums rather than averages so batches merge by addition.
+                CREATE TABLE IF NOT EXISTS stats_hourly (
+                    bucket TEXT PRIMARY KEY,
+                    games INTEGER NOT NULL,
+                    score_sum INTEGER NOT NULL,
+                    perfect_count INTEGER NOT NULL,
+                    failure_count INTEGER NOT NULL,
+                    length_sum INTEGER NOT NULL,
+                    length_count INTEGER NOT NULL
+                ) WITHOUT ROWID;
+                
+                CREATE TABLE IF NOT EXISTS stats_daily (
+                    bucket TEXT PRIMARY KEY,
+                    games INTEGER NOT NULL,
+                    score_sum INTEGER NOT NULL,
+                    perfect_count INTEGER NOT NULL,
+                    failure_count INTEGER NOT NULL,
+                    length_sum INTEGER NOT NULL,
+                    length_count INTEGER NOT NULL
+                ) WITHOUT ROWID;
+                
+                -- Compaction watermarks (last games.id folded into rollups)
+                CREATE TABLE IF NOT EXISTS rollup_state (
+                    name TEXT PRIMARY KEY,
+                    last_game_id INTEGER NOT NULL
+                );
+                
+                -- Graph change log, polled by workers to apply incremental reloads
+                CREATE TABLE IF NOT EXISTS graph_changes (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    kind TEXT NOT NULL,
+                    word1 TEXT NOT NULL,
+                    word2 TEXT,
+                    strength REAL,
+                    changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 );
                 
-                -- Create indexes for performance
-                CREATE INDEX IF NOT EXISTS idx_words_word ON words(word);
-                CREATE INDEX IF NOT EXISTS idx_conn_word1 ON connections(word1_id);
-                CREATE INDEX IF NOT EXISTS idx_conn_word2 ON connections(word2_id);
+                -- Latest graph analytics run (single row) and its per-word results
+                CREATE TABLE IF NOT EXISTS graph_metrics (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    version INTEGER NOT NULL,
+                    summary TEXT NOT NULL,
+                    computed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                );
+                
+                CREATE TABLE IF NOT EXISTS word_metrics (
+                    word TEXT PRIMARY KEY,
+                    betweenness REAL NOT NULL,
+                    eccentricity INTEGER
+                ) WITHOUT ROWID;
+                
+                -- Game history keyset pagination on (completed_at, id); score
+                -- is included so score filters are evaluated inside the index
+                CREATE INDEX IF NOT EXISTS idx_games_completed
+                    ON games(completed_at, id, score);
+                CREATE INDEX IF NOT EXISTS idx_games_start_completed
+                    ON games(start_word, completed_at, id, score);
+                CREATE INDEX IF NOT EXISTS idx_games_end_completed
+                    ON games(end_word, completed_at, id, score);
+                CREATE INDEX IF NOT EXISTS idx_leaderboard_rank
+                    ON leaderboard(score DESC, player_length, game_id);
             """)
+            self._migrate_games(conn)
+            migrated = self._migrate_connections(conn)
+        
+        with self.get_connection() as conn:
+            # Taken before the check so concurrent upgrades backfill once
+            conn.execute("BEGIN IMMEDIATE")
+            if (
+                conn.execute("SELECT 1 FROM puzzle_scores LIMIT 1").fetchone() is None
+                and conn.execute("SELECT 1 FROM games LIMIT 1").fetchone() is not None
+            ):
+                self._rebuild_game_stats(conn, self.LEADERBOARD_SIZE)
+        
+        if migrated:
+            # Return the legacy table's pages to the filesystem
+            with self.get_connection() as conn:
+                conn.execute("VACUUM")
+    
+    def _migrate_games(self, conn: sqlite3.Connection) -> None:
+        """Add the packed path columns to games tables that predate them."""
+        columns = {row["name"] for row in conn.execute("PRAGMA table_info(games)")}
+        for column in ("player_ids", "optimal_ids"):
+            if column not in columns:
+                conn.execute(f"ALTER TABLE games ADD COLUMN {column} BLOB")
+    
+    def _migrate_connections(self, conn: sqlite3.Connection) -> bool:
+        """
+        Rewrite a legacy connections table into canonical edges.
+        
+        Older databases gave every edge a surrogate id, some held both
+        directions of an association, and words.word, connections.word1_id
+        and connections.word2_id carried indexes the unique constraint and
+        primary key already provide (the graph is only ever read whole).
+        
+        Returns:
+            True if the table was rewritten
+        """
+        columns = {row["name"] for row in conn.execute("PRAGMA table_info(connections)")}
+        if "id" not in columns:
+            return False
+        
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute("""
+            CREATE TABLE connections_canonical (
+                word1_id INTEGER NOT NULL,
+                word2_id INTEGER NOT NULL,
+                strength REAL DEFAULT 1.0,
+                PRIMARY KEY (word1_id, word2_id),
+                FOREIGN KEY (word1_id) REFERENCES words(id),
+                FOREIGN KEY (word2_id) REFERENCES words(id),
+                CHECK (word1_id < word2_id)
+            ) WITHOUT ROWID
+        """)
+        # The first-inserted direction of a pair keeps its strength
+        conn.execute("""
+            INSERT OR IGNORE INTO connections_canonical (word1_id, word2_id, strength)
+            SELECT MIN(word1_id, word2_id), MAX(word1_id, word2_id), strength
+            FROM connections
+            WHERE word1_id <> word2_id
+            ORDER BY id
+        """)
+        conn.execute("DROP TABLE connections")
+        conn.execute("ALTER TABLE connections_canonical RENAME TO connections")
+        conn.execute("DROP INDEX IF EXISTS idx_words_word")
+        return True
+    
+    # Word graph
+    
+    def load_words(self) -> List[str]:
+        """Get every word in the graph."""
+        return [row["word"] for row in self.execute("SELECT word FROM words")]
+    
+    def load_connections(self) -> List[Tuple[str, str]]:
+        """Get every connection as a (word1, word2) pair."""
+        rows = self.execute("""
+            SELECT w1.word as word1, w2.word as word2
+            FROM connections c
+            JOIN words w1 ON c.word1_id = w1.id
+            JOIN words w2 ON c.word2_id = w2.id
+        """)
+        return [(row["word1"], row["word2"]) for row in rows]
+    
+    def graph_version(self) -> int:
+        """Get the id of the newest graph change-log entry."""
+        try:
+            row = self.execute_one("SELECT MAX(id) as version FROM graph_changes")
+        except sqlite3.OperationalError:
+            # Database predates change tracking
+            return 0
+        return (row["version"] or 0) if row else 0
+    
+    def graph_changes_since(self, version: int) -> List[Dict[str, Any]]:
+        """Get change-log entries newer than a version, oldest first."""
+        try:
+            return self.execute(
+                """
+                SELECT id, kind, word1, word2, strength
+                FROM graph_changes
+                WHERE id > ?
+                ORDER BY id
+                """,
+                (version,)
+            )
+        except sqlite3.OperationalError:
+            return []
+    
+    def add_word(self, word: str, category: Optional[str] = None) -> bool:
+        """Add a word and log the change."""
+        with self.get_connection() as conn:
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO words (word, category) VALUES (?, ?)",
+                (word, category)
+            )
+            if not cursor.rowcount:
+                return False
+            conn.execute(
+                "INSERT INTO graph_changes (kind, word1) VALUES ('word', ?)",
+                (word,)
+            )
+            return True
+    
+    def add_connection(self, word1: str, word2: str, strength: float = 1.0) -> bool:
+        """Connect two existing words and log the change."""
+        with self.get_connection() as conn:
+            cursor = conn.execute(
+                """
+                INSERT OR IGNORE INTO connections (word1_id, word2_id, strength)
+                SELECT MIN(w1.id, w2.id), MAX(w1.id, w2.id), ? FROM words w1, words w2
+                WHERE w1.word = ? AND w2.word = ? AND w1.id <> w2.id
+                """,
+                (strength, word1, word2)
+            )
+            if not cursor.rowcount:
+                return False
+            conn.execute(
+                """
+                INSERT INTO graph_changes (kind, word1, word2, strength)
+                VALUES ('connection', ?, ?, ?)
+                """,
+                (word1, word2, strength)
+            )
+            return True
+    
+    # Games, score histograms and leaderboard
+    
+    def save_game(
+        self,
+        start_word: str,
+        end_word: str,
+        player_path: GamePath,
+        optimal_path: GamePath,
+        player_length: int,
+        optimal_length: int,
+        score: int,
+        top_n: int
+    ) -> int:
+        """Record a game atomically with its histogram and leaderboard updates."""
+        player_text, player_ids = path_columns(player_path)
+        optimal_text, optimal_ids = path_columns(optimal_path)
+        with self.get_connection() as conn:
+            game_id = conn.execute(
+                """
+                INSERT INTO games 
+                (start_word, end_word, player_path, optimal_path, 
+                 player_length, optimal_length, score, player_ids, optimal_ids)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    start_word,
+                    end_word,
+                    player_text,
+                    optimal_text,
+                    player_length,
+                    optimal_length,
+                    score,
+                    player_ids,
+                    optimal_ids
+                )
+            ).lastrowid
+            
+            for key in ((start_word, end_word), ("*", "*")):
+                conn.execute(
+                    """
+                    INSERT INTO puzzle_scores (start_word, end_word, score, count)
+                    VALUES (?, ?, ?, 1)
+                    ON CONFLICT (start_word, end_word, score)
+                    DO UPDATE SET count = count + 1
+                    """,
+                    (*key, score)
+                )
+            
+            # Only completed paths are ranked
+            if player_length > 0:
+                conn.execute(
+                    """
+                    INSERT INTO leaderboard
+                    (game_id, start_word, end_word, score, player_length, completed_at)
+                    SELECT id, start_word, end_word, score, player_length, completed_at
+                    FROM games WHERE id = ?
+                    """,
+                    (game_id,)
+                )
+                conn.execute(
+                    """
+                    DELETE FROM leaderboard WHERE game_id NOT IN (
+                        SELECT game_id FROM leaderboard
+                        ORDER BY score DESC, player_length ASC, game_id ASC
+                        LIMIT ?
+                    )
+                    """,
+                    (top_n,)
+                )
+            return game_id
+    
+    def game_history(
+        self,
+        limit: int,
+        before: Optional[HistoryKey] = None,
+        word: Optional[str] = None,
+        min_score: Optional[int] = None,
+        max_score: Optional[int] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get games newest first, ordered by (completed_at, id).
+        
+        Each call seeks directly to the keyset position through the
+        completed_at indexes, so cost does not grow with table size.
+        """
+        conditions = []
+        params: List[Any] = []
+        
+        if before:
+            conditions.append("(completed_at, id) < (?, ?)")
+            params += list(before)
+        if min_score is not None:
+            conditions.append("score >= ?")
+            params.append(min_score)
+        if max_score is not None:
+            conditions.append("score <= ?")
+            params.append(max_score)
+        if since:
+            conditions.append("completed_at >= ?")
+            params.append(since)
+        if until:
+            conditions.append("completed_at < ?")
+            params.append(until)
+        
+        def page_query(extra: Optional[str] = None) -> str:
+            where = " AND ".join(([extra] if extra else []) + conditions) or "1"
+            return f"""
+                SELECT * FROM games
+                WHERE {where}
+                ORDER BY completed_at DESC, id DESC
+                LIMIT ?
+            """
+        
+        if word:
+            # One ordered index seek per side, merged; an OR would force a sort
+            return self.execute(
+                f"""
+                SELECT * FROM ({page_query("start_word = ?")})
+                UNION ALL
+                SELECT * FROM ({page_query("end_word = ?")})
+                ORDER BY completed_at DESC, id DESC
+                LIMIT ?
+                """,
+                tuple([word] + params + [limit, word] + params + [limit, limit])
+            )
+        return self.execute(page_query(), tuple(params + [limit]))
+    
+    def iter_games(self, after_id: int = 0, batch_size: int = 5000) -> Iterator[Dict[str, Any]]:
+        """
+        Stream every game oldest first, one primary-key batch per query.
+        
+        Each batch is a short read of its own rather than one long-lived
+        cursor, so an export never holds a read transaction (or the
+        in-memory instance lock) while the caller writes its output.
+        """
+        while True:
+            rows = self.execute(
+                "SELECT * FROM games WHERE id > ? ORDER BY id LIMIT ?",
+                (after_id, batch_size)
+            )
+            yield from rows
+            if len(rows) < batch_size:
+                return
+            after_id = rows[-1]["id"]
+    
+    def score_histogram(self, start_word: str, end_word: str) -> Dict[int, int]:
+        """Get score -> game count for a puzzle ('*', '*' for all games)."""
+        rows = self.execute(
+            """
+            SELECT score, count FROM puzzle_scores
+            WHERE start_word = ? AND end_word = ?
+            ORDER BY score DESC
+            """,
+            (start_word, end_word)
+        )
+        return {row["score"]: row["count"] for row in rows}
+    
+    def puzzle_results(self, start_word: str) -> Dict[str, Tuple[int, int]]:
+        """Get (games, solved) per end word for puzzles from a start word."""
+        try:
+            rows = self.execute(
+                """
+                SELECT end_word, SUM(count) AS games,
+                       SUM(CASE WHEN score >= ? THEN count ELSE 0 END) AS solved
+                FROM puzzle_scores
+                WHERE start_word = ?
+                GROUP BY end_word
+                """,
+                (self.SOLVED_SCORE, start_word)
+            )
+        except sqlite3.OperationalError:
+            # Database has no game tables yet (graph-only snapshot)
+            return {}
+        return {row["end_word"]: (row["games"], row["solved"]) for row in rows}
+    
+    def top_games(self, limit: int) -> List[Dict[str, Any]]:
+        """Get leaderboard rows, best first."""
+        return self.execute(
+            """
+            SELECT game_id, start_word, end_word, score, player_length, completed_at
+            FROM leaderboard
+            ORDER BY score DESC, player_length ASC, game_id ASC
+            LIMIT ?
+            """,
+            (limit,)
+        )
+    
+    def rebuild_leaderboard(self, top_n: int) -> None:
+        """Recompute histograms and leaderboard from the games table."""
+        with self.get_connection() as conn:
+            self._rebuild_game_stats(conn, top_n)
+    
+    def _rebuild_game_stats(self, conn: sqlite3.Connection, top_n: int) -> None:
+        """Recompute histograms and leaderboard inside a transaction."""
+        conn.execute("DELETE FROM puzzle_scores")
+        conn.execute("DELETE FROM leaderboard")
+        conn.execute(
+            """
+            INSERT INTO puzzle_scores (start_word, end_word, score, count)
+            SELECT start_word, end_word, score, COUNT(*)
+            FROM games GROUP BY start_word, end_word, score
+            """
+        )
+        conn.execute(
+            """
+            INSERT INTO puzzle_scores (start_word, end_word, score, count)
+            SELECT '*', '*', score, COUNT(*) FROM games GROUP BY score
+            """
+        )
+        conn.execute(
+            """
+            INSERT INTO leaderboard
+            (game_id, start_word, end_word, score, player_length, completed_at)
+            SELECT id, start_word, end_word, score, player_length, completed_at
+            FROM games WHERE player_length > 0
+            ORDER BY score DESC, player_length ASC, id ASC
+            LIMIT ?
+            """,
+            (top_n,)
+        )
+    
+    # Packed paths
+    
+    def load_path_words(self, after_id: int = 0) -> List[Tuple[int, str]]:
+        """Get (id, word) dictionary entries past an id."""
+        rows = self.execute(
+            "SELECT id, word FROM path_words WHERE id > ? ORDER BY id", (after_id,)
+        )
+        return [(row["id"], row["word"]) for row in rows]
+    
+    def add_path_words(self, words: List[str]) -> List[Tuple[int, str]]:
+        """Add words to the packed-path dictionary and return their entries."""
+        with self.get_connection() as conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO path_words (word) VALUES (?)",
+                [(word,) for word in words]
+            )
+            rows = conn.execute(
+                f"SELECT id, word FROM path_words WHERE word IN ({', '.join('?' * len(words))})",
+                tuple(words)
+            ).fetchall()
+        return [(row["id"], row["word"]) for row in rows]
+    
+    def text_path_games(self, after_id: int, limit: int) -> List[Dict[str, Any]]:
+        """Get games whose paths are still stored as text, oldest first."""
+        return self.execute(
+            """
+            SELECT id, player_path, optimal_path FROM games
+            WHERE id > ? AND player_ids IS NULL
+            ORDER BY id
+            LIMIT ?
+            """,
+            (after_id, limit)
+        )
+    
+    def set_packed_paths(self, rows: List[Tuple[int, bytes, bytes]]) -> None:
+        """Replace the text paths of games with packed ones."""
+        with self.get_connection() as conn:
+            conn.executemany(
+                """
+                UPDATE games
+                SET player_ids = ?, optimal_ids = ?, player_path = NULL, optimal_path = NULL
+                WHERE id = ?
+                """,
+                [(player_ids, optimal_ids, game_id) for game_id, player_ids, optimal_ids in rows]
+            )
+    
+    # Stats rollups
+    
+    # Bucket format (strftime on completed_at) per rollup table
+    ROLLUP_TABLES = {
+        "hour": ("stats_hourly", "%Y-%m-%d %H:00:00"),
+        "day": ("stats_daily", "%Y-%m-%d"),
+    }
+    
+    def compact_rollups(self, batch_size: int) -> int:
+        """
+        Fold up to batch_size games past the watermark into the rollups.
+        
+        Reads and advances the watermark under BEGIN IMMEDIATE, so
+        concurrent compactions from other processes never double count.
+        """
+        with self.get_connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT last_game_id FROM rollup_state WHERE name = 'games'"
+            ).fetchone()
+            low = row[0] if row else 0
+            high = conn.execute(
+                "SELECT MAX(id) FROM (SELECT id FROM games WHERE id > ? ORDER BY id LIMIT ?)",
+                (low, batch_size)
+            ).fetchone()[0]
+            if high is None:
+                return 0
+            
+            for table, bucket_format in self.ROLLUP_TABLES.values():
+                conn.execute(
+                    f"""
+                    INSERT INTO {table}
+                    (bucket, games, score_sum, perfect_count, failure_count,
+                     length_sum, length_count)
+                    SELECT
+                        strftime(?, completed_at),
+                        COUNT(*),
+                        SUM(score),
+                        SUM(CASE WHEN score = 100 THEN 1 ELSE 0 END),
+                        SUM(CASE WHEN score = 0 THEN 1 ELSE 0 END),
+                        SUM(CASE WHEN player_length > 0 THEN player_length ELSE 0 END),
+                        SUM(CASE WHEN player_length > 0 THEN 1 ELSE 0 END)
+                    FROM games
+                    WHERE id > ? AND id <= ?
+                    GROUP BY 1
+                    ON CONFLICT (bucket) DO UPDATE SET
+                        games = games + excluded.games,
+                        score_sum = score_sum + excluded.score_sum,
+                        perfect_count = perfect_count + excluded.perfect_count,
+                        failure_count = failure_count + excluded.failure_count,
+                        length_sum = length_sum + excluded.length_sum,
+                        length_count = length_count + excluded.length_count
+                    """,
+                    (bucket_format, low, high)
+                )
+            
+            conn.execute(
+                """
+                INSERT INTO rollup_state (name, last_game_id) VALUES ('games', ?)
+                ON CONFLICT (name) DO UPDATE SET last_game_id = excluded.last_game_id
+                """,
+                (high,)
+            )
+            return conn.execute(
+                "SELECT COUNT(*) FROM games WHERE id > ? AND id <= ?", (low, high)
+            ).fetchone()[0]
+    
+    def rollup_watermark(self) -> int:
+        """Get the id of the last game folded into the rollups."""
+        row = self.execute_one(
+            "SELECT last_game_id FROM rollup_state WHERE name = 'games'"
+        )
+        return row["last_game_id"] if row else 0
+    
+    def rollup_buckets(
+        self,
+        granularity: str,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        limit: int = 30
+    ) -> List[Dict[str, Any]]:
+        """Get raw rollup rows, newest bucket first."""
+        table, _ = self.ROLLUP_TABLES[granularity]
+        
+        conditions, params = [], []
+        if since:
+            conditions.append("bucket >= ?")
+            params.append(since)
+        if until:
+            conditions.append("bucket <= ?")
+            params.append(until)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        
+        return self.execute(
+            f"SELECT * FROM {table} {where} ORDER BY bucket DESC LIMIT ?",
+            (*params, limit)
+        )
+    
+    def path_length_totals(self) -> Tuple[int, int]:
+        """Get all-time (sum of player path lengths, completed games)."""
+        watermark = self.rollup_watermark()
+        row = self.execute_one(
+            """
+            SELECT
+                (SELECT COALESCE(SUM(length_sum), 0) FROM stats_daily)
+                + (SELECT COALESCE(SUM(player_length), 0) FROM games
+                   WHERE id > ? AND player_length > 0) AS length_sum,
+                (SELECT COALESCE(SUM(length_count), 0) FROM stats_daily)
+                + (SELECT COUNT(*) FROM games
+                   WHERE id > ? AND player_length > 0) AS length_count
+            """,
+            (watermark, watermark)
+        )
+        return row["length_sum"], row["length_count"]
+    
+    # Graph analytics
+    
+    def save_graph_metrics(
+        self,
+        version: int,
+        summary: Dict[str, Any],
+        word_metrics: List[Tuple[str, float, Optional[int]]]
+    ) -> None:
+        """Replace the stored graph analytics run."""
+        with self.get_connection() as conn:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO graph_metrics (id, version, summary, computed_at)
+                VALUES (1, ?, ?, CURRENT_TIMESTAMP)
+                """,
+                (version, json.dumps(summary))
+            )
+            conn.execute("DELETE FROM word_metrics")
+            conn.executemany(
+                "INSERT INTO word_metrics (word, betweenness, eccentricity) VALUES (?, ?, ?)",
+                word_metrics
+            )
+    
+    def load_graph_metrics(self) -> Optional[Dict[str, Any]]:
+        """Get the stored graph analytics run."""
+        try:
+            row = self.execute_one(
+                "SELECT version, summary, computed_at FROM graph_metrics WHERE id = 1"
+            )
+        except sqlite3.OperationalError:
+            # Database predates graph analytics
+            return None
+        if row is None:
+            return None
+        
+        words = self.execute("SELECT word, betweenness, eccentricity FROM word_metrics")
+        return {
+            "version": row["version"],
+            "computed_at": row["computed_at"],
+            "summary": json.loads(row["summary"]),
+            "words": {
+                w["word"]: {"betweenness": w["betweenness"], "eccentricity": w["eccentricity"]}
+                for w in words
+            },
+        }
+
+
 
+class AsyncDatabase:
+    """
+    Awaitable wrapper that runs storage calls on a dedicated executor.
+    
+    Keeps blocking database I/O off the event loop in the ASGI app. Any
+    callable that touches the database (Storage methods or the services
+    built on them) is offloaded with run(), so every backend works.
+    """
+    
+    def __init__(self, database: Storage, max_workers: int = 4):
+        """
+        Initialize async wrapper.
+        
+        Args:
+            database: Storage backend to wrap
+            max_workers: Number of database executor threads
+        """
+        self.db = database
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="sqlite"
+        )
+    
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run a blocking callable on the SQLite executor.
+        
+        Args:
+            fn: Callable to run
+            *args: Positional arguments for fn
+            
+        Returns:
+            Result of fn
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(fn, *args))
+    
+    def close(self) -> None:
+        """Shut down the executor."""
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,357 @@
+"""
+In-memory storage backend for Six Degrees.
+
+A dependency-free fake of the Storage interface for tests and local
+experiments. Nothing is persisted; all state lives in one process.
+"""
+
+import copy
+import threading
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from app.models.storage import GamePath, HistoryKey, Storage, path_columns
+
+
+class MemoryStorage(Storage):
+    """
+    Storage implementation backed by Python dicts and lists.
+    """
+
+    # Bucket format per rollup granularity (same keys as the SQL backends)
+    BUCKET_FORMATS = {
+        "hour": "%Y-%m-%d %H:00:00",
+        "day": "%Y-%m-%d",
+    }
+
+    def __init__(self):
+        """Initialize empty storage."""
+        self._lock = threading.Lock()
+        self.words: Dict[str, Optional[str]] = {}
+        self.connections: Dict[Tuple[str, str], float] = {}  # Sorted pair -> strength
+        self.changes: List[Dict[str, Any]] = []
+        self.games: List[Dict[str, Any]] = []
+        self.path_words: Dict[str, int] = {}
+        self.histograms: Dict[Tuple[str, str], Counter] = {}
+        self.leaderboard: List[Dict[str, Any]] = []
+        self.rollups: Dict[str, Dict[str, Dict[str, int]]] = {
+            granularity: {} for granularity in self.GRANULARITIES
+        }
+        self.watermark = 0
+        self.graph_metrics: Optional[Dict[str, Any]] = None
+        self._next_game_id = 1
+
+    def init_schema(self) -> None:
+        """Nothing to create."""
+
+    # Word graph
+
+    def load_words(self) -> List[str]:
+        """Get every word in the graph."""
+        with self._lock:
+            return list(self.words)
+
+    def load_connections(self) -> List[Tuple[str, str]]:
+        """Get every connection as a (word1, word2) pair."""
+        with self._lock:
+            return list(self.connections)
+
+    def graph_version(self) -> int:
+        """Get the id of the newest graph change-log entry."""
+        with self._lock:
+            return self.changes[-1]["id"] if self.changes else 0
+
+    def graph_changes_since(self, version: int) -> List[Dict[str, Any]]:
+        """Get change-log entries newer than a version, oldest first."""
+        with self._lock:
+            return [dict(change) for change in self.changes if change["id"] > version]
+
+    def add_word(self, word: str, category: Optional[str] = None) -> bool:
+        """Add a word and log the change."""
+        with self._lock:
+            if word in self.words:
+                return False
+            self.words[word] = category
+            self._log_change("word", word)
+            return True
+
+    def add_connection(self, word1: str, word2: str, strength: float = 1.0) -> bool:
+        """Connect two existing words and log the change."""
+        with self._lock:
+            key = (word1, word2) if word1 < word2 else (word2, word1)
+            if (
+                key in self.connections or word1 == word2
+                or word1 not in self.words or word2 not in self.words
+            ):
+                return False
+            self.connections[key] = strength
+            self._log_change("connection", word1, word2, strength)
+            return True
+
+    def _log_change(
+        self,
+        kind: str,
+        word1: str,
+        word2: Optional[str] = None,
+        strength: Optional[float] = None
+    ) -> None:
+        """Append a change-log entry (caller holds the lock)."""
+        self.changes.append({
+            "id": len(self.changes) + 1,
+            "kind": kind,
+            "word1": word1,
+            "word2": word2,
+            "strength": strength,
+        })
+
+    # Games, score histograms and leaderboard
+
+    def save_game(
+        self,
+        start_word: str,
+        end_word: str,
+        player_path: GamePath,
+        optimal_path: GamePath,
+        player_length: int,
+        optimal_length: int,
+        score: int,
+        top_n: int
+    ) -> int:
+        """Record a game with its histogram and leaderboard updates."""
+        player_text, player_ids = path_columns(player_path)
+        optimal_text, optimal_ids = path_columns(optimal_path)
+        with self._lock:
+            game = {
+                "id": self._next_game_id,
+                "start_word": start_word,
+                "end_word": end_word,
+                "player_path": player_text,
+                "optimal_path": optimal_text,
+                "player_length": player_length,
+                "optimal_length": optimal_length,
+                "score": score,
+                "completed_at": datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S"),
+                "player_ids": player_ids,
+                "optimal_ids": optimal_ids,
+            }
+            self._next_game_id += 1
+            self.games.append(game)
+
+            for key in ((start_word, end_word), ("*", "*")):
+                self.histograms.setdefault(key, Counter())[score] += 1
+
+            if player_length > 0:
+                self.leaderboard.append(self._leaderboard_row(game))
+                self.leaderboard.sort(key=self._rank_key)
+                del self.leaderboard[top_n:]
+            return game["id"]
+
+    def game_history(
+        self,
+        limit: int,
+        before: Optional[HistoryKey] = None,
+        word: Optional[str] = None,
+        min_score: Optional[int] = None,
+        max_score: Optional[int] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Get games newest first, ordered by (completed_at, id)."""
+        def matches(game: Dict[str, Any]) -> bool:
+            return (
+                (before is None or (game["completed_at"], game["id"]) < tuple(before))
+                and (word is None or word in (game["start_word"], game["end_word"]))
+                and (min_score is None or game["score"] >= min_score)
+                and (max_score is None or game["score"] <= max_score)
+                and (since is None or game["completed_at"] >= since)
+                and (until is None or game["completed_at"] < until)
+            )
+
+        with self._lock:
+            rows = [dict(game) for game in self.games if matches(game)]
+        rows.sort(key=lambda g: (g["completed_at"], g["id"]), reverse=True)
+        return rows[:limit]
+
+    def iter_games(self, after_id: int = 0, batch_size: int = 5000) -> Iterator[Dict[str, Any]]:
+        """Stream every game oldest first, copying one batch at a time."""
+        while True:
+            with self._lock:
+                rows = [dict(game) for game in self.games if game["id"] > after_id][:batch_size]
+            yield from rows
+            if len(rows) < batch_size:
+                return
+            after_id = rows[-1]["id"]
+
+    def score_histogram(self, start_word: str, end_word: str) -> Dict[int, int]:
+        """Get score -> game count for a puzzle ('*', '*' for all games)."""
+        with self._lock:
+            counts = self.histograms.get((start_word, end_word), Counter())
+            return dict(sorted(counts.items(), reverse=True))
+
+    def puzzle_results(self, start_word: str) -> Dict[str, Tuple[int, int]]:
+        """Get (games, solved) per end word for puzzles from a start word."""
+        with self._lock:
+            return {
+                end_word: (
+                    sum(counts.values()),
+                    sum(count for score, count in counts.items() if score >= self.SOLVED_SCORE)
+                )
+                for (start, end_word), counts in self.histograms.items()
+                if start == start_word
+            }
+
+    def top_games(self, limit: int) -> List[Dict[str, Any]]:
+        """Get leaderboard rows, best first."""
+        with self._lock:
+            return [dict(row) for row in self.leaderboard[:limit]]
+
+    def rebuild_leaderboard(self, top_n: int) -> None:
+        """Recompute histograms and leaderboard from the games list."""
+        with self._lock:
+            self.histograms = {}
+            for game in self.games:
+                for key in ((game["start_word"], game["end_word"]), ("*", "*")):
+                    self.histograms.setdefault(key, Counter())[game["score"]] += 1
+            self.leaderboard = sorted(
+                (self._leaderboard_row(g) for g in self.games if g["player_length"] > 0),
+                key=self._rank_key
+            )[:top_n]
+
+    @staticmethod
+    def _leaderboard_row(game: Dict[str, Any]) -> Dict[str, Any]:
+        """Project a game onto the leaderboard columns."""
+        return {
+            "game_id": game["id"],
+            "start_word": game["start_word"],
+            "end_word": game["end_word"],
+            "score": game["score"],
+            "player_length": game["player_length"],
+            "completed_at": game["completed_at"],
+        }
+
+    @staticmethod
+    def _rank_key(row: Dict[str, Any]) -> Tuple[int, int, int]:
+        """Leaderboard order: score desc, path length asc, id asc."""
+        return (-row["score"], row["player_length"], row["game_id"])
+
+    # Packed paths
+
+    def load_path_words(self, after_id: int = 0) -> List[Tuple[int, str]]:
+        """Get (id, word) dictionary entries past an id."""
+        with self._lock:
+            return sorted(
+                (word_id, word) for word, word_id in self.path_words.items() if word_id > after_id
+            )
+
+    def add_path_words(self, words: List[str]) -> List[Tuple[int, str]]:
+        """Add words to the packed-path dictionary and return their entries."""
+        with self._lock:
+            return [
+                (self.path_words.setdefault(word, len(self.path_words) + 1), word)
+                for word in words
+            ]
+
+    def text_path_games(self, after_id: int, limit: int) -> List[Dict[str, Any]]:
+        """Get games whose paths are still stored as text, oldest first."""
+        with self._lock:
+            rows = [
+                {key: game[key] for key in ("id", "player_path", "optimal_path")}
+                for game in self.games
+                if game["id"] > after_id and game["player_ids"] is None
+            ]
+        return rows[:limit]
+
+    def set_packed_paths(self, rows: List[Tuple[int, bytes, bytes]]) -> None:
+        """Replace the text paths of games with packed ones."""
+        packed = {game_id: (player_ids, optimal_ids) for game_id, player_ids, optimal_ids in rows}
+        with self._lock:
+            for game in self.games:
+                if game["id"] in packed:
+                    game["player_ids"], game["optimal_ids"] = packed[game["id"]]
+                    game["player_path"] = game["optimal_path"] = None
+
+    # Stats rollups
+
+    def compact_rollups(self, batch_size: int) -> int:
+        """Fold up to batch_size games past the watermark into the rollups."""
+        with self._lock:
+            batch = [g for g in self.games if g["id"] > self.watermark][:batch_size]
+            for game in batch:
+                completed_at = datetime.strptime(game["completed_at"], "%Y-%m-%d %H:%M:%S")
+                for granularity, bucket_format in self.BUCKET_FORMATS.items():
+                    bucket = self.rollups[granularity].setdefault(
+                        completed_at.strftime(bucket_format),
+                        dict.fromkeys((
+                            "games", "score_sum", "perfect_count", "failure_count",
+                            "length_sum", "length_count"
+                        ), 0)
+                    )
+                    bucket["games"] += 1
+                    bucket["score_sum"] += game["score"]
+                    bucket["perfect_count"] += game["score"] == 100
+                    bucket["failure_count"] += game["score"] == 0
+                    if game["player_length"] > 0:
+                        bucket["length_sum"] += game["player_length"]
+                        bucket["length_count"] += 1
+            if batch:
+                self.watermark = batch[-1]["id"]
+            return len(batch)
+
+    def rollup_watermark(self) -> int:
+        """Get the id of the last game folded into the rollups."""
+        return self.watermark
+
+    def rollup_buckets(
+        self,
+        granularity: str,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        limit: int = 30
+    ) -> List[Dict[str, Any]]:
+        """Get raw rollup rows, newest bucket first."""
+        with self._lock:
+            rows = [
+                {"bucket": bucket, **sums}
+                for bucket, sums in self.rollups[granularity].items()
+                if (since is None or bucket >= since) and (until is None or bucket <= until)
+            ]
+        rows.sort(key=lambda row: row["bucket"], reverse=True)
+        return rows[:limit]
+
+    def path_length_totals(self) -> Tuple[int, int]:
+        """Get all-time (sum of player path lengths, completed games)."""
+        with self._lock:
+            daily = self.rollups["day"].values()
+            tail = [
+                g["player_length"] for g in self.games
+                if g["id"] > self.watermark and g["player_length"] > 0
+            ]
+            return (
+                sum(b["length_sum"] for b in daily) + sum(tail),
+                sum(b["length_count"] for b in daily) + len(tail)
+            )
+
+    # Graph analytics
+
+    def save_graph_metrics(
+        self,
+        version: int,
+        summary: Dict[str, Any],
+        word_metrics: List[Tuple[str, float, Optional[int]]]
+    ) -> None:
+        """Replace the stored graph analytics run."""
+        with self._lock:
+            self.graph_metrics = {
+                "version": version,
+                "computed_at": datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S"),
+                "summary": copy.deepcopy(summary),
+                "words": {
+                    word: {"betweenness": betweenness, "eccentricity": eccentricity}
+                    for word, betweenness, eccentricity in word_metrics
+                },
+            }
+
+    def load_graph_metrics(self) -> Optional[Dict[str, Any]]:
+        """Get the stored graph analytics run."""
+        with self._lock:
+            return copy.deepcopy(self.graph_metrics)
@@ -0,0 +1,817 @@
+"""
+PostgreSQL storage backend for Six Degrees.
+
+Lets every serverless instance share one game history instead of a
+per-instance SQLite file. Connections come from a thread-safe pool, and
+aggregates (histograms, rollups, path length totals) are computed by the
+server. Requires psycopg2:
+
+    pip install psycopg2-binary
+"""
+
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import psycopg2
+    from psycopg2.extras import Json, RealDictCursor
+    from psycopg2.pool import ThreadedConnectionPool
+except ImportError:  # pragma: no cover - optional dependency
+    psycopg2 = None
+
+from app.models.storage import GamePath, HistoryKey, Storage, path_columns
+
+HAS_POSTGRES = psycopg2 is not None
+
+# completed_at rendered like SQLite's CURRENT_TIMESTAMP, so cursors and
+# API payloads are identical across backends
+COMPLETED_AT = "to_char(games.completed_at, 'YYYY-MM-DD HH24:MI:SS')"
+
+GAME_COLUMNS = f"""
+    games.id, games.start_word, games.end_word, games.player_path,
+    games.optimal_path, games.player_length, games.optimal_length,
+    games.score, {COMPLETED_AT} AS completed_at,
+    games.player_ids, games.optimal_ids
+"""
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS words (
+        id SERIAL PRIMARY KEY,
+        word TEXT UNIQUE NOT NULL,
+        category TEXT
+    );
+
+    -- One row per undirected pair, as (smaller id, larger id)
+    CREATE TABLE IF NOT EXISTS connections (
+        word1_id INTEGER NOT NULL REFERENCES words(id),
+        word2_id INTEGER NOT NULL REFERENCES words(id),
+        strength REAL DEFAULT 1.0,
+        PRIMARY KEY (word1_id, word2_id),
+        CHECK (word1_id < word2_id)
+    );
+
+    CREATE TABLE IF NOT EXISTS games (
+        id BIGSERIAL PRIMARY KEY,
+        start_word TEXT NOT NULL,
+        end_word TEXT NOT NULL,
+        player_path TEXT,
+        optimal_path TEXT,
+        player_length INTEGER,
+        optimal_length INTEGER,
+        score INTEGER,
+        completed_at TIMESTAMP(0) NOT NULL
+            DEFAULT (now() AT TIME ZONE 'utc')::timestamp(0)
+    );
+
+    -- Packed word ids replacing the text paths (see PathCodec)
+    ALTER TABLE games ADD COLUMN IF NOT EXISTS player_ids BYTEA;
+    ALTER TABLE games ADD COLUMN IF NOT EXISTS optimal_ids BYTEA;
+
+    -- Dictionary for packed paths; ids are never reused
+    CREATE TABLE IF NOT EXISTS path_words (
+        id SERIAL PRIMARY KEY,
+        word TEXT UNIQUE NOT NULL
+    );
+
+    CREATE TABLE IF NOT EXISTS puzzle_scores (
+        start_word TEXT NOT NULL,
+        end_word TEXT NOT NULL,
+        score INTEGER NOT NULL,
+        count BIGINT NOT NULL DEFAULT 0,
+        PRIMARY KEY (start_word, end_word, score)
+    );
+
+    CREATE TABLE IF NOT EXISTS leaderboard (
+        game_id BIGINT PRIMARY KEY,
+        start_word TEXT NOT NULL,
+        end_word TEXT NOT NULL,
+        score INTEGER NOT NULL,
+        player_length INTEGER NOT NULL,
+        completed_at TEXT
+    );
+
+    CREATE TABLE IF NOT EXISTS stats_hourly (
+        bucket TEXT PRIMARY KEY,
+        games BIGINT NOT NULL,
+        score_sum BIGINT NOT NULL,
+        perfect_count BIGINT NOT NULL,
+        failure_count BIGINT NOT NULL,
+        length_sum BIGINT NOT NULL,
+        length_count BIGINT NOT NULL
+    );
+
+    CREATE TABLE IF NOT EXISTS stats_daily (
+        bucket TEXT PRIMARY KEY,
+        games BIGINT NOT NULL,
+        score_sum BIGINT NOT NULL,
+        perfect_count BIGINT NOT NULL,
+        failure_count BIGINT NOT NULL,
+        length_sum BIGINT NOT NULL,
+        length_count BIGINT NOT NULL
+    );
+
+    CREATE TABLE IF NOT EXISTS rollup_state (
+        name TEXT PRIMARY KEY,
+        last_game_id BIGINT NOT NULL
+    );
+    INSERT INTO rollup_state (name, last_game_id) VALUES ('games', 0)
+        ON CONFLICT (name) DO NOTHING;
+
+    CREATE TABLE IF NOT EXISTS graph_changes (
+        id BIGSERIAL PRIMARY KEY,
+        kind TEXT NOT NULL,
+        word1 TEXT NOT NULL,
+        word2 TEXT,
+        strength REAL,
+        changed_at TIMESTAMP DEFAULT now()
+    );
+
+    CREATE TABLE IF NOT EXISTS graph_metrics (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        version BIGINT NOT NULL,
+        summary JSONB NOT NULL,
+        computed_at TIMESTAMP DEFAULT now()
+    );
+
+    CREATE TABLE IF NOT EXISTS word_metrics (
+        word TEXT PRIMARY KEY,
+        betweenness DOUBLE PRECISION NOT NULL,
+        eccentricity INTEGER
+    );
+
+    CREATE INDEX IF NOT EXISTS idx_games_completed
+        ON games(completed_at, id) INCLUDE (score);
+    CREATE INDEX IF NOT EXISTS idx_games_start_completed
+        ON games(start_word, completed_at, id) INCLUDE (score);
+    CREATE INDEX IF NOT EXISTS idx_games_end_completed
+        ON games(end_word, completed_at, id) INCLUDE (score);
+    CREATE INDEX IF NOT EXISTS idx_leaderboard_rank
+        ON leaderboard(score DESC, player_length, game_id);
+"""
+
+
+class PostgresStorage(Storage):
+    """
+    Storage implementation on a pooled PostgreSQL connection set.
+    """
+
+    # Bucket format (to_char on completed_at) per rollup table
+    ROLLUP_TABLES = {
+        "hour": ("stats_hourly", "YYYY-MM-DD HH24:00:00"),
+        "day": ("stats_daily", "YYYY-MM-DD"),
+    }
+
+    # Advisory lock key fencing game inserts from the rollup watermark.
+    # BIGSERIAL ids are drawn at insert time but become visible at
+    # commit, so a lower id can appear after a higher one was compacted.
+    # Saves hold the lock shared; compaction briefly takes it exclusively
+    # to find the highest id no open transaction can still undercut.
+    GAME_INSERT_LOCK = 0x5D6A3E01
+
+    def __init__(self, dsn: str, min_connections: int = 1, max_connections: int = 10):
+        """
+        Initialize connection pool.
+
+        Args:
+            dsn: libpq connection string or postgresql:// URL
+            min_connections: Connections opened up front
+            max_connections: Upper bound on pooled connections
+        """
+        if not HAS_POSTGRES:
+            raise RuntimeError("psycopg2 is required for the PostgreSQL backend")
+
+        self.dsn = dsn
+        self._pool = ThreadedConnectionPool(min_connections, max_connections, dsn)
+
+    def location(self) -> Optional[str]:
+        """Get the connection string, which reaches the same server from anywhere."""
+        return self.dsn
+
+    @contextmanager
+    def get_connection(self) -> Iterator[Any]:
+        """
+        Borrow a pooled connection for one transaction.
+
+        Yields:
+            psycopg2 connection, committed on success
+        """
+        conn = self._pool.getconn()
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self._pool.putconn(conn)
+
+    def execute(self, query: str, params: tuple = ()) -> List[Dict[str, Any]]:
+        """
+        Execute a query and return results as dictionaries.
+
+        Args:
+            query: SQL query string (%s placeholders)
+            params: Query parameters
+
+        Returns:
+            List of result dictionaries
+        """
+        with self.get_connection() as conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+                cursor.execute(query, params)
+                return [dict(row) for row in cursor.fetchall()] if cursor.description else []
+
+    def execute_one(self, query: str, params: tuple = ()) -> Optional[Dict[str, Any]]:
+        """Execute a query and return the first result or None."""
+        results = self.execute(query, params)
+        return results[0] if results else None
+
+    def init_schema(self) -> None:
+        """Create tables and indexes, migrating legacy connection tables."""
+        with self.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(SCHEMA)
+                self._migrate_connections(cursor)
+                # Taken before the check so concurrent upgrades backfill once
+                cursor.execute("LOCK TABLE puzzle_scores IN SHARE ROW EXCLUSIVE MODE")
+                cursor.execute(
+                    "SELECT NOT EXISTS (SELECT 1 FROM puzzle_scores)"
+                    " AND EXISTS (SELECT 1 FROM games)"
+                )
+                if cursor.fetchone()[0]:
+                    self._rebuild_game_stats(cursor, self.LEADERBOARD_SIZE)
+
+    @staticmethod
+    def _migrate_connections(cursor: Any) -> bool:
+        """
+        Rewrite a legacy connections table into canonical edges.
+
+        Older schemas gave every edge a surrogate id and could hold both
+        directions of an association. Runs inside init_schema's
+        transaction, so other instances never see a half-migrated table.
+
+        Returns:
+            True if the table was rewritten
+        """
+        cursor.execute(
+            """
+            SELECT 1 FROM information_schema.columns
+            WHERE table_schema = current_schema()
+              AND table_name = 'connections' AND column_name = 'id'
+            """
+        )
+        if cursor.fetchone() is None:
+            return False
+
+        cursor.execute("LOCK TABLE connections IN EXCLUSIVE MODE")
+        cursor.execute(
+            """
+            CREATE TABLE connections_canonical (
+                word1_id INTEGER NOT NULL REFERENCES words(id),
+                word2_id INTEGER NOT NULL REFERENCES words(id),
+                strength REAL DEFAULT 1.0,
+                PRIMARY KEY (word1_id, word2_id),
+                CHECK (word1_id < word2_id)
+            )
+            """
+        )
+        # The first-inserted direction of a pair keeps its strength
+        cursor.execute(
+            """
+            INSERT INTO connections_canonical (word1_id, word2_id, strength)
+            SELECT LEAST(word1_id, word2_id), GREATEST(word1_id, word2_id), strength
+            FROM connections
+            WHERE word1_id <> word2_id
+            ORDER BY id
+            ON CONFLICT (word1_id, word2_id) DO NOTHING
+            """
+        )
+        cursor.execute("DROP TABLE connections")
+        cursor.execute("ALTER TABLE connections_canonical RENAME TO connections")
+        return True
+
+    def close(self) -> None:
+        """Close every pooled connection."""
+        self._pool.closeall()
+
+    # Word graph
+
+    def load_words(self) -> List[str]:
+        """Get every word in the graph."""
+        return [row["word"] for row in self.execute("SELECT word FROM words")]
+
+    def load_connections(self) -> List[Tuple[str, str]]:
+        """Get every connection as a (word1, word2) pair."""
+        rows = self.execute("""
+            SELECT w1.word AS word1, w2.word AS word2
+            FROM connections c
+            JOIN words w1 ON c.word1_id = w1.id
+            JOIN words w2 ON c.word2_id = w2.id
+        """)
+        return [(row["word1"], row["word2"]) for row in rows]
+
+    def graph_version(self) -> int:
+        """Get the id of the newest graph change-log entry."""
+        row = self.execute_one("SELECT COALESCE(MAX(id), 0) AS version FROM graph_changes")
+        return row["version"]
+
+    def graph_changes_since(self, version: int) -> List[Dict[str, Any]]:
+        """Get change-log entries newer than a version, oldest first."""
+        return self.execute(
+            """
+            SELECT id, kind, word1, word2, strength
+            FROM graph_changes
+            WHERE id > %s
+            ORDER BY id
+            """,
+            (version,)
+        )
+
+    def add_word(self, word: str, category: Optional[str] = None) -> bool:
+        """Add a word and log the change."""
+        with self.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    """
+                    INSERT INTO words (word, category) VALUES (%s, %s)
+                    ON CONFLICT (word) DO NOTHING
+                    """,
+                    (word, category)
+                )
+                if not cursor.rowcount:
+                    return False
+                cursor.execute(
+                    "INSERT INTO graph_changes (kind, word1) VALUES ('word', %s)",
+                    (word,)
+                )
+                return True
+
+    def add_connection(self, word1: str, word2: str, strength: float = 1.0) -> bool:
+        """Connect two existing words and log the change."""
+        with self.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    """
+                    INSERT INTO connections (word1_id, word2_id, strength)
+                    SELECT LEAST(w1.id, w2.id), GREATEST(w1.id, w2.id), %s
+                    FROM words w1, words w2
+                    WHERE w1.word = %s AND w2.word = %s AND w1.id <> w2.id
+                    ON CONFLICT (word1_id, word2_id) DO NOTHING
+                    """,
+                    (strength, word1, word2)
+                )
+                if not cursor.rowcount:
+                    return False
+                cursor.execute(
+                    """
+                    INSERT INTO graph_changes (kind, word1, word2, strength)
+                    VALUES ('connection', %s, %s, %s)
+                    """,
+                    (word1, word2, strength)
+                )
+                return True
+
+    # Games, score histograms and leaderboard
+
+    def save_game(
+        self,
+        start_word: str,
+        end_word: str,
+        player_path: GamePath,
+        optimal_path: GamePath,
+        player_length: int,
+        optimal_length: int,
+        score: int,
+        top_n: int
+    ) -> int:
+        """Record a game atomically with its histogram and leaderboard updates."""
+        player_text, player_ids = path_columns(player_path)
+        optimal_text, optimal_ids = path_columns(optimal_path)
+        with self.get_connection() as conn:
+            with conn.cursor() as cursor:
+                # Taken before the id is drawn, released at commit
+                cursor.execute(
+                    "SELECT pg_advisory_xact_lock_shared(%s)", (self.GAME_INSERT_LOCK,)
+                )
+                cursor.execute(
+                    """
+                    INSERT INTO games
+                    (start_word, end_word, player_path, optimal_path,
+                     player_length, optimal_length, score, player_ids, optimal_ids)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+                    RETURNING id
+                    """,
+                    (
+                        start_word,
+                        end_word,
+                        player_text,
+                        optimal_text,
+                        player_length,
+                        optimal_length,
+                        score,
+                        player_ids,
+                        optimal_ids
+                    )
+                )
+                game_id = cursor.fetchone()[0]
+
+                cursor.execute(
+                    """
+                    INSERT INTO puzzle_scores (start_word, end_word, score, count)
+                    VALUES (%s, %s, %s, 1), ('*', '*', %s, 1)
+                    ON CONFLICT (start_word, end_word, score)
+                    DO UPDATE SET count = puzzle_scores.count + 1
+                    """,
+                    (start_word, end_word, score, score)
+                )
+
+                # Only completed paths are ranked
+                if player_length > 0:
+                    cursor.execute(
+                        f"""
+                        INSERT INTO leaderboard
+                        (game_id, start_word, end_word, score, player_length, completed_at)
+                        SELECT id, start_word, end_word, score, player_length, {COMPLETED_AT}
+                        FROM games WHERE id = %s
+                        """,
+                        (game_id,)
+                    )
+                    cursor.execute(
+                        """
+                        DELETE FROM leaderboard WHERE game_id NOT IN (
+                            SELECT game_id FROM leaderboard
+                            ORDER BY score DESC, player_length ASC, game_id ASC
+                            LIMIT %s
+                        )
+                        """,
+                        (top_n,)
+                    )
+                return game_id
+
+    def game_history(
+        self,
+        limit: int,
+        before: Optional[HistoryKey] = None,
+        word: Optional[str] = None,
+        min_score: Optional[int] = None,
+        max_score: Optional[int] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Get games newest first, ordered by (completed_at, id)."""
+        conditions = []
+        params: List[Any] = []
+
+        if before:
+            conditions.append("(games.completed_at, games.id) < (%s::timestamp, %s)")
+            params += list(before)
+        if min_score is not None:
+            conditions.append("games.score >= %s")
+            params.append(min_score)
+        if max_score is not None:
+            conditions.append("games.score <= %s")
+            params.append(max_score)
+        if since:
+            conditions.append("games.completed_at >= %s::timestamp")
+            params.append(since)
+        if until:
+            conditions.append("games.completed_at < %s::timestamp")
+            params.append(until)
+
+        def page_query(extra: Optional[str] = None) -> str:
+            where = " AND ".join(([extra] if extra else []) + conditions) or "TRUE"
+            return f"""
+                SELECT {GAME_COLUMNS} FROM games
+                WHERE {where}
+                ORDER BY games.completed_at DESC, games.id DESC
+                LIMIT %s
+            """
+
+        if word:
+            # One ordered index scan per side, merged
+            return self.execute(
+                f"""
+                ({page_query("games.start_word = %s")})
+                UNION ALL
+                ({page_query("games.end_word = %s")})
+                ORDER BY completed_at DESC, id DESC
+                LIMIT %s
+                """,
+                tuple([word] + params + [limit, word] + params + [limit, limit])
+            )
+        return self.execute(page_query(), tuple(params + [limit]))
+
+    def iter_games(self, after_id: int = 0, batch_size: int = 5000) -> Iterator[Dict[str, Any]]:
+        """
+        Stream every game oldest first through a server-side cursor.
+
+        The named cursor keeps the result set on the server and fetches
+        batch_size rows per round trip; the pooled connection is held
+        until the iterator is exhausted or closed.
+        """
+        with self.get_connection() as conn:
+            with conn.cursor(name="iter_games", cursor_factory=RealDictCursor) as cursor:
+                cursor.itersize = batch_size
+                cursor.execute(
+                    f"SELECT {GAME_COLUMNS} FROM games WHERE games.id > %s ORDER BY games.id",
+                    (after_id,)
+                )
+                for row in cursor:
+                    yield dict(row)
+
+    def score_histogram(self, start_word: str, end_word: str) -> Dict[int, int]:
+        """Get score -> game count for a puzzle ('*', '*' for all games)."""
+        rows = self.execute(
+            """
+            SELECT score, count FROM puzzle_scores
+            WHERE start_word = %s AND end_word = %s
+            ORDER BY score DESC
+            """,
+            (start_word, end_word)
+        )
+        return {row["score"]: row["count"] for row in rows}
+
+    def puzzle_results(self, start_word: str) -> Dict[str, Tuple[int, int]]:
+        """Get (games, solved) per end word for puzzles from a start word."""
+        rows = self.execute(
+            """
+            SELECT end_word, SUM(count) AS games,
+                   SUM(CASE WHEN score >= %s THEN count ELSE 0 END) AS solved
+            FROM puzzle_scores
+            WHERE start_word = %s
+            GROUP BY end_word
+            """,
+            (self.SOLVED_SCORE, start_word)
+        )
+        return {row["end_word"]: (int(row["games"]), int(row["solved"])) for row in rows}
+
+    def top_games(self, limit: int) -> List[Dict[str, Any]]:
+        """Get leaderboard rows, best first."""
+        return self.execute(
+            """
+            SELECT game_id, start_word, end_word, score, player_length, completed_at
+            FROM leaderboard
+            ORDER BY score DESC, player_length ASC, game_id ASC
+            LIMIT %s
+            """,
+            (limit,)
+        )
+
+    def rebuild_leaderboard(self, top_n: int) -> None:
+        """Recompute histograms and leaderboard from the games table."""
+        with self.get_connection() as conn:
+            with conn.cursor() as cursor:
+                self._rebuild_game_stats(cursor, top_n)
+
+    @staticmethod
+    def _rebuild_game_stats(cursor: Any, top_n: int) -> None:
+        """Recompute histograms and leaderboard inside a transaction."""
+        cursor.execute("DELETE FROM puzzle_scores")
+        cursor.execute("DELETE FROM leaderboard")
+        cursor.execute(
+            """
+            INSERT INTO puzzle_scores (start_word, end_word, score, count)
+            SELECT start_word, end_word, score, COUNT(*)
+            FROM games GROUP BY start_word, end_word, score
+            UNION ALL
+            SELECT '*', '*', score, COUNT(*) FROM games GROUP BY score
+            """
+        )
+        cursor.execute(
+            f"""
+            INSERT INTO leaderboard
+            (game_id, start_word, end_word, score, player_length, completed_at)
+            SELECT id, start_word, end_word, score, player_length, {COMPLETED_AT}
+            FROM games WHERE player_length > 0
+            ORDER BY score DESC, player_length ASC, id ASC
+            LIMIT %s
+            """,
+            (top_n,)
+        )
+
+    # Packed paths
+
+    def load_path_words(self, after_id: int = 0) -> List[Tuple[int, str]]:
+        """Get (id, word) dictionary entries past an id."""
+        rows = self.execute(
+            "SELECT id, word FROM path_words WHERE id > %s ORDER BY id", (after_id,)
+        )
+        return [(row["id"], row["word"]) for row in rows]
+
+    def add_path_words(self, words: List[str]) -> List[Tuple[int, str]]:
+        """Add words to the packed-path dictionary and return their entries."""
+        with self.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.executemany(
+                    "INSERT INTO path_words (word) VALUES (%s) ON CONFLICT (word) DO NOTHING",
+                    [(word,) for word in words]
+                )
+                cursor.execute(
+                    "SELECT id, word FROM path_words WHERE word = ANY(%s)", (list(words),)
+                )
+                return [(word_id, word) for word_id, word in cursor.fetchall()]
+
+    def text_path_games(self, after_id: int, limit: int) -> List[Dict[str, Any]]:
+        """Get games whose paths are still stored as text, oldest first."""
+        return self.execute(
+            """
+            SELECT id, player_path, optimal_path FROM games
+            WHERE id > %s AND player_ids IS NULL
+            ORDER BY id
+            LIMIT %s
+            """,
+            (after_id, limit)
+        )
+
+    def set_packed_paths(self, rows: List[Tuple[int, bytes, bytes]]) -> None:
+        """Replace the text paths of games with packed ones."""
+        with self.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.executemany(
+                    """
+                    UPDATE games
+                    SET player_ids = %s, optimal_ids = %s,
+                        player_path = NULL, optimal_path = NULL
+                    WHERE id = %s
+                    """,
+                    [
+                        (player_ids, optimal_ids, game_id)
+                        for game_id, player_ids, optimal_ids in rows
+                    ]
+                )
+
+    # Stats rollups
+
+    def compact_rollups(self, batch_size: int) -> int:
+        """
+        Fold up to batch_size games past the watermark into the rollups.
+
+        The watermark row is locked FOR UPDATE, so concurrent compactions
+        from other instances queue behind each other. Only games up to
+        the settled id (see GAME_INSERT_LOCK) are folded in, so none
+        committing later can fall below the watermark.
+        """
+        with self.get_connection() as conn:
+            with conn.cursor() as cursor:
+                # Waits out in-flight saves; held only for this transaction
+                cursor.execute("SELECT pg_advisory_xact_lock(%s)", (self.GAME_INSERT_LOCK,))
+                cursor.execute("SELECT COALESCE(MAX(id), 0) FROM games")
+                settled = cursor.fetchone()[0]
+
+        with self.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    "SELECT last_game_id FROM rollup_state WHERE name = 'games' FOR UPDATE"
+                )
+                low = cursor.fetchone()[0]
+                cursor.execute(
+                    """
+                    SELECT MAX(id), COUNT(*) FROM (
+                        SELECT id FROM games WHERE id > %s AND id <= %s ORDER BY id LIMIT %s
+                    ) batch
+                    """,
+                    (low, settled, batch_size)
+                )
+                high, count = cursor.fetchone()
+                if high is None:
+                    return 0
+
+                for table, bucket_format in self.ROLLUP_TABLES.values():
+                    cursor.execute(
+                        f"""
+                        INSERT INTO {table}
+                        (bucket, games, score_sum, perfect_count, failure_count,
+                         length_sum, length_count)
+                        SELECT
+                            to_char(completed_at, %s),
+                            COUNT(*),
+                            SUM(score),
+                            COUNT(*) FILTER (WHERE score = 100),
+                            COUNT(*) FILTER (WHERE score = 0),
+                            COALESCE(SUM(player_length) FILTER (WHERE player_length > 0), 0),
+                            COUNT(*) FILTER (WHERE player_length > 0)
+                        FROM games
+                        WHERE id > %s AND id <= %s
+                        GROUP BY 1
+                        ON CONFLICT (bucket) DO UPDATE SET
+                            games = {table}.games + excluded.games,
+                            score_sum = {table}.score_sum + excluded.score_sum,
+                            perfect_count = {table}.perfect_count + excluded.perfect_count,
+                            failure_count = {table}.failure_count + excluded.failure_count,
+                            length_sum = {table}.length_sum + excluded.length_sum,
+                            length_count = {table}.length_count + excluded.length_count
+                        """,
+                        (bucket_format, low, high)
+                    )
+
+                cursor.execute(
+                    "UPDATE rollup_state SET last_game_id = %s WHERE name = 'games'",
+                    (high,)
+                )
+                return count
+
+    def rollup_watermark(self) -> int:
+        """Get the id of the last game folded into the rollups."""
+        row = self.execute_one("SELECT last_game_id FROM rollup_state WHERE name = 'games'")
+        return row["last_game_id"] if row else 0
+
+    def rollup_buckets(
+        self,
+        granularity: str,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        limit: int = 30
+    ) -> List[Dict[str, Any]]:
+        """Get raw rollup rows, newest bucket first."""
+        table, _ = self.ROLLUP_TABLES[granularity]
+
+        conditions, params = [], []
+        if since:
+            conditions.append("bucket >= %s")
+            params.append(since)
+        if until:
+            conditions.append("bucket <= %s")
+            params.append(until)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        return self.execute(
+            f"SELECT * FROM {table} {where} ORDER BY bucket DESC LIMIT %s",
+            (*params, limit)
+        )
+
+    def path_length_totals(self) -> Tuple[int, int]:
+        """Get all-time (sum of player path lengths, completed games)."""
+        row = self.execute_one(
+            """
+            WITH mark AS (
+                SELECT COALESCE(MAX(last_game_id), 0) AS id
+                FROM rollup_state WHERE name = 'games'
+            ),
+            tail AS (
+                SELECT COALESCE(SUM(player_length), 0) AS length_sum,
+                       COUNT(*) AS length_count
+                FROM games, mark
+                WHERE games.id > mark.id AND games.player_length > 0
+            ),
+            rolled AS (
+                SELECT COALESCE(SUM(length_sum), 0) AS length_sum,
+                       COALESCE(SUM(length_count), 0) AS length_count
+                FROM stats_daily
+            )
+            SELECT rolled.length_sum + tail.length_sum AS length_sum,
+                   rolled.length_count + tail.length_count AS length_count
+            FROM rolled, tail
+            """
+        )
+        return int(row["length_sum"]), int(row["length_count"])
+
+    # Graph analytics
+
+    def save_graph_metrics(
+        self,
+        version: int,
+        summary: Dict[str, Any],
+        word_metrics: List[Tuple[str, float, Optional[int]]]
+    ) -> None:
+        """Replace the stored graph analytics run."""
+        with self.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    """
+                    INSERT INTO graph_metrics (id, version, summary, computed_at)
+                    VALUES (1, %s, %s, now())
+                    ON CONFLICT (id) DO UPDATE SET
+                        version = excluded.version,
+                        summary = excluded.summary,
+                        computed_at = excluded.computed_at
+                    """,
+                    (version, Json(summary))
+                )
+                cursor.execute("DELETE FROM word_metrics")
+                cursor.executemany(
+                    "INSERT INTO word_metrics (word, betweenness, eccentricity) VALUES (%s, %s, %s)",
+                    word_metrics
+                )
+
+    def load_graph_metrics(self) -> Optional[Dict[str, Any]]:
+        """Get the stored graph analytics run."""
+        row = self.execute_one(
+            """
+            SELECT version, summary,
+                   to_char(computed_at, 'YYYY-MM-DD HH24:MI:SS') AS computed_at
+            FROM graph_metrics WHERE id = 1
+            """
+        )
+        if row is None:
+            return None
+
+        words = self.execute("SELECT word, betweenness, eccentricity FROM word_metrics")
+        return {
+            "version": row["version"],
+            "computed_at": row["computed_at"],
+            "summary": row["summary"],
+            "words": {
+                w["word"]: {"betweenness": w["betweenness"], "eccentricity": w["eccentricity"]}
+                for w in words
+            },
+        }
@@ -0,0 +1,357 @@
+"""
+Storage interface for Six Degrees.
+
+Covers the persistence WordGraph and GameEngine need: the word graph and
+its change log, saved games with their score histograms and leaderboard,
+the stats rollups, and the latest graph analytics run. Implementations:
+
+- Database (app.models.database): SQLite, the default
+- PostgresStorage (app.models.postgres): pooled PostgreSQL connections
+- MemoryStorage (app.models.memory): in-process fake for tests
+"""
+
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+# Keyset position in game history: (completed_at, id)
+HistoryKey = Tuple[str, int]
+
+# A saved path: its words (stored comma-joined in player_path/optimal_path)
+# or a packed word-id BLOB (stored in player_ids/optimal_ids, see PathCodec)
+GamePath = Union[List[str], bytes]
+
+
+class Storage(ABC):
+    """
+    Backend-neutral persistence for the word graph and game history.
+    """
+
+    # Granularities accepted by rollup_buckets()
+    GRANULARITIES = ("hour", "day")
+
+    # Whether GameArchive can move old games into monthly SQLite files
+    ARCHIVABLE = False
+
+    # Games kept in the leaderboard when init_schema backfills it
+    LEADERBOARD_SIZE = 100
+
+    # Lowest score puzzle_results() counts as solved: a completed path
+    # (GameEngine.SCORE_COMPLETED), above most partial credit for broken ones
+    SOLVED_SCORE = 50
+
+    @abstractmethod
+    def init_schema(self) -> None:
+        """
+        Create tables and indexes if they do not exist.
+
+        Databases upgraded from before the incremental histograms have
+        games but no puzzle_scores; their histograms and leaderboard are
+        rebuilt once here so totals and stats do not start from zero.
+        """
+
+    def close(self) -> None:
+        """Release connections held by the backend."""
+
+    def location(self) -> Optional[str]:
+        """
+        Get the open_storage() target other processes reach this data by.
+
+        Returns:
+            File path or URL, or None if the data lives only in this process
+        """
+        return None
+
+    # Word graph
+
+    @abstractmethod
+    def load_words(self) -> List[str]:
+        """Get every word in the graph."""
+
+    @abstractmethod
+    def load_connections(self) -> List[Tuple[str, str]]:
+        """Get every connection once, as a (word1, word2) pair."""
+
+    @abstractmethod
+    def graph_version(self) -> int:
+        """Get the id of the newest graph change-log entry (0 if none)."""
+
+    @abstractmethod
+    def graph_changes_since(self, version: int) -> List[Dict[str, Any]]:
+        """
+        Get change-log entries newer than a version, oldest first.
+
+        Returns:
+            Dicts with id, kind, word1, word2 and strength
+        """
+
+    @abstractmethod
+    def add_word(self, word: str, category: Optional[str] = None) -> bool:
+        """
+        Add a word and log the change.
+
+        Returns:
+            True if the word was new
+        """
+
+    @abstractmethod
+    def add_connection(self, word1: str, word2: str, strength: float = 1.0) -> bool:
+        """
+        Connect two existing words and log the change.
+
+        Connections are undirected and stored once per pair, so the
+        reverse of an existing connection (or a self-loop) is rejected.
+
+        Returns:
+            True if the connection was new
+        """
+
+    # Games, score histograms and leaderboard
+
+    @abstractmethod
+    def save_game(
+        self,
+        start_word: str,
+        end_word: str,
+        player_path: GamePath,
+        optimal_path: GamePath,
+        player_length: int,
+        optimal_length: int,
+        score: int,
+        top_n: int
+    ) -> int:
+        """
+        Record a game atomically with its histogram and leaderboard updates.
+
+        Args:
+            player_path: Player's words, or their packed BLOB
+            optimal_path: Optimal path's words, or their packed BLOB
+            top_n: Number of completed games kept in the leaderboard
+
+        Returns:
+            Id of the saved game
+        """
+
+    @abstractmethod
+    def game_history(
+        self,
+        limit: int,
+        before: Optional[HistoryKey] = None,
+        word: Optional[str] = None,
+        min_score: Optional[int] = None,
+        max_score: Optional[int] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get games newest first, ordered by (completed_at, id).
+
+        Args:
+            limit: Maximum rows
+            before: Only games strictly older than this keyset position
+            word: Only games starting or ending with this (uppercase) word
+            min_score: Minimum score (inclusive)
+            max_score: Maximum score (inclusive)
+            since: Earliest completed_at (inclusive)
+            until: Latest completed_at (exclusive)
+
+        Returns:
+            games rows: player_path and optimal_path comma-joined, or
+            NULL with the path packed in player_ids and optimal_ids
+        """
+
+    @abstractmethod
+    def iter_games(self, after_id: int = 0, batch_size: int = 5000) -> Iterator[Dict[str, Any]]:
+        """
+        Stream every game oldest first, by id, in constant memory.
+
+        Rows are fetched batch_size at a time, and closing the iterator
+        early releases whatever it holds.
+
+        Args:
+            after_id: Only games with a larger id (to resume an export)
+            batch_size: Rows fetched per round trip
+
+        Returns:
+            games rows, as from game_history
+        """
+
+    @abstractmethod
+    def score_histogram(self, start_word: str, end_word: str) -> Dict[int, int]:
+        """Get score -> game count for a puzzle ('*', '*' for all games)."""
+
+    @abstractmethod
+    def puzzle_results(self, start_word: str) -> Dict[str, Tuple[int, int]]:
+        """
+        Get game outcomes for every puzzle played from a start word.
+
+        Returns:
+            end_word -> (games, solved), where solved counts games
+            scoring at least SOLVED_SCORE
+        """
+
+    @abstractmethod
+    def top_games(self, limit: int) -> List[Dict[str, Any]]:
+        """Get leaderboard rows, best first."""
+
+    @abstractmethod
+    def rebuild_leaderboard(self, top_n: int) -> None:
+        """Recompute histograms and leaderboard from the games table."""
+
+    # Packed paths
+
+    @abstractmethod
+    def load_path_words(self, after_id: int = 0) -> List[Tuple[int, str]]:
+        """
+        Get (id, word) entries of the packed-path dictionary.
+
+        Ids are never reused, but concurrent writers may commit a lower
+        id after a higher one (PostgreSQL sequences), so entries past
+        after_id are not necessarily all entries added since it was seen.
+        """
+
+    @abstractmethod
+    def add_path_words(self, words: List[str]) -> List[Tuple[int, str]]:
+        """
+        Add words to the packed-path dictionary (existing ones are ignored).
+
+        Returns:
+            (id, word) entries for every given word, new or existing
+        """
+
+    @abstractmethod
+    def text_path_games(self, after_id: int, limit: int) -> List[Dict[str, Any]]:
+        """
+        Get games whose paths are still stored as text, oldest first.
+
+        Returns:
+            Dicts with id, player_path and optimal_path
+        """
+
+    @abstractmethod
+    def set_packed_paths(self, rows: List[Tuple[int, bytes, bytes]]) -> None:
+        """
+        Replace the text paths of games with packed ones.
+
+        Args:
+            rows: (game id, player_ids, optimal_ids)
+        """
+
+    # Stats rollups
+
+    @abstractmethod
+    def compact_rollups(self, batch_size: int) -> int:
+        """
+        Fold up to batch_size games past the watermark into the rollups.
+
+        Must be safe to run concurrently from several processes.
+
+        Returns:
+            Number of games folded in
+        """
+
+    @abstractmethod
+    def rollup_watermark(self) -> int:
+        """Get the id of the last game folded into the rollups."""
+
+    @abstractmethod
+    def rollup_buckets(
+        self,
+        granularity: str,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        limit: int = 30
+    ) -> List[Dict[str, Any]]:
+        """
+        Get raw rollup rows, newest bucket first.
+
+        Returns:
+            Dicts with bucket, games, score_sum, perfect_count,
+            failure_count, length_sum and length_count
+        """
+
+    @abstractmethod
+    def path_length_totals(self) -> Tuple[int, int]:
+        """
+        Get all-time (sum of player path lengths, completed games).
+
+        Combines the daily rollups with games not yet compacted.
+        """
+
+    # Graph analytics
+
+    @abstractmethod
+    def save_graph_metrics(
+        self,
+        version: int,
+        summary: Dict[str, Any],
+        word_metrics: List[Tuple[str, float, Optional[int]]]
+    ) -> None:
+        """
+        Replace the stored graph analytics run.
+
+        Args:
+            version: Graph version the metrics were computed at
+            summary: JSON-serializable summary
+            word_metrics: (word, betweenness, eccentricity) rows;
+                eccentricity is None for words that were not sampled
+        """
+
+    @abstractmethod
+    def load_graph_metrics(self) -> Optional[Dict[str, Any]]:
+        """
+        Get the stored graph analytics run.
+
+        Returns:
+            Dict with version, computed_at, summary and words
+            (word -> {"betweenness", "eccentricity"}), or None
+        """
+
+
+def path_columns(path: GamePath) -> Tuple[Optional[str], Optional[bytes]]:
+    """Split a saved path into its (text, packed) column values."""
+    if isinstance(path, bytes):
+        return None, path
+    return ",".join(path), None
+
+
+def is_database_url(target: str) -> bool:
+    """Check whether a database setting is a PostgreSQL URL."""
+    return target.startswith(("postgres://", "postgresql://"))
+
+
+def open_storage(
+    target: str,
+    read_only: bool = False,
+    tune_writes: bool = False,
+    in_memory: bool = False,
+    snapshot: Optional[str] = None
+) -> Storage:
+    """
+    Open the storage backend for a database setting.
+
+    Args:
+        target: PostgreSQL URL (postgres:// or postgresql://) or
+            SQLite file path
+        read_only: Open a SQLite file as immutable (see Database)
+        tune_writes: Tune a SQLite file for inserts (see Database)
+        in_memory: Serve a SQLite file from memory (see Database)
+        snapshot: File an in-memory database is first loaded from
+
+    The SQLite options are ignored for PostgreSQL, whose server manages
+    locking and durability for every client alike.
+
+    Returns:
+        Storage instance
+    """
+    if is_database_url(target):
+        from app.models.postgres import PostgresStorage
+        return PostgresStorage(target)
+
+    from app.models.database import Database
+    return Database(
+        target,
+        read_only=read_only,
+        tune_writes=tune_writes,
+        in_memory=in_memory,
+        snapshot=snapshot
+    )
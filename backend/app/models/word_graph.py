@@ -4,9 +4,33 @@ Word Graph for Six Degrees game.
 Represents the semantic word network as a graph structure.
 """
 
+import heapq
+import threading
+import time
+from array import array
 from collections import defaultdict
-from typing import Dict, Set, List, Optional
-from app.models.database import Database
+from dataclasses import dataclass
+from typing import Callable, Dict, Set, List, Optional, Tuple
+from app.models.storage import Storage
+
+
+@dataclass(frozen=True)
+class GraphChange:
+    """A single entry from the graph change log."""
+    id: int
+    kind: str
+    word1: str
+    word2: Optional[str] = None
+    strength: Optional[float] = None
+
+
+@dataclass(frozen=True)
+class IndexedGraph:
+    """Integer-indexed CSR view of a WordGraph (see WordGraph.indexed)."""
+    words: List[str]  # Sorted; a word's id is its position
+    index: Dict[str, int]
+    indptr: "array[int]"  # Row i's neighbours are indices[indptr[i]:indptr[i + 1]]
+    indices: "array[int]"
 
 
 class WordGraph:
@@ -15,44 +39,322 @@ class WordGraph:
     
     Words are nodes, semantic connections are edges.
     Supports efficient BFS pathfinding.
+    
+    Every mutation is also recorded in the ``graph_changes`` log, so
+    other processes can pick it up with ``refresh()`` instead of
+    reloading the whole graph.
+    
+    Connected components are labelled as words and edges arrive. The
+    graph only grows, so merging is all that is needed: the smaller
+    component is relabelled into the larger one, which keeps lookups
+    O(1) and total relabelling O(n log n).
+    
+    Each word also keeps a short, stable preview of its neighbours,
+    ranked by the neighbours' own degree, for word validation responses.
+    
+    For integer-indexed searches the graph also serves a cached CSR view
+    (see indexed()), dropped whenever a word or edge is added.
+    
+    Thread safety: mutations (load, refresh, add_*) and the multi-step
+    exports (snapshot, to_csr, indexed) run under one RLock. Neighbour
+    sets and component member lists are copied on write, so a set from
+    get_neighbors() or a list from component_members() never changes
+    under a caller iterating it without the lock.
     """
     
-    def __init__(self, database: Database):
+    # Minimum seconds between change-log polls in refresh()
+    REFRESH_INTERVAL = 5.0
+    
+    # Neighbours kept in each word's preview
+    PREVIEW_SIZE = 10
+    
+    def __init__(self, database: Optional[Storage]):
         """
         Initialize word graph from database.
         
         Args:
-            database: Database instance for data access
+            database: Storage backend for data access (None for snapshots)
         """
         self.db = database
         self._adjacency: Dict[str, Set[str]] = defaultdict(set)
         self._words: Set[str] = set()
+        self._component: Dict[str, str] = {}
+        self._members: Dict[str, List[str]] = {}
+        self._previews: Dict[str, Tuple[str, ...]] = {}
+        self._indexed: Optional[IndexedGraph] = None
         self._loaded = False
+        self._version = 0
+        self._last_refresh = 0.0
+        self._listeners: List[Callable[[List[GraphChange]], None]] = []
+        self._lock = threading.RLock()
+    
+    @property
+    def version(self) -> int:
+        """Id of the last change-log entry reflected in memory."""
+        return self._version
     
     def load(self) -> None:
         """Load graph from database into memory."""
         if self._loaded:
             return
+        
+        with self._lock:
+            if self._loaded:
+                return
+            
+            # Read the version first: changes racing with the load are
+            # re-applied by the next refresh, which is idempotent.
+            self._version = self.db.graph_version()
+            self._last_refresh = time.monotonic()
+                
+            # Load all words
+            self._words = {word.upper() for word in self.db.load_words()}
+            for word in self._words:
+                self._track(word)
+            
+            # Load all connections; nothing is published until _loaded
+            for word1, word2 in self.db.load_connections():
+                word1 = word1.upper()
+                word2 = word2.upper()
+                self._adjacency[word1].add(word2)
+                self._adjacency[word2].add(word1)
+                self._link(word1, word2)
+            
+            self._build_previews()
+            self._loaded = True
+    
+    def snapshot(self) -> Tuple[List[str], Dict[str, List[str]]]:
+        """
+        Export the in-memory graph as plain, picklable data.
+        
+        Returns:
+            Tuple of (words, adjacency lists)
+        """
+        self.load()
+        with self._lock:
+            words = list(self._words)
+            adjacency = {word: list(neighbors) for word, neighbors in self._adjacency.items()}
+        return words, adjacency
+    
+    def to_csr(self) -> Tuple[List[str], List[int], List[int]]:
+        """
+        Export the graph in compressed sparse row form.
+        
+        Returns:
+            Tuple of (sorted words, row pointer, column indices)
+        """
+        self.load()
+        with self._lock:
+            words = sorted(self._words)
+            index = {word: i for i, word in enumerate(words)}
+            indptr = [0]
+            indices: List[int] = []
+            for word in words:
+                indices.extend(sorted(
+                    index[neighbor] 
+                    for neighbor in self._adjacency.get(word, ()) 
+                    if neighbor in index
+                ))
+                indptr.append(len(indices))
+        return words, indptr, indices
+    
+    def indexed(self) -> "IndexedGraph":
+        """
+        Get the cached integer-indexed CSR view of the graph.
+        
+        Rebuilt on first use after any word or edge is added.
+        
+        Returns:
+            IndexedGraph over the current words and edges
+        """
+        indexed = self._indexed
+        if indexed is None:
+            with self._lock:
+                # Built and cached under the lock, so it matches one version
+                indexed = self._indexed
+                if indexed is None:
+                    words, indptr, indices = self.to_csr()
+                    indexed = IndexedGraph(
+                        words,
+                        {word: i for i, word in enumerate(words)},
+                        array("i", indptr),
+                        array("i", indices)
+                    )
+                    self._indexed = indexed
+        return indexed
+    
+    @classmethod
+    def from_snapshot(
+        cls, 
+        snapshot: Tuple[List[str], Dict[str, List[str]]]
+    ) -> "WordGraph":
+        """
+        Build a detached, already-loaded graph from snapshot().
+        
+        Used by worker processes that never touch the database.
+        
+        Args:
+            snapshot: Output of snapshot()
+            
+        Returns:
+            WordGraph without a database
+        """
+        words, adjacency = snapshot
+        graph = cls(None)
+        graph._words = set(words)
+        for word in graph._words:
+            graph._track(word)
+        for word, neighbors in adjacency.items():
+            graph._adjacency[word] = set(neighbors)
+            for neighbor in neighbors:
+                graph._link(word, neighbor)
+        graph._build_previews()
+        graph._loaded = True
+        return graph
+    
+    def subscribe(self, listener: Callable[[List[GraphChange]], None]) -> None:
+        """
+        Register a callback for applied graph deltas.
+        
+        Derived caches use this to update themselves incrementally.
+        
+        Args:
+            listener: Called with the list of changes applied by refresh()
+        """
+        self._listeners.append(listener)
+    
+    def refresh(self, force: bool = False) -> int:
+        """
+        Apply changes recorded by other processes since the last poll.
+        
+        Polls are throttled to REFRESH_INTERVAL unless forced.
+        
+        Args:
+            force: Poll the change log regardless of the interval
+            
+        Returns:
+            Number of changes applied
+        """
+        if not self._loaded:
+            self.load()
+            return 0
+        if self.db is None:
+            return 0
+        
+        if not force and time.monotonic() - self._last_refresh < self.REFRESH_INTERVAL:
+            return 0
+        
+        with self._lock:
+            # Another thread may have polled while this one waited
+            now = time.monotonic()
+            if not force and now - self._last_refresh < self.REFRESH_INTERVAL:
+                return 0
+            self._last_refresh = now
+            return len(self._pull())
+    
+    def _pull(self) -> List[GraphChange]:
+        """Apply change-log entries newer than the version (lock held)."""
+        rows = self.db.graph_changes_since(self._version)
+        if not rows:
+            return []
+        
+        changes = [GraphChange(**row) for row in rows]
+        for change in changes:
+            self._apply(change)
+        self._version = changes[-1].id
+        
+        for listener in self._listeners:
+            listener(changes)
+        return changes
+    
+    def _apply(self, change: GraphChange) -> None:
+        """Apply a single change-log entry to the in-memory graph."""
+        if change.kind == "word":
+            word = change.word1.upper()
+            self._words.add(word)
+            self._track(word)
+        elif change.kind == "connection":
+            self._connect(change.word1.upper(), change.word2.upper())
+    
+    def _connect(self, word1: str, word2: str) -> None:
+        """Add an edge to a published graph (lock held)."""
+        # Replace rather than mutate the sets readers may be iterating
+        adjacency = self._adjacency
+        adjacency[word1] = adjacency.get(word1, set()) | {word2}
+        adjacency[word2] = adjacency.get(word2, set()) | {word1}
+        self._link(word1, word2)
+        self._invalidate_previews(word1, word2)
+    
+    def _track(self, word: str) -> None:
+        """Give a new word its own component."""
+        if word not in self._component:
+            self._component[word] = word
+            self._members[word] = [word]
+            self._indexed = None
+    
+    def _link(self, word1: str, word2: str) -> None:
+        """Merge the components of two connected words (idempotent)."""
+        self._indexed = None
+        self._track(word1)
+        self._track(word2)
+        label1, label2 = self._component[word1], self._component[word2]
+        if label1 == label2:
+            return
+        if len(self._members[label1]) < len(self._members[label2]):
+            label1, label2 = label2, label1
+        
+        # Relabel the smaller component; the merged list is a new one,
+        # since component_members() hands lists out
+        moved = self._members.pop(label2)
+        for word in moved:
+            self._component[word] = label1
+        self._members[label1] = self._members[label1] + moved
+    
+    def _rank_neighbors(self, word: str) -> Tuple[str, ...]:
+        """Pick a word's best-connected neighbours (ties by spelling)."""
+        adjacency = self._adjacency
+        return tuple(heapq.nsmallest(
+            self.PREVIEW_SIZE,
+            adjacency.get(word, ()),
+            key=lambda neighbor: (-len(adjacency[neighbor]), neighbor)
+        ))
+    
+    def _build_previews(self) -> None:
+        """Precompute the neighbour preview of every connected word."""
+        self._previews = {word: self._rank_neighbors(word) for word in self._adjacency}
+    
+    def _invalidate_previews(self, word1: str, word2: str) -> None:
+        """
+        Drop previews affected by a new edge.
+        
+        The endpoints gain a neighbour, and their neighbours see an
+        endpoint's degree change; those previews are rebuilt on demand.
+        """
+        for word in (word1, word2):
+            self._previews.pop(word, None)
+            for neighbor in self._adjacency.get(word, ()):
+                self._previews.pop(neighbor, None)
+    
+    def neighbor_preview(self, word: str) -> Tuple[str, ...]:
+        """
+        Get a word's top neighbours, best-connected first.
+        
+        Precomputed at load, so repeated calls do not allocate.
+        
+        Args:
+            word: Word to look up
             
-        # Load all words
-        words = self.db.execute("SELECT word FROM words")
-        self._words = {row["word"].upper() for row in words}
-        
-        # Load all connections
-        connections = self.db.execute("""
-            SELECT w1.word as word1, w2.word as word2
-            FROM connections c
-            JOIN words w1 ON c.word1_id = w1.id
-            JOIN words w2 ON c.word2_id = w2.id
-        """)
-        
-        for conn in connections:
-            word1 = conn["word1"].upper()
-            word2 = conn["word2"].upper()
-            self._adjacency[word1].add(word2)
-            self._adjacency[word2].add(word1)
-        
-        self._loaded = True
+        Returns:
+            Up to PREVIEW_SIZE neighbours (empty if none)
+        """
+        self.load()
+        word = word.upper()
+        preview = self._previews.get(word)
+        if preview is None:
+            preview = self._rank_neighbors(word)
+            if preview:
+                self._previews[word] = preview
+        return preview
     
     def has_word(self, word: str) -> bool:
         """
@@ -94,6 +396,48 @@ class WordGraph:
         self.load()
         return word2.upper() in self._adjacency.get(word1.upper(), set())
     
+    def same_component(self, word1: str, word2: str) -> bool:
+        """
+        Check if any path connects two words, in O(1).
+        
+        Args:
+            word1: First word
+            word2: Second word
+            
+        Returns:
+            True if both words exist and share a component
+        """
+        self.load()
+        label = self._component.get(word1.upper())
+        return label is not None and label == self._component.get(word2.upper())
+    
+    def component_members(self, word: str) -> List[str]:
+        """
+        Get every word in the same component as a word.
+        
+        The list is shared with the graph and must not be modified.
+        
+        Args:
+            word: Word to look up
+            
+        Returns:
+            Words in the component (empty if the word is unknown)
+        """
+        self.load()
+        label = self._component.get(word.upper())
+        return self._members[label] if label is not None else []
+    
+    def component_sizes(self) -> List[int]:
+        """
+        Get the size of every connected component.
+        
+        Returns:
+            Component sizes, largest first
+        """
+        self.load()
+        with self._lock:
+            return sorted((len(members) for members in self._members.values()), reverse=True)
+    
     def get_all_words(self) -> List[str]:
         """
         Get all words in graph.
@@ -122,23 +466,26 @@ class WordGraph:
             Number of edges in graph
         """
         self.load()
-        return sum(len(neighbors) for neighbors in self._adjacency.values()) // 2
+        with self._lock:
+            return sum(len(neighbors) for neighbors in self._adjacency.values()) // 2
     
     def add_word(self, word: str, category: Optional[str] = None) -> None:
         """
         Add a word to the graph.
         
+        A loaded graph applies the edit through the change log, like a
+        refresh, so its version moves past the new entry.
+        
         Args:
             word: Word to add
             category: Optional category
         """
         word = word.upper()
-        if word not in self._words:
-            self.db.insert(
-                "INSERT OR IGNORE INTO words (word, category) VALUES (?, ?)",
-                (word, category)
-            )
-            self._words.add(word)
+        with self._lock:
+            if word not in self._words:
+                self.db.add_word(word, category)
+                if self._loaded:
+                    self._pull()
     
     def add_connection(self, word1: str, word2: str, strength: float = 1.0) -> None:
         """
@@ -152,15 +499,8 @@ class WordGraph:
         word1 = word1.upper()
         word2 = word2.upper()
         
-        # Get word IDs
-        w1 = self.db.execute_one("SELECT id FROM words WHERE word = ?", (word1,))
-        w2 = self.db.execute_one("SELECT id FROM words WHERE word = ?", (word2,))
-        
-        if w1 and w2:
-            self.db.insert(
-                "INSERT OR IGNORE INTO connections (word1_id, word2_id, strength) VALUES (?, ?, ?)",
-                (w1["id"], w2["id"], strength)
-            )
-            self._adjacency[word1].add(word2)
-            self._adjacency[word2].add(word1)
+        # Ignored unless both words exist
+        with self._lock:
+            if self.db.add_connection(word1, word2, strength) and self._loaded:
+                self._pull()
 
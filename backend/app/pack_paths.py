@@ -0,0 +1,37 @@
+"""
+Pack stored game paths for Six Degrees.
+
+Rewrites games saved with comma-joined text paths to packed word-id
+BLOBs (see PathCodec). Safe to run on a live database and to re-run;
+enable PACK_PATHS so new games are saved packed too:
+
+    python -m app.pack_paths --db data/sixdegrees.db
+"""
+
+import argparse
+import logging
+from app.models.storage import open_storage
+from app.services.game_engine import GameEngine
+
+
+def main() -> None:
+    """Pack stored paths from the command line."""
+    parser = argparse.ArgumentParser(description="Pack Six Degrees game paths")
+    parser.add_argument("--db", default="data/sixdegrees.db", help="Database path or URL")
+    parser.add_argument(
+        "--batch-size", type=int, default=5000, help="Games rewritten per transaction"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
+    db = open_storage(args.db)
+    # Adds the packed path columns to databases that predate them
+    db.init_schema()
+    # The graph loads lazily, so this touches only the games table
+    engine = GameEngine(storage=db)
+    print(f"Packed paths of {engine.pack_stored_paths(args.batch_size)} games")
+    engine.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -5,26 +5,54 @@ Handles puzzle generation, validation, and submission.
 """
 
 from flask import Blueprint, jsonify, request, current_app
+from app import open_app_storage
 from app.services.game_engine import GameEngine
+from app.services.search_pool import SearchTimeout
+from app.services.sessions import SessionNotFound, SessionStore
 
 game_bp = Blueprint("game", __name__)
 
 # Initialize game engine (singleton pattern)
 _engine = None
-_engine_db_path = None
+_engine_settings = None
 
 
 def get_engine() -> GameEngine:
     """Get or create game engine instance."""
-    global _engine, _engine_db_path
+    global _engine, _engine_settings
     db_path = current_app.config.get("DATABASE", "data/sixdegrees.db")
-    # Recreate engine if db_path changed
-    if _engine is None or _engine_db_path != db_path:
-        _engine = GameEngine(db_path=db_path)
-        _engine_db_path = db_path
+    graph_db_path = current_app.config.get("GRAPH_DATABASE")
+    in_memory = current_app.config.get("IN_MEMORY_DATABASE", False)
+    # Recreate engine if the database settings changed
+    if _engine is None or _engine_settings != (db_path, graph_db_path, in_memory):
+        if _engine is not None:
+            _engine.close()
+        _engine = GameEngine(
+            db_path=db_path,
+            graph_db_path=graph_db_path,
+            storage=open_app_storage(current_app) if in_memory else None,
+            pack_paths=current_app.config.get("PACK_PATHS", False),
+            search_processes=current_app.config.get("SEARCH_PROCESSES", 0),
+            sessions=SessionStore(spill_path=current_app.config.get("SESSION_SPILL"))
+        )
+        _engine_settings = (db_path, graph_db_path, in_memory)
+    # Pick up graph edits made by other workers (throttled)
+    _engine.graph.refresh()
     return _engine
 
 
+@game_bp.errorhandler(SearchTimeout)
+def search_timeout(error):
+    """Map search timeouts and exhausted budgets to a fast retryable response."""
+    return jsonify({"error": str(error), "degraded": True}), 503, {"Retry-After": "1"}
+
+
+@game_bp.errorhandler(SessionNotFound)
+def session_not_found(error):
+    """Map unknown or expired puzzle_ids to 404."""
+    return jsonify({"error": str(error)}), 404
+
+
 @game_bp.route("/new", methods=["GET"])
 def new_game():
     """
@@ -32,18 +60,24 @@ def new_game():
     
     Query params:
         difficulty: easy, medium, hard (default: medium)
+        seed: Integer seed for a reproducible puzzle (optional)
     
     Returns:
-        Puzzle with start/end words
+        Puzzle with start/end words and the puzzle_id of its session
     """
     difficulty = request.args.get("difficulty", "medium")
     
     if difficulty not in ["easy", "medium", "hard"]:
         return jsonify({"error": "Invalid difficulty"}), 400
     
+    try:
+        seed = int(request.args["seed"]) if "seed" in request.args else None
+    except ValueError:
+        return jsonify({"error": "seed must be an integer"}), 400
+    
     try:
         engine = get_engine()
-        puzzle = engine.generate_puzzle(difficulty)
+        puzzle = engine.generate_puzzle(difficulty, seed)
         return jsonify(puzzle.to_dict())
     except ValueError as e:
         return jsonify({"error": str(e)}), 500
@@ -56,7 +90,9 @@ def validate_word():
     
     Body:
         word: Word to validate
-        chain: Current chain of words
+        puzzle_id: Session to validate against; a valid word is appended
+        chain: Current chain of words (used without a puzzle_id, or if
+            the session has expired)
     
     Returns:
         Validation result
@@ -70,20 +106,87 @@ def validate_word():
     chain = data.get("chain", [])
     
     engine = get_engine()
+    if data.get("puzzle_id"):
+        try:
+            return jsonify(engine.validate_move(data["puzzle_id"], word))
+        except SessionNotFound:
+            if "chain" not in data:
+                raise
     result = engine.validate_word(word, chain)
     
     return jsonify(result)
 
 
+@game_bp.route("/validate-chain", methods=["POST"])
+def validate_chain():
+    """
+    Validate a whole chain in one call.
+    
+    Body:
+        chain: Player's chain (excluding start/end)
+        puzzle_id: Session to validate against; its chain becomes the
+            leading valid words
+        start_word: Puzzle start word (used without a puzzle_id, or if
+            the session has expired)
+        end_word: Puzzle end word (likewise)
+    
+    Returns:
+        Per-position diagnostics and distances to the end word
+    """
+    data = request.get_json()
+    
+    if not data or not isinstance(data.get("chain"), list) or \
+            not all(isinstance(word, str) for word in data["chain"]):
+        return jsonify({"error": "'chain' must be a list of words"}), 400
+    
+    required = ["start_word", "end_word"]
+    legacy = all(key in data for key in required)
+    if not (legacy or data.get("puzzle_id")):
+        return jsonify({"error": f"Missing required fields: {required} or puzzle_id"}), 400
+    
+    engine = get_engine()
+    if data.get("puzzle_id"):
+        try:
+            return jsonify(engine.replay_chain(data["puzzle_id"], data["chain"]))
+        except SessionNotFound:
+            if not legacy:
+                raise
+    report = engine.validate_chain(data["start_word"], data["end_word"], data["chain"])
+    
+    return jsonify(report)
+
+
+@game_bp.route("/undo", methods=["POST"])
+def undo_move():
+    """
+    Remove the last word from a session's chain.
+    
+    Body:
+        puzzle_id: Session id from /new
+    
+    Returns:
+        Removed word and the remaining chain
+    """
+    data = request.get_json()
+    
+    if not data or "puzzle_id" not in data:
+        return jsonify({"error": "Missing 'puzzle_id' in request"}), 400
+    
+    engine = get_engine()
+    return jsonify(engine.undo_move(data["puzzle_id"]))
+
+
 @game_bp.route("/submit", methods=["POST"])
 def submit_solution():
     """
     Submit a completed solution.
     
     Body:
+        puzzle_id: Session to submit (closes it)
         start_word: Puzzle start word
         end_word: Puzzle end word
-        path: Player's word chain (excluding start/end)
+        path: Player's word chain (excluding start/end); optional with a
+            puzzle_id, which defaults to the session's chain
     
     Returns:
         Game result with score
@@ -91,10 +194,17 @@ def submit_solution():
     data = request.get_json()
     
     required = ["start_word", "end_word", "path"]
-    if not data or not all(key in data for key in required):
-        return jsonify({"error": f"Missing required fields: {required}"}), 400
+    legacy = bool(data) and all(key in data for key in required)
+    if not data or not (legacy or data.get("puzzle_id")):
+        return jsonify({"error": f"Missing required fields: {required} or puzzle_id"}), 400
     
     engine = get_engine()
+    if data.get("puzzle_id"):
+        try:
+            return jsonify(engine.submit_session(data["puzzle_id"], data.get("path")).to_dict())
+        except SessionNotFound:
+            if not legacy:
+                raise
     result = engine.submit_solution(
         start_word=data["start_word"],
         end_word=data["end_word"],
@@ -110,6 +220,7 @@ def get_hint():
     Get a hint for current puzzle state.
     
     Body:
+        puzzle_id: Session to hint for (no search needed)
         start_word: Puzzle start word
         end_word: Puzzle end word
         chain: Current chain (excluding start/end)
@@ -121,10 +232,17 @@ def get_hint():
     data = request.get_json()
     
     required = ["start_word", "end_word"]
-    if not data or not all(key in data for key in required):
-        return jsonify({"error": f"Missing required fields: {required}"}), 400
+    legacy = bool(data) and all(key in data for key in required)
+    if not data or not (legacy or data.get("puzzle_id")):
+        return jsonify({"error": f"Missing required fields: {required} or puzzle_id"}), 400
     
     engine = get_engine()
+    if data.get("puzzle_id"):
+        try:
+            return jsonify(engine.session_hint(data["puzzle_id"], data.get("hint_level", 1)))
+        except SessionNotFound:
+            if not legacy:
+                raise
     hint = engine.get_hint(
         start_word=data["start_word"],
         end_word=data["end_word"],
@@ -4,23 +4,41 @@ Statistics API routes for Six Degrees.
 Provides game statistics and history.
 """
 
-from flask import Blueprint, jsonify, current_app
+from flask import Blueprint, Response, jsonify, current_app, request
+from app import open_app_storage
+from app.services.export import GameExport
 from app.services.game_engine import GameEngine
 
 stats_bp = Blueprint("stats", __name__)
 
 # Share engine instance
 _engine = None
-_engine_db_path = None
+_engine_settings = None
 
 
 def get_engine() -> GameEngine:
     """Get or create game engine instance."""
-    global _engine, _engine_db_path
+    global _engine, _engine_settings
     db_path = current_app.config.get("DATABASE", "data/sixdegrees.db")
-    if _engine is None or _engine_db_path != db_path:
-        _engine = GameEngine(db_path=db_path)
-        _engine_db_path = db_path
+    graph_db_path = current_app.config.get("GRAPH_DATABASE")
+    in_memory = current_app.config.get("IN_MEMORY_DATABASE", False)
+    if _engine is None or _engine_settings != (db_path, graph_db_path, in_memory):
+        if _engine is not None:
+            _engine.close()
+        _engine = GameEngine(
+            db_path=db_path,
+            graph_db_path=graph_db_path,
+            storage=open_app_storage(current_app) if in_memory else None,
+            pack_paths=current_app.config.get("PACK_PATHS", False),
+            search_processes=current_app.config.get("SEARCH_PROCESSES", 0)
+        )
+        _engine_settings = (db_path, graph_db_path, in_memory)
+        # Recompute graph analytics off the request path
+        interval = current_app.config.get("ANALYTICS_INTERVAL", 0)
+        if interval and not current_app.config.get("TESTING"):
+            _engine.analytics.start(interval)
+    # Pick up graph edits made by other workers (throttled)
+    _engine.graph.refresh()
     return _engine
 
 
@@ -43,12 +61,177 @@ def get_graph_info():
     Get word graph information.
     
     Returns:
-        Graph statistics
+        Graph statistics with components, degree distribution, hubs,
+        sampled eccentricity (stale while being recomputed) and search
+        coalescing metrics
     """
     engine = get_engine()
     
     return jsonify({
         "total_words": engine.graph.word_count(),
-        "total_connections": engine.graph.connection_count()
+        "total_connections": engine.graph.connection_count(),
+        "analytics": engine.analytics.summary(),
+        "searches": engine.pathfinder.flights.stats()
     })
 
+
+
+@stats_bp.route("/games", methods=["GET"])
+def get_game_history():
+    """
+    Page through game history, newest first.
+    
+    Query params:
+        limit: Games per page (1-100, default: 20)
+        cursor: next_cursor from the previous page
+        word: Only games starting or ending with this word
+        min_score, max_score: Inclusive score bounds
+        since, until: completed_at range (ISO date or datetime)
+        include_archived: true to continue into archived months
+    
+    Returns:
+        Page of games and next_cursor
+    """
+    try:
+        limit = int(request.args.get("limit", 20))
+        # Not get(type=int), which turns a malformed bound into no bound
+        min_score = int(request.args["min_score"]) if "min_score" in request.args else None
+        max_score = int(request.args["max_score"]) if "max_score" in request.args else None
+    except ValueError:
+        return jsonify({"error": "limit and score bounds must be integers"}), 400
+    
+    if not 1 <= limit <= 100:
+        return jsonify({"error": "limit must be between 1 and 100"}), 400
+    
+    engine = get_engine()
+    try:
+        page = engine.get_game_history(
+            limit=limit,
+            cursor=request.args.get("cursor"),
+            word=request.args.get("word"),
+            min_score=min_score,
+            max_score=max_score,
+            since=request.args.get("since"),
+            until=request.args.get("until"),
+            include_archived=request.args.get("include_archived", "").lower() in ("1", "true")
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    
+    return jsonify(page)
+
+
+@stats_bp.route("/leaderboard", methods=["GET"])
+def get_leaderboard():
+    """
+    Get the best games overall.
+    
+    Query params:
+        limit: Number of games (1-100, default: 10)
+    
+    Returns:
+        Ranked list of games
+    """
+    try:
+        limit = int(request.args.get("limit", 10))
+    except ValueError:
+        return jsonify({"error": "limit must be an integer"}), 400
+    
+    if not 1 <= limit <= 100:
+        return jsonify({"error": "limit must be between 1 and 100"}), 400
+    
+    engine = get_engine()
+    return jsonify({"leaderboard": engine.leaderboard.top(limit)})
+
+
+@stats_bp.route("/puzzle", methods=["GET"])
+def get_puzzle_stats():
+    """
+    Get the score histogram for one puzzle.
+    
+    Query params:
+        start, end: Puzzle words
+        score: Optional score to rank against the histogram
+    
+    Returns:
+        Histogram, game count and optional percentile
+    """
+    start = request.args.get("start")
+    end = request.args.get("end")
+    if not start or not end:
+        return jsonify({"error": "Missing start or end"}), 400
+    
+    try:
+        score = int(request.args["score"]) if "score" in request.args else None
+    except ValueError:
+        return jsonify({"error": "score must be an integer"}), 400
+    
+    engine = get_engine()
+    stats = engine.leaderboard.puzzle_stats(start, end, score=score)
+    return jsonify(stats)
+
+
+@stats_bp.route("/timeseries", methods=["GET"])
+def get_timeseries():
+    """
+    Get game stats per hour or day, read from the rollup tables.
+    
+    Query params:
+        granularity: hour or day (default: day)
+        since, until: Bucket range (ISO date or datetime)
+        limit: Most recent buckets to return (1-1000, default: 30)
+    
+    Returns:
+        Buckets oldest first
+    """
+    granularity = request.args.get("granularity", "day")
+    try:
+        limit = int(request.args.get("limit", 30))
+    except ValueError:
+        return jsonify({"error": "limit must be an integer"}), 400
+    
+    if not 1 <= limit <= 1000:
+        return jsonify({"error": "limit must be between 1 and 1000"}), 400
+    
+    engine = get_engine()
+    try:
+        points = engine.rollups.timeseries(
+            granularity,
+            since=request.args.get("since"),
+            until=request.args.get("until"),
+            limit=limit
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    
+    return jsonify({"granularity": granularity, "points": points})
+
+
+@stats_bp.route("/export", methods=["GET"])
+def export_games():
+    """
+    Stream the whole game history, oldest first, as a chunked download.
+    
+    Query params:
+        format: csv, jsonl or parquet (default: jsonl; parquet needs pyarrow)
+        after_id: Only games with a larger id, to resume an export
+    
+    Returns:
+        Chunked response in the requested format
+    """
+    try:
+        after_id = int(request.args.get("after_id", 0))
+    except ValueError:
+        # A bad resume token must not restart the export from the first game
+        return jsonify({"error": "after_id must be an integer"}), 400
+    
+    try:
+        export = GameExport(get_engine(), request.args.get("format", "jsonl"), after_id=after_id)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    
+    return Response(
+        export.chunks(),
+        mimetype=export.content_type,
+        headers={"Content-Disposition": f'attachment; filename="games.{export.format}"'}
+    )
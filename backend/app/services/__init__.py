@@ -1,7 +1,18 @@
 """Business logic services for Six Degrees game."""
 
+from app.services.archive import GameArchive
+from app.services.budget import SearchBudget, SearchBudgetExceeded
+from app.services.checkpoints import DatabaseCheckpoints
+from app.services.difficulty import DifficultyModel
+from app.services.export import GameExport
 from app.services.game_engine import GameEngine
+from app.services.graph_analytics import GraphAnalytics
+from app.services.leaderboard import Leaderboard
 from app.services.pathfinder import Pathfinder
+from app.services.rollups import StatsRollups
+from app.services.search_pool import SearchPool, SearchTimeout
+from app.services.sessions import GameSession, SessionNotFound, SessionStore
+from app.services.single_flight import SingleFlight
 
-__all__ = ["GameEngine", "Pathfinder"]
+__all__ = ["DatabaseCheckpoints", "DifficultyModel", "GameArchive", "GameEngine", "GameExport", "GameSession", "GraphAnalytics", "Leaderboard", "Pathfinder", "SearchBudget", "SearchBudgetExceeded", "SearchPool", "SearchTimeout", "SessionNotFound", "SessionStore", "SingleFlight", "StatsRollups"]
 
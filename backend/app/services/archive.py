@@ -0,0 +1,179 @@
+"""
+Retention and archival of game history for Six Degrees.
+
+Games older than the retention window are moved out of the hot games
+table into one SQLite file per month (games-YYYY-MM.db). Only games
+already folded into the stats rollups are moved, so rollups, score
+histograms and the leaderboard stay complete. Run periodically with
+python -m app.archive_games.
+"""
+
+import logging
+import re
+import sqlite3
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List, Optional, Tuple
+from app.models.database import Database
+from app.services.rollups import StatsRollups
+
+
+class GameArchive:
+    """
+    Monthly archive partitions for the games table.
+    """
+
+    # Games younger than this stay in the hot table
+    RETENTION_DAYS = 90
+
+    FILE_PATTERN = re.compile(r"^games-(\d{4}-\d{2})\.db$")
+
+    def __init__(
+        self,
+        database: Database,
+        rollups: StatsRollups,
+        archive_dir: Optional[str] = None,
+        retention_days: int = RETENTION_DAYS
+    ):
+        """
+        Initialize archive.
+
+        Args:
+            database: Database holding the hot games table
+            rollups: Rollups that must cover games before they move
+            archive_dir: Directory for monthly files
+                (default: "archive" next to the database)
+            retention_days: Age in days after which games are archived
+        """
+        self.db = database
+        self.rollups = rollups
+        self.archive_dir = (
+            Path(archive_dir) if archive_dir else database.db_path.parent / "archive"
+        )
+        self.retention_days = retention_days
+
+    def path_for(self, month: str) -> Path:
+        """Get the archive file for a month ("YYYY-MM")."""
+        return self.archive_dir / f"games-{month}.db"
+
+    def months(self) -> List[Tuple[str, Path]]:
+        """
+        List archived months.
+
+        Returns:
+            (month, path) tuples, newest month first
+        """
+        if not self.archive_dir.is_dir():
+            return []
+        found = []
+        for path in self.archive_dir.iterdir():
+            match = self.FILE_PATTERN.match(path.name)
+            if match:
+                found.append((match.group(1), path))
+        return sorted(found, reverse=True)
+
+    def archive(self, before: Optional[str] = None) -> int:
+        """
+        Move old games into their monthly archive files.
+
+        Idempotent: rows are copied with INSERT OR IGNORE before being
+        deleted, so an interrupted run is completed by the next one.
+
+        Args:
+            before: Archive games completed before this date
+                (default: now minus retention_days)
+
+        Returns:
+            Number of games moved
+        """
+        if before is None:
+            before = (datetime.utcnow() - timedelta(days=self.retention_days)).strftime("%Y-%m-%d")
+
+        # Rollups must cover every game that leaves the hot table
+        self.rollups.compact()
+        watermark = self.rollups.watermark()
+
+        months = self.db.execute(
+            """
+            SELECT DISTINCT strftime('%Y-%m', completed_at) AS month
+            FROM games WHERE completed_at < ? AND id <= ?
+            """,
+            (before, watermark)
+        )
+
+        moved = 0
+        for row in months:
+            month = row["month"]
+            lower = f"{month}-01"
+            upper = min(self.next_month(month), before)
+            moved += self._move(self.path_for(month), lower, upper, watermark)
+            logging.info(f"[ARCHIVE] Moved games for {month} to {self.path_for(month).name}")
+        return moved
+
+    def _move(self, path: Path, lower: str, upper: str, watermark: int) -> int:
+        """Copy one month's games into its archive file, then delete them."""
+        self._ensure_schema(path)
+
+        conn = sqlite3.connect(self.db.db_path)
+        try:
+            conn.execute("ATTACH DATABASE ? AS archive", (str(path),))
+            columns = ", ".join(
+                row[1] for row in conn.execute("PRAGMA archive.table_info(games)")
+            )
+            window = "completed_at >= ? AND completed_at < ? AND id <= ?"
+            params = (lower, upper, watermark)
+
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                f"""
+                INSERT OR IGNORE INTO archive.games ({columns})
+                SELECT {columns} FROM main.games WHERE {window}
+                """,
+                params
+            )
+            moved = conn.execute(f"DELETE FROM main.games WHERE {window}", params).rowcount
+            conn.commit()
+
+            conn.execute("DETACH DATABASE archive")
+            return moved
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def _ensure_schema(self, path: Path) -> None:
+        """Create the games table and its indexes, or add columns it lacks."""
+        archive_db = Database(str(path))
+        archived = archive_db.execute("PRAGMA table_info(games)")
+        if archived:
+            # Files from before a column was added (e.g. packed paths) gain
+            # it, so moved rows keep every field
+            names = {column["name"] for column in archived}
+            with archive_db.get_connection() as conn:
+                for column in self.db.execute("PRAGMA table_info(games)"):
+                    if column["name"] not in names:
+                        conn.execute(
+                            f"ALTER TABLE games ADD COLUMN {column['name']} {column['type']}"
+                        )
+            return
+
+        # Same DDL as the hot table, so history queries run unchanged
+        statements = self.db.execute(
+            """
+            SELECT sql FROM sqlite_master
+            WHERE tbl_name = 'games' AND sql IS NOT NULL
+            ORDER BY type DESC
+            """
+        )
+        with archive_db.get_connection() as conn:
+            for statement in statements:
+                conn.execute(statement["sql"])
+
+    @staticmethod
+    def next_month(month: str) -> str:
+        """Get the first day of the month after "YYYY-MM"."""
+        year, mon = map(int, month.split("-"))
+        year, mon = (year + 1, 1) if mon == 12 else (year, mon + 1)
+        return f"{year:04d}-{mon:02d}-01"
+
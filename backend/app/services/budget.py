@@ -0,0 +1,75 @@
+"""
+Search budgets for Six Degrees.
+
+A SearchBudget caps one call's work by node expansions and wall-clock
+time, so a pathological query fails fast with SearchBudgetExceeded
+instead of holding a worker. The exception is a SearchTimeout, so every
+handler that already degrades on timeouts covers it too.
+"""
+
+import time
+from typing import Optional
+
+from app.services.search_pool import SearchTimeout
+
+
+class SearchBudgetExceeded(SearchTimeout):
+    """Raised when a search runs out of node expansions or time."""
+
+
+class SearchBudget:
+    """
+    Node-expansion and deadline budget for one call.
+    """
+
+    # Expansions between clock reads
+    CHECK_EVERY = 256
+
+    def __init__(
+        self,
+        max_expansions: Optional[int] = None,
+        timeout: Optional[float] = None
+    ):
+        """
+        Initialize budget.
+
+        Args:
+            max_expansions: Nodes the call may expand (None for no cap)
+            timeout: Seconds the call may run (None for no deadline)
+        """
+        self.max_expansions = max_expansions
+        self.deadline = time.monotonic() + timeout if timeout is not None else None
+        self.expansions = 0
+        self._next_check = self.CHECK_EVERY
+
+    def spend(self, count: int = 1) -> None:
+        """
+        Record node expansions, checking the clock periodically.
+
+        Raises:
+            SearchBudgetExceeded: If the cap or the deadline is passed
+        """
+        self.expansions += count
+        if self.max_expansions is not None and self.expansions > self.max_expansions:
+            raise SearchBudgetExceeded(
+                f"Search exceeded its budget of {self.max_expansions} expansions"
+            )
+        if self.expansions >= self._next_check:
+            self._next_check = self.expansions + self.CHECK_EVERY
+            self.check_deadline()
+
+    def check_deadline(self) -> None:
+        """
+        Check the clock now.
+
+        Raises:
+            SearchBudgetExceeded: If the deadline has passed
+        """
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            raise SearchBudgetExceeded("Search exceeded its deadline")
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left before the deadline (None without one)."""
+        if self.deadline is None:
+            return None
+        return max(self.deadline - time.monotonic(), 0.0)
@@ -0,0 +1,67 @@
+"""
+Periodic checkpoints of an in-memory database for Six Degrees.
+
+An in-memory Database keeps disk I/O off request paths, but its games
+are lost with the process. A checkpoint job copies it back to its file
+every interval (and once more on stop), so a restarted instance resumes
+from the last copy instead of the original snapshot.
+"""
+
+import logging
+import threading
+from typing import Optional
+from app.models.database import Database
+
+
+class DatabaseCheckpoints:
+    """
+    Background job writing an in-memory Database to its file.
+    """
+
+    def __init__(self, database: Database):
+        """
+        Initialize checkpoint job.
+
+        Args:
+            database: In-memory Database to copy to disk
+        """
+        self.db = database
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def checkpoint(self) -> None:
+        """Copy the database to disk now."""
+        self.db.checkpoint()
+
+    def start(self, interval: float = 60.0) -> None:
+        """
+        Run checkpoints on a background thread every interval seconds.
+
+        Args:
+            interval: Seconds between checkpoints
+        """
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, args=(interval,), name="db-checkpoints", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background thread after a final checkpoint."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self, interval: float) -> None:
+        """Background loop: wait for the next interval, then checkpoint."""
+        while True:
+            stopping = self._stop.wait(interval)
+            try:
+                self.checkpoint()
+            except Exception:
+                logging.exception("Database checkpoint failed")
+            if stopping:
+                return
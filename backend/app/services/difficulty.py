@@ -0,0 +1,290 @@
+"""
+Puzzle difficulty model for Six Degrees.
+
+Path length alone over-rates puzzles that have many shortest paths or
+whose shortest paths all run through hub words. Each (start, end) pair
+is scored 0-100 from four terms:
+
+- length: longer optimal paths are harder
+- path count: every doubling of the shortest-path count makes it easier
+- hub avoidance: share of shortest paths that avoid hub words
+- solve rate: share of past games on the pair that failed, smoothed
+  towards 50% while there are few games
+
+The graph terms are computed per start word in one BFS (vectorized
+across many starts by iter_features()) and cached; solve rates come from
+the incrementally maintained score histograms.
+"""
+
+import math
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Iterator, Optional, Set, Tuple
+
+from app.models.storage import Storage
+from app.models.word_graph import WordGraph
+from app.services.budget import SearchBudget
+from app.services.vectorized import CSRGraph
+
+
+@dataclass(frozen=True, slots=True)
+class PairFeatures:
+    """Graph features of one (start, end) pair."""
+    length: int
+    path_count: float
+    hub_free_paths: float
+
+
+class DifficultyModel:
+    """
+    Scores puzzle pairs and caches their graph features per start word.
+    """
+
+    # Term weights (sum to 1)
+    WEIGHT_LENGTH = 0.4
+    WEIGHT_PATHS = 0.25
+    WEIGHT_HUBS = 0.15
+    WEIGHT_SOLVE_RATE = 0.2
+
+    # Pseudo-games at a 50% solve rate added to every pair's history
+    SOLVE_RATE_PRIOR = 5
+
+    # Words at or above this degree percentile are hubs...
+    HUB_PERCENTILE = 0.99
+    # ...provided they have more than this many neighbours
+    HUB_MIN_DEGREE = 2
+
+    # Start words whose features are kept
+    CACHE_SIZE = 2048
+
+    def __init__(
+        self,
+        graph: WordGraph,
+        database: Storage,
+        min_length: int = 2,
+        max_length: int = 5,
+        csr: Optional[Callable[[], Optional[CSRGraph]]] = None,
+        cache_size: int = CACHE_SIZE
+    ):
+        """
+        Initialize difficulty model.
+
+        Args:
+            graph: Word graph
+            database: Storage holding the score histograms
+            min_length: Shortest puzzle length scored
+            max_length: Longest puzzle length scored
+            csr: Provider of the CSR export for iter_features() (None, or
+                returning None, uses pure-Python BFS)
+            cache_size: Start words whose features are kept
+        """
+        self.graph = graph
+        self.db = database
+        self.min_length = min_length
+        self.max_length = max_length
+        self.csr = csr
+        self.cache_size = cache_size
+        self._features: "OrderedDict[str, Dict[str, PairFeatures]]" = OrderedDict()
+        self._hubs: Optional[Set[str]] = None
+
+        graph.subscribe(self._on_graph_change)
+
+    def _on_graph_change(self, changes) -> None:
+        """Drop graph-derived caches."""
+        self._features.clear()
+        self._hubs = None
+
+    def hubs(self) -> Set[str]:
+        """
+        Get the hub words (cached until the graph changes).
+
+        Returns:
+            Words in the top degree percentile
+        """
+        if self._hubs is None:
+            degrees = {
+                word: len(self.graph.get_neighbors(word)) for word in self.graph.get_all_words()
+            }
+            ordered = sorted(degrees.values())
+            threshold = ordered[int(self.HUB_PERCENTILE * (len(ordered) - 1))] if ordered else 0
+            threshold = max(threshold, self.HUB_MIN_DEGREE + 1)
+            self._hubs = {word for word, degree in degrees.items() if degree >= threshold}
+        return self._hubs
+
+    # Graph features
+
+    def features_from(
+        self,
+        start: str,
+        budget: Optional[SearchBudget] = None
+    ) -> Dict[str, PairFeatures]:
+        """
+        Get features for every end word in the length window.
+
+        Args:
+            start: Start word
+            budget: Limits for the BFS on a cache miss (None for unlimited)
+
+        Returns:
+            end word -> PairFeatures (empty if start is unknown)
+
+        Raises:
+            SearchBudgetExceeded: If the BFS runs out of budget
+        """
+        start = start.upper()
+        cached = self._features.get(start)
+        if cached is not None:
+            self._features.move_to_end(start)
+            return cached
+
+        features = self._bfs_features(start, budget) if self.graph.has_word(start) else {}
+        self._remember(start, features)
+        return features
+
+    def _remember(self, start: str, features: Dict[str, PairFeatures]) -> None:
+        """Cache one start word's features, evicting the least recent."""
+        self._features[start] = features
+        self._features.move_to_end(start)
+        while len(self._features) > self.cache_size:
+            self._features.popitem(last=False)
+
+    def _bfs_features(
+        self,
+        start: str,
+        budget: Optional[SearchBudget] = None
+    ) -> Dict[str, PairFeatures]:
+        """Count shortest paths, in total and avoiding hubs, in one BFS."""
+        hubs = self.hubs()
+        distance = {start: 0}
+        paths = {start: 1.0}
+        free = {start: 1.0}
+        frontier = [start]
+        for depth in range(1, self.max_length + 1):
+            next_frontier = []
+            for word in frontier:
+                if budget is not None:
+                    budget.spend()
+                passes_free = free[word] if word == start or word not in hubs else 0.0
+                for neighbor in self.graph.get_neighbors(word):
+                    if neighbor not in distance:
+                        distance[neighbor] = depth
+                        paths[neighbor] = free[neighbor] = 0.0
+                        next_frontier.append(neighbor)
+                    if distance[neighbor] == depth:
+                        paths[neighbor] += paths[word]
+                        free[neighbor] += passes_free
+            if not next_frontier:
+                break
+            frontier = next_frontier
+
+        return {
+            word: PairFeatures(length, paths[word], free[word])
+            for word, length in distance.items()
+            if length >= self.min_length
+        }
+
+    def iter_features(
+        self,
+        sources: Iterable[str]
+    ) -> Iterator[Tuple[str, Dict[str, PairFeatures]]]:
+        """
+        Compute features for many start words in one batch job.
+
+        Uses the vectorized backend when available, one BFS per start
+        otherwise. Results are also cached.
+
+        Args:
+            sources: Start words (unknown words are skipped)
+
+        Yields:
+            Tuples of (start word, end word -> PairFeatures)
+        """
+        sources = [word.upper() for word in sources if self.graph.has_word(word)]
+        csr = self.csr() if self.csr is not None else None
+        if csr is None:
+            for start in sources:
+                features = self._bfs_features(start)
+                self._remember(start, features)
+                yield start, features
+            return
+
+        hubs = self.hubs()
+        for i in range(0, len(sources), csr.BATCH_SIZE):
+            batch = sources[i:i + csr.BATCH_SIZE]
+            distances, counts, free = csr.path_counts(batch, self.max_length, hubs)
+            for row, start in enumerate(batch):
+                columns = (distances[row] >= self.min_length).nonzero()[0]
+                features = {
+                    csr.words[col]: PairFeatures(
+                        int(distances[row, col]), float(counts[row, col]), float(free[row, col])
+                    )
+                    for col in columns.tolist()
+                }
+                self._remember(start, features)
+                yield start, features
+
+    # Scoring
+
+    def score(self, features: PairFeatures, games: int = 0, solved: int = 0) -> float:
+        """
+        Combine features and game history into a 0-100 score.
+
+        Args:
+            features: Graph features of the pair
+            games: Games played on the pair
+            solved: Games completed (see Storage.puzzle_results)
+
+        Returns:
+            Difficulty score, higher is harder
+        """
+        span = max(self.max_length - self.min_length, 1)
+        length_term = (features.length - self.min_length) / span
+        paths_term = 1 / (1 + math.log2(max(features.path_count, 1.0)))
+        hubs_term = features.hub_free_paths / features.path_count if features.path_count else 0.0
+        prior = self.SOLVE_RATE_PRIOR
+        failure_term = 1 - (solved + prior / 2) / (games + prior)
+
+        return round(100 * (
+            self.WEIGHT_LENGTH * length_term
+            + self.WEIGHT_PATHS * paths_term
+            + self.WEIGHT_HUBS * hubs_term
+            + self.WEIGHT_SOLVE_RATE * failure_term
+        ), 1)
+
+    def scores_from(
+        self,
+        start: str,
+        budget: Optional[SearchBudget] = None
+    ) -> Dict[str, Tuple[float, int]]:
+        """
+        Score every end word in the length window.
+
+        Args:
+            start: Start word
+            budget: Limits for the BFS on a cache miss (None for unlimited)
+
+        Returns:
+            end word -> (score, optimal length)
+
+        Raises:
+            SearchBudgetExceeded: If the BFS runs out of budget
+        """
+        start = start.upper()
+        results = self.db.puzzle_results(start)
+        return {
+            end: (self.score(features, *results.get(end, (0, 0))), features.length)
+            for end, features in self.features_from(start, budget).items()
+        }
+
+    def pair_score(self, start: str, end: str) -> Optional[float]:
+        """
+        Score one pair.
+
+        Returns:
+            Difficulty score, or None if end is outside the length window
+        """
+        features = self.features_from(start).get(end.upper())
+        if features is None:
+            return None
+        games, solved = self.db.puzzle_results(start.upper()).get(end.upper(), (0, 0))
+        return self.score(features, games, solved)
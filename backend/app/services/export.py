@@ -0,0 +1,218 @@
+"""
+Streaming game history export for Six Degrees.
+
+Walks game history oldest first through Storage.iter_games (the monthly
+archive files, then the hot games table), decodes each path (text or
+packed) and serializes one batch at a time, so an export of any size
+runs in constant memory. Formats:
+
+- csv: one row per game, paths comma-joined (quoted by the writer)
+- jsonl: one JSON object per line, paths as arrays
+- parquet: one row group per batch, paths as lists (needs pyarrow)
+"""
+
+import csv
+import io
+from typing import Any, BinaryIO, Dict, Iterator, List
+
+from app.json_provider import dumps_bytes
+from app.models.database import Database
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # pragma: no cover - optional dependency
+    pyarrow = None
+
+HAS_PYARROW = pyarrow is not None
+
+# Columns of every exported game, in output order
+FIELDS = (
+    "id", "start_word", "end_word", "player_path", "optimal_path",
+    "player_length", "optimal_length", "score", "completed_at",
+)
+
+# Content type per format
+FORMATS = {
+    "csv": "text/csv",
+    "jsonl": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that collects pyarrow's output until drained."""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        """Take everything written since the last drain."""
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class GameExport:
+    """
+    One export of game history in a given format.
+    """
+
+    def __init__(
+        self,
+        engine: Any,
+        fmt: str = "jsonl",
+        after_id: int = 0,
+        batch_size: int = 5000,
+        include_archived: bool = True
+    ):
+        """
+        Initialize export.
+
+        Args:
+            engine: GameEngine whose history store and path codec to use
+            fmt: One of FORMATS
+            after_id: Only games with a larger id (to resume an export)
+            batch_size: Games read and serialized per chunk
+            include_archived: Start with the engine's archived months
+                (False exports the hot table only)
+
+        Raises:
+            ValueError: If the format is unknown or needs pyarrow
+        """
+        if fmt not in FORMATS:
+            raise ValueError(f"format must be one of {', '.join(FORMATS)}")
+        if fmt == "parquet" and not HAS_PYARROW:
+            raise ValueError("parquet export requires pyarrow")
+        if batch_size < 1:
+            raise ValueError("batch_size must be positive")
+        self.engine = engine
+        self.format = fmt
+        self.after_id = after_id
+        self.batch_size = batch_size
+        self.include_archived = include_archived
+        self.exported = 0
+
+    @property
+    def content_type(self) -> str:
+        """Content type of the serialized output."""
+        return FORMATS[self.format]
+
+    def batches(self) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Yield decoded games in batches of up to batch_size.
+
+        Each game has FIELDS as keys, with paths as word lists.
+        """
+        decode = self.engine.decode_path
+        batch: List[Dict[str, Any]] = []
+        for game in self._games():
+            batch.append({
+                "id": game["id"],
+                "start_word": game["start_word"],
+                "end_word": game["end_word"],
+                "player_path": decode(game),
+                "optimal_path": decode(game, "optimal"),
+                "player_length": game["player_length"],
+                "optimal_length": game["optimal_length"],
+                "score": game["score"],
+                "completed_at": game["completed_at"],
+            })
+            if len(batch) == self.batch_size:
+                self.exported += len(batch)
+                yield batch
+                batch = []
+        if batch:
+            self.exported += len(batch)
+            yield batch
+
+    def _games(self) -> Iterator[Dict[str, Any]]:
+        """
+        Stream games in id order: archived months oldest first, then the hot table.
+
+        Ids grow with completion time, so each source resumes after the
+        last id already yielded. That also skips rows an interrupted
+        archive run left in both places.
+        """
+        after_id = self.after_id
+        archive = self.engine.archive if self.include_archived else None
+        for _, path in reversed(archive.months() if archive is not None else []):
+            for game in Database(str(path)).iter_games(after_id, self.batch_size):
+                after_id = game["id"]
+                yield game
+        yield from self.engine.db.iter_games(after_id, self.batch_size)
+
+    def chunks(self) -> Iterator[bytes]:
+        """
+        Serialize the export, one chunk per batch.
+
+        Suitable as a chunked HTTP response body. An empty history still
+        yields the CSV header or the Parquet schema.
+        """
+        return getattr(self, f"_{self.format}_chunks")()
+
+    def write(self, out: BinaryIO) -> int:
+        """
+        Write the whole export to a binary file.
+
+        Returns:
+            Number of games written
+        """
+        for chunk in self.chunks():
+            out.write(chunk)
+        return self.exported
+
+    def _csv_chunks(self) -> Iterator[bytes]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        writer.writerow(FIELDS)
+        yield buffer.getvalue().encode("utf-8")
+        for batch in self.batches():
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerows(
+                (
+                    g["id"], g["start_word"], g["end_word"],
+                    ",".join(g["player_path"]), ",".join(g["optimal_path"]),
+                    g["player_length"], g["optimal_length"], g["score"], g["completed_at"],
+                )
+                for g in batch
+            )
+            yield buffer.getvalue().encode("utf-8")
+
+    def _jsonl_chunks(self) -> Iterator[bytes]:
+        for batch in self.batches():
+            yield b"".join(dumps_bytes(game) + b"\n" for game in batch)
+
+    def _parquet_chunks(self) -> Iterator[bytes]:
+        words = pyarrow.list_(pyarrow.string())
+        schema = pyarrow.schema([
+            ("id", pyarrow.int64()),
+            ("start_word", pyarrow.string()),
+            ("end_word", pyarrow.string()),
+            ("player_path", words),
+            ("optimal_path", words),
+            ("player_length", pyarrow.int32()),
+            ("optimal_length", pyarrow.int32()),
+            ("score", pyarrow.int32()),
+            ("completed_at", pyarrow.string()),
+        ])
+        sink = _ChunkSink()
+        with pyarrow.parquet.ParquetWriter(sink, schema) as writer:
+            for batch in self.batches():
+                writer.write_table(pyarrow.Table.from_pylist(batch, schema=schema))
+                yield sink.drain()
+        yield sink.drain()
@@ -4,15 +4,29 @@ Game Engine for Six Degrees.
 Handles game logic, scoring, and puzzle generation.
 """
 
+import base64
+import logging
 import random
-from typing import Dict, List, Optional, Tuple, Any
-from dataclasses import dataclass, asdict
+from functools import partial
+from typing import Collection, Dict, List, Optional, Tuple, Any
+from dataclasses import dataclass, field
 from app.models.database import Database
+from app.models.storage import GamePath, Storage, is_database_url, open_storage
 from app.models.word_graph import WordGraph
+from app.services.archive import GameArchive
+from app.services.budget import SearchBudget, SearchBudgetExceeded
+from app.services.difficulty import DifficultyModel
+from app.services.graph_analytics import GraphAnalytics
+from app.services.leaderboard import Leaderboard
+from app.services.rollups import StatsRollups
+from app.services.path_codec import PathCodec
 from app.services.pathfinder import Pathfinder
+from app.services.search_pool import SearchPool, SearchTimeout
+from app.services.sessions import GameSession, SessionStore
+from app.services.vectorized import HAS_NUMPY, CSRGraph
 
 
-@dataclass
+@dataclass(slots=True)
 class GameResult:
     """Result of a completed game."""
     start_word: str
@@ -23,23 +37,44 @@ class GameResult:
     optimal_length: int
     score: int
     is_perfect: bool
+    percentile: Optional[float] = None  # Share of players beaten on this puzzle
     
     def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary."""
-        return asdict(self)
+        """Convert to dictionary (shares the path lists, no deep copy)."""
+        return {
+            "start_word": self.start_word,
+            "end_word": self.end_word,
+            "player_path": self.player_path,
+            "optimal_path": self.optimal_path,
+            "player_length": self.player_length,
+            "optimal_length": self.optimal_length,
+            "score": self.score,
+            "is_perfect": self.is_perfect,
+            "percentile": self.percentile,
+        }
 
 
-@dataclass  
+@dataclass(slots=True)
 class Puzzle:
     """A game puzzle with start and end words."""
     start_word: str
     end_word: str
     optimal_length: int
     difficulty: str
+    difficulty_score: Optional[float] = None  # DifficultyModel score, 0-100
+    # Server-side session id; not part of the puzzle's identity
+    puzzle_id: Optional[str] = field(default=None, compare=False)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
-        return asdict(self)
+        return {
+            "start_word": self.start_word,
+            "end_word": self.end_word,
+            "optimal_length": self.optimal_length,
+            "difficulty": self.difficulty,
+            "difficulty_score": self.difficulty_score,
+            "puzzle_id": self.puzzle_id,
+        }
 
 
 class GameEngine:
@@ -56,7 +91,7 @@ class GameEngine:
     SCORE_PLUS_TWO = 80    # +2 steps  
     SCORE_PLUS_THREE = 70  # +3 steps
     SCORE_PLUS_FOUR = 60   # +4 steps
-    SCORE_COMPLETED = 50   # Completed but longer
+    SCORE_COMPLETED = Storage.SOLVED_SCORE  # 50 - completed but longer
     SCORE_FAILED = 0       # Invalid path
     
     # Difficulty settings (optimal path length)
@@ -64,70 +99,347 @@ class GameEngine:
     DIFFICULTY_MEDIUM = (3, 4)
     DIFFICULTY_HARD = (4, 5)
     
-    def __init__(self, db_path: str = "data/sixdegrees.db"):
+    # Difficulty bands on the DifficultyModel score, [low, high)
+    DIFFICULTY_SCORES = {
+        "easy": (0.0, 45.0),
+        "medium": (45.0, 65.0),
+        "hard": (65.0, 101.0),
+    }
+    
+    # Default budget for one generate_puzzle call
+    PUZZLE_MAX_EXPANSIONS = 500000
+    PUZZLE_DEADLINE = 3.0  # Seconds
+    
+    def __init__(
+        self, 
+        db_path: Optional[str] = None,
+        graph: Optional[WordGraph] = None,
+        search_processes: int = 0,
+        storage: Optional[Storage] = None,
+        sessions: Optional[SessionStore] = None,
+        graph_db_path: Optional[str] = None,
+        graph_storage: Optional[Storage] = None,
+        pack_paths: bool = False
+    ):
         """
         Initialize game engine.
         
+        The word graph and the game history can live in separate stores:
+        the graph is static and read-heavy, the history takes every
+        submitted game. Without graph_db_path or graph_storage both come
+        from db_path, as in single-file deployments.
+        
+        There is no default store: every service reads or writes the
+        history, so an engine opened on the wrong file would do so
+        silently. Use MemoryStorage for a throwaway engine.
+        
         Args:
-            db_path: Path to SQLite database
+            db_path: Path to SQLite database, or a PostgreSQL URL
+                (required unless storage is given)
+            graph: Preloaded graph to use instead of loading from db_path
+            search_processes: Worker processes for expensive searches
+                (0 keeps all pathfinding inline)
+            storage: Storage backend to use instead of opening db_path
+            sessions: Session store for puzzles in play (default: an
+                in-memory store without spill)
+            graph_db_path: Word graph database, opened read-only (an
+                existing single-file database works as-is)
+            graph_storage: Graph storage backend to use instead of
+                opening graph_db_path
+            pack_paths: Save new games' paths as packed word ids
+                (see PathCodec) instead of comma-joined text
+            
+        Raises:
+            ValueError: If neither db_path nor storage is given
         """
-        self.db = Database(db_path)
-        self.graph = WordGraph(self.db)
-        self.pathfinder = Pathfinder(self.graph)
+        if graph_storage is None and graph_db_path is not None:
+            graph_storage = open_storage(graph_db_path, read_only=True)
+        split = graph_storage is not None
+        if storage is None and db_path is None:
+            raise ValueError("GameEngine needs a db_path or a storage backend")
+        if storage is None:
+            # A dedicated history file only takes writes: tune it for them
+            storage = (
+                open_storage(db_path) if is_database_url(db_path)
+                else Database(db_path, tune_writes=split)
+            )
+        if split:
+            # History-only stores start empty; create their tables
+            storage.init_schema()
+        self.db = storage
+        self.graph_db = graph_storage if split else storage
+        self.graph = graph if graph is not None else WordGraph(self.graph_db)
+        self.search_pool = (
+            SearchPool(self.graph, max_workers=search_processes, history=self.db.location())
+            if search_processes > 0 else None
+        )
+        self.pathfinder = Pathfinder(self.graph, pool=self.search_pool)
+        self.analytics = GraphAnalytics(self.graph, self.db, processes=search_processes)
+        self.leaderboard = Leaderboard(self.db)
+        self.rollups = StatsRollups(self.db)
+        self.sessions = sessions if sessions is not None else SessionStore()
+        self.pack_paths = pack_paths
+        self.paths = PathCodec(self.db)
+        # Monthly archive files are a SQLite feature
+        self.archive = (
+            GameArchive(self.db, self.rollups) if self.db.ARCHIVABLE else None
+        )
+        
+        # Derived caches, dropped whenever graph deltas are applied
+        self._csr: Optional[CSRGraph] = None
+        self._puzzle_starts: Dict[int, List[str]] = {}
+        self.graph.subscribe(self._on_graph_change)
+        
+        # Pairs are scored over the whole easy-to-hard length window
+        self.difficulty = DifficultyModel(
+            self.graph,
+            self.db,
+            min_length=self.DIFFICULTY_EASY[0],
+            max_length=self.DIFFICULTY_HARD[1],
+            csr=self.csr_graph
+        )
+    
+    def _on_graph_change(self, changes) -> None:
+        """Invalidate caches derived from the graph."""
+        self._csr = None
+        self._puzzle_starts = {}
     
-    def generate_puzzle(self, difficulty: str = "medium") -> Puzzle:
+    def generate_puzzle(
+        self,
+        difficulty: str = "medium",
+        seed: Optional[int] = None,
+        budget: Optional[SearchBudget] = None
+    ) -> Puzzle:
         """
         Generate a new puzzle with appropriate difficulty.
         
+        Large graphs are handed to the search pool when one is configured.
+        A session is then opened for the puzzle (see validate_move); if
+        the budget runs out first, the puzzle is served without one.
+        
         Args:
             difficulty: easy, medium, or hard
+            seed: Random seed for a reproducible puzzle
+            budget: Limits for the whole call (default: PUZZLE_MAX_EXPANSIONS
+                expansions within PUZZLE_DEADLINE seconds)
             
         Returns:
-            Puzzle with start and end words
+            Puzzle with start and end words and its puzzle_id
+            
+        Raises:
+            SearchBudgetExceeded: If no puzzle is found within the budget
+            SearchTimeout: If an offloaded generation does not finish in time
         """
-        # Get difficulty range
-        if difficulty == "easy":
-            min_len, max_len = self.DIFFICULTY_EASY
-        elif difficulty == "hard":
-            min_len, max_len = self.DIFFICULTY_HARD
+        if budget is None:
+            budget = self.puzzle_budget()
+        if self.search_pool is not None and self.search_pool.should_offload():
+            puzzle = self.search_pool.generate_puzzle(
+                difficulty,
+                inline=partial(self._generate_puzzle, budget=budget),
+                seed=seed,
+                timeout=budget.remaining()
+            )
         else:
-            min_len, max_len = self.DIFFICULTY_MEDIUM
+            puzzle = self._generate_puzzle(difficulty, seed, budget)
         
-        words = self.graph.get_all_words()
+        try:
+            self._open_session(puzzle, budget)
+        except SearchBudgetExceeded:
+            # Clients fall back to sending start/end/chain themselves
+            logging.warning(
+                f"[PUZZLE] No session for {puzzle.start_word} → {puzzle.end_word}: over budget"
+            )
+        return puzzle
+    
+    def puzzle_budget(self) -> SearchBudget:
+        """Create the default budget for one generate_puzzle call."""
+        return SearchBudget(self.PUZZLE_MAX_EXPANSIONS, self.PUZZLE_DEADLINE)
+    
+    def close(self) -> None:
+        """Release background resources such as the search pool."""
+        self.analytics.stop()
+        if self.search_pool is not None:
+            self.search_pool.close()
+        self.db.close()
+        if self.graph_db is not self.db:
+            self.graph_db.close()
+    
+    def _generate_puzzle(
+        self,
+        difficulty: str,
+        seed: Optional[int] = None,
+        budget: Optional[SearchBudget] = None
+    ) -> Puzzle:
+        """
+        Generate a puzzle in the current process.
         
-        # Try to find a valid puzzle
-        max_attempts = 100
+        Each attempt scores every end word within reach of a random
+        start (one cached BFS, see DifficultyModel) and draws the end
+        uniformly from those whose score falls in the difficulty's band.
+        An attempt only misses when the start has no such end. Each word
+        the feature BFS expands counts against the budget, as does each
+        attempt (cached starts cost only that).
+        """
+        rng = random.Random(seed)
+        low, high = self._score_range(difficulty)
+        starts = self._starts_for(self.difficulty.min_length)
+        
+        max_attempts = 100 if starts else 0
         for _ in range(max_attempts):
-            start = random.choice(words)
-            end = random.choice(words)
-            
-            if start == end:
+            start = rng.choice(starts)
+            if budget is not None:
+                budget.spend()
+            scored = self.difficulty.scores_from(start, budget)
+            ring = sorted(end for end, (score, _) in scored.items() if low <= score < high)
+            if not ring:
                 continue
             
-            path = self.pathfinder.find_shortest_path(start, end)
-            if path and min_len <= len(path) - 1 <= max_len:
-                return Puzzle(
-                    start_word=start,
-                    end_word=end,
-                    optimal_length=len(path) - 1,
-                    difficulty=difficulty
-                )
+            end = rng.choice(ring)
+            score, length = scored[end]
+            return Puzzle(
+                start_word=start,
+                end_word=end,
+                optimal_length=length,
+                difficulty=difficulty,
+                difficulty_score=score
+            )
         
         # Fallback: return any valid puzzle
-        for start in words:
-            for end in words:
-                if start != end:
-                    path = self.pathfinder.find_shortest_path(start, end)
-                    if path:
-                        return Puzzle(
-                            start_word=start,
-                            end_word=end,
-                            optimal_length=len(path) - 1,
-                            difficulty="unknown"
-                        )
+        for start in sorted(self.graph.get_all_words()):
+            distances = self.pathfinder.distances_from(start, budget=budget)
+            for end, distance in sorted(distances.items()):
+                if distance:
+                    return Puzzle(
+                        start_word=start,
+                        end_word=end,
+                        optimal_length=distance,
+                        difficulty="unknown"
+                    )
         
         raise ValueError("Could not generate puzzle - check word database")
     
+    def _starts_for(self, min_len: int) -> List[str]:
+        """
+        Get candidate start words for a minimum puzzle length (cached).
+        
+        Only components with more than min_len words can hold a pair
+        that far apart. Sorted so seeded puzzles do not depend on set
+        iteration order.
+        """
+        starts = self._puzzle_starts.get(min_len)
+        if starts is None:
+            starts = sorted(
+                word for word in self.graph.get_all_words()
+                if len(self.graph.component_members(word)) > min_len
+            )
+            self._puzzle_starts[min_len] = starts
+        return starts
+    
+    def _score_range(self, difficulty: str) -> Tuple[float, float]:
+        """Get the [low, high) difficulty score band for a difficulty."""
+        return self.DIFFICULTY_SCORES.get(difficulty, self.DIFFICULTY_SCORES["medium"])
+    
+    def csr_graph(self) -> Optional[CSRGraph]:
+        """
+        Get the cached CSR export of the graph for batch jobs.
+        
+        Returns:
+            CSRGraph, or None when NumPy is not installed
+        """
+        if not HAS_NUMPY:
+            return None
+        if self._csr is None:
+            self._csr = CSRGraph.from_graph(self.graph)
+        return self._csr
+    
+    def _sample_sources(self, sample_size: Optional[int], rng: random.Random) -> List[str]:
+        """Pick source words for a batch job (all words if sample_size is None)."""
+        words = sorted(self.graph.get_all_words())
+        if sample_size is None or sample_size >= len(words):
+            return words
+        return rng.sample(words, sample_size)
+    
+    def distance_histogram(
+        self, 
+        sample_size: Optional[int] = 200, 
+        seed: Optional[int] = None
+    ) -> Dict[int, int]:
+        """
+        Count word pairs by shortest-path distance.
+        
+        Uses the vectorized backend when NumPy is installed.
+        
+        Args:
+            sample_size: Number of source words to sample (None for all)
+            seed: Random seed for reproducible samples
+            
+        Returns:
+            Mapping of distance to number of (source, word) pairs
+        """
+        rng = random.Random(seed)
+        sources = self._sample_sources(sample_size, rng)
+        max_depth = self.pathfinder.MAX_PATH_LENGTH
+        
+        csr = self.csr_graph()
+        if csr is not None:
+            return csr.distance_histogram(sources, max_depth)
+        
+        histogram: Dict[int, int] = {}
+        for source in sources:
+            for distance in self.pathfinder.distances_from(source, max_depth).values():
+                if distance:
+                    histogram[distance] = histogram.get(distance, 0) + 1
+        return dict(sorted(histogram.items()))
+    
+    def fill_puzzle_pool(
+        self, 
+        difficulty: str = "medium", 
+        count: int = 100,
+        sample_size: Optional[int] = 200,
+        seed: Optional[int] = None
+    ) -> List[Puzzle]:
+        """
+        Generate many puzzles of one difficulty in a single batch.
+        
+        Scores every pair reachable from the sampled starts with the
+        difficulty model, using the vectorized backend when NumPy is
+        installed. Results are identical for a given seed whichever
+        backend runs.
+        
+        Args:
+            difficulty: easy, medium, or hard
+            count: Number of puzzles wanted
+            sample_size: Number of start words to sample (None for all)
+            seed: Random seed for reproducible pools
+            
+        Returns:
+            Up to count puzzles
+        """
+        rng = random.Random(seed)
+        low, high = self._score_range(difficulty)
+        sources = self._sample_sources(sample_size, rng)
+        
+        pairs = []
+        for start, features in self.difficulty.iter_features(sources):
+            results = self.db.puzzle_results(start)
+            for end, pair in features.items():
+                score = self.difficulty.score(pair, *results.get(end, (0, 0)))
+                if low <= score < high:
+                    pairs.append((start, end, pair.length, score))
+        
+        pairs.sort()
+        chosen = rng.sample(pairs, min(count, len(pairs)))
+        return [
+            Puzzle(
+                start_word=start,
+                end_word=end,
+                optimal_length=distance,
+                difficulty=difficulty,
+                difficulty_score=score
+            )
+            for start, end, distance, score in chosen
+        ]
+    
     def validate_word(self, word: str, current_chain: List[str]) -> Dict[str, Any]:
         """
         Validate a word addition to the chain.
@@ -140,9 +452,32 @@ class GameEngine:
             Validation result with details
         """
         word = word.upper()
+        last_word = current_chain[-1].upper() if current_chain else None
+        return self._check_word(
+            word, len(current_chain), last_word, {w.upper() for w in current_chain}
+        )
+    
+    def _check_word(
+        self,
+        word: str,
+        chain_length: int,
+        last_word: Optional[str],
+        used: Collection[str]
+    ) -> Dict[str, Any]:
+        """
+        Validate an uppercased word against a chain's state.
         
+        Args:
+            word: Word to validate
+            chain_length: Words in the chain, start word included
+            last_word: Word the new one must connect to (None for none)
+            used: Words already in the chain
+            
+        Returns:
+            Validation result with details
+        """
         # Check chain length first - no point validating if limit reached
-        if len(current_chain) >= 6:
+        if chain_length >= 6:
             return {
                 "valid": False,
                 "error": "max_length",
@@ -158,7 +493,7 @@ class GameEngine:
             }
         
         # Check for duplicates
-        if word in [w.upper() for w in current_chain]:
+        if word in used:
             return {
                 "valid": False,
                 "error": "duplicate_word",
@@ -166,8 +501,7 @@ class GameEngine:
             }
         
         # Check connection to last word
-        if current_chain:
-            last_word = current_chain[-1].upper()
+        if last_word is not None:
             if not self.graph.are_connected(last_word, word):
                 return {
                     "valid": False,
@@ -178,9 +512,319 @@ class GameEngine:
         return {
             "valid": True,
             "word": word,
-            "connections": list(self.graph.get_neighbors(word))[:10]  # Sample connections
+            "connections": self.graph.neighbor_preview(word)  # Precomputed, ranked
+        }
+    
+    def validate_chain(
+        self,
+        start_word: str,
+        end_word: str,
+        chain: List[str],
+        distances: Optional[Dict[str, int]] = None,
+        budget: Optional[SearchBudget] = None
+    ) -> Dict[str, Any]:
+        """
+        Validate a whole chain in one pass.
+        
+        Every position gets the diagnostics validate_word would give for
+        it and its distance to the end word. Distances come from the
+        given map, and at most one BFS from the end word fills the gaps.
+        
+        Args:
+            start_word: Starting word
+            end_word: Target word
+            chain: Player's chain (excluding start/end)
+            distances: Known distances to the end word
+            budget: Limits for the BFS (default: the pathfinder's budget())
+            
+        Returns:
+            Dictionary with valid (every position valid), complete (the
+            chain reaches the end word as a valid path), valid_length
+            (leading valid words) and positions (start word first)
+            
+        Raises:
+            SearchBudgetExceeded: If the BFS runs out of budget
+        """
+        start_word = start_word.upper()
+        end_word = end_word.upper()
+        chain = [w.upper() for w in chain]
+        known = distances or {}
+        searched: Optional[Dict[str, int]] = None
+        
+        def distance(word: str) -> Optional[int]:
+            nonlocal searched
+            if word in known:
+                return known[word]
+            if searched is None:
+                searched = self.pathfinder.distances_from(
+                    end_word, budget=budget or self.pathfinder.budget()
+                )
+            return searched.get(word)
+        
+        positions = [{
+            "position": 0,
+            "word": start_word,
+            "valid": self.graph.has_word(start_word),
+            "distance_to_end": distance(start_word),
+        }]
+        used = {start_word}
+        valid_length = None
+        for i, word in enumerate(chain, start=1):
+            result = self._check_word(word, i, chain[i - 2] if i > 1 else start_word, used)
+            used.add(word)
+            position = {
+                "position": i,
+                "word": word,
+                "valid": result["valid"],
+                "distance_to_end": distance(word),
+            }
+            if not result["valid"]:
+                position["error"] = result["error"]
+                position["message"] = result["message"]
+                if valid_length is None:
+                    valid_length = i - 1
+            positions.append(position)
+        
+        return {
+            "valid": valid_length is None and positions[0]["valid"],
+            "complete": self.pathfinder.validate_path([start_word] + chain + [end_word]),
+            "valid_length": len(chain) if valid_length is None else valid_length,
+            "positions": positions,
         }
     
+    # Server-side sessions
+    
+    def _open_session(self, puzzle: Puzzle, budget: Optional[SearchBudget] = None) -> None:
+        """
+        Open a session for a new puzzle and set its puzzle_id.
+        
+        One BFS from the end word, one step deeper than the optimal
+        length, yields both the optimal path and the distances that
+        later hints read instead of searching.
+        
+        Raises:
+            SearchBudgetExceeded: If the BFS runs out of budget
+        """
+        session = GameSession(
+            puzzle_id=self.sessions.new_id(),
+            start_word=puzzle.start_word,
+            end_word=puzzle.end_word,
+            difficulty=puzzle.difficulty,
+            optimal_path=[],
+            distance_to_end={},
+            graph_version=self.graph.version,
+            used={puzzle.start_word},
+        )
+        self._measure_session(session, puzzle.optimal_length + 1, budget)
+        self.sessions.put(session)
+        puzzle.puzzle_id = session.puzzle_id
+    
+    def _measure_session(
+        self,
+        session: GameSession,
+        max_depth: int,
+        budget: Optional[SearchBudget] = None
+    ) -> None:
+        """Fill a session's distance map and optimal path from one BFS."""
+        session.distance_to_end = self.pathfinder.distances_from(
+            session.end_word, max_depth, budget or self.pathfinder.budget()
+        )
+        session.optimal_path = self._descend(session.start_word, session.distance_to_end)
+        session.graph_version = self.graph.version
+    
+    def _descend(self, word: str, distances: Dict[str, int]) -> List[str]:
+        """
+        Follow decreasing distances from a word down to the end word.
+        
+        Ties go to the alphabetically first neighbour.
+        
+        Returns:
+            Path from word to the end, or [] if word is not in distances
+        """
+        if word not in distances:
+            return []
+        path = [word]
+        while distances[word]:
+            closer = distances[word] - 1
+            word = min(n for n in self.graph.get_neighbors(word) if distances.get(n) == closer)
+            path.append(word)
+        return path
+    
+    def _session(self, puzzle_id: str) -> GameSession:
+        """
+        Get a session, re-measuring it if the graph changed since.
+        
+        Raises:
+            SessionNotFound: If the puzzle_id is unknown or expired
+        """
+        session = self.sessions.get(puzzle_id)
+        if session.graph_version != self.graph.version:
+            depth = len(session.optimal_path) if session.optimal_path else None
+            self._measure_session(session, depth or self.pathfinder.MAX_PATH_LENGTH)
+        return session
+    
+    def validate_move(self, puzzle_id: str, word: str) -> Dict[str, Any]:
+        """
+        Validate a word against a session and append it if valid.
+        
+        Args:
+            puzzle_id: Session id from generate_puzzle
+            word: Word to add after the session's current word
+            
+        Returns:
+            Validation result, as from validate_word
+            
+        Raises:
+            SessionNotFound: If the puzzle_id is unknown or expired
+        """
+        session = self._session(puzzle_id)
+        word = word.upper()
+        result = self._check_word(
+            word, len(session.chain) + 1, session.current_word, session.used
+        )
+        if result["valid"]:
+            session.chain.append(word)
+            session.used.add(word)
+        return result
+    
+    def replay_chain(self, puzzle_id: str, chain: List[str]) -> Dict[str, Any]:
+        """
+        Validate a whole chain against a session and adopt it.
+        
+        The session's chain becomes the chain's leading valid words, so
+        a reconnecting client restores its state in one call.
+        
+        Args:
+            puzzle_id: Session id from generate_puzzle
+            chain: Player's chain (excluding start/end)
+            
+        Returns:
+            Validation report, as from validate_chain
+            
+        Raises:
+            SessionNotFound: If the puzzle_id is unknown or expired
+        """
+        session = self._session(puzzle_id)
+        report = self.validate_chain(
+            session.start_word, session.end_word, chain, session.distance_to_end
+        )
+        session.chain = [p["word"] for p in report["positions"][1:report["valid_length"] + 1]]
+        session.used = {session.start_word, *session.chain}
+        return report
+    
+    def undo_move(self, puzzle_id: str) -> Dict[str, Any]:
+        """
+        Remove the last word from a session's chain.
+        
+        Args:
+            puzzle_id: Session id from generate_puzzle
+            
+        Returns:
+            Dictionary with the removed word (None if the chain was
+            empty) and the remaining chain
+            
+        Raises:
+            SessionNotFound: If the puzzle_id is unknown or expired
+        """
+        session = self._session(puzzle_id)
+        removed = session.chain.pop() if session.chain else None
+        if removed is not None:
+            session.used.discard(removed)
+        return {"removed": removed, "chain": list(session.chain)}
+    
+    def session_hint(self, puzzle_id: str, hint_level: int = 1) -> Dict[str, Any]:
+        """
+        Get a hint for a session's current word.
+        
+        Reads the session's distance map; only a chain that has strayed
+        outside it falls back to a fresh search.
+        
+        Args:
+            puzzle_id: Session id from generate_puzzle
+            hint_level: How many hints used (1-based), reveals that many letters
+            
+        Returns:
+            Hint information, as from get_hint
+            
+        Raises:
+            SessionNotFound: If the puzzle_id is unknown or expired
+        """
+        session = self._session(puzzle_id)
+        current_word = session.current_word
+        distances = session.distance_to_end
+        if current_word in distances:
+            remaining_path = self._descend(current_word, distances)
+        else:
+            try:
+                remaining_path = self.pathfinder.find_shortest_path(
+                    current_word, session.end_word
+                )
+            except SearchTimeout:
+                return self._degraded_hint(hint_level)
+        return self._hint_response(current_word, remaining_path, hint_level)
+    
+    def score_session(
+        self,
+        puzzle_id: str,
+        player_path: Optional[List[str]] = None
+    ) -> GameResult:
+        """
+        Score a session's chain without recording it (see record_session).
+        
+        Args:
+            puzzle_id: Session id from generate_puzzle
+            player_path: Chain to score instead of the session's own
+            
+        Returns:
+            GameResult with scoring details
+            
+        Raises:
+            SessionNotFound: If the puzzle_id is unknown or expired
+        """
+        session = self._session(puzzle_id)
+        return self.score_solution(
+            session.start_word,
+            session.end_word,
+            session.chain if player_path is None else player_path,
+            optimal_path=session.optimal_path or None
+        )
+    
+    def submit_session(
+        self,
+        puzzle_id: str,
+        player_path: Optional[List[str]] = None
+    ) -> GameResult:
+        """
+        Score and record a session's chain, then close the session.
+        
+        Args:
+            puzzle_id: Session id from generate_puzzle
+            player_path: Chain to score instead of the session's own
+            
+        Returns:
+            GameResult with scoring details
+            
+        Raises:
+            SessionNotFound: If the puzzle_id is unknown or expired
+        """
+        result = self.score_session(puzzle_id, player_path)
+        self.record_session(puzzle_id, result)
+        return result
+    
+    def record_session(self, puzzle_id: str, result: GameResult) -> None:
+        """
+        Record a result from score_session and close its session.
+        
+        The I/O half of submit_session, for callers that score and
+        write on different executors.
+        
+        Args:
+            puzzle_id: Session the result was scored from
+            result: Result from score_session
+        """
+        self.record_game(result)
+        self.sessions.pop(puzzle_id)
+    
     def calculate_score(self, player_length: int, optimal_length: int) -> int:
         """
         Calculate score based on path lengths.
@@ -228,6 +872,35 @@ class GameEngine:
             end_word: Target word of puzzle
             player_path: Player's submitted chain
             
+        Returns:
+            GameResult with scoring details
+        """
+        result = self.score_solution(start_word, end_word, player_path)
+        
+        # Save to history
+        self.record_game(result)
+        
+        return result
+    
+    def score_solution(
+        self, 
+        start_word: str, 
+        end_word: str, 
+        player_path: List[str],
+        optimal_path: Optional[List[str]] = None
+    ) -> GameResult:
+        """
+        Score a player's solution without recording it.
+        
+        This is the CPU-bound half of submit_solution, split out so async
+        callers can run it and record_game on different executors.
+        
+        Args:
+            start_word: Starting word of puzzle
+            end_word: Target word of puzzle
+            player_path: Player's submitted chain
+            optimal_path: Known optimal path (searched for if None)
+            
         Returns:
             GameResult with scoring details
         """
@@ -240,7 +913,8 @@ class GameEngine:
         is_valid = self.pathfinder.validate_path(full_path)
         
         # Get optimal path
-        optimal_path = self.pathfinder.find_shortest_path(start_word, end_word) or []
+        if optimal_path is None:
+            optimal_path = self.pathfinder.find_shortest_path(start_word, end_word) or []
         optimal_length = len(optimal_path) - 1 if optimal_path else -1
         
         # Calculate score
@@ -264,9 +938,6 @@ class GameEngine:
             is_perfect=score == self.SCORE_PERFECT
         )
         
-        # Save to history
-        self._save_game(result)
-        
         return result
     
     def get_hint(
@@ -279,7 +950,8 @@ class GameEngine:
         """
         Get a hint for the current puzzle state.
         
-        Progressive hints reveal more letters each time:
+        Degrades to an "unavailable" hint if the search runs out of
+        budget. Progressive hints reveal more letters each time:
         - Level 1: First letter
         - Level 2: First two letters
         - Level 3+: More letters revealed
@@ -300,8 +972,29 @@ class GameEngine:
             current_word = start_word.upper()
         
         # Find path from current to end
-        remaining_path = self.pathfinder.find_shortest_path(current_word, end_word.upper())
-        
+        try:
+            remaining_path = self.pathfinder.find_shortest_path(current_word, end_word.upper())
+        except SearchTimeout:
+            return self._degraded_hint(hint_level)
+        return self._hint_response(current_word, remaining_path, hint_level)
+    
+    @staticmethod
+    def _degraded_hint(hint_level: int) -> Dict[str, Any]:
+        """Answer a hint whose search ran out of budget or time."""
+        return {
+            "type": "unavailable",
+            "hint": "Hints are busy right now - try again in a moment",
+            "hint_level": hint_level,
+            "degraded": True
+        }
+    
+    def _hint_response(
+        self,
+        current_word: str,
+        remaining_path: Optional[List[str]],
+        hint_level: int
+    ) -> Dict[str, Any]:
+        """Build a progressive hint from the path left to the end word."""
         if remaining_path and len(remaining_path) > 1:
             next_word = remaining_path[1]
             word_length = len(next_word)
@@ -358,51 +1051,55 @@ class GameEngine:
                 valid_count += 1
         return valid_count
 
-    def _save_game(self, result: GameResult) -> None:
-        """Save game result to database and log it."""
-        import logging
-        
-        self.db.insert(
-            """
-            INSERT INTO games 
-            (start_word, end_word, player_path, optimal_path, 
-             player_length, optimal_length, score)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                result.start_word,
-                result.end_word,
-                ",".join(result.player_path),
-                ",".join(result.optimal_path),
-                result.player_length,
-                result.optimal_length,
-                result.score
-            )
+    def record_game(self, result: GameResult) -> None:
+        """
+        Save a game result to the history and log it.
+        
+        The I/O half of submit_solution, for callers that score and
+        write on different executors. The storage backend updates the
+        leaderboard in the same transaction; the result's percentile is
+        filled in afterwards.
+        
+        Args:
+            result: Result from score_solution
+        """
+        game_id = self.db.save_game(
+            result.start_word,
+            result.end_word,
+            self.encode_path(result.player_path),
+            self.encode_path(result.optimal_path),
+            result.player_length,
+            result.optimal_length,
+            result.score,
+            top_n=self.leaderboard.top_n
+        )
+        result.percentile = self.leaderboard.percentile(
+            result.score, result.start_word, result.end_word
         )
         
         # Log the submission for monitoring
-        total = self.get_total_games()
         logging.info(
-            f"[GAME #{total}] {result.start_word} → {result.end_word} | "
+            f"[GAME #{game_id}] {result.start_word} → {result.end_word} | "
             f"Score: {result.score} | Path: {result.player_length}/{result.optimal_length} steps | "
             f"Chain: {' → '.join([result.start_word] + result.player_path + [result.end_word])}"
         )
     
     def get_total_games(self) -> int:
-        """Get total number of games played."""
-        result = self.db.execute_one("SELECT COUNT(*) as count FROM games")
-        return result["count"] if result else 0
+        """Get total number of games played, including archived games."""
+        return sum(self.leaderboard.histogram().values())
     
     def get_statistics(self) -> Dict[str, Any]:
         """
         Get comprehensive game statistics.
         
+        All-time figures come from the global score histogram and the
+        rollups, so they include archived games without scanning them.
+        
         Returns:
             Dictionary of statistics
         """
-        # Get total count
-        total_result = self.db.execute_one("SELECT COUNT(*) as count FROM games")
-        total_games = total_result["count"] if total_result else 0
+        histogram = self.leaderboard.histogram()
+        total_games = sum(histogram.values())
         
         if total_games == 0:
             return {
@@ -417,55 +1114,204 @@ class GameEngine:
                 "recent_games": []
             }
         
-        # Get aggregate stats
-        agg = self.db.execute_one("""
-            SELECT 
-                AVG(score) as avg_score,
-                AVG(CASE WHEN player_length > 0 THEN player_length END) as avg_length,
-                SUM(CASE WHEN score = 110 THEN 1 ELSE 0 END) as beat_algo,
-                SUM(CASE WHEN score = 100 THEN 1 ELSE 0 END) as perfect,
-                SUM(CASE WHEN score >= 50 AND score < 100 THEN 1 ELSE 0 END) as completed,
-                SUM(CASE WHEN score = 0 THEN 1 ELSE 0 END) as failed
-            FROM games
-        """)
-        
-        # Score distribution
-        score_dist = self.db.execute("""
-            SELECT score, COUNT(*) as count 
-            FROM games 
-            GROUP BY score 
-            ORDER BY score DESC
-        """)
+        def games_where(predicate) -> int:
+            return sum(count for score, count in histogram.items() if predicate(score))
+        
+        failed = games_where(lambda s: s == self.SCORE_FAILED)
+        length_sum, length_count = self.rollups.path_length_totals()
         
         # Recent games
-        recent = self.db.execute(
-            "SELECT * FROM games ORDER BY completed_at DESC LIMIT 10"
-        )
+        recent = self.db.game_history(10)
         
         return {
             "total_games": total_games,
-            "average_score": round(agg["avg_score"] or 0, 1),
-            "beat_algorithm_games": agg["beat_algo"] or 0,
-            "perfect_games": agg["perfect"] or 0,
-            "completed_games": agg["completed"] or 0,
-            "failed_games": agg["failed"] or 0,
-            "success_rate": round(((total_games - (agg["failed"] or 0)) / total_games * 100), 1) if total_games else 0,
-            "average_path_length": round(agg["avg_length"] or 0, 1),
+            "average_score": round(
+                sum(score * count for score, count in histogram.items()) / total_games, 1
+            ),
+            "beat_algorithm_games": games_where(lambda s: s == self.SCORE_BEAT_ALGO),
+            "perfect_games": games_where(lambda s: s == self.SCORE_PERFECT),
+            "completed_games": games_where(
+                lambda s: self.SCORE_COMPLETED <= s < self.SCORE_PERFECT
+            ),
+            "failed_games": failed,
+            "success_rate": round((total_games - failed) / total_games * 100, 1),
+            "average_path_length": round(length_sum / length_count, 1) if length_count else 0,
             "score_distribution": {
-                str(s["score"]): s["count"] for s in score_dist
+                str(score): count for score, count in histogram.items()
             },
-            "recent_games": [
-                {
-                    "id": g["id"],
-                    "start": g["start_word"],
-                    "end": g["end_word"],
-                    "score": g["score"],
-                    "player_length": g["player_length"],
-                    "optimal_length": g["optimal_length"],
-                    "player_path": g["player_path"].split(",") if g["player_path"] else [],
-                    "completed_at": g["completed_at"]
-                }
-                for g in recent
-            ]
+            "recent_games": [self._format_game(g) for g in recent]
+        }
+    
+    def get_game_history(
+        self,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        word: Optional[str] = None,
+        min_score: Optional[int] = None,
+        max_score: Optional[int] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        include_archived: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Page through game history, newest first, with keyset pagination.
+        
+        Each page seeks directly to the cursor position through the
+        completed_at indexes, so cost does not grow with table size or
+        page depth. Only the hot games table is read unless archived
+        history is requested.
+        
+        Args:
+            limit: Maximum games per page
+            cursor: next_cursor from the previous page
+            word: Only games starting or ending with this word
+            min_score: Minimum score (inclusive)
+            max_score: Maximum score (inclusive)
+            since: Earliest completed_at (inclusive, ISO date or datetime)
+            until: Latest completed_at (exclusive, ISO date or datetime)
+            include_archived: Continue into the monthly archive files
+            
+        Returns:
+            Dictionary with games and next_cursor (None on the last page)
+            
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        before = self._decode_cursor(cursor) if cursor else None
+        if word:
+            word = word.upper()
+        if since:
+            since = since.replace("T", " ")
+        if until:
+            until = until.replace("T", " ")
+        
+        # Fetch one extra row to learn whether another page exists
+        fetch = limit + 1
+        
+        def query(db: Storage) -> List[Dict[str, Any]]:
+            return db.game_history(
+                fetch,
+                before=before,
+                word=word,
+                min_score=min_score,
+                max_score=max_score,
+                since=since,
+                until=until
+            )
+        
+        rows = query(self.db)
+        
+        if include_archived and self.archive is not None:
+            newest = before[0] if before else None
+            for month, path in self.archive.months():
+                month_start, month_end = f"{month}-01", self.archive.next_month(month)
+                if since and month_end <= since:
+                    break
+                if len(rows) >= fetch and rows[fetch - 1]["completed_at"] >= month_end:
+                    break
+                if (until and month_start >= until) or (newest and month_start > newest):
+                    continue
+                rows += query(Database(str(path)))
+                rows.sort(key=lambda g: (g["completed_at"], g["id"]), reverse=True)
+                del rows[fetch:]
+        
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = self._encode_cursor(rows[-1]["completed_at"], rows[-1]["id"])
+        
+        return {
+            "games": [self._format_game(g) for g in rows],
+            "next_cursor": next_cursor
         }
+    
+    @staticmethod
+    def _encode_cursor(completed_at: str, game_id: int) -> str:
+        """Encode a keyset position as an opaque cursor."""
+        raw = f"{completed_at}|{game_id}".encode("utf-8")
+        return base64.urlsafe_b64encode(raw).decode("ascii")
+    
+    @staticmethod
+    def _decode_cursor(cursor: str) -> Tuple[str, int]:
+        """Decode a cursor from _encode_cursor."""
+        try:
+            raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+            completed_at, game_id = raw.rsplit("|", 1)
+            return completed_at, int(game_id)
+        except (ValueError, UnicodeError):
+            raise ValueError("Invalid cursor")
+    
+    def _format_game(self, g: Dict[str, Any]) -> Dict[str, Any]:
+        """Shape a games row for API responses."""
+        return {
+            "id": g["id"],
+            "start": g["start_word"],
+            "end": g["end_word"],
+            "score": g["score"],
+            "player_length": g["player_length"],
+            "optimal_length": g["optimal_length"],
+            "player_path": self.decode_path(g),
+            "completed_at": g["completed_at"]
+        }
+    
+    # Path encoding
+    
+    def encode_path(self, path: List[str]) -> GamePath:
+        """
+        Prepare a path for save_game in the configured encoding.
+        
+        Args:
+            path: Uppercase words
+            
+        Returns:
+            Packed BLOB when pack_paths is set, otherwise the words
+        """
+        return self.paths.encode(path) if self.pack_paths else path
+    
+    def decode_path(self, game: Dict[str, Any], column: str = "player") -> List[str]:
+        """
+        Read a path from a games row, whichever encoding it was saved in.
+        
+        Args:
+            game: games row
+            column: "player" or "optimal"
+            
+        Returns:
+            Path words
+        """
+        packed = game.get(f"{column}_ids")
+        if packed is not None:
+            return self.paths.decode(packed)
+        text = game.get(f"{column}_path")
+        return text.split(",") if text else []
+    
+    def pack_stored_paths(self, batch_size: int = 5000) -> int:
+        """
+        Migrate games saved with text paths to packed word ids.
+        
+        Works through the games table in id order, one batch per
+        transaction, so it can run on a live database and resume after
+        an interruption. Archived games keep their text paths.
+        
+        Args:
+            batch_size: Games rewritten per transaction
+            
+        Returns:
+            Number of games migrated
+        """
+        migrated, after_id = 0, 0
+        while True:
+            rows = self.db.text_path_games(after_id, batch_size)
+            if not rows:
+                return migrated
+            self.db.set_packed_paths([
+                (
+                    row["id"],
+                    self.paths.encode(self.decode_path(row, "player")),
+                    self.paths.encode(self.decode_path(row, "optimal")),
+                )
+                for row in rows
+            ])
+            migrated += len(rows)
+            after_id = rows[-1]["id"]
 
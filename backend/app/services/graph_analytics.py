@@ -0,0 +1,398 @@
+"""
+Structural analytics for the Six Degrees word graph.
+
+Components come from the labels WordGraph maintains, and the degree
+distribution is kept up to date incrementally from graph deltas.
+
+Betweenness and eccentricity are estimated from a seeded sample of BFS
+sources (Brandes' algorithm), optionally spread over worker processes.
+The latest sampled run is persisted, so a restarted process reuses it
+while the graph is unchanged. When the graph version moves on, a
+background job recomputes the run while requests keep serving the
+previous one, marked stale.
+"""
+
+import logging
+import random
+import threading
+from collections import Counter, defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from app.models.storage import Storage
+from app.models.word_graph import GraphChange, WordGraph
+
+Neighbors = Callable[[str], Iterable[str]]
+
+
+def brandes(
+    neighbors: Neighbors,
+    sources: Iterable[str]
+) -> Tuple[Dict[str, float], Dict[str, int]]:
+    """
+    Accumulate shortest-path dependencies from each source.
+
+    Args:
+        neighbors: Adjacency lookup
+        sources: BFS sources
+
+    Returns:
+        Tuple of (unscaled betweenness sums, eccentricity per source)
+    """
+    centrality: Dict[str, float] = defaultdict(float)
+    eccentricity: Dict[str, int] = {}
+
+    for source in sources:
+        order: List[str] = []
+        preds: Dict[str, List[str]] = defaultdict(list)
+        sigma = {source: 1}
+        dist = {source: 0}
+        queue = deque([source])
+        while queue:
+            v = queue.popleft()
+            order.append(v)
+            for w in neighbors(v):
+                if w not in dist:
+                    dist[w] = dist[v] + 1
+                    sigma[w] = 0
+                    queue.append(w)
+                if dist[w] == dist[v] + 1:
+                    sigma[w] += sigma[v]
+                    preds[w].append(v)
+        eccentricity[source] = dist[order[-1]]
+
+        delta: Dict[str, float] = defaultdict(float)
+        for w in reversed(order):
+            for v in preds[w]:
+                delta[v] += sigma[v] / sigma[w] * (1 + delta[w])
+            if w != source:
+                centrality[w] += delta[w]
+
+    return dict(centrality), eccentricity
+
+
+# Per-process graph, built by _init_worker
+_worker_graph: Optional[WordGraph] = None
+
+
+def _init_worker(snapshot) -> None:
+    """Build the worker's graph from a parent snapshot."""
+    global _worker_graph
+    _worker_graph = WordGraph.from_snapshot(snapshot)
+
+
+def _brandes_chunk(sources: List[str]) -> Tuple[Dict[str, float], Dict[str, int]]:
+    """Worker entry point for brandes()."""
+    return brandes(_worker_graph.get_neighbors, sources)
+
+
+class GraphAnalytics:
+    """
+    Components, degree distribution, hubs and sampled path metrics.
+    """
+
+    # BFS sources sampled for betweenness and eccentricity
+    SAMPLE_SIZE = 64
+
+    # Highest-betweenness words reported as hubs
+    HUB_COUNT = 10
+
+    # Sources per worker task when running in parallel
+    CHUNK_SIZE = 8
+
+    def __init__(
+        self,
+        graph: WordGraph,
+        database: Optional[Storage] = None,
+        sample_size: int = SAMPLE_SIZE,
+        processes: int = 0,
+        seed: int = 0
+    ):
+        """
+        Initialize analytics.
+
+        Args:
+            graph: Graph to analyse
+            database: Storage for persisted runs (None keeps them in memory)
+            sample_size: BFS sources per sampled run (all words if larger)
+            processes: Worker processes for sampled runs (0 runs inline)
+            seed: Seed for source sampling
+        """
+        self.graph = graph
+        self.db = database
+        self.sample_size = sample_size
+        self.processes = processes
+        self.seed = seed
+
+        # Incremental degree counts, built on first use
+        self._built = False
+        self._degree: Dict[str, int] = {}
+        self._degree_counts: Counter = Counter()
+
+        # Latest sampled run (see _sampled_run)
+        self._run: Optional[Dict[str, Any]] = None
+        self._compute_lock = threading.Lock()
+
+        # Background recompute job (see start)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        graph.subscribe(self._on_graph_change)
+
+    # Components and incremental degrees
+
+    def _ensure_built(self) -> None:
+        """Count degrees from scratch on first use."""
+        if not self._built:
+            self._degree, self._degree_counts = {}, Counter()
+            for word in self.graph.get_all_words():
+                self._update_degree(word)
+            self._built = True
+
+    def _update_degree(self, word: str) -> None:
+        """Move a word to its current degree bucket (idempotent)."""
+        degree = len(self.graph.get_neighbors(word))
+        old = self._degree.get(word)
+        if old == degree:
+            return
+        if old is not None:
+            self._degree_counts[old] -= 1
+            if not self._degree_counts[old]:
+                del self._degree_counts[old]
+        self._degree[word] = degree
+        self._degree_counts[degree] += 1
+
+    def _on_graph_change(self, changes: List[GraphChange]) -> None:
+        """Fold graph deltas into the incremental state."""
+        if not self._built:
+            return
+        for change in changes:
+            self._update_degree(change.word1.upper())
+            if change.kind == "connection":
+                self._update_degree(change.word2.upper())
+
+    def components(self) -> Dict[str, Any]:
+        """
+        Summarize connected components.
+
+        Returns:
+            Dict with count, largest, isolated (single-word components)
+            and sizes (largest first, at most 10)
+        """
+        sizes = self.graph.component_sizes()
+        return {
+            "count": len(sizes),
+            "largest": sizes[0] if sizes else 0,
+            "isolated": sum(1 for size in sizes if size == 1),
+            "sizes": sizes[:10],
+        }
+
+    def degree_distribution(self) -> Dict[str, Any]:
+        """
+        Summarize word degrees.
+
+        Returns:
+            Dict with mean, max and counts (degree -> word count, keyed
+            by the degree as a string so the dict is JSON-ready)
+        """
+        self._ensure_built()
+        words = sum(self._degree_counts.values())
+        total = sum(degree * count for degree, count in self._degree_counts.items())
+        return {
+            "mean": round(total / words, 2) if words else 0,
+            "max": max(self._degree_counts, default=0),
+            "counts": {
+                str(degree): count for degree, count in sorted(self._degree_counts.items())
+            },
+        }
+
+    # Sampled betweenness and eccentricity
+
+    def _sample_sources(self) -> List[str]:
+        """Pick BFS sources reproducibly."""
+        words = sorted(self.graph.get_all_words())
+        if len(words) <= self.sample_size:
+            return words
+        return random.Random(self.seed).sample(words, self.sample_size)
+
+    def _accumulate(self, sources: List[str]) -> Tuple[Dict[str, float], Dict[str, int]]:
+        """Run Brandes over the sources, in worker processes if configured."""
+        if self.processes <= 0 or len(sources) <= self.CHUNK_SIZE:
+            return brandes(self.graph.get_neighbors, sources)
+
+        chunks = [
+            sources[i:i + self.CHUNK_SIZE] for i in range(0, len(sources), self.CHUNK_SIZE)
+        ]
+        centrality: Dict[str, float] = defaultdict(float)
+        eccentricity: Dict[str, int] = {}
+        with ProcessPoolExecutor(
+            max_workers=self.processes,
+            initializer=_init_worker,
+            initargs=(self.graph.snapshot(),)
+        ) as executor:
+            for partial_sums, partial_ecc in executor.map(_brandes_chunk, chunks):
+                for word, value in partial_sums.items():
+                    centrality[word] += value
+                eccentricity.update(partial_ecc)
+        return dict(centrality), eccentricity
+
+    def compute(self) -> Dict[str, Any]:
+        """
+        Estimate betweenness and eccentricity and persist the run.
+
+        Betweenness sums over k sampled sources are scaled by n / k, and
+        halved because every undirected pair is seen from both ends.
+
+        Returns:
+            The new run (version, computed_at, summary and words)
+        """
+        version = self.graph.version
+        sources = self._sample_sources()
+        sums, eccentricity = self._accumulate(sources)
+
+        scale = self.graph.word_count() / len(sources) / 2 if sources else 0
+        betweenness = {word: value * scale for word, value in sums.items()}
+        hubs = sorted(betweenness.items(), key=lambda item: (-item[1], item[0]))
+        values = list(eccentricity.values())
+
+        summary = {
+            "sample_size": len(sources),
+            "hubs": [
+                {
+                    "word": word,
+                    "betweenness": round(value, 2),
+                    "degree": len(self.graph.get_neighbors(word)),
+                }
+                for word, value in hubs[:self.HUB_COUNT]
+            ],
+            "eccentricity": {
+                "diameter_estimate": max(values, default=0),
+                "radius_estimate": min(values, default=0),
+                "mean": round(sum(values) / len(values), 2) if values else 0,
+            },
+        }
+        rows = [
+            (word, betweenness.get(word, 0.0), eccentricity.get(word))
+            for word in set(betweenness) | set(eccentricity)
+        ]
+
+        run = {
+            "version": version,
+            "computed_at": None,
+            "summary": summary,
+            "words": {
+                word: {"betweenness": value, "eccentricity": ecc}
+                for word, value, ecc in rows
+            },
+        }
+        if self.db is not None:
+            self.db.save_graph_metrics(version, summary, rows)
+            stored = self.db.load_graph_metrics()
+            if stored is not None:
+                run["computed_at"] = stored["computed_at"]
+        # Published whole, so readers on other threads never see it half-built
+        self._run = run
+
+        logging.info(
+            f"[ANALYTICS] Sampled {len(sources)} sources at graph version {version}"
+        )
+        return run
+
+    def refresh(self) -> bool:
+        """
+        Bring the sampled run up to the current graph version.
+
+        Reuses a run another process has already persisted for this
+        version before computing one.
+
+        Returns:
+            True if the run was replaced
+        """
+        with self._compute_lock:
+            version = self.graph.version
+            if self._run is not None and self._run["version"] == version:
+                return False
+            stored = self.db.load_graph_metrics() if self.db is not None else None
+            if stored is not None and stored["version"] == version:
+                self._run = stored
+            else:
+                self.compute()
+            return True
+
+    def start(self, interval: float = 60.0) -> None:
+        """
+        Recompute stale runs on a background thread every interval seconds.
+
+        While it runs, requests serve the previous run instead of
+        recomputing it themselves.
+
+        Args:
+            interval: Seconds between checks of the graph version
+        """
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run_job, args=(interval,), name="graph-analytics", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background recompute thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run_job(self, interval: float) -> None:
+        """Background loop: wait for the next interval, pick up graph edits, refresh."""
+        # The first run comes from storage or the first request
+        while not self._stop.wait(interval):
+            try:
+                self.graph.refresh()
+                self.refresh()
+            except Exception:
+                logging.exception("Graph analytics recompute failed")
+
+    def _sampled_run(self) -> Dict[str, Any]:
+        """
+        Get the latest sampled run.
+
+        Only a process with no run at all computes one inline. Otherwise
+        a stale run is served as is while the background job (if
+        started) recomputes it; without the job it is recomputed here.
+        """
+        if self._run is None and self.db is not None:
+            self._run = self.db.load_graph_metrics()
+        run = self._run
+        if run is None or (self._thread is None and run["version"] != self.graph.version):
+            self.refresh()
+            run = self._run
+        return run
+
+    def betweenness(self, word: str) -> float:
+        """Get a word's estimated betweenness (0 if never on a sampled path)."""
+        metrics = self._sampled_run()["words"].get(word.upper())
+        return metrics["betweenness"] if metrics else 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Get every metric for the current graph version.
+
+        Components and degrees are always current; the sampled metrics
+        come from the run for version, which lags the graph while stale.
+
+        Returns:
+            Dict with version, stale, components, degrees, hubs,
+            eccentricity, sample_size and computed_at
+        """
+        self.graph.load()
+        run = self._sampled_run()
+        return {
+            "version": run["version"],
+            "stale": run["version"] != self.graph.version,
+            "computed_at": run["computed_at"],
+            "components": self.components(),
+            "degrees": self.degree_distribution(),
+            **run["summary"],
+        }
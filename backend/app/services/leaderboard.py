@@ -0,0 +1,138 @@
+"""
+Leaderboard and percentile tracking for Six Degrees.
+
+Score histograms per (start_word, end_word) puzzle, plus one global
+histogram, are updated incrementally by Storage.save_game(). Percentiles
+are answered from the histogram, so they cost O(score buckets) instead
+of a scan over games. A bounded top-N table backs the global leaderboard.
+"""
+
+from typing import Any, Dict, List, Optional
+from app.models.storage import Storage
+
+
+class Leaderboard:
+    """
+    Incrementally maintained score histograms and top-N games.
+    """
+
+    # Histogram key used for the global (all puzzles) histogram
+    GLOBAL = "*"
+
+    # Games kept in the global leaderboard
+    TOP_N = Storage.LEADERBOARD_SIZE
+
+    def __init__(self, database: Storage, top_n: int = TOP_N):
+        """
+        Initialize leaderboard.
+
+        Args:
+            database: Storage backend holding the games table
+            top_n: Number of games kept in the leaderboard
+        """
+        self.db = database
+        self.top_n = top_n
+
+    def histogram(self, start_word: str = GLOBAL, end_word: str = GLOBAL) -> Dict[int, int]:
+        """
+        Get the score histogram for a puzzle (or globally).
+
+        Args:
+            start_word: Puzzle start word (default: all puzzles)
+            end_word: Puzzle end word (default: all puzzles)
+
+        Returns:
+            Mapping of score to number of games
+        """
+        return self.db.score_histogram(start_word.upper(), end_word.upper())
+
+    def percentile(
+        self,
+        score: int,
+        start_word: str = GLOBAL,
+        end_word: str = GLOBAL
+    ) -> Optional[float]:
+        """
+        Get the share of games that scored below a score.
+
+        Args:
+            score: Score to rank
+            start_word: Puzzle start word (default: all puzzles)
+            end_word: Puzzle end word (default: all puzzles)
+
+        Returns:
+            Percentage of games with a lower score, or None if the
+            puzzle has no games
+        """
+        histogram = self.histogram(start_word, end_word)
+        if not histogram:
+            return None
+        return self._percentile(histogram, score)
+
+    def puzzle_stats(
+        self,
+        start_word: str,
+        end_word: str,
+        score: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Summarize one puzzle's score histogram for API responses.
+
+        Args:
+            start_word: Puzzle start word
+            end_word: Puzzle end word
+            score: Optional score to rank against the histogram
+
+        Returns:
+            Game count, score distribution and (if score given) percentile
+        """
+        histogram = self.histogram(start_word, end_word)
+        stats: Dict[str, Any] = {
+            "start": start_word.upper(),
+            "end": end_word.upper(),
+            "total_games": sum(histogram.values()),
+            "score_distribution": {str(s): count for s, count in histogram.items()}
+        }
+        if score is not None:
+            stats["percentile"] = self._percentile(histogram, score) if histogram else None
+        return stats
+
+    def top(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Get the best games overall.
+
+        Args:
+            limit: Number of games to return (at most top_n)
+
+        Returns:
+            Ranked list of games
+        """
+        rows = self.db.top_games(min(limit, self.top_n))
+        return [
+            {
+                "rank": rank,
+                "id": row["game_id"],
+                "start": row["start_word"],
+                "end": row["end_word"],
+                "score": row["score"],
+                "player_length": row["player_length"],
+                "completed_at": row["completed_at"]
+            }
+            for rank, row in enumerate(rows, start=1)
+        ]
+
+    def rebuild(self) -> None:
+        """
+        Recompute histograms and leaderboard from the games table.
+
+        One-off full scan, used to backfill databases that predate the
+        leaderboard tables.
+        """
+        self.db.rebuild_leaderboard(self.top_n)
+
+    @staticmethod
+    def _percentile(histogram: Dict[int, int], score: int) -> float:
+        """Percentage of histogram entries strictly below score."""
+        total = sum(histogram.values())
+        below = sum(count for bucket, count in histogram.items() if bucket < score)
+        return round(below / total * 100, 1) if total else 0.0
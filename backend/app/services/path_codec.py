@@ -0,0 +1,124 @@
+"""
+Packed path encoding for Six Degrees.
+
+Game rows can store paths as word ids instead of comma-joined text.
+Ids come from a per-store dictionary (path_words), so they stay valid
+whichever graph the engine loads. A packed path is one width byte
+followed by the ids as little-endian unsigned integers of that width
+(1, 2 or 4 bytes, the narrowest that fits), so decoding is a single
+array.frombytes call rather than a string split:
+
+    b"\\x02" + ids as uint16    # vocabularies under 65536 words
+"""
+
+import sys
+import threading
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple
+from app.models.storage import Storage
+
+# Array typecode per id width in bytes
+TYPECODES = {1: "B", 2: "H", 4: "I"}
+
+
+def pack_ids(ids: Sequence[int]) -> bytes:
+    """
+    Pack word ids into a width-tagged little-endian BLOB.
+
+    Args:
+        ids: Non-negative ids below 2**32
+
+    Returns:
+        Packed bytes (one width byte for an empty path)
+    """
+    top = max(ids, default=0)
+    width = 1 if top < 1 << 8 else 2 if top < 1 << 16 else 4
+    packed = array(TYPECODES[width], ids)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return bytes((width,)) + packed.tobytes()
+
+
+def unpack_ids(blob: bytes) -> Sequence[int]:
+    """
+    Unpack a BLOB (or memoryview) from pack_ids.
+
+    Raises:
+        ValueError: If the width byte or length is invalid
+    """
+    if not blob or blob[0] not in TYPECODES:
+        raise ValueError("Invalid packed path")
+    ids = array(TYPECODES[blob[0]])
+    ids.frombytes(blob[1:])
+    if sys.byteorder == "big":
+        ids.byteswap()
+    return ids
+
+
+class PathCodec:
+    """
+    Thread-safe word <-> id mapping for packed paths, cached per store.
+    """
+
+    def __init__(self, storage: Storage):
+        """
+        Initialize codec.
+
+        Args:
+            storage: Storage backend holding the path_words dictionary
+        """
+        self.db = storage
+        self._lock = threading.Lock()
+        self._ids: Dict[str, int] = {}
+        # Indexed by id; ids are nearly dense, and gaps are never referenced
+        self._words: List[Optional[str]] = [None]
+
+    def _remember(self, entries: List[Tuple[int, str]]) -> None:
+        """Cache dictionary entries (lock held)."""
+        for word_id, word in entries:
+            self._ids[word] = word_id
+            if word_id >= len(self._words):
+                self._words.extend([None] * (word_id + 1 - len(self._words)))
+            self._words[word_id] = word
+
+    def encode(self, path: List[str]) -> bytes:
+        """
+        Pack a path, adding unseen words to the dictionary.
+
+        Args:
+            path: Uppercase words
+
+        Returns:
+            Packed BLOB for player_ids/optimal_ids
+        """
+        with self._lock:
+            missing = [word for word in dict.fromkeys(path) if word not in self._ids]
+            if missing:
+                # Looked up by name: another writer may have committed a
+                # lower id than the highest one cached
+                self._remember(self.db.add_path_words(missing))
+            return pack_ids([self._ids[word] for word in path])
+
+    def decode(self, blob: bytes) -> List[str]:
+        """
+        Unpack a path from encode (in this or another process).
+
+        Raises:
+            ValueError: If the BLOB is malformed or names unknown ids
+        """
+        ids = unpack_ids(blob)
+        words = self._words
+        try:
+            path = [words[word_id] for word_id in ids]
+        except IndexError:
+            path = [None]
+        if None in path:
+            # Ids may have been committed out of order, so reload everything
+            with self._lock:
+                self._remember(self.db.load_path_words())
+            words = self._words
+            path = [words[word_id] if word_id < len(words) else None for word_id in ids]
+            if None in path:
+                unknown = next(i for i, word in zip(ids, path) if word is None)
+                raise ValueError(f"Unknown path word id {unknown}")
+        return path
@@ -1,12 +1,64 @@
 """
 Pathfinder service using BFS algorithm.
 
-Finds shortest paths between words in the word graph.
+Finds shortest paths between words in the word graph. Identical
+searches running at the same time are coalesced into one, and every
+search runs under a node-expansion and wall-clock budget.
+
+Searches over a real WordGraph run on its integer-indexed CSR view with
+a per-thread BFSWorkspace, so a search allocates almost nothing beyond
+the path it returns.
 """
 
-from collections import deque
-from typing import List, Optional, Set
-from app.models.word_graph import WordGraph
+import threading
+from array import array
+from functools import partial
+from typing import TYPE_CHECKING, Dict, List, Optional
+from app.models.word_graph import IndexedGraph, WordGraph
+from app.services.budget import SearchBudget
+from app.services.single_flight import SingleFlight
+
+if TYPE_CHECKING:
+    from app.services.search_pool import SearchPool
+
+# Process-wide, so every engine's searches report into one set of metrics
+SEARCHES = SingleFlight()
+
+
+class BFSWorkspace:
+    """
+    Reusable arrays for integer-indexed BFS.
+    
+    A word counts as visited when its stamp equals the current
+    generation, so starting a search is a counter increment rather than
+    a clear, and the parent entries of unvisited words are never read.
+    """
+    
+    __slots__ = ("size", "stamp", "parent", "queue", "generation")
+    
+    # Stamps are unsigned 32-bit; wrap before overflowing
+    MAX_GENERATION = 2 ** 32 - 1
+    
+    def __init__(self, size: int):
+        """
+        Allocate arrays for a vocabulary.
+        
+        Args:
+            size: Number of words the arrays can index
+        """
+        self.size = size
+        self.stamp = array("I", bytes(4 * size))
+        self.parent = array("i", bytes(4 * size))
+        self.queue = array("i", bytes(4 * size))
+        self.generation = 0
+    
+    def next_generation(self) -> int:
+        """Start a search: get a stamp no word carries yet."""
+        self.generation += 1
+        if self.generation == self.MAX_GENERATION:
+            self.stamp = array("I", bytes(4 * self.size))
+            self.generation = 1
+        return self.generation
 
 
 class Pathfinder:
@@ -18,31 +70,68 @@ class Pathfinder:
     
     MAX_PATH_LENGTH = 6
     
-    def __init__(self, graph: WordGraph):
+    # Default per-search budget
+    MAX_EXPANSIONS = 100000
+    DEADLINE = 2.0  # Seconds
+    
+    def __init__(
+        self,
+        graph: WordGraph,
+        pool: Optional["SearchPool"] = None,
+        flights: Optional[SingleFlight] = None,
+        max_expansions: Optional[int] = MAX_EXPANSIONS,
+        deadline: Optional[float] = DEADLINE
+    ):
         """
         Initialize pathfinder with word graph.
         
         Args:
             graph: WordGraph instance for traversal
+            pool: Optional process pool for expensive searches
+            flights: Group coalescing concurrent identical searches
+                (default: the process-wide SEARCHES)
+            max_expansions: Nodes one search may expand (None for no cap)
+            deadline: Seconds one search may run (None for no deadline)
         """
         self.graph = graph
+        self.pool = pool
+        self.flights = flights if flights is not None else SEARCHES
+        self.max_expansions = max_expansions
+        self.deadline = deadline
+        self._local = threading.local()
+    
+    def budget(self) -> SearchBudget:
+        """Create a budget with this pathfinder's default limits."""
+        return SearchBudget(self.max_expansions, self.deadline)
     
     def find_shortest_path(
         self, 
         start: str, 
         end: str, 
-        max_length: int = MAX_PATH_LENGTH
+        max_length: int = MAX_PATH_LENGTH,
+        budget: Optional[SearchBudget] = None
     ) -> Optional[List[str]]:
         """
         Find shortest path between two words using BFS.
         
+        Concurrent calls for the same words share one search (run under
+        the first caller's budget); the others wait for it no longer than
+        their own budget's deadline. Each caller gets its own copy of the
+        path.
+        
         Args:
             start: Starting word
             end: Target word
             max_length: Maximum path length allowed
+            budget: Limits for this search (default: budget())
             
         Returns:
             List of words forming path, or None if no path exists
+            
+        Raises:
+            SearchBudgetExceeded: If the search runs out of budget
+            SearchTimeout: If an offloaded or shared search does not
+                finish in time
         """
         start = start.upper()
         end = end.upper()
@@ -55,28 +144,209 @@ class Pathfinder:
         if start == end:
             return [start]
         
-        # BFS with path tracking
-        queue: deque = deque([(start, [start])])
-        visited: Set[str] = {start}
+        # Direct neighbours are too cheap to offload
+        if self.graph.are_connected(start, end):
+            return [start, end]
+        
+        if budget is None:
+            budget = self.budget()
+        key = (id(self.graph), self.graph.version, start, end, max_length)
+        path = self.flights.do(
+            key, self._search, start, end, max_length, budget, timeout=budget.remaining()
+        )
+        return list(path) if path is not None else None
+    
+    def _search(
+        self,
+        start: str,
+        end: str,
+        max_length: int,
+        budget: SearchBudget
+    ) -> Optional[List[str]]:
+        """Run one search, on the pool when the graph is large enough."""
+        if self.pool is not None and self.pool.should_offload():
+            # Workers apply their own default budget; the deadline caps the wait
+            return self.pool.find_shortest_path(
+                start, end, max_length,
+                inline=partial(self._bfs, budget=budget),
+                timeout=budget.remaining()
+            )
+        
+        return self._bfs(start, end, max_length, budget)
+    
+    def workspace(self, size: int) -> BFSWorkspace:
+        """
+        Get this thread's BFS workspace, grown to fit a vocabulary.
         
-        while queue:
-            current, path = queue.popleft()
+        Args:
+            size: Number of words to index
             
-            # Check path length constraint
-            if len(path) > max_length:
-                continue
+        Returns:
+            Workspace with at least size entries
+        """
+        workspace = getattr(self._local, "workspace", None)
+        if workspace is None or workspace.size < size:
+            workspace = self._local.workspace = BFSWorkspace(size)
+        return workspace
+    
+    def _bfs(
+        self,
+        start: str,
+        end: str,
+        max_length: int,
+        budget: Optional[SearchBudget] = None
+    ) -> Optional[List[str]]:
+        """
+        Breadth-first search between two existing, distinct words.
+        
+        Expands one level at a time and stops at the level that would
+        exceed max_length, recording parents instead of copying paths.
+        
+        Args:
+            start: Starting word (uppercase)
+            end: Target word (uppercase)
+            max_length: Maximum path length allowed
+            budget: Limits for this search (None for unlimited)
+            
+        Returns:
+            List of words forming path, or None if no path exists
+            
+        Raises:
+            SearchBudgetExceeded: If the search runs out of budget
+        """
+        if isinstance(self.graph, WordGraph):
+            indexed = self.graph.indexed()
+            if start in indexed.index and end in indexed.index:
+                return self._bfs_indexed(indexed, start, end, max_length, budget)
+        
+        parents: Dict[str, Optional[str]] = {start: None}
+        frontier = [start]
+        
+        # Words at depth max_length - 1 are the last worth expanding
+        for _ in range(max_length):
+            next_frontier = []
+            for current in frontier:
+                if budget is not None:
+                    budget.spend()
+                for neighbor in self.graph.get_neighbors(current):
+                    if neighbor in parents:
+                        continue
+                    parents[neighbor] = current
+                    if neighbor == end:
+                        return self._unwind(parents, end)
+                    next_frontier.append(neighbor)
+            if not next_frontier:
+                break
+            frontier = next_frontier
+        
+        return None
+    
+    def _bfs_indexed(
+        self,
+        graph: IndexedGraph,
+        start: str,
+        end: str,
+        max_length: int,
+        budget: Optional[SearchBudget] = None
+    ) -> Optional[List[str]]:
+        """
+        Breadth-first search over integer ids in this thread's workspace.
+        
+        Same contract as _bfs; neighbours are visited in sorted order.
+        """
+        workspace = self.workspace(len(graph.words))
+        generation = workspace.next_generation()
+        stamp, parent, queue = workspace.stamp, workspace.parent, workspace.queue
+        indptr, indices = graph.indptr, graph.indices
+        source, target = graph.index[start], graph.index[end]
+        
+        stamp[source] = generation
+        parent[source] = -1
+        queue[0] = source
+        head, tail = 0, 1
+        level_end, depth = 1, 0
+        while head < tail:
+            if head == level_end:
+                # queue[head:tail] is the next level
+                depth += 1
+                if depth >= max_length:
+                    break
+                level_end = tail
             
-            # Explore neighbors
-            for neighbor in self.graph.get_neighbors(current):
-                if neighbor == end:
-                    return path + [neighbor]
-                
-                if neighbor not in visited:
-                    visited.add(neighbor)
-                    queue.append((neighbor, path + [neighbor]))
+            current = queue[head]
+            head += 1
+            if budget is not None:
+                budget.spend()
+            for k in range(indptr[current], indptr[current + 1]):
+                neighbor = indices[k]
+                if stamp[neighbor] == generation:
+                    continue
+                stamp[neighbor] = generation
+                parent[neighbor] = current
+                if neighbor == target:
+                    path = [end]
+                    node = current
+                    while node != -1:
+                        path.append(graph.words[node])
+                        node = parent[node]
+                    path.reverse()
+                    return path
+                queue[tail] = neighbor
+                tail += 1
         
         return None
     
+    @staticmethod
+    def _unwind(parents: Dict[str, Optional[str]], end: str) -> List[str]:
+        """Rebuild the path to end from a parent map."""
+        path = [end]
+        while parents[path[-1]] is not None:
+            path.append(parents[path[-1]])
+        path.reverse()
+        return path
+    
+    def distances_from(
+        self,
+        start: str,
+        max_depth: int = MAX_PATH_LENGTH,
+        budget: Optional[SearchBudget] = None
+    ) -> Dict[str, int]:
+        """
+        Get hop distances from one word to everything within max_depth.
+        
+        Args:
+            start: Source word
+            max_depth: Deepest level to explore
+            budget: Limits for this search (None for unlimited)
+            
+        Returns:
+            Mapping of word to distance (start maps to 0); empty if
+            start is not in the graph
+            
+        Raises:
+            SearchBudgetExceeded: If the search runs out of budget
+        """
+        start = start.upper()
+        if not self.graph.has_word(start):
+            return {}
+        
+        distances = {start: 0}
+        frontier = [start]
+        for depth in range(1, max_depth + 1):
+            next_frontier = []
+            for word in frontier:
+                if budget is not None:
+                    budget.spend()
+                for neighbor in self.graph.get_neighbors(word):
+                    if neighbor not in distances:
+                        distances[neighbor] = depth
+                        next_frontier.append(neighbor)
+            if not next_frontier:
+                break
+            frontier = next_frontier
+        
+        return distances
+    
     def validate_path(self, path: List[str]) -> bool:
         """
         Validate that a path is valid in the graph.
@@ -146,6 +416,8 @@ class Pathfinder:
         """
         Check if any path exists between words.
         
+        Answered from the graph's component labels, without a search.
+        
         Args:
             start: Starting word
             end: Target word
@@ -153,5 +425,5 @@ class Pathfinder:
         Returns:
             True if path exists
         """
-        return self.find_shortest_path(start, end) is not None
+        return self.graph.same_component(start, end)
 
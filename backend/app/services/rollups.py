@@ -0,0 +1,138 @@
+"""
+Time-bucketed stats rollups for Six Degrees.
+
+A compaction job folds newly saved games into hourly and daily rollup
+tables, tracking the last compacted game id as a watermark. Time-series
+queries read only the rollups, so they never scan the games table.
+"""
+
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+from app.models.storage import Storage
+
+
+class StatsRollups:
+    """
+    Hourly and daily game aggregates, filled incrementally from games.
+    """
+
+    # Games folded per transaction; bounds how long the write lock is held
+    BATCH_SIZE = 50000
+
+    def __init__(self, database: Storage):
+        """
+        Initialize rollups.
+
+        Args:
+            database: Storage backend holding the games table
+        """
+        self.db = database
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def compact(self) -> int:
+        """
+        Fold games saved since the last compaction into the rollups.
+
+        Safe to run from several processes at once: each batch reads and
+        advances the watermark in one write transaction.
+
+        Returns:
+            Number of games compacted
+        """
+        total = 0
+        while True:
+            compacted = self.db.compact_rollups(self.BATCH_SIZE)
+            total += compacted
+            if compacted < self.BATCH_SIZE:
+                return total
+
+    def watermark(self) -> int:
+        """Get the id of the last game folded into the rollups."""
+        return self.db.rollup_watermark()
+
+    def path_length_totals(self) -> Tuple[int, int]:
+        """
+        Get all-time completed path length totals.
+
+        Reads the daily rollups plus games not yet compacted, so it
+        stays correct after games are archived.
+
+        Returns:
+            (sum of player path lengths, number of completed games)
+        """
+        return self.db.path_length_totals()
+
+    def timeseries(
+        self,
+        granularity: str = "day",
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        limit: int = 30
+    ) -> List[Dict[str, Any]]:
+        """
+        Get per-bucket game stats, oldest first.
+
+        Args:
+            granularity: "hour" or "day"
+            since: Earliest bucket to include (ISO date or datetime)
+            until: Latest bucket to include (ISO date or datetime)
+            limit: Most recent buckets to return within the range
+
+        Returns:
+            List of bucket stats
+
+        Raises:
+            ValueError: If granularity is unknown
+        """
+        if granularity not in self.db.GRANULARITIES:
+            raise ValueError(f"granularity must be one of {list(self.db.GRANULARITIES)}")
+
+        rows = self.db.rollup_buckets(granularity, since=since, until=until, limit=limit)
+        return [
+            {
+                "bucket": row["bucket"],
+                "games": row["games"],
+                "average_score": round(row["score_sum"] / row["games"], 1),
+                "perfect_games": row["perfect_count"],
+                "failed_games": row["failure_count"],
+                "average_path_length": round(
+                    row["length_sum"] / row["length_count"], 1
+                ) if row["length_count"] else 0
+            }
+            for row in reversed(rows)
+        ]
+
+    def start(self, interval: float = 60.0) -> None:
+        """
+        Run compaction on a background thread every interval seconds.
+
+        Args:
+            interval: Seconds between compactions
+        """
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, args=(interval,), name="stats-rollups", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background compaction thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self, interval: float) -> None:
+        """Background loop: compact, then wait for the next interval."""
+        while not self._stop.is_set():
+            try:
+                compacted = self.compact()
+                if compacted:
+                    logging.info(f"[ROLLUPS] Compacted {compacted} games")
+            except Exception:
+                logging.exception("Stats rollup compaction failed")
+            self._stop.wait(interval)
@@ -0,0 +1,203 @@
+"""
+Process pool for CPU-heavy pathfinding.
+
+BFS is pure-Python work that holds the GIL for the whole search. The
+pool runs expensive searches and puzzle generation in worker processes,
+each holding its own snapshot of the word graph (built once by the pool
+initializer) and, for puzzle scoring, its own connection to the game
+history. Cheap queries and small graphs stay inline.
+"""
+
+import logging
+import threading
+from concurrent.futures import CancelledError, ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, List, Optional
+
+from app.models.memory import MemoryStorage
+from app.models.storage import open_storage
+from app.models.word_graph import WordGraph
+
+
+class SearchTimeout(Exception):
+    """Raised when an offloaded search does not finish in time."""
+
+
+# Per-process engine, built by _init_worker
+_worker_engine = None
+
+
+def _init_worker(snapshot, history: Optional[str]) -> None:
+    """Build the worker's engine from a parent graph snapshot and history target."""
+    global _worker_engine
+    from app.services.game_engine import GameEngine
+
+    # Without a shared history only searches are offloaded (see generate_puzzle)
+    storage = open_storage(history) if history is not None else MemoryStorage()
+    _worker_engine = GameEngine(graph=WordGraph.from_snapshot(snapshot), storage=storage)
+
+
+def _find_shortest_path(start: str, end: str, max_length: int) -> Optional[List[str]]:
+    """Worker entry point for Pathfinder.find_shortest_path."""
+    return _worker_engine.pathfinder.find_shortest_path(start, end, max_length)
+
+
+def _generate_puzzle(difficulty: str, seed: Optional[int] = None):
+    """Worker entry point for GameEngine.generate_puzzle (the parent opens the session)."""
+    return _worker_engine._generate_puzzle(difficulty, seed, _worker_engine.puzzle_budget())
+
+
+class SearchPool:
+    """
+    Optional process-pool executor for pathfinding.
+
+    The pool is started lazily and replaced with one built from a fresh
+    snapshot when the parent graph's version moves on; calls already
+    submitted to the old pool finish there.
+
+    A call that times out is not interrupted: its worker keeps running
+    until the search returns, bounded by the worker engine's own search
+    budget (Pathfinder.DEADLINE, or GameEngine.puzzle_budget()).
+    """
+
+    # Graphs smaller than this are always searched inline
+    INLINE_MAX_WORDS = 5000
+
+    # Seconds to wait for an offloaded call
+    DEFAULT_TIMEOUT = 10.0
+
+    def __init__(
+        self,
+        graph: WordGraph,
+        max_workers: Optional[int] = None,
+        timeout: float = DEFAULT_TIMEOUT,
+        inline_max_words: int = INLINE_MAX_WORDS,
+        history: Optional[str] = None,
+    ):
+        """
+        Initialize search pool.
+
+        Args:
+            graph: Parent graph to snapshot into workers
+            max_workers: Worker process count (default: CPU count)
+            timeout: Seconds to wait for each offloaded call
+            inline_max_words: Graph size below which work stays inline
+            history: open_storage() target workers read solve rates
+                from (see Storage.location); None keeps puzzle
+                generation inline
+        """
+        self.graph = graph
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.inline_max_words = inline_max_words
+        self.history = history
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._version: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def should_offload(self) -> bool:
+        """
+        Check whether searches on the current graph are worth a round trip.
+
+        Returns:
+            True if work should be sent to the pool
+        """
+        return self.graph.word_count() >= self.inline_max_words
+
+    def find_shortest_path(
+        self,
+        start: str,
+        end: str,
+        max_length: int,
+        inline: Callable[[str, str, int], Optional[List[str]]],
+        timeout: Optional[float] = None,
+    ) -> Optional[List[str]]:
+        """
+        Run Pathfinder.find_shortest_path in a worker.
+
+        Args:
+            start: Starting word
+            end: Target word
+            max_length: Maximum path length allowed
+            inline: Local search used if the pool is unavailable
+            timeout: Seconds to wait, if shorter than the pool's timeout
+
+        Raises:
+            SearchTimeout: If the worker does not answer in time
+        """
+        return self._call(_find_shortest_path, (start, end, max_length), inline, timeout)
+
+    def generate_puzzle(
+        self,
+        difficulty: str,
+        inline: Callable[..., Any],
+        seed: Optional[int] = None,
+        timeout: Optional[float] = None
+    ):
+        """
+        Run GameEngine.generate_puzzle in a worker.
+
+        Runs inline when workers have no history to score puzzles with.
+
+        Args:
+            difficulty: easy, medium, or hard
+            inline: Local generator used if the pool is unavailable
+            seed: Random seed for a reproducible puzzle
+            timeout: Seconds to wait, if shorter than the pool's timeout
+
+        Raises:
+            SearchTimeout: If the worker does not answer in time
+        """
+        if self.history is None:
+            return inline(difficulty, seed)
+        return self._call(_generate_puzzle, (difficulty, seed), inline, timeout)
+
+    def close(self) -> None:
+        """Shut down worker processes, cancelling queued calls (they run inline)."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Get the executor, replacing it if the graph has changed."""
+        with self._lock:
+            if self._executor is not None and self._version != self.graph.version:
+                # Other threads may have calls in flight on the old pool; let
+                # them finish and retire its workers once they are idle
+                stale, self._executor = self._executor, None
+                stale.shutdown(wait=False, cancel_futures=False)
+
+            if self._executor is None:
+                self._version = self.graph.version
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    initializer=_init_worker,
+                    initargs=(self.graph.snapshot(), self.history),
+                )
+            return self._executor
+
+    def _call(
+        self,
+        fn: Callable[..., Any],
+        args: tuple,
+        inline: Callable[..., Any],
+        timeout: Optional[float] = None
+    ) -> Any:
+        """Submit a call to the pool, falling back inline if it is broken or closed."""
+        if timeout is None or timeout > self.timeout:
+            timeout = self.timeout
+        try:
+            future = self._get_executor().submit(fn, *args)
+            return future.result(timeout=timeout)
+        except FutureTimeout:
+            future.cancel()
+            # A call that already started runs on; its worker's budget bounds it
+            raise SearchTimeout(f"Search did not finish within {timeout:g}s")
+        except CancelledError:
+            # close() ran while the call was queued
+            return inline(*args)
+        except BrokenProcessPool:
+            logging.warning("Search pool broken, running inline; it restarts on next use")
+            self.close()
+            return inline(*args)
@@ -0,0 +1,221 @@
+"""
+Server-side game sessions for Six Degrees.
+
+A session is opened when a puzzle is generated and is addressed by its
+puzzle_id. It holds everything later calls would otherwise re-derive:
+the optimal path, the distance from every nearby word to the end word
+(so hints are a neighbour scan instead of a BFS) and the player's chain
+with a set for O(1) duplicate checks.
+
+Sessions live in a bounded in-memory LRU with a sliding TTL. With a
+spill path configured, sessions evicted from memory are written to a
+SQLite file and transparently reloaded on their next use.
+"""
+
+import json
+import secrets
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+
+class SessionNotFound(Exception):
+    """Raised when a puzzle_id is unknown or its session has expired."""
+
+
+@dataclass(slots=True)
+class GameSession:
+    """State of one puzzle being played."""
+    puzzle_id: str
+    start_word: str
+    end_word: str
+    difficulty: str
+    optimal_path: List[str]
+    distance_to_end: Dict[str, int]  # Words within optimal_length of the end
+    graph_version: int
+    chain: List[str] = field(default_factory=list)  # Player's words, excluding start/end
+    used: Set[str] = field(default_factory=set)  # start_word plus chain
+    touched_at: float = 0.0
+
+    @property
+    def current_word(self) -> str:
+        """Word the next step must connect to."""
+        return self.chain[-1] if self.chain else self.start_word
+
+    def to_json(self) -> str:
+        """Serialize for the SQLite spill."""
+        data = asdict(self)
+        data["used"] = sorted(self.used)
+        return json.dumps(data)
+
+    @classmethod
+    def from_json(cls, raw: str) -> "GameSession":
+        """Deserialize from the SQLite spill."""
+        data = json.loads(raw)
+        data["used"] = set(data["used"])
+        return cls(**data)
+
+
+class SessionStore:
+    """
+    Bounded LRU of game sessions with a sliding TTL.
+    """
+
+    # Sessions kept in memory
+    MAX_SESSIONS = 10000
+
+    # Seconds a session survives without being used
+    TTL = 3600.0
+
+    def __init__(
+        self,
+        max_sessions: int = MAX_SESSIONS,
+        ttl: float = TTL,
+        spill_path: Optional[str] = None
+    ):
+        """
+        Initialize session store.
+
+        Args:
+            max_sessions: Sessions kept in memory before evicting the
+                least recently used
+            ttl: Seconds of inactivity after which a session expires
+            spill_path: SQLite file receiving evicted sessions (None
+                drops them)
+        """
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self.spill_path = Path(spill_path) if spill_path else None
+        self._sessions: "OrderedDict[str, GameSession]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        if self.spill_path is not None:
+            self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+            self._spill_execute(
+                """
+                CREATE TABLE IF NOT EXISTS sessions (
+                    puzzle_id TEXT PRIMARY KEY,
+                    data TEXT NOT NULL,
+                    touched_at REAL NOT NULL
+                )
+                """
+            )
+
+    def __len__(self) -> int:
+        """Number of sessions held in memory."""
+        return len(self._sessions)
+
+    @staticmethod
+    def new_id() -> str:
+        """Generate an unguessable puzzle_id."""
+        return secrets.token_urlsafe(12)
+
+    def put(self, session: GameSession) -> None:
+        """
+        Store a session, evicting the least recently used if full.
+
+        Args:
+            session: Session to store
+        """
+        session.touched_at = time.time()
+        with self._lock:
+            self._sessions[session.puzzle_id] = session
+            self._sessions.move_to_end(session.puzzle_id)
+            evicted = []
+            while len(self._sessions) > self.max_sessions:
+                evicted.append(self._sessions.popitem(last=False)[1])
+        if evicted and self.spill_path is not None:
+            self._write_spill(evicted)
+
+    def get(self, puzzle_id: str) -> GameSession:
+        """
+        Get a live session and refresh its TTL.
+
+        Args:
+            puzzle_id: Session id from generate_puzzle
+
+        Returns:
+            The session
+
+        Raises:
+            SessionNotFound: If the id is unknown or expired
+        """
+        now = time.time()
+        with self._lock:
+            session = self._sessions.get(puzzle_id)
+            if session is not None:
+                if now - session.touched_at > self.ttl:
+                    del self._sessions[puzzle_id]
+                    session = None
+                else:
+                    session.touched_at = now
+                    self._sessions.move_to_end(puzzle_id)
+                    return session
+
+        session = self._read_spill(puzzle_id, now)
+        if session is None:
+            raise SessionNotFound(f"Unknown or expired puzzle_id '{puzzle_id}'")
+        self.put(session)
+        return session
+
+    def pop(self, puzzle_id: str) -> None:
+        """Forget a session (e.g. once it has been submitted)."""
+        with self._lock:
+            self._sessions.pop(puzzle_id, None)
+        if self.spill_path is not None:
+            self._spill_execute("DELETE FROM sessions WHERE puzzle_id = ?", (puzzle_id,))
+
+    # SQLite spill
+
+    def _spill(self) -> sqlite3.Connection:
+        """Open a connection to the spill database."""
+        return sqlite3.connect(self.spill_path, timeout=5.0)
+
+    def _spill_execute(self, query: str, params: tuple = ()) -> None:
+        """Run one statement against the spill database and commit."""
+        conn = self._spill()
+        try:
+            with conn:
+                conn.execute(query, params)
+        finally:
+            conn.close()
+
+    def _write_spill(self, sessions: List[GameSession]) -> None:
+        """Persist evicted sessions and purge expired ones."""
+        conn = self._spill()
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO sessions (puzzle_id, data, touched_at) VALUES (?, ?, ?)",
+                    [(s.puzzle_id, s.to_json(), s.touched_at) for s in sessions]
+                )
+                conn.execute(
+                    "DELETE FROM sessions WHERE touched_at < ?", (time.time() - self.ttl,)
+                )
+        finally:
+            conn.close()
+
+    def _read_spill(self, puzzle_id: str, now: float) -> Optional[GameSession]:
+        """Take a live session out of the spill."""
+        if self.spill_path is None:
+            return None
+        conn = self._spill()
+        try:
+            with conn:
+                row = conn.execute(
+                    "SELECT data, touched_at FROM sessions WHERE puzzle_id = ?", (puzzle_id,)
+                ).fetchone()
+                if row is None:
+                    return None
+                conn.execute("DELETE FROM sessions WHERE puzzle_id = ?", (puzzle_id,))
+        finally:
+            conn.close()
+
+        data, touched_at = row
+        if now - touched_at > self.ttl:
+            return None
+        return GameSession.from_json(data)
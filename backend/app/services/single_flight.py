@@ -0,0 +1,109 @@
+"""
+Single-flight call coalescing for Six Degrees.
+
+When a puzzle is shared, many clients ask for the same search within
+milliseconds. A SingleFlight group runs one call per key at a time:
+callers arriving while it is in flight wait for that call and share its
+result (or its exception) instead of repeating the work, for as long
+as their own deadline allows.
+"""
+
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from app.services.search_pool import SearchTimeout
+
+
+class _Call:
+    """One in-flight call and the outcome its waiters share."""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Thread-safe group deduplicating concurrent calls by key.
+    """
+
+    def __init__(self):
+        """Initialize an empty group."""
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._requests = 0
+        self._executions = 0
+        self._coalesced = 0
+
+    def do(
+        self,
+        key: Hashable,
+        fn: Callable[..., Any],
+        *args: Any,
+        timeout: Optional[float] = None
+    ) -> Any:
+        """
+        Run fn(*args) unless a call with the same key is in flight.
+
+        Args:
+            key: Identity of the call (equal keys must mean equal results)
+            fn: Callable to run
+            *args: Positional arguments for fn
+            timeout: Seconds to wait for another thread's call (None to
+                wait for it however long it takes); a leader's own call
+                is bounded only by fn
+
+        Returns:
+            Result of fn, possibly computed by another thread
+
+        Raises:
+            SearchTimeout: If the shared call outlasts the timeout (the
+                call itself carries on for its other callers)
+            Whatever fn raised, in every caller that shared the call
+        """
+        with self._lock:
+            self._requests += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self._executions += 1
+            else:
+                self._coalesced += 1
+
+        if not leader:
+            if not call.done.wait(timeout):
+                raise SearchTimeout(f"Shared search did not finish within {timeout:g}s")
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get coalescing metrics.
+
+        Returns:
+            Dict with requests, executions, coalesced (requests that
+            waited on another call) and in_flight
+        """
+        with self._lock:
+            return {
+                "requests": self._requests,
+                "executions": self._executions,
+                "coalesced": self._coalesced,
+                "in_flight": len(self._calls),
+            }
@@ -0,0 +1,218 @@
+"""
+Vectorized BFS backend for bulk graph analytics.
+
+Exports the word graph as a CSR adjacency matrix and runs
+level-synchronous BFS from many sources at once: each level expands a
+boolean (sources x words) frontier matrix in a single sparse product.
+Used by GameEngine batch jobs when NumPy is installed; SciPy is used for
+the product when available, with a pure NumPy fallback.
+"""
+
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+try:
+    from scipy import sparse
+except ImportError:  # pragma: no cover - optional dependency
+    sparse = None
+
+from app.models.word_graph import WordGraph
+
+HAS_NUMPY = np is not None
+
+# Sentinel distance for words not reached within max_depth
+UNREACHED = -1
+
+
+class CSRGraph:
+    """
+    Word graph as a CSR adjacency matrix.
+
+    Rows and columns follow the sorted word list of WordGraph.to_csr().
+    """
+
+    # Sources expanded together; bounds the frontier matrices' memory
+    BATCH_SIZE = 256
+
+    def __init__(self, words: List[str], indptr: List[int], indices: List[int]):
+        """
+        Initialize from CSR arrays.
+
+        Args:
+            words: Word for each row/column
+            indptr: CSR row pointer (len(words) + 1 entries)
+            indices: CSR column indices
+        """
+        if not HAS_NUMPY:
+            raise RuntimeError("NumPy is required for the vectorized backend")
+
+        self.words = words
+        self.index = {word: i for i, word in enumerate(words)}
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int64)
+
+        n = len(words)
+        self.matrix = None
+        if sparse is not None:
+            # int32 so a row summing many frontier neighbours cannot wrap to 0
+            data = np.ones(len(self.indices), dtype=np.int32)
+            self.matrix = sparse.csr_matrix((data, self.indices, self.indptr), shape=(n, n))
+
+        # Row starts of non-isolated words, for the NumPy reduceat fallback
+        self._rows = np.flatnonzero(np.diff(self.indptr))
+
+    @classmethod
+    def from_graph(cls, graph: WordGraph) -> "CSRGraph":
+        """
+        Export a WordGraph.
+
+        Args:
+            graph: Graph to export
+
+        Returns:
+            CSRGraph over the graph's current words and edges
+        """
+        return cls(*graph.to_csr())
+
+    def _expand(self, frontier: "np.ndarray") -> "np.ndarray":
+        """Return the words adjacent to each row of a boolean frontier."""
+        if self.matrix is not None:
+            # Undirected graph: frontier @ A == (A @ frontier.T).T
+            return (self.matrix @ frontier.T.astype(np.int32)).T > 0
+
+        reached = np.zeros_like(frontier)
+        if len(self.indices):
+            gathered = frontier[:, self.indices]
+            reached[:, self._rows] = np.logical_or.reduceat(
+                gathered, self.indptr[self._rows], axis=1
+            )
+        return reached
+
+    def _propagate(self, values: "np.ndarray") -> "np.ndarray":
+        """Sum each row of a (sources x words) float matrix over neighbours."""
+        if self.matrix is not None:
+            return np.asarray(self.matrix @ values.T).T
+
+        summed = np.zeros_like(values)
+        if len(self.indices):
+            gathered = values[:, self.indices]
+            summed[:, self._rows] = np.add.reduceat(
+                gathered, self.indptr[self._rows], axis=1
+            )
+        return summed
+
+    def multi_source_distances(self, sources: List[str], max_depth: int) -> "np.ndarray":
+        """
+        Run BFS from several sources at once.
+
+        Args:
+            sources: Source words (must be in the graph)
+            max_depth: Deepest level to expand
+
+        Returns:
+            (len(sources) x len(words)) int16 matrix of hop distances,
+            UNREACHED where a word is further than max_depth
+        """
+        k, n = len(sources), len(self.words)
+        distances = np.full((k, n), UNREACHED, dtype=np.int16)
+        frontier = np.zeros((k, n), dtype=bool)
+        frontier[np.arange(k), [self.index[word] for word in sources]] = True
+        distances[frontier] = 0
+        visited = frontier.copy()
+
+        for depth in range(1, max_depth + 1):
+            frontier = self._expand(frontier) & ~visited
+            if not frontier.any():
+                break
+            distances[frontier] = depth
+            visited |= frontier
+
+        return distances
+
+    def path_counts(
+        self,
+        sources: List[str],
+        max_depth: int,
+        blocked: Iterable[str] = ()
+    ) -> Tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+        """
+        Run BFS from several sources, counting shortest paths.
+
+        Counts are floats so very large path counts do not overflow.
+
+        Args:
+            sources: Source words (must be in the graph)
+            max_depth: Deepest level to expand
+            blocked: Words that may not be intermediate steps of the
+                paths counted in the third matrix
+
+        Returns:
+            Tuple of (distances as in multi_source_distances, shortest
+            path counts, shortest path counts avoiding blocked words),
+            each (len(sources) x len(words))
+        """
+        k, n = len(sources), len(self.words)
+        rows = np.arange(k)
+        columns = [self.index[word] for word in sources]
+        open_words = np.ones(n, dtype=bool)
+        open_words[[self.index[word] for word in blocked if word in self.index]] = False
+
+        distances = np.full((k, n), UNREACHED, dtype=np.int16)
+        counts = np.zeros((k, n), dtype=np.float64)
+        free = np.zeros((k, n), dtype=np.float64)
+        frontier = np.zeros((k, n), dtype=bool)
+        frontier[rows, columns] = True
+        distances[frontier] = 0
+        counts[frontier] = free[frontier] = 1.0
+        visited = frontier.copy()
+
+        for depth in range(1, max_depth + 1):
+            reached = self._propagate(np.where(frontier, counts, 0.0))
+            # Sources are endpoints, so they pass paths on even if blocked
+            passing = frontier if depth == 1 else frontier & open_words
+            reached_free = self._propagate(np.where(passing, free, 0.0))
+
+            frontier = (reached > 0) & ~visited
+            if not frontier.any():
+                break
+            distances[frontier] = depth
+            counts[frontier] = reached[frontier]
+            free[frontier] = reached_free[frontier]
+            visited |= frontier
+
+        return distances, counts, free
+
+    def iter_distances(
+        self,
+        sources: List[str],
+        max_depth: int
+    ) -> Iterator[Tuple[List[str], "np.ndarray"]]:
+        """
+        Run multi-source BFS in memory-bounded batches.
+
+        Yields:
+            Tuples of (source batch, distance matrix for that batch)
+        """
+        for i in range(0, len(sources), self.BATCH_SIZE):
+            batch = sources[i:i + self.BATCH_SIZE]
+            yield batch, self.multi_source_distances(batch, max_depth)
+
+    def distance_histogram(self, sources: List[str], max_depth: int) -> Dict[int, int]:
+        """
+        Count (source, word) pairs by shortest-path distance.
+
+        Args:
+            sources: Source words
+            max_depth: Deepest distance to count
+
+        Returns:
+            Mapping of distance (>= 1) to pair count
+        """
+        counts = np.zeros(max_depth + 1, dtype=np.int64)
+        for _, distances in self.iter_distances(sources, max_depth):
+            counts += np.bincount(distances[distances > 0], minlength=max_depth + 1)
+        return {depth: int(c) for depth, c in enumerate(counts) if depth and c}
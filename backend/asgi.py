@@ -0,0 +1,11 @@
+"""
+Entry point for serving the API over ASGI.
+
+Run with any ASGI server, e.g. ``uvicorn asgi:app --port 5000``.
+"""
+
+import os
+
+from app.asgi import create_asgi_app
+
+app = create_asgi_app(db_path=os.environ.get("DATABASE", "data/sixdegrees.db"))
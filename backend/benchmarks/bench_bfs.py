@@ -0,0 +1,91 @@
+"""
+Per-search latency and allocations of shortest-path BFS.
+
+Compares the dict-and-set search used for duck-typed graphs with the
+integer-indexed search on a reused per-thread workspace, over a seeded
+random graph:
+
+    python benchmarks/bench_bfs.py [words] [average degree]
+"""
+
+import os
+import random
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.models.word_graph import WordGraph  # noqa: E402
+from app.services.pathfinder import Pathfinder  # noqa: E402
+from app.services.single_flight import SingleFlight  # noqa: E402
+
+
+class DictGraph:
+    """Duck-typed view of a WordGraph, which forces the generic search."""
+
+    def __init__(self, graph: WordGraph):
+        self.get_neighbors = graph.get_neighbors
+        self.has_word = graph.has_word
+        self.are_connected = graph.are_connected
+
+
+def build_graph(size: int, degree: int, seed: int = 0) -> WordGraph:
+    """Build a random graph with about size * degree / 2 edges."""
+    rng = random.Random(seed)
+    words = [f"W{i}" for i in range(size)]
+    adjacency = {word: set() for word in words}
+    for _ in range(size * degree // 2):
+        a, b = rng.sample(words, 2)
+        adjacency[a].add(b)
+        adjacency[b].add(a)
+    return WordGraph.from_snapshot(
+        (words, {word: list(neighbors) for word, neighbors in adjacency.items()})
+    )
+
+
+def peak_allocation(search, pairs) -> float:
+    """Average peak bytes allocated while one search runs."""
+    search(*pairs[0])  # Warm caches and the workspace
+    tracemalloc.start()
+    total = 0
+    for start, end in pairs:
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        search(start, end)
+        total += tracemalloc.get_traced_memory()[1] - base
+    tracemalloc.stop()
+    return total / len(pairs)
+
+
+def main(size: int = 20000, degree: int = 6, searches: int = 200) -> None:
+    """Time both searches and print per-search costs."""
+    graph = build_graph(size, degree)
+    rng = random.Random(1)
+    words = sorted(graph.get_all_words())
+    pairs = [tuple(rng.sample(words, 2)) for _ in range(searches)]
+
+    cases = {
+        "dict + set": Pathfinder(DictGraph(graph), flights=SingleFlight(), max_expansions=None),
+        "indexed workspace": Pathfinder(graph, flights=SingleFlight(), max_expansions=None),
+    }
+
+    print(f"{size} words, average degree ~{degree}, {searches} searches of up to 6 steps")
+    for name, pathfinder in cases.items():
+        def search(start, end, pathfinder=pathfinder):
+            return pathfinder._bfs(start, end, Pathfinder.MAX_PATH_LENGTH)
+
+        def run(search=search):
+            for start, end in pairs:
+                search(start, end)
+
+        seconds = min(timeit.repeat(run, number=1, repeat=3))
+        peak = peak_allocation(search, pairs)
+        print(
+            f"  {name:20s} {seconds / searches * 1e3:7.3f} ms/search"
+            f"  {peak / 1024:9.1f} KiB peak allocation/search"
+        )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
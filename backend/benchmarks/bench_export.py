@@ -0,0 +1,107 @@
+"""
+Throughput and memory of the streaming game history export.
+
+Fills a SQLite file with synthetic games (half with text paths, half
+packed), then exports it in every available format to /dev/null through
+GameExport, reporting rows per second and the process's peak RSS, which
+should stay flat as the row count grows:
+
+    python benchmarks/bench_export.py [games] [batch size]
+"""
+
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.init_db import WORD_ASSOCIATIONS  # noqa: E402
+from app.models.database import Database  # noqa: E402
+from app.services.export import FORMATS, HAS_PYARROW, GameExport  # noqa: E402
+from app.services.game_engine import GameEngine  # noqa: E402
+
+# Distinct paths the synthetic games cycle through
+SAMPLES = 1024
+
+
+def fill(db: Database, engine: GameEngine, count: int) -> None:
+    """Insert count games in one statement, cycling through sample paths."""
+    rng = random.Random(0)
+    words = sorted({word for pair in WORD_ASSOCIATIONS for word in pair})
+    samples = []
+    for i in range(SAMPLES):
+        walk = rng.sample(words, rng.randint(3, 8))
+        samples.append((
+            i, walk[0], walk[-1], ",".join(walk[1:-1]), ",".join(walk),
+            engine.paths.encode(walk[1:-1]), engine.paths.encode(walk),
+        ))
+
+    with db.get_connection() as conn:
+        conn.execute(
+            "CREATE TEMP TABLE samples (id INTEGER PRIMARY KEY, start_word, end_word, "
+            "player_path, optimal_path, player_ids, optimal_ids)"
+        )
+        conn.executemany("INSERT INTO samples VALUES (?, ?, ?, ?, ?, ?, ?)", samples)
+        # Odd games keep text paths, even ones are packed
+        conn.execute(
+            f"""
+            WITH RECURSIVE n(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM n WHERE x < ?)
+            INSERT INTO games (
+                start_word, end_word, player_path, optimal_path, player_length,
+                optimal_length, score, player_ids, optimal_ids
+            )
+            SELECT s.start_word, s.end_word,
+                   CASE x % 2 WHEN 1 THEN s.player_path END,
+                   CASE x % 2 WHEN 1 THEN s.optimal_path END,
+                   x % 6 + 1, x % 5 + 1, x % 101,
+                   CASE x % 2 WHEN 0 THEN s.player_ids END,
+                   CASE x % 2 WHEN 0 THEN s.optimal_ids END
+            FROM n JOIN samples s ON s.id = x % {SAMPLES}
+            """,
+            (count,)
+        )
+
+
+def peak_rss_mib() -> float:
+    """Peak resident set size of this process so far."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main(count: int = 10_000_000, batch_size: int = 5000) -> None:
+    """Build the table, export it in each format and print throughput."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "games.db")
+        db = Database(path)
+        db.init_schema()
+        engine = GameEngine(storage=db)
+
+        started = time.perf_counter()
+        fill(db, engine, count)
+        print(
+            f"{count} games, {os.path.getsize(path) / 2**20:.0f} MiB file, "
+            f"built in {time.perf_counter() - started:.1f} s, batches of {batch_size}"
+        )
+        print(f"  {'peak RSS before export':27s} {peak_rss_mib():8.0f} MiB")
+
+        formats = [fmt for fmt in FORMATS if fmt != "parquet" or HAS_PYARROW]
+        for fmt in formats:
+            export = GameExport(engine, fmt, batch_size=batch_size)
+            started = time.perf_counter()
+            with open(os.devnull, "wb") as out:
+                exported = export.write(out)
+            seconds = time.perf_counter() - started
+            assert exported == count
+            print(
+                f"  {fmt:8s} {seconds:8.1f} s  {count / seconds / 1e3:8.0f}k rows/s"
+                f"  {peak_rss_mib():8.0f} MiB peak RSS"
+            )
+        if not HAS_PYARROW:
+            print("  parquet  skipped (pyarrow not installed)")
+        engine.close()
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
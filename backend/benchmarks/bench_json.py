@@ -0,0 +1,76 @@
+"""
+Per-request serialization cost for /submit and /stats responses.
+
+Compares the previous path (dataclasses.asdict + Flask's default JSON
+provider) with direct to_dict + the app's registered provider:
+
+    python benchmarks/bench_json.py
+"""
+
+import os
+import sys
+import timeit
+from dataclasses import asdict
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from flask import Flask  # noqa: E402
+from flask.json.provider import DefaultJSONProvider  # noqa: E402
+
+from app.json_provider import HAS_ORJSON, init_json  # noqa: E402
+from app.services.game_engine import GameResult  # noqa: E402
+
+RESULT = GameResult(
+    start_word="OCEAN",
+    end_word="KEYBOARD",
+    player_path=["WAVE", "SOUND", "MUSIC", "PIANO"],
+    optimal_path=["OCEAN", "WAVE", "SOUND", "TYPE", "KEYBOARD"],
+    player_length=5,
+    optimal_length=4,
+    score=90,
+    is_perfect=False,
+)
+
+STATS = {
+    "total_games": 12345,
+    "average_score": 71.3,
+    "score_distribution": {str(s): s * 7 for s in range(0, 120, 10)},
+    "recent_games": [
+        {
+            "id": i,
+            "start": "OCEAN",
+            "end": "KEYBOARD",
+            "score": 90,
+            "player_length": 5,
+            "optimal_length": 4,
+            "player_path": ["WAVE", "SOUND", "MUSIC", "PIANO"],
+            "completed_at": "2024-01-01 12:00:00",
+        }
+        for i in range(10)
+    ],
+}
+
+
+def main(number: int = 20000) -> None:
+    """Time both serialization paths and print per-call costs."""
+    baseline = Flask("baseline")
+    baseline.json = DefaultJSONProvider(baseline)
+    fast = Flask("fast")
+    init_json(fast)
+
+    cases = {
+        "submit (asdict + default)": lambda: baseline.json.response(asdict(RESULT)),
+        "submit (to_dict + provider)": lambda: fast.json.response(RESULT.to_dict()),
+        "stats  (default)": lambda: baseline.json.response(STATS),
+        "stats  (provider)": lambda: fast.json.response(STATS),
+    }
+
+    print(f"orjson available: {HAS_ORJSON}")
+    with baseline.app_context(), fast.app_context():
+        for name, fn in cases.items():
+            seconds = min(timeit.repeat(fn, number=number, repeat=3))
+            print(f"  {name:30s} {seconds / number * 1e6:7.2f} us/request")
+
+
+if __name__ == "__main__":
+    main()
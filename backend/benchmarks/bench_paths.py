@@ -0,0 +1,101 @@
+"""
+Row size and decode throughput of text vs packed game paths.
+
+Saves the same random games (walks over the seed vocabulary) into two
+SQLite files, one with comma-joined text paths and one with packed
+word-id BLOBs, then compares file size, stored path bytes and the cost
+of reading paths back through GameEngine.decode_path:
+
+    python benchmarks/bench_paths.py [games]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.init_db import WORD_ASSOCIATIONS  # noqa: E402
+from app.models.database import Database  # noqa: E402
+from app.models.word_graph import WordGraph  # noqa: E402
+from app.services.game_engine import GameEngine  # noqa: E402
+
+
+def random_games(count: int, seed: int = 0):
+    """Yield (player_path, optimal_path) pairs from random walks."""
+    rng = random.Random(seed)
+    adjacency = {}
+    for word1, word2 in WORD_ASSOCIATIONS:
+        adjacency.setdefault(word1, []).append(word2)
+        adjacency.setdefault(word2, []).append(word1)
+    words = sorted(adjacency)
+    for _ in range(count):
+        walk = [rng.choice(words)]
+        for _ in range(rng.randint(2, 7)):
+            walk.append(rng.choice(adjacency[walk[-1]]))
+        yield walk[1:-1], walk
+
+
+def fill(path: str, games, pack: bool) -> GameEngine:
+    """Save games into a fresh database through the engine's encoding."""
+    db = Database(path)
+    db.init_schema()
+    engine = GameEngine(graph=WordGraph.from_snapshot(([], {})), storage=db, pack_paths=pack)
+    with db.get_connection() as conn:
+        conn.executemany(
+            """
+            INSERT INTO games (start_word, end_word, player_path, optimal_path,
+                               player_length, optimal_length, score, player_ids, optimal_ids)
+            VALUES (?, ?, ?, ?, ?, ?, 100, ?, ?)
+            """,
+            [
+                (
+                    optimal[0], optimal[-1],
+                    None if pack else ",".join(player), None if pack else ",".join(optimal),
+                    len(player) + 1, len(optimal) - 1,
+                    engine.encode_path(player) if pack else None,
+                    engine.encode_path(optimal) if pack else None,
+                )
+                for player, optimal in games
+            ]
+        )
+    db.execute("VACUUM")
+    return engine
+
+
+def main(count: int = 50000) -> None:
+    """Fill both databases and print size and decode costs."""
+    games = list(random_games(count))
+    workdir = tempfile.mkdtemp()
+    print(f"{count} games, paths of 1-6 words over {len(games and WORD_ASSOCIATIONS)} associations")
+    for name, pack in (("text", False), ("packed ids", True)):
+        path = os.path.join(workdir, f"{name.replace(' ', '_')}.db")
+        engine = fill(path, games, pack)
+        row = engine.db.execute_one(
+            """
+            SELECT SUM(LENGTH(COALESCE(player_path, player_ids))
+                       + LENGTH(COALESCE(optimal_path, optimal_ids))) AS bytes
+            FROM games
+            """
+        )
+        rows = engine.db.execute("SELECT * FROM games")
+
+        def decode(rows=rows, engine=engine):
+            for game in rows:
+                engine.decode_path(game, "player")
+                engine.decode_path(game, "optimal")
+
+        seconds = min(timeit.repeat(decode, number=1, repeat=5))
+        print(
+            f"  {name:12s} {os.path.getsize(path) / 1024:8.0f} KiB file"
+            f"  {row['bytes'] / count:6.1f} path bytes/game"
+            f"  {count * 2 / seconds / 1e6:6.2f} M paths/s decoded"
+        )
+        os.unlink(path)
+    os.rmdir(workdir)
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
@@ -0,0 +1,92 @@
+"""
+On-disk size, edge JOIN and graph load time before and after the edge migration.
+
+Builds a legacy database the way the serverless seeder did (surrogate
+ids, both directions of every association, redundant indexes), times
+WordGraph.load, then migrates it with Database.init_schema and repeats:
+
+    python benchmarks/bench_schema.py [words] [average degree]
+"""
+
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.models.database import Database  # noqa: E402
+from app.models.word_graph import WordGraph  # noqa: E402
+
+LEGACY_SCHEMA = """
+    CREATE TABLE words (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        word TEXT UNIQUE NOT NULL,
+        category TEXT
+    );
+    CREATE TABLE connections (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        word1_id INTEGER NOT NULL,
+        word2_id INTEGER NOT NULL,
+        strength REAL DEFAULT 1.0,
+        FOREIGN KEY (word1_id) REFERENCES words(id),
+        FOREIGN KEY (word2_id) REFERENCES words(id),
+        UNIQUE(word1_id, word2_id)
+    );
+    CREATE INDEX idx_words_word ON words(word);
+    CREATE INDEX idx_conn_word1 ON connections(word1_id);
+    CREATE INDEX idx_conn_word2 ON connections(word2_id);
+"""
+
+
+def build_legacy(path: str, size: int, degree: int, seed: int = 0) -> None:
+    """Write a legacy database with about size * degree / 2 associations."""
+    rng = random.Random(seed)
+    conn = sqlite3.connect(path)
+    conn.executescript(LEGACY_SCHEMA)
+    conn.executemany("INSERT INTO words (word) VALUES (?)", ((f"W{i}",) for i in range(size)))
+    edges = []
+    for _ in range(size * degree // 2):
+        a, b = rng.sample(range(1, size + 1), 2)
+        edges += [(a, b), (b, a)]
+    conn.executemany(
+        "INSERT OR IGNORE INTO connections (word1_id, word2_id) VALUES (?, ?)", edges
+    )
+    conn.commit()
+    conn.close()
+
+
+def measure(path: str) -> None:
+    """Print file size, edge rows and the best JOIN and graph load times."""
+    db = Database(path)
+    rows = db.execute_one("SELECT COUNT(*) AS n FROM connections")["n"]
+    join = min(timeit.repeat(db.load_connections, number=1, repeat=5))
+    load = min(timeit.repeat(lambda: WordGraph(db).load(), number=1, repeat=5))
+    print(
+        f"  {os.path.getsize(path) / 1024:9.1f} KiB  {rows:8d} rows"
+        f"  {join * 1e3:7.1f} ms load_connections  {load * 1e3:7.1f} ms WordGraph.load"
+    )
+
+
+def main(size: int = 20000, degree: int = 6) -> None:
+    """Measure a legacy database, migrate it in place and measure again."""
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    os.unlink(path)
+    try:
+        build_legacy(path, size, degree)
+        print(f"{size} words, average degree ~{degree}")
+        print("legacy (surrogate id, both directions, redundant indexes)")
+        measure(path)
+
+        Database(path).init_schema()
+        print("canonical (min_id, max_id) WITHOUT ROWID")
+        measure(path)
+    finally:
+        os.unlink(path)
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
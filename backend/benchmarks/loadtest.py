@@ -0,0 +1,146 @@
+"""
+HTTP load test for the Six Degrees API.
+
+Opens many concurrent keep-alive connections against one endpoint
+(/api/game/validate by default) and reports throughput and latency
+percentiles. Use it to compare the Flask (WSGI) and ASGI serving modes:
+
+    python run.py &                              # Flask on :5000
+    uvicorn asgi:app --port 5001 &               # ASGI on :5001
+    python benchmarks/loadtest.py --port 5000 --connections 500
+    python benchmarks/loadtest.py --port 5001 --connections 500
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from typing import List, Tuple
+
+
+async def _request(
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+    host: str,
+    path: str,
+    body: bytes,
+) -> Tuple[int, bool]:
+    """
+    Send one keep-alive POST and read the response.
+
+    Returns:
+        Tuple of (status code, whether the server kept the connection open)
+    """
+    writer.write(
+        f"POST {path} HTTP/1.1\r\n"
+        f"Host: {host}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        "Connection: keep-alive\r\n\r\n".encode("latin-1") + body
+    )
+    await writer.drain()
+
+    status_line = await reader.readline()
+    status = int(status_line.split()[1])
+    length = 0
+    keep_alive = True
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        name = name.lower()
+        if name == "content-length":
+            length = int(value)
+        elif name == "connection" and value.strip().lower() == "close":
+            keep_alive = False
+    await reader.readexactly(length)
+    return status, keep_alive
+
+
+async def _worker(
+    host: str,
+    port: int,
+    requests: int,
+    path: str,
+    body: bytes,
+    latencies: List[float],
+    errors: List[int],
+) -> None:
+    """Run a sequence of requests, reusing the connection when allowed."""
+    writer = None
+    for _ in range(requests):
+        started = time.perf_counter()
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection(host, port)
+            status, keep_alive = await _request(reader, writer, host, path, body)
+        except (OSError, asyncio.IncompleteReadError, IndexError, ValueError):
+            errors.append(1)
+            if writer is not None:
+                writer.close()
+            writer = None
+            continue
+        latencies.append(time.perf_counter() - started)
+        if status >= 500:
+            errors.append(1)
+        if not keep_alive:
+            writer.close()
+            writer = None
+
+    if writer is not None:
+        writer.close()
+
+
+async def run(
+    host: str, port: int, connections: int, requests: int, path: str, body: bytes
+) -> Tuple[float, List[float], int]:
+    """
+    Run the load test.
+
+    Returns:
+        Tuple of (elapsed seconds, request latencies, error count)
+    """
+    latencies: List[float] = []
+    errors: List[int] = []
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        _worker(host, port, requests, path, body, latencies, errors)
+        for _ in range(connections)
+    ))
+    return time.perf_counter() - started, latencies, sum(errors)
+
+
+def main() -> None:
+    """Parse arguments, run the load test and print a summary."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5000)
+    parser.add_argument("--connections", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=20, help="Requests per connection")
+    parser.add_argument("--path", default="/api/game/validate")
+    parser.add_argument(
+        "--body",
+        default=json.dumps({"word": "WAVE", "chain": ["OCEAN"]}),
+        help="JSON request body",
+    )
+    args = parser.parse_args()
+
+    elapsed, latencies, errors = asyncio.run(run(
+        args.host, args.port, args.connections, args.requests,
+        args.path, args.body.encode("utf-8"),
+    ))
+
+    latencies.sort()
+    completed = len(latencies)
+    print(f"{args.connections} connections x {args.requests} requests -> {args.path}")
+    print(f"  completed: {completed}  errors: {errors}  elapsed: {elapsed:.2f}s")
+    if completed:
+        print(f"  throughput: {completed / elapsed:.0f} req/s")
+        print(f"  latency p50: {statistics.median(latencies) * 1000:.1f} ms")
+        print(f"  latency p99: {latencies[int(completed * 0.99) - 1] * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Tests for games archival into monthly partitions.
+"""
+
+import pytest
+from app.services.archive import GameArchive
+from app.services.game_engine import GameEngine, GameResult
+
+
+class TestGameArchive:
+    """Test moving old games out of the hot table."""
+
+    DATES = [
+        "2024-01-05 10:00:00",
+        "2024-01-20 10:00:00",
+        "2024-02-03 10:00:00",
+        "2024-02-03 10:00:00",
+        "2024-03-10 10:00:00",
+        "2024-06-01 10:00:00",
+    ]
+
+    @pytest.fixture
+    def engine(self, temp_db, tmp_path):
+        """Create engine with games spread over several months."""
+        engine = GameEngine(db_path=str(temp_db.db_path))
+        engine.archive = GameArchive(engine.db, engine.rollups, archive_dir=str(tmp_path))
+        for i, completed_at in enumerate(self.DATES):
+            engine.record_game(GameResult(
+                start_word="CAT",
+                end_word="DOG" if i % 2 else "FISH",
+                player_path=["PET"],
+                optimal_path=["CAT", "PET", "DOG"],
+                player_length=2 + i % 2,
+                optimal_length=2,
+                score=100 - 10 * (i % 2),
+                is_perfect=i % 2 == 0
+            ))
+            temp_db.execute(
+                "UPDATE games SET completed_at = ? WHERE id = (SELECT MAX(id) FROM games)",
+                (completed_at,)
+            )
+        return engine
+
+    def _history(self, engine, **kwargs):
+        """Follow cursors through the full history."""
+        ids, cursor = [], None
+        while True:
+            page = engine.get_game_history(limit=2, cursor=cursor, **kwargs)
+            ids += [g["id"] for g in page["games"]]
+            cursor = page["next_cursor"]
+            if cursor is None:
+                return ids
+
+    def test_archive_moves_old_games(self, engine):
+        """Test that only games before the cutoff leave the hot table."""
+        assert engine.archive.archive(before="2024-03-01") == 4
+        assert [month for month, _ in engine.archive.months()] == ["2024-02", "2024-01"]
+
+        hot = engine.db.execute("SELECT completed_at FROM games")
+        assert all(row["completed_at"] >= "2024-03-01" for row in hot)
+
+        # Re-running finds nothing left to move
+        assert engine.archive.archive(before="2024-03-01") == 0
+
+    def test_stats_survive_archival(self, engine):
+        """Test that all-time stats and rollups are unchanged."""
+        stats = engine.get_statistics()
+        engine.rollups.compact()
+        series = engine.rollups.timeseries("day")
+
+        engine.archive.archive(before="2024-03-01")
+
+        after = engine.get_statistics()
+        assert after["total_games"] == stats["total_games"] == 6
+        assert after["average_score"] == stats["average_score"]
+        assert after["average_path_length"] == stats["average_path_length"]
+        assert engine.rollups.timeseries("day") == series
+        assert engine.get_total_games() == 6
+
+    def test_history_hot_only_by_default(self, engine):
+        """Test that archived games are only read when requested."""
+        all_ids = self._history(engine)
+        engine.archive.archive(before="2024-03-01")
+
+        assert self._history(engine) == all_ids[:2]
+        assert self._history(engine, include_archived=True) == all_ids
+
+    def test_archived_history_filters(self, engine):
+        """Test filters and cursors across archive files."""
+        engine.archive.archive(before="2024-03-01")
+
+        page = engine.get_game_history(
+            limit=10, word="dog", since="2024-01-10", include_archived=True
+        )
+        assert [g["completed_at"][:10] for g in page["games"]] == [
+            "2024-06-01", "2024-02-03", "2024-01-20"
+        ]
+
+        page = engine.get_game_history(limit=1, until="2024-02-01", include_archived=True)
+        assert page["games"][0]["completed_at"] == "2024-01-20 10:00:00"
+        page = engine.get_game_history(
+            limit=1, cursor=page["next_cursor"], include_archived=True
+        )
+        assert page["games"][0]["completed_at"] == "2024-01-05 10:00:00"
@@ -0,0 +1,234 @@
+"""
+Tests for the ASGI serving mode.
+
+Drives the ASGI app directly with synthetic scopes, no server needed.
+"""
+
+import asyncio
+import json
+import pytest
+from app.asgi import AsgiApp
+from app.models.word_graph import WordGraph
+from app.services.game_engine import Puzzle
+
+
+def call(app, method, path, body=None, query=b""):
+    """Send a single HTTP request through the ASGI app."""
+    raw = json.dumps(body).encode("utf-8") if body is not None else b""
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": raw, "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        "type": "http",
+        "method": method,
+        "path": path,
+        "query_string": query,
+        "headers": [(b"origin", b"http://localhost:5173")],
+    }
+    asyncio.run(app(scope, receive, send))
+
+    start, *bodies = messages
+    headers = dict(start["headers"])
+    body = b"".join(message["body"] for message in bodies)
+    if headers[b"content-type"] != b"application/json":
+        # Streamed downloads come back raw
+        return start["status"], headers, body
+    payload = json.loads(body) if body else None
+    return start["status"], headers, payload
+
+
+class TestAsgiApp:
+    """Test ASGI endpoints against a small real graph."""
+
+    @pytest.fixture
+    def app(self, temp_db):
+        """Create ASGI app backed by a seeded temporary database."""
+        graph = WordGraph(temp_db)
+        for word in ["OCEAN", "WAVE", "WATER", "FISH"]:
+            graph.add_word(word)
+        graph.add_connection("OCEAN", "WAVE")
+        graph.add_connection("WAVE", "WATER")
+        graph.add_connection("OCEAN", "FISH")
+        return AsgiApp(db_path=str(temp_db.db_path))
+
+    def test_validate(self, app):
+        """Test word validation endpoint."""
+        status, headers, payload = call(
+            app, "POST", "/api/game/validate", {"word": "wave", "chain": ["OCEAN"]}
+        )
+
+        assert status == 200
+        assert payload["valid"] is True
+        assert headers[b"access-control-allow-origin"] == b"http://localhost:5173"
+
+    def test_validate_missing_word(self, app):
+        """Test validation rejects bodies without a word."""
+        status, _, payload = call(app, "POST", "/api/game/validate", {})
+
+        assert status == 400
+        assert "error" in payload
+
+    def test_submit_records_game(self, app):
+        """Test that submissions are scored and saved."""
+        status, _, payload = call(app, "POST", "/api/game/submit", {
+            "start_word": "FISH", "end_word": "WATER", "path": ["OCEAN", "WAVE"]
+        })
+
+        assert status == 200
+        assert payload["score"] == 100
+        assert payload["percentile"] == 0.0
+        assert app.engine.get_total_games() == 1
+
+        status, _, payload = call(app, "GET", "/api/stats/leaderboard", query=b"limit=5")
+        assert status == 200
+        assert [g["score"] for g in payload["leaderboard"]] == [100]
+
+        status, _, payload = call(
+            app, "GET", "/api/stats/puzzle", query=b"start=fish&end=water&score=100"
+        )
+        assert payload["total_games"] == 1
+        assert payload["percentile"] == 0.0
+
+    def test_session_flow(self, app):
+        """Test validate, undo, hint and submit against a puzzle_id."""
+        puzzle = Puzzle("FISH", "WATER", 3, "medium")
+        app.engine._open_session(puzzle)
+        body = {"puzzle_id": puzzle.puzzle_id}
+
+        assert call(app, "POST", "/api/game/validate", {**body, "word": "wave"})[2]["valid"] is False
+        assert call(app, "POST", "/api/game/validate", {**body, "word": "ocean"})[2]["valid"] is True
+        assert call(app, "POST", "/api/game/validate", {**body, "word": "fish"})[2]["error"] == \
+            "duplicate_word"
+
+        status, _, payload = call(app, "POST", "/api/game/undo", body)
+        assert status == 200
+        assert payload == {"removed": "OCEAN", "chain": []}
+
+        status, _, payload = call(app, "POST", "/api/game/hint", body)
+        assert payload["steps_remaining"] == 3
+        assert payload["masked_word"] == "O____"
+
+        call(app, "POST", "/api/game/validate", {**body, "word": "ocean"})
+        call(app, "POST", "/api/game/validate", {**body, "word": "wave"})
+        status, _, payload = call(app, "POST", "/api/game/submit", body)
+        assert status == 200
+        assert payload["score"] == 100
+        assert payload["player_path"] == ["OCEAN", "WAVE"]
+
+        # Submitting closes the session
+        assert call(app, "POST", "/api/game/undo", body)[0] == 404
+
+    def test_validate_chain(self, app):
+        """Test whole-chain validation and its input checks."""
+        status, _, payload = call(app, "POST", "/api/game/validate-chain", {
+            "start_word": "FISH", "end_word": "WATER", "chain": ["ocean", "wave"]
+        })
+        assert status == 200
+        assert payload["complete"] is True
+        assert [p["distance_to_end"] for p in payload["positions"]] == [3, 2, 1]
+
+        assert call(app, "POST", "/api/game/validate-chain", {"chain": "OCEAN"})[0] == 400
+        assert call(app, "POST", "/api/game/validate-chain", {"chain": []})[0] == 400
+
+    def test_expired_session_falls_back(self, app):
+        """Test that legacy fields are used when the session is gone."""
+        status, _, payload = call(app, "POST", "/api/game/validate", {
+            "puzzle_id": "expired", "word": "wave", "chain": ["OCEAN"]
+        })
+        assert status == 200
+        assert payload["valid"] is True
+
+        status, _, _ = call(app, "POST", "/api/game/hint", {"puzzle_id": "expired"})
+        assert status == 404
+
+    def test_budget_exceeded_degrades(self, app):
+        """Test fast degraded answers when searches run out of budget."""
+        app.engine.pathfinder.max_expansions = 0
+        status, _, payload = call(app, "POST", "/api/game/hint", {
+            "start_word": "FISH", "end_word": "WATER", "chain": []
+        })
+        assert status == 200
+        assert payload["type"] == "unavailable"
+        assert payload["degraded"] is True
+
+        status, _, payload = call(app, "POST", "/api/game/validate-chain", {
+            "start_word": "FISH", "end_word": "WATER", "chain": ["OCEAN"]
+        })
+        assert status == 503
+        assert payload["degraded"] is True
+
+        app.engine.PUZZLE_MAX_EXPANSIONS = 0
+        status, _, payload = call(app, "GET", "/api/game/new")
+        assert status == 503
+        assert payload["degraded"] is True
+
+    def test_timeseries(self, app):
+        """Test that the time series reads compacted rollups."""
+        call(app, "POST", "/api/game/submit", {
+            "start_word": "FISH", "end_word": "WATER", "path": ["OCEAN", "WAVE"]
+        })
+        app.engine.rollups.compact()
+
+        status, _, payload = call(app, "GET", "/api/stats/timeseries", query=b"granularity=hour")
+        assert status == 200
+        assert payload["points"][0]["games"] == 1
+
+        assert call(app, "GET", "/api/stats/timeseries", query=b"granularity=week")[0] == 400
+
+    def test_export_streams(self, app):
+        """Test that the export streams as a chunked JSONL download."""
+        for _ in range(3):
+            call(app, "POST", "/api/game/submit", {
+                "start_word": "FISH", "end_word": "WATER", "path": ["OCEAN", "WAVE"]
+            })
+
+        status, headers, body = call(app, "GET", "/api/stats/export", query=b"format=jsonl")
+        assert status == 200
+        assert headers[b"content-type"] == b"application/x-ndjson"
+        games = [json.loads(line) for line in body.splitlines()]
+        assert [g["player_path"] for g in games] == [["OCEAN", "WAVE"]] * 3
+
+        assert call(app, "GET", "/api/stats/export", query=b"format=xml")[0] == 400
+
+    def test_graph_info(self, app):
+        """Test that graph info includes the analytics summary."""
+        status, _, payload = call(app, "GET", "/api/stats/graph")
+
+        assert status == 200
+        assert payload["total_words"] == 4
+        assert payload["analytics"]["components"]["count"] == 1
+        assert payload["analytics"]["hubs"][0]["word"] in ("OCEAN", "WAVE")
+
+    def test_stats_trailing_slash(self, app):
+        """Test that the stats root matches the Flask URL."""
+        status, _, payload = call(app, "GET", "/api/stats/")
+
+        assert status == 200
+        assert payload["total_games"] == 0
+
+    def test_new_game_invalid_difficulty(self, app):
+        """Test difficulty validation."""
+        status, _, _ = call(app, "GET", "/api/game/new", query=b"difficulty=extreme")
+        assert status == 400
+
+    def test_new_game_seed(self, app):
+        """Test that seeded puzzles repeat and bad seeds are rejected."""
+        query = b"difficulty=easy&seed=7"
+        status, _, first = call(app, "GET", "/api/game/new", query=query)
+        assert status == 200
+        second = call(app, "GET", "/api/game/new", query=query)[2]
+        # Same puzzle, each in its own session
+        assert second.pop("puzzle_id") != first.pop("puzzle_id")
+        assert second == first
+
+        assert call(app, "GET", "/api/game/new", query=b"seed=abc")[0] == 400
+
+    def test_unknown_route_and_method(self, app):
+        """Test 404 and 405 handling."""
+        assert call(app, "GET", "/api/nope")[0] == 404
+        assert call(app, "GET", "/api/game/validate")[0] == 405
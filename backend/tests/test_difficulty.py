@@ -0,0 +1,122 @@
+"""
+Tests for the puzzle difficulty model.
+
+Uses small real graphs whose shortest-path counts are known exactly.
+"""
+
+import pytest
+from app.models.memory import MemoryStorage
+from app.models.word_graph import WordGraph
+from app.services.budget import SearchBudget, SearchBudgetExceeded
+from app.services.difficulty import DifficultyModel, PairFeatures
+from app.services.vectorized import HAS_NUMPY, CSRGraph
+
+
+@pytest.fixture
+def graph():
+    """
+    Create a graph with a hub H and a quiet route:
+
+        S - H - T        (H also links to X1..X4)
+        S - A - B - U
+        T - U
+    """
+    edges = [
+        ("S", "H"), ("H", "T"), ("S", "A"), ("A", "B"), ("B", "U"), ("T", "U"),
+        ("H", "X1"), ("H", "X2"), ("H", "X3"), ("H", "X4"),
+    ]
+    adjacency = {}
+    for word1, word2 in edges:
+        adjacency.setdefault(word1, []).append(word2)
+        adjacency.setdefault(word2, []).append(word1)
+    return WordGraph.from_snapshot((list(adjacency), adjacency))
+
+
+@pytest.fixture
+def model(graph):
+    """Create a model over the graph with empty game history."""
+    return DifficultyModel(graph, MemoryStorage(), min_length=2, max_length=5)
+
+
+class TestDifficultyModel:
+    """Test features, scoring and batch computation."""
+
+    def test_hubs(self, model):
+        """Test that only the high-degree word is a hub."""
+        assert model.hubs() == {"H"}
+
+    def test_features(self, model):
+        """Test shortest-path counts with and without hubs."""
+        features = model.features_from("s")
+
+        assert features["T"] == PairFeatures(2, 1.0, 0.0)
+        # S-H-T-U and S-A-B-U
+        assert features["U"] == PairFeatures(3, 2.0, 1.0)
+        assert "A" not in features  # below min_length
+
+    def test_score_terms(self, model):
+        """Test that each term moves the score the right way."""
+        unique = PairFeatures(3, 1.0, 1.0)
+
+        assert model.score(PairFeatures(4, 1.0, 1.0)) > model.score(unique)
+        assert model.score(PairFeatures(3, 8.0, 8.0)) < model.score(unique)
+        assert model.score(PairFeatures(3, 1.0, 0.0)) < model.score(unique)
+        assert model.score(unique, games=20, solved=2) > model.score(unique)
+        assert model.score(unique, games=20, solved=20) < model.score(unique)
+
+    def test_solve_rate_from_history(self, graph):
+        """Test that recorded games feed pair scores."""
+        storage = MemoryStorage()
+        model = DifficultyModel(graph, storage, min_length=2, max_length=5)
+        before = model.pair_score("S", "U")
+
+        for _ in range(10):
+            storage.save_game("S", "U", [], ["S", "A", "B", "U"], -1, 3, 0, 10)
+
+        assert model.pair_score("S", "U") > before
+        assert model.pair_score("S", "A") is None
+
+    def test_partial_credit_is_not_a_solve(self, graph):
+        """Test that broken paths scoring partial credit count as failures."""
+        storage = MemoryStorage()
+        model = DifficultyModel(graph, storage, min_length=2, max_length=5)
+        storage.save_game("S", "U", [], ["S", "A", "B", "U"], -1, 3, 0, 10)
+        failed = model.pair_score("S", "U")
+
+        storage.save_game("S", "U", ["A"], ["S", "A", "B", "U"], -1, 3, 10, 10)
+        assert storage.puzzle_results("S")["U"] == (2, 0)
+        assert model.pair_score("S", "U") > failed
+
+    def test_bfs_spends_budget(self, model):
+        """Test that the feature BFS is charged per expansion and can run out."""
+        budget = SearchBudget()
+        model.scores_from("S", budget)
+        assert budget.expansions == len(model.graph.get_all_words())
+
+        # Cached starts cost nothing; an exhausted BFS caches nothing
+        model.scores_from("S", SearchBudget(max_expansions=0))
+        with pytest.raises(SearchBudgetExceeded):
+            model.scores_from("T", SearchBudget(max_expansions=3))
+        assert "T" not in model._features
+
+    def test_cache_is_bounded_and_invalidated(self, graph):
+        """Test LRU eviction and graph-change invalidation."""
+        model = DifficultyModel(graph, MemoryStorage(), cache_size=2)
+        for word in ("S", "T", "U"):
+            model.features_from(word)
+        assert list(model._features) == ["T", "U"]
+
+        model._on_graph_change([])
+        assert not model._features
+        assert model._hubs is None
+
+    @pytest.mark.skipif(not HAS_NUMPY, reason="NumPy not installed")
+    def test_vectorized_matches_bfs(self, graph):
+        """Test that the batch job agrees with per-start BFS."""
+        python = DifficultyModel(graph, MemoryStorage())
+        vectorized = DifficultyModel(
+            graph, MemoryStorage(), csr=lambda: CSRGraph.from_graph(graph)
+        )
+        words = sorted(graph.get_all_words())
+
+        assert dict(vectorized.iter_features(words)) == dict(python.iter_features(words))
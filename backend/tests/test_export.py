@@ -0,0 +1,131 @@
+"""
+Tests for the streaming game history export.
+
+Covers each format over text and packed paths, resuming with after_id,
+archived months, and the chunked HTTP endpoint.
+"""
+
+import csv
+import io
+import json
+import pytest
+from app.models.memory import MemoryStorage
+from app.routes import stats_routes
+from app.services.archive import GameArchive
+from app.services.export import HAS_PYARROW, GameExport
+from app.services.game_engine import GameEngine
+
+
+@pytest.fixture
+def engine():
+    """Create engine over a store with one text-path and two packed-path games."""
+    engine = GameEngine(storage=MemoryStorage())
+    engine.db.save_game("CAT", "DOG", ["PET"], ["CAT", "PET", "DOG"], 1, 2, 100, 10)
+    for path in (["PET", "BONE"], ["FUR"]):
+        engine.db.save_game(
+            "CAT", "DOG", engine.paths.encode(path),
+            engine.paths.encode(["CAT", "PET", "DOG"]), len(path), 2, 80, 10
+        )
+    return engine
+
+
+class TestGameExport:
+    """Test serialization of every format."""
+
+    def test_jsonl(self, engine):
+        """Test that each game is one line with decoded paths."""
+        export = GameExport(engine, "jsonl", batch_size=2)
+        chunks = list(export.chunks())
+        games = [json.loads(line) for line in b"".join(chunks).splitlines()]
+
+        assert len(chunks) == 2
+        assert export.exported == 3
+        assert [g["player_path"] for g in games] == [["PET"], ["PET", "BONE"], ["FUR"]]
+        assert games[1]["optimal_path"] == ["CAT", "PET", "DOG"]
+
+    def test_csv_resumes_after_id(self, engine):
+        """Test the CSV header and that after_id skips exported games."""
+        out = io.BytesIO()
+
+        assert GameExport(engine, "csv", after_id=1).write(out) == 2
+        rows = list(csv.DictReader(io.StringIO(out.getvalue().decode("utf-8"))))
+        assert [row["id"] for row in rows] == ["2", "3"]
+        assert rows[0]["player_path"] == "PET,BONE"
+
+    def test_empty_csv_has_header(self):
+        """Test that an empty history still yields the header row."""
+        export = GameExport(GameEngine(storage=MemoryStorage()), "csv")
+
+        assert b"".join(export.chunks()).startswith(b"id,start_word,end_word,")
+
+    @pytest.mark.skipif(not HAS_PYARROW, reason="pyarrow not installed")
+    def test_parquet(self, engine):
+        """Test that Parquet output streams as one row group per batch."""
+        import pyarrow.parquet
+
+        data = b"".join(GameExport(engine, "parquet", batch_size=2).chunks())
+        parquet = pyarrow.parquet.ParquetFile(io.BytesIO(data))
+
+        assert parquet.metadata.num_row_groups == 2
+        assert parquet.read().column("player_path").to_pylist()[2] == ["FUR"]
+
+    def test_includes_archived_months(self, temp_db, tmp_path):
+        """Test that archived months are exported first and can be left out."""
+        engine = GameEngine(db_path=str(temp_db.db_path))
+        engine.archive = GameArchive(engine.db, engine.rollups, archive_dir=str(tmp_path))
+        for completed_at in ("2024-01-05", "2024-01-20", "2024-02-03", "2024-06-01"):
+            engine.db.save_game("CAT", "DOG", ["PET"], ["CAT", "PET", "DOG"], 1, 2, 100, 10)
+            temp_db.execute(
+                "UPDATE games SET completed_at = ? WHERE id = (SELECT MAX(id) FROM games)",
+                (completed_at,)
+            )
+        engine.rollups.compact()
+        assert engine.archive.archive(before="2024-03-01") == 3
+
+        def ids(**kwargs):
+            export = GameExport(engine, "jsonl", batch_size=2, **kwargs)
+            return [json.loads(line)["id"] for line in b"".join(export.chunks()).splitlines()]
+
+        # Ids 1 and 2 are in the January file, 3 in February's
+        assert ids() == [1, 2, 3, 4]
+        assert ids(after_id=2) == [3, 4]
+        assert ids(include_archived=False) == [4]
+
+    def test_invalid_format(self, engine):
+        """Test that unknown formats are rejected up front."""
+        with pytest.raises(ValueError):
+            GameExport(engine, "xml")
+
+
+class TestExportEndpoint:
+    """Test the chunked /api/stats/export endpoint."""
+
+    def test_streams_csv(self, client, engine, monkeypatch):
+        """Test the download headers and body."""
+        monkeypatch.setattr(stats_routes, "get_engine", lambda: engine)
+
+        response = client.get("/api/stats/export?format=csv")
+
+        assert response.status_code == 200
+        assert response.is_streamed
+        assert response.mimetype == "text/csv"
+        assert 'filename="games.csv"' in response.headers["Content-Disposition"]
+        assert len(response.get_data().splitlines()) == 4
+
+    def test_rejects_unknown_format(self, client, engine, monkeypatch):
+        """Test that a bad format is a JSON 400."""
+        monkeypatch.setattr(stats_routes, "get_engine", lambda: engine)
+
+        response = client.get("/api/stats/export?format=xml")
+
+        assert response.status_code == 400
+        assert "error" in response.get_json()
+
+    def test_rejects_malformed_after_id(self, client, engine, monkeypatch):
+        """Test that a bad resume token is a 400, not an export from the start."""
+        monkeypatch.setattr(stats_routes, "get_engine", lambda: engine)
+
+        response = client.get("/api/stats/export?after_id=abc")
+
+        assert response.status_code == 400
+        assert response.get_json() == {"error": "after_id must be an integer"}
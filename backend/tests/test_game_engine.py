@@ -4,9 +4,17 @@ Tests for the Game Engine.
 Validates puzzle generation, scoring, and game logic.
 """
 
+import sqlite3
 import pytest
+from dataclasses import asdict
 from unittest.mock import Mock, patch, MagicMock
+from app.models.database import Database
+from app.models.memory import MemoryStorage
+from app.models.word_graph import WordGraph
+from app.routes import stats_routes
+from app.services.budget import SearchBudget, SearchBudgetExceeded
 from app.services.game_engine import GameEngine, GameResult, Puzzle
+from app.services.path_codec import PathCodec, pack_ids, unpack_ids
 
 
 class TestScoring:
@@ -15,10 +23,9 @@ class TestScoring:
     @pytest.fixture
     def engine(self):
         """Create game engine with mocked dependencies."""
-        with patch('app.services.game_engine.Database'), \
-             patch('app.services.game_engine.WordGraph'), \
+        with patch('app.services.game_engine.WordGraph'), \
              patch('app.services.game_engine.Pathfinder'):
-            return GameEngine()
+            return GameEngine(storage=MemoryStorage())
     
     def test_score_beat_algorithm(self, engine):
         """Test bonus score for beating the algorithm."""
@@ -86,6 +93,13 @@ class TestGameResult:
         assert d["end_word"] == "KEYBOARD"
         assert d["score"] == 100
         assert d["is_perfect"] is True
+    
+    def test_to_dict_matches_fields(self):
+        """Test that direct serialization covers every field."""
+        result = GameResult("A", "B", [], ["A", "B"], 1, 1, 100, True)
+        
+        assert result.to_dict() == asdict(result)
+        assert not hasattr(result, "__dict__")  # slotted
 
 
 class TestPuzzle:
@@ -106,6 +120,11 @@ class TestPuzzle:
         assert d["end_word"] == "DOG"
         assert d["optimal_length"] == 4
         assert d["difficulty"] == "medium"
+    
+    def test_to_dict_matches_fields(self):
+        """Test that direct serialization covers every field."""
+        puzzle = Puzzle("CAT", "DOG", 4, "medium")
+        assert puzzle.to_dict() == asdict(puzzle)
 
 
 class TestWordValidation:
@@ -114,11 +133,10 @@ class TestWordValidation:
     @pytest.fixture
     def engine_with_graph(self):
         """Create engine with mock graph."""
-        with patch('app.services.game_engine.Database'), \
-             patch('app.services.game_engine.WordGraph') as MockGraph, \
+        with patch('app.services.game_engine.WordGraph') as MockGraph, \
              patch('app.services.game_engine.Pathfinder'):
             
-            engine = GameEngine()
+            engine = GameEngine(storage=MemoryStorage())
             
             # Configure mock graph
             valid_words = {"OCEAN", "WAVE", "WATER", "FISH"}
@@ -132,6 +150,7 @@ class TestWordValidation:
             engine.graph.has_word = lambda w: w.upper() in valid_words
             engine.graph.are_connected = lambda w1, w2: w2.upper() in connections.get(w1.upper(), set())
             engine.graph.get_neighbors = lambda w: connections.get(w.upper(), set())
+            engine.graph.neighbor_preview = lambda w: tuple(sorted(connections.get(w.upper(), ())))
             
             return engine
     
@@ -141,6 +160,7 @@ class TestWordValidation:
         
         assert result["valid"] is True
         assert result["word"] == "WAVE"
+        assert result["connections"] == ("OCEAN", "WATER")
     
     def test_validate_word_not_found(self, engine_with_graph):
         """Test validation with unknown word."""
@@ -172,17 +192,67 @@ class TestWordValidation:
         assert result["error"] == "max_length"
 
 
+class TestChainValidation:
+    """Test whole-chain validation."""
+    
+    @pytest.fixture
+    def engine(self):
+        """Create engine over a chain graph A-B-C-D plus an island Z."""
+        adjacency = {"A": ["B"], "B": ["A", "C"], "C": ["B", "D"], "D": ["C"], "Z": []}
+        graph = WordGraph.from_snapshot((list(adjacency), adjacency))
+        return GameEngine(graph=graph, storage=MemoryStorage())
+    
+    def test_complete_chain(self, engine):
+        """Test a chain that reaches the end word."""
+        report = engine.validate_chain("a", "d", ["b", "c"])
+        
+        assert report["valid"] is True
+        assert report["complete"] is True
+        assert report["valid_length"] == 2
+        assert [p["distance_to_end"] for p in report["positions"]] == [3, 2, 1]
+    
+    def test_per_position_diagnostics(self, engine):
+        """Test that every position reports its own error."""
+        report = engine.validate_chain("A", "D", ["B", "NOPE", "A", "Z"])
+        
+        assert report["valid"] is False
+        assert report["complete"] is False
+        assert report["valid_length"] == 1
+        assert [p.get("error") for p in report["positions"]] == [
+            None, None, "word_not_found", "duplicate_word", "not_connected"
+        ]
+        assert report["positions"][4]["distance_to_end"] is None
+    
+    def test_one_search_at_most(self, engine):
+        """Test that known distances are used before searching."""
+        with patch.object(
+            engine.pathfinder, "distances_from", wraps=engine.pathfinder.distances_from
+        ) as search:
+            engine.validate_chain("A", "D", ["B"], distances={"A": 3, "B": 2})
+            search.assert_not_called()
+            engine.validate_chain("A", "D", ["B", "C"], distances={"A": 3})
+            assert search.call_count == 1
+    
+    def test_search_is_budgeted(self, engine):
+        """Test that the BFS from the end word runs under a budget."""
+        with pytest.raises(SearchBudgetExceeded):
+            engine.validate_chain("A", "D", ["B"], budget=SearchBudget(max_expansions=1))
+        
+        engine.pathfinder.max_expansions = 1
+        with pytest.raises(SearchBudgetExceeded):
+            engine.validate_chain("A", "D", ["B"])
+
+
 class TestHints:
     """Test hint generation."""
     
     @pytest.fixture
     def engine_with_pathfinder(self):
         """Create engine with mock pathfinder."""
-        with patch('app.services.game_engine.Database'), \
-             patch('app.services.game_engine.WordGraph'), \
+        with patch('app.services.game_engine.WordGraph'), \
              patch('app.services.game_engine.Pathfinder') as MockPathfinder:
             
-            engine = GameEngine()
+            engine = GameEngine(storage=MemoryStorage())
             
             # Configure mock pathfinder
             engine.pathfinder.find_shortest_path = Mock(
@@ -205,3 +275,443 @@ class TestHints:
         assert "masked_word" in hint
         assert hint["hint_level"] == 1
 
+
+
+class TestBatchJobs:
+    """Test bulk analytics jobs."""
+    
+    @pytest.fixture
+    def engine(self):
+        """Create engine over a detached chain graph A-B-C-D-E-F."""
+        adjacency = {
+            "A": ["B"],
+            "B": ["A", "C"],
+            "C": ["B", "D"],
+            "D": ["C", "E"],
+            "E": ["D", "F"],
+            "F": ["E"],
+        }
+        graph = WordGraph.from_snapshot((list(adjacency), adjacency))
+        return GameEngine(graph=graph, storage=MemoryStorage())
+    
+    def test_distance_histogram(self, engine):
+        """Test pair counts over all sources."""
+        histogram = engine.distance_histogram(sample_size=None)
+        assert histogram == {1: 10, 2: 8, 3: 6, 4: 4, 5: 2}
+    
+    def test_fill_puzzle_pool(self, engine):
+        """Test that pooled puzzles match the requested difficulty."""
+        puzzles = engine.fill_puzzle_pool("hard", count=5, sample_size=None, seed=1)
+        
+        assert len(puzzles) == 5
+        for puzzle in puzzles:
+            assert 4 <= puzzle.optimal_length <= 5
+            assert engine.pathfinder.get_path_length(
+                puzzle.start_word, puzzle.end_word
+            ) == puzzle.optimal_length
+    
+    def test_backends_agree(self, engine):
+        """Test that NumPy and pure-Python runs give the same pool."""
+        with patch('app.services.game_engine.HAS_NUMPY', False):
+            python_pool = engine.fill_puzzle_pool("medium", count=4, sample_size=None, seed=7)
+        
+        assert engine.fill_puzzle_pool("medium", count=4, sample_size=None, seed=7) == python_pool
+
+
+class TestPuzzleSampling:
+    """Test component-aware, distance-stratified puzzle generation."""
+    
+    @pytest.fixture
+    def cycle_engine(self):
+        """Create engine over a 12-word cycle W0-W1-...-W11-W0."""
+        words = [f"W{i}" for i in range(12)]
+        adjacency = {
+            word: [words[(i - 1) % 12], words[(i + 1) % 12]] for i, word in enumerate(words)
+        }
+        graph = WordGraph.from_snapshot((words, adjacency))
+        return GameEngine(graph=graph, storage=MemoryStorage())
+    
+    def test_pooled_puzzles_score_like_inline(self, temp_db):
+        """Test that workers score puzzles against the same game history."""
+        words = [f"W{i}" for i in range(12)]
+        adjacency = {
+            word: [words[(i - 1) % 12], words[(i + 1) % 12]] for i, word in enumerate(words)
+        }
+        graph = WordGraph.from_snapshot((words, adjacency))
+        engine = GameEngine(graph=graph, storage=temp_db, search_processes=1)
+        engine.search_pool.inline_max_words = 0
+        try:
+            seeds = range(6)
+            unplayed = [engine._generate_puzzle("hard", seed) for seed in seeds]
+            # Every attempt on these pairs failed
+            for puzzle in unplayed:
+                for _ in range(10):
+                    temp_db.save_game(puzzle.start_word, puzzle.end_word, [], [], -1, 5, 0, 10)
+            
+            inline = [engine._generate_puzzle("hard", seed) for seed in seeds]
+            pooled = [engine.generate_puzzle("hard", seed=seed) for seed in seeds]
+            
+            assert inline != unplayed
+            for puzzle in pooled:
+                puzzle.puzzle_id = None
+            assert pooled == inline
+        finally:
+            engine.close()
+    
+    def test_starts_share_a_component_with_ends(self):
+        """Test that starts come only from components big enough."""
+        # Chain A-B-C-D-E plus many small islands
+        adjacency = {"A": ["B"], "B": ["A", "C"], "C": ["B", "D"], "D": ["C", "E"], "E": ["D"]}
+        words = list(adjacency)
+        for i in range(50):
+            island = [f"X{i}", f"Y{i}"]
+            adjacency[island[0]], adjacency[island[1]] = [island[1]], [island[0]]
+            words += island
+        graph = WordGraph.from_snapshot((words, adjacency))
+        engine = GameEngine(graph=graph, storage=MemoryStorage())
+        
+        for seed in range(20):
+            puzzle = engine.generate_puzzle("medium", seed=seed)
+            assert puzzle.start_word in "ABCDE"
+            assert puzzle.end_word in "ABCDE"
+            assert 45 <= puzzle.difficulty_score < 65
+    
+    def test_one_bfs_per_puzzle(self, cycle_engine):
+        """Test that a start with a non-empty band needs a single search."""
+        searches = []
+        bfs_features = cycle_engine.difficulty._bfs_features
+        cycle_engine.difficulty._bfs_features = (
+            lambda word, budget=None: searches.append(word) or bfs_features(word, budget)
+        )
+        
+        puzzle = cycle_engine.generate_puzzle("hard", seed=5)
+        
+        assert searches == [puzzle.start_word]
+        assert cycle_engine.pathfinder.get_path_length(
+            puzzle.start_word, puzzle.end_word
+        ) == puzzle.optimal_length
+    
+    def test_seed_is_reproducible(self, cycle_engine):
+        """Test that a seed always yields the same puzzle."""
+        assert cycle_engine.generate_puzzle("easy", seed=42) == \
+            cycle_engine.generate_puzzle("easy", seed=42)
+    
+    def test_difficulty_distribution(self, cycle_engine):
+        """Test that scores stay in band and ends are drawn uniformly from it."""
+        lengths = {}
+        for seed in range(400):
+            puzzle = cycle_engine.generate_puzzle("hard", seed=seed)
+            assert puzzle.difficulty == "hard"
+            assert puzzle.difficulty_score >= 65
+            lengths[puzzle.optimal_length] = lengths.get(puzzle.optimal_length, 0) + 1
+        
+        # Unique paths and no hubs: lengths 4 and 5 score as hard, and
+        # every word on the cycle has two words at each distance
+        assert set(lengths) == {4, 5}
+        assert 0.4 < lengths[4] / 400 < 0.6
+
+
+class TestGameHistory:
+    """Test keyset-paginated game history."""
+    
+    @pytest.fixture
+    def engine(self, temp_db):
+        """Create engine over a database with 25 recorded games."""
+        for i in range(25):
+            temp_db.insert(
+                """
+                INSERT INTO games (start_word, end_word, player_path, optimal_path,
+                                   player_length, optimal_length, score, completed_at)
+                VALUES (?, ?, 'X', 'X', 2, 2, ?, ?)
+                """,
+                (
+                    "OCEAN" if i % 5 == 0 else "CAT",
+                    "FISH" if i % 3 == 0 else "DOG",
+                    (i % 11) * 10,
+                    # Pairs of games share a timestamp to exercise the id tiebreak
+                    f"2024-01-{i // 2 + 1:02d} 12:00:00",
+                )
+            )
+        return GameEngine(db_path=str(temp_db.db_path))
+    
+    def _all_pages(self, engine, **filters):
+        """Follow cursors until the last page."""
+        ids, cursor = [], None
+        while True:
+            page = engine.get_game_history(limit=4, cursor=cursor, **filters)
+            ids += [g["id"] for g in page["games"]]
+            cursor = page["next_cursor"]
+            if cursor is None:
+                return ids
+    
+    def test_pages_cover_history_once(self, engine):
+        """Test that paging returns every game exactly once, newest first."""
+        assert self._all_pages(engine) == list(range(25, 0, -1))
+    
+    def test_word_filter(self, engine):
+        """Test filtering by start or end word."""
+        ids = self._all_pages(engine, word="ocean")
+        expected = [i + 1 for i in range(24, -1, -1) if i % 5 == 0]
+        assert ids == expected
+        
+        ids = self._all_pages(engine, word="FISH")
+        assert ids == [i + 1 for i in range(24, -1, -1) if i % 3 == 0]
+    
+    def test_score_and_date_filters(self, engine):
+        """Test score bounds and completed_at range."""
+        page = engine.get_game_history(
+            limit=100, min_score=50, max_score=80, since="2024-01-03", until="2024-01-08"
+        )
+        
+        for game in page["games"]:
+            assert 50 <= game["score"] <= 80
+            assert "2024-01-03" <= game["completed_at"] < "2024-01-08"
+        assert page["next_cursor"] is None
+    
+    def test_invalid_cursor(self, engine):
+        """Test that garbage cursors are rejected."""
+        with pytest.raises(ValueError):
+            engine.get_game_history(cursor="not-a-cursor")
+    
+    def test_pages_use_index_order(self, engine):
+        """Test that paging never sorts the table."""
+        plan = engine.db.execute(
+            """
+            EXPLAIN QUERY PLAN
+            SELECT * FROM games WHERE (completed_at, id) < (?, ?)
+            ORDER BY completed_at DESC, id DESC LIMIT 5
+            """,
+            ("2024-01-05 12:00:00", 9)
+        )
+        details = " ".join(row["detail"] for row in plan)
+        
+        assert "idx_games_completed" in details
+        assert "TEMP B-TREE" not in details
+    
+    def test_endpoint_rejects_malformed_bounds(self, client, engine, monkeypatch):
+        """Test that bad score bounds are a 400, not a silently dropped filter."""
+        monkeypatch.setattr(stats_routes, "get_engine", lambda: engine)
+        
+        response = client.get("/api/stats/games?limit=100&min_score=80")
+        assert response.status_code == 200
+        assert all(game["score"] >= 80 for game in response.get_json()["games"])
+        
+        for query in ("min_score=abc", "max_score=", "limit=x"):
+            response = client.get(f"/api/stats/games?{query}")
+            assert response.status_code == 400
+            assert response.get_json() == {"error": "limit and score bounds must be integers"}
+
+
+class TestLeaderboard:
+    """Test incrementally maintained leaderboard and percentiles."""
+    
+    @pytest.fixture
+    def engine(self, temp_db):
+        """Create engine with a small leaderboard."""
+        engine = GameEngine(db_path=str(temp_db.db_path))
+        engine.leaderboard.top_n = 3
+        return engine
+    
+    def _save(self, engine, score, player_length=3, start="CAT", end="DOG"):
+        result = GameResult(
+            start_word=start,
+            end_word=end,
+            player_path=["X"] * max(player_length - 1, 0),
+            optimal_path=[start, "X", end],
+            player_length=player_length,
+            optimal_length=2,
+            score=score,
+            is_perfect=False
+        )
+        engine.record_game(result)
+        return result
+    
+    def test_save_sets_percentile(self, engine):
+        """Saved games are ranked against earlier games on the same puzzle."""
+        assert self._save(engine, 50).percentile == 0.0
+        assert self._save(engine, 70).percentile == 50.0
+        assert self._save(engine, 30).percentile == 0.0
+        assert self._save(engine, 100, start="OCEAN").percentile == 0.0
+    
+    def test_histograms(self, engine):
+        """Per-puzzle and global histograms count every game."""
+        for score in (50, 50, 70):
+            self._save(engine, score)
+        self._save(engine, 0, player_length=-1, start="OCEAN")
+        
+        assert engine.leaderboard.histogram("cat", "dog") == {70: 1, 50: 2}
+        assert engine.leaderboard.histogram() == {70: 1, 50: 2, 0: 1}
+        assert engine.leaderboard.percentile(60) == 75.0
+        assert engine.leaderboard.percentile(60, "NONE", "NONE") is None
+    
+    def test_top_is_bounded_and_ordered(self, engine):
+        """Leaderboard keeps the best top_n completed games."""
+        for score, length in ((50, 3), (90, 4), (90, 3), (70, 3), (100, -1)):
+            self._save(engine, score, player_length=length)
+        
+        top = engine.leaderboard.top(10)
+        assert [(g["score"], g["player_length"]) for g in top] == [(90, 3), (90, 4), (70, 3)]
+        assert [g["rank"] for g in top] == [1, 2, 3]
+        assert all(g["completed_at"] for g in top)
+        
+        count = engine.db.execute_one("SELECT COUNT(*) AS n FROM leaderboard")["n"]
+        assert count == 3
+    
+    def test_rebuild_matches_incremental(self, engine):
+        """Backfill from games reproduces the incremental state."""
+        for score, length in ((50, 3), (90, 4), (90, 3), (70, 3), (100, -1)):
+            self._save(engine, score, player_length=length, start="CAT" if score < 80 else "OCEAN")
+        
+        histogram = engine.leaderboard.histogram()
+        top = engine.leaderboard.top(10)
+        engine.leaderboard.rebuild()
+        
+        assert engine.leaderboard.histogram() == histogram
+        assert engine.leaderboard.top(10) == top
+    
+    def test_puzzle_stats(self, engine):
+        """Puzzle summary includes distribution and optional percentile."""
+        for score in (50, 70):
+            self._save(engine, score)
+        
+        stats = engine.leaderboard.puzzle_stats("cat", "dog", score=60)
+        assert stats["total_games"] == 2
+        assert stats["score_distribution"] == {"70": 1, "50": 1}
+        assert stats["percentile"] == 50.0
+        assert "percentile" not in engine.leaderboard.puzzle_stats("CAT", "DOG")
+    
+    def test_endpoints_reject_malformed_ints(self, client, engine, monkeypatch):
+        """Test that bad limits and scores are a 400, as on the ASGI app."""
+        monkeypatch.setattr(stats_routes, "get_engine", lambda: engine)
+        self._save(engine, 70)
+        
+        response = client.get("/api/stats/leaderboard?limit=abc")
+        assert response.status_code == 400
+        assert response.get_json() == {"error": "limit must be an integer"}
+        
+        response = client.get("/api/stats/puzzle?start=CAT&end=DOG&score=abc")
+        assert response.status_code == 400
+        assert response.get_json() == {"error": "score must be an integer"}
+        
+        response = client.get("/api/stats/puzzle?start=CAT&end=DOG&score=60")
+        assert response.get_json()["percentile"] == 0.0
+
+
+class TestSplitStores:
+    """Test a read-only graph database beside a separate history database."""
+    
+    @pytest.fixture
+    def graph_path(self, tmp_path):
+        """Write a CAT-PET-DOG graph file."""
+        path = tmp_path / "graph.db"
+        writer = WordGraph(Database(str(path)))
+        writer.db.init_schema()
+        for word in ("CAT", "PET", "DOG"):
+            writer.add_word(word)
+        writer.add_connection("CAT", "PET")
+        writer.add_connection("PET", "DOG")
+        return path
+    
+    def test_games_go_to_history(self, graph_path, tmp_path):
+        """Games land in the history file; the graph file is never written."""
+        before = graph_path.read_bytes()
+        engine = GameEngine(db_path=str(tmp_path / "history.db"), graph_db_path=str(graph_path))
+        
+        result = engine.submit_solution("CAT", "DOG", ["PET"])
+        
+        assert result.score == 100
+        assert engine.get_total_games() == 1
+        assert engine.db.execute_one("PRAGMA journal_mode")["journal_mode"] == "wal"
+        assert graph_path.read_bytes() == before
+        with pytest.raises(sqlite3.OperationalError):
+            engine.graph.add_word("FISH")
+        engine.close()
+    
+    def test_single_file_compatibility(self, graph_path):
+        """Without a graph path, one file serves both as before."""
+        engine = GameEngine(db_path=str(graph_path))
+        
+        assert engine.graph_db is engine.db
+        engine.submit_solution("CAT", "DOG", ["PET"])
+        assert engine.get_total_games() == 1
+        engine.close()
+    
+    def test_store_is_required(self, graph_path):
+        """Test that an engine never falls back to a default database file."""
+        with pytest.raises(ValueError):
+            GameEngine()
+        with pytest.raises(ValueError):
+            GameEngine(graph_db_path=str(graph_path))
+    
+    def test_health_check_reads_configured_database(self, app, client, graph_path, monkeypatch):
+        """Test that the health check counts games in the app's DATABASE."""
+        app.config["DATABASE"] = str(graph_path)
+        monkeypatch.setattr(stats_routes, "_engine", None)
+        GameEngine(db_path=str(graph_path)).submit_solution("CAT", "DOG", ["PET"])
+        
+        assert client.get("/api/health").get_json()["total_games_played"] == 1
+        stats_routes._engine.close()
+
+
+class TestPathEncoding:
+    """Test packed word-id paths and the migration to them."""
+    
+    @pytest.fixture
+    def engine(self):
+        """Create engine over CAT-PET-DOG with in-memory storage."""
+        adjacency = {"CAT": ["PET"], "PET": ["CAT", "DOG"], "DOG": ["PET"]}
+        graph = WordGraph.from_snapshot((list(adjacency), adjacency))
+        return GameEngine(graph=graph, storage=MemoryStorage())
+    
+    @pytest.mark.parametrize("ids", [[], [0, 7, 255], [256, 3], [70000, 1]])
+    def test_pack_round_trip(self, ids):
+        """Ids round-trip at the narrowest width that fits."""
+        packed = pack_ids(ids)
+        
+        assert list(unpack_ids(packed)) == ids
+        assert len(packed) == 1 + len(ids) * packed[0]
+    
+    def test_packed_games_read_back(self, engine):
+        """Packed and text games come back as the same word lists."""
+        engine.submit_solution("CAT", "DOG", ["PET"])
+        engine.pack_paths = True
+        engine.submit_solution("CAT", "DOG", ["PET"])
+        
+        stored = engine.db.game_history(10)
+        assert [g["player_ids"] is None for g in stored] == [False, True]
+        assert [g["player_path"] for g in engine.get_game_history()["games"]] == [["PET"]] * 2
+        assert engine.decode_path(stored[0], "optimal") == ["CAT", "PET", "DOG"]
+    
+    def test_migration_packs_text_rows(self, engine):
+        """Migrated rows decode to their original paths."""
+        for _ in range(3):
+            engine.submit_solution("CAT", "DOG", ["PET"])
+        engine.submit_solution("CAT", "DOG", ["FISH"])
+        before = engine.get_game_history()["games"]
+        
+        assert engine.pack_stored_paths(batch_size=2) == 4
+        assert engine.pack_stored_paths() == 0
+        assert engine.get_game_history()["games"] == before
+        assert all(g["player_path"] is None for g in engine.db.game_history(10))
+    
+    def test_other_process_words_are_fetched(self, engine):
+        """Ids added through another codec are resolved on first sight."""
+        writer = PathCodec(engine.db)
+        
+        assert engine.paths.decode(writer.encode(["OWL", "CAT"])) == ["OWL", "CAT"]
+    
+    def test_ids_committed_out_of_order(self, engine):
+        """Words whose id is below the highest cached one are still found."""
+        engine.db.path_words.update({"CAT": 1, "DOG": 3})
+        reader = PathCodec(engine.db)
+        assert reader.decode(pack_ids([3])) == ["DOG"]
+        engine.paths.encode(["DOG"])
+        # Committed late by a concurrent writer, with a lower sequence value
+        engine.db.path_words["PET"] = 2
+        
+        assert list(unpack_ids(engine.paths.encode(["PET", "DOG"]))) == [2, 3]
+        assert reader.decode(pack_ids([2, 3])) == ["PET", "DOG"]
+        with pytest.raises(ValueError):
+            reader.decode(pack_ids([4]))
+        with pytest.raises(ValueError):
+            engine.paths.decode(pack_ids([99]))
@@ -0,0 +1,156 @@
+"""
+Tests for graph analytics.
+
+Uses a small real graph whose centrality values are known exactly.
+"""
+
+import pytest
+from app.models.word_graph import WordGraph
+from app.services.graph_analytics import GraphAnalytics, brandes
+
+
+class TestGraphAnalytics:
+    """Test components, degrees and sampled path metrics."""
+
+    @pytest.fixture
+    def graph(self, temp_db):
+        """Create a path A-B-C-D, a pair E-F and an isolated G."""
+        graph = WordGraph(temp_db)
+        for word in "ABCDEFG":
+            graph.add_word(word)
+        for word1, word2 in [("A", "B"), ("B", "C"), ("C", "D"), ("E", "F")]:
+            graph.add_connection(word1, word2)
+        graph.load()
+        return graph
+
+    def test_components(self, graph, temp_db):
+        """Test component labelling."""
+        analytics = GraphAnalytics(graph, temp_db)
+
+        assert analytics.components() == {
+            "count": 3, "largest": 4, "isolated": 1, "sizes": [4, 2, 1]
+        }
+        assert graph.same_component("a", "D")
+        assert not graph.same_component("A", "E")
+
+    def test_degree_distribution(self, graph, temp_db):
+        """Test degree counts and mean."""
+        degrees = GraphAnalytics(graph, temp_db).degree_distribution()
+
+        assert degrees["counts"] == {"0": 1, "1": 4, "2": 2}
+        assert degrees["max"] == 2
+        assert degrees["mean"] == round(8 / 7, 2)
+
+    def test_incremental_updates(self, graph, temp_db):
+        """Test that graph deltas merge components and move degrees."""
+        analytics = GraphAnalytics(graph, temp_db)
+        analytics.components()
+
+        other = WordGraph(temp_db)
+        other.add_word("H")
+        other.add_connection("D", "E")
+        other.add_connection("G", "H")
+        graph.refresh(force=True)
+
+        assert analytics.components()["sizes"] == [6, 2]
+        assert graph.same_component("A", "F")
+        assert analytics.degree_distribution()["counts"] == {"1": 4, "2": 4}
+
+    def test_exact_betweenness_when_sampling_everything(self, graph, temp_db):
+        """Test that a full sample gives exact betweenness and eccentricity."""
+        analytics = GraphAnalytics(graph, temp_db, sample_size=100)
+        run = analytics.compute()
+
+        # On the path A-B-C-D, B and C each lie on two shortest paths
+        assert analytics.betweenness("B") == pytest.approx(2.0)
+        assert analytics.betweenness("C") == pytest.approx(2.0)
+        assert analytics.betweenness("A") == 0.0
+        assert run["words"]["A"]["eccentricity"] == 3
+        assert run["summary"]["eccentricity"]["diameter_estimate"] == 3
+        assert [hub["word"] for hub in run["summary"]["hubs"][:2]] == ["B", "C"]
+
+    def test_run_is_persisted_and_reused(self, graph, temp_db, monkeypatch):
+        """Test that a new process reuses the stored run until the graph changes."""
+        GraphAnalytics(graph, temp_db, sample_size=100).compute()
+
+        fresh = GraphAnalytics(WordGraph(temp_db), temp_db, sample_size=100)
+        calls = []
+        monkeypatch.setattr(fresh, "compute", lambda: calls.append(1))
+        summary = fresh.summary()
+
+        assert calls == []
+        assert summary["hubs"][0]["word"] in ("B", "C")
+        assert summary["computed_at"] is not None
+
+    def test_recomputes_after_graph_change(self, graph, temp_db):
+        """Test that sampled metrics follow the graph version."""
+        analytics = GraphAnalytics(graph, temp_db, sample_size=100)
+        before = analytics.summary()
+
+        WordGraph(temp_db).add_connection("D", "E")
+        graph.refresh(force=True)
+        after = analytics.summary()
+
+        assert after["version"] > before["version"]
+        assert after["eccentricity"]["diameter_estimate"] == 5
+
+    def test_background_job_serves_stale_run(self, graph, temp_db, monkeypatch):
+        """Test that requests serve the last run while the job recomputes it."""
+        analytics = GraphAnalytics(graph, temp_db, sample_size=100)
+        before = analytics.summary()
+        assert before["stale"] is False
+
+        analytics.start(interval=60)
+        try:
+            WordGraph(temp_db).add_connection("D", "E")
+            graph.refresh(force=True)
+            calls = []
+            compute = analytics.compute
+            monkeypatch.setattr(analytics, "compute", lambda: calls.append(1) or compute())
+            stale = analytics.summary()
+
+            assert calls == []
+            assert stale["stale"] is True
+            assert stale["version"] == before["version"]
+            assert stale["components"]["largest"] == 6  # Always current
+
+            # What the job runs on its next tick
+            assert analytics.refresh() is True
+            assert calls == [1]
+            after = analytics.summary()
+            assert after["stale"] is False
+            assert after["eccentricity"]["diameter_estimate"] == 5
+        finally:
+            analytics.stop()
+        assert analytics._thread is None
+
+    def test_refresh_reuses_run_persisted_elsewhere(self, graph, temp_db, monkeypatch):
+        """Test that the job loads another process's run for this version."""
+        analytics = GraphAnalytics(graph, temp_db, sample_size=100)
+        analytics.summary()
+        WordGraph(temp_db).add_connection("D", "E")
+        graph.refresh(force=True)
+        GraphAnalytics(graph, temp_db, sample_size=100).compute()
+
+        monkeypatch.setattr(analytics, "compute", lambda: pytest.fail("recomputed"))
+        assert analytics.refresh() is True
+        assert analytics.refresh() is False
+        assert analytics.summary()["version"] == graph.version
+
+    def test_parallel_matches_inline(self, graph, temp_db):
+        """Test that worker processes produce the same estimates."""
+        inline = GraphAnalytics(graph, None, sample_size=100).compute()
+        analytics = GraphAnalytics(graph, None, sample_size=100, processes=2)
+        analytics.CHUNK_SIZE = 2
+        parallel = analytics.compute()
+
+        assert parallel["words"] == inline["words"]
+
+    def test_brandes_counts_multiple_shortest_paths(self):
+        """Test dependency splitting on a square."""
+        square = {"A": ["B", "D"], "B": ["A", "C"], "C": ["B", "D"], "D": ["A", "C"]}
+        sums, eccentricity = brandes(square.__getitem__, square)
+
+        # A-C and B-D each have two shortest paths, split between the middles
+        assert sums == {word: pytest.approx(1.0) for word in "ABCD"}
+        assert eccentricity == dict.fromkeys("ABCD", 2)
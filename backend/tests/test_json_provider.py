@@ -0,0 +1,32 @@
+"""
+Tests for the JSON provider registration.
+"""
+
+import json
+import pytest
+from app.json_provider import HAS_ORJSON, dumps_bytes
+from app.services.game_engine import Puzzle
+
+
+class TestJsonProvider:
+    """Test API response serialization."""
+    
+    def test_dumps_bytes(self):
+        """Test payload encoding round-trips."""
+        payload = {"word": "OCEAN", "connections": ["WAVE"], "valid": True}
+        assert json.loads(dumps_bytes(payload)) == payload
+    
+    def test_response_body(self, app):
+        """Test that app responses decode to the original payload."""
+        puzzle = Puzzle("CAT", "DOG", 3, "easy")
+        
+        with app.app_context():
+            response = app.json.response(puzzle.to_dict())
+        
+        assert response.mimetype == "application/json"
+        assert json.loads(response.get_data()) == puzzle.to_dict()
+    
+    @pytest.mark.skipif(not HAS_ORJSON, reason="orjson not installed")
+    def test_orjson_registered(self, app):
+        """Test that the orjson provider is used when available."""
+        assert type(app.json).__name__ == "OrjsonProvider"
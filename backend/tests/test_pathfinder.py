@@ -5,8 +5,18 @@ Validates BFS algorithm and path validation logic.
 """
 
 import pytest
-from unittest.mock import Mock, MagicMock
-from app.services.pathfinder import Pathfinder
+import random
+import threading
+import time
+from concurrent.futures import CancelledError, ThreadPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from unittest.mock import Mock, MagicMock, patch
+from app.models.memory import MemoryStorage
+from app.models.word_graph import WordGraph
+from app.services.budget import SearchBudget, SearchBudgetExceeded
+from app.services.pathfinder import BFSWorkspace, Pathfinder
+from app.services.search_pool import SearchPool, SearchTimeout
+from app.services.single_flight import SingleFlight
 
 
 class TestPathfinder:
@@ -35,6 +45,7 @@ class TestPathfinder:
         graph.has_word = lambda w: w.upper() in words
         graph.get_neighbors = lambda w: adjacency.get(w.upper(), set())
         graph.are_connected = lambda w1, w2: w2.upper() in adjacency.get(w1.upper(), set())
+        graph.same_component = lambda w1, w2: w1.upper() in words and w2.upper() in words
         graph.load = Mock()
         
         return graph
@@ -156,6 +167,34 @@ class TestPathfinderMaxLength:
         
         return graph
     
+    def test_stops_at_max_length(self, long_graph):
+        """Test that no word past the depth limit is expanded."""
+        expanded = []
+        get_neighbors = long_graph.get_neighbors
+        long_graph.get_neighbors = lambda w: expanded.append(w) or get_neighbors(w)
+        
+        assert Pathfinder(long_graph).find_shortest_path("A", "J", max_length=3) is None
+        assert expanded == ["A", "B", "C"]
+    
+    def test_expansion_budget(self, long_graph):
+        """Test that searches fail fast once their budget is spent."""
+        pathfinder = Pathfinder(long_graph, flights=SingleFlight(), max_expansions=3)
+        
+        with pytest.raises(SearchBudgetExceeded):
+            pathfinder.find_shortest_path("A", "G")
+        with pytest.raises(SearchBudgetExceeded):
+            pathfinder.distances_from("A", budget=SearchBudget(max_expansions=3))
+        assert pathfinder.find_shortest_path("A", "D") == ["A", "B", "C", "D"]
+    
+    def test_deadline(self):
+        """Test that the clock is read every CHECK_EVERY expansions."""
+        budget = SearchBudget(timeout=1.0)
+        with patch("app.services.budget.time.monotonic", return_value=float("inf")):
+            budget.spend(SearchBudget.CHECK_EVERY - 1)
+            with pytest.raises(SearchBudgetExceeded):
+                budget.spend()
+        assert isinstance(SearchBudgetExceeded(), SearchTimeout)
+    
     def test_respects_max_length(self, long_graph):
         """Test that pathfinder respects max length constraint."""
         pathfinder = Pathfinder(long_graph)
@@ -168,3 +207,253 @@ class TestPathfinderMaxLength:
         path = pathfinder.find_shortest_path("A", "J", max_length=6)
         assert path is None
 
+
+
+class TestSearchPool:
+    """Test process-pool offload of expensive searches."""
+    
+    @pytest.fixture
+    def graph(self):
+        """Create a detached graph: chain A-B-C-D plus isolated Z."""
+        adjacency = {
+            "A": ["B"],
+            "B": ["A", "C"],
+            "C": ["B", "D"],
+            "D": ["C"],
+        }
+        return WordGraph.from_snapshot((["A", "B", "C", "D", "Z"], adjacency))
+    
+    def test_offloaded_search(self, graph):
+        """Test that searches run in a worker return the same path."""
+        pool = SearchPool(graph, max_workers=1, inline_max_words=0)
+        try:
+            pathfinder = Pathfinder(graph, pool=pool)
+            assert pathfinder.find_shortest_path("A", "D") == ["A", "B", "C", "D"]
+            assert pathfinder.find_shortest_path("A", "Z") is None
+        finally:
+            pool.close()
+    
+    def test_small_graph_stays_inline(self, graph):
+        """Test that small graphs never start worker processes."""
+        pool = SearchPool(graph, inline_max_words=1000)
+        pathfinder = Pathfinder(graph, pool=pool)
+        
+        assert pathfinder.find_shortest_path("A", "D") == ["A", "B", "C", "D"]
+        assert pool._executor is None
+    
+    def test_timeout_raises(self, graph):
+        """Test that slow workers surface a SearchTimeout."""
+        pool = SearchPool(graph, inline_max_words=0, timeout=0.01)
+        future = Mock()
+        future.result.side_effect = FutureTimeout()
+        executor = Mock()
+        executor.submit.return_value = future
+        pool._get_executor = Mock(return_value=executor)
+        
+        with pytest.raises(SearchTimeout):
+            Pathfinder(graph, pool=pool).find_shortest_path("A", "D")
+        future.cancel.assert_called_once()
+    
+    def test_broken_pool_falls_back_inline(self, graph):
+        """Test inline execution when the worker pool has died."""
+        pool = SearchPool(graph, inline_max_words=0)
+        executor = Mock()
+        executor.submit.side_effect = BrokenProcessPool()
+        pool._get_executor = Mock(return_value=executor)
+        
+        path = Pathfinder(graph, pool=pool).find_shortest_path("A", "D")
+        
+        assert path == ["A", "B", "C", "D"]
+    
+    def test_graph_change_keeps_calls_in_flight(self, graph):
+        """Test that a new graph version swaps pools without cancelling the old one's calls."""
+        pool = SearchPool(graph, inline_max_words=0)
+        old, new = Mock(), Mock()
+        with patch("app.services.search_pool.ProcessPoolExecutor", side_effect=[old, new]):
+            assert pool._get_executor() is old
+            graph._version += 1
+            assert pool._get_executor() is new
+        
+        old.shutdown.assert_called_once_with(wait=False, cancel_futures=False)
+        new.shutdown.assert_not_called()
+    
+    def test_cancelled_call_falls_back_inline(self, graph):
+        """Test that calls cancelled by close() run inline instead of failing."""
+        pool = SearchPool(graph, inline_max_words=0)
+        future = Mock()
+        future.result.side_effect = CancelledError()
+        executor = Mock()
+        executor.submit.return_value = future
+        pool._get_executor = Mock(return_value=executor)
+        
+        path = Pathfinder(graph, pool=pool).find_shortest_path("A", "D")
+        
+        assert path == ["A", "B", "C", "D"]
+
+
+class TestSingleFlight:
+    """Test coalescing of concurrent identical searches."""
+    
+    @pytest.fixture
+    def graph(self):
+        """Create a chain graph A-B-C-D."""
+        adjacency = {"A": ["B"], "B": ["A", "C"], "C": ["B", "D"], "D": ["C"]}
+        return WordGraph.from_snapshot((list(adjacency), adjacency))
+    
+    def test_concurrent_searches_share_one_bfs(self, graph):
+        """Test that identical in-flight searches wait on a single BFS."""
+        pathfinder = Pathfinder(graph, flights=SingleFlight())
+        release = threading.Event()
+        bfs_calls = []
+        bfs = pathfinder._bfs
+        
+        def slow_bfs(*args):
+            bfs_calls.append(args[:3])
+            release.wait(5)
+            return bfs(*args)
+        
+        pathfinder._bfs = slow_bfs
+        callers = 16
+        with ThreadPoolExecutor(max_workers=callers) as executor:
+            futures = [
+                executor.submit(pathfinder.find_shortest_path, "a", "d") for _ in range(callers)
+            ]
+            # Wait until every caller has joined the leader's flight
+            deadline = time.monotonic() + 5
+            while pathfinder.flights.stats()["requests"] < callers:
+                assert time.monotonic() < deadline
+                time.sleep(0.001)
+            release.set()
+            paths = [future.result(timeout=5) for future in futures]
+        
+        assert bfs_calls == [("A", "D", 6)]
+        assert paths == [["A", "B", "C", "D"]] * callers
+        assert len({id(path) for path in paths}) == callers  # Private copies
+        assert pathfinder.flights.stats() == {
+            "requests": callers, "executions": 1, "coalesced": callers - 1, "in_flight": 0
+        }
+    
+    def test_errors_reach_every_waiter(self):
+        """Test that a failed call raises in the leader and its waiters."""
+        flights = SingleFlight()
+        started, release = threading.Event(), threading.Event()
+        
+        def failing():
+            started.set()
+            release.wait(5)
+            raise SearchTimeout("too slow")
+        
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            leader = executor.submit(flights.do, "key", failing)
+            started.wait(5)
+            waiter = executor.submit(flights.do, "key", failing)
+            while flights.stats()["coalesced"] < 1:
+                time.sleep(0.001)
+            release.set()
+            for future in (leader, waiter):
+                with pytest.raises(SearchTimeout):
+                    future.result(timeout=5)
+        
+        # The failed flight is gone, so the next call runs afresh
+        assert flights.do("key", lambda: "ok") == "ok"
+        assert flights.stats()["executions"] == 2
+    
+    def test_waiters_give_up_at_their_deadline(self, graph):
+        """Test that a waiter's own budget bounds its wait, not the leader's."""
+        pathfinder = Pathfinder(graph, flights=SingleFlight(), deadline=None)
+        started, release = threading.Event(), threading.Event()
+        bfs = pathfinder._bfs
+        
+        def slow_bfs(*args):
+            started.set()
+            release.wait(5)
+            return bfs(*args)
+        
+        pathfinder._bfs = slow_bfs
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            leader = executor.submit(pathfinder.find_shortest_path, "A", "D")
+            started.wait(5)
+            began = time.monotonic()
+            with pytest.raises(SearchTimeout):
+                pathfinder.find_shortest_path("A", "D", budget=SearchBudget(timeout=0.05))
+            assert time.monotonic() - began < 2
+            
+            # The shared search carries on for the leader
+            release.set()
+            assert leader.result(timeout=5) == ["A", "B", "C", "D"]
+
+
+class TestBFSWorkspace:
+    """Test integer-indexed BFS on reusable per-thread workspaces."""
+    
+    @pytest.fixture
+    def graph(self):
+        """Create a seeded random graph of 300 words."""
+        rng = random.Random(3)
+        words = [f"W{i}" for i in range(300)]
+        adjacency = {word: set() for word in words}
+        for _ in range(450):
+            a, b = rng.sample(words, 2)
+            adjacency[a].add(b)
+            adjacency[b].add(a)
+        return WordGraph.from_snapshot(
+            (words, {word: list(neighbors) for word, neighbors in adjacency.items()})
+        )
+    
+    def test_matches_generic_bfs(self, graph):
+        """Test that indexed and dict-based searches find equally short paths."""
+        generic = Mock(wraps=graph, spec=["get_neighbors", "has_word", "are_connected"])
+        fast = Pathfinder(graph, flights=SingleFlight())
+        slow = Pathfinder(generic, flights=SingleFlight())
+        
+        for i in range(0, 300, 7):
+            start, end = "W0", f"W{i}"
+            for max_length in (3, 6):
+                path = fast._bfs(start, end, max_length)
+                expected = slow._bfs(start, end, max_length)
+                assert (path is None) == (expected is None)
+                if path is not None:
+                    assert len(path) == len(expected) <= max_length + 1
+                    assert fast.validate_path(path)
+    
+    def test_workspace_is_reused_without_clearing(self, graph):
+        """Test that searches share one workspace and only bump its generation."""
+        pathfinder = Pathfinder(graph, flights=SingleFlight())
+        pathfinder.find_shortest_path("W0", "W150")
+        workspace = pathfinder.workspace(0)
+        stamp = workspace.stamp
+        
+        pathfinder.find_shortest_path("W1", "W299")
+        
+        assert pathfinder.workspace(0) is workspace
+        assert workspace.stamp is stamp
+        assert workspace.generation == 2
+    
+    def test_generation_wraps(self, graph):
+        """Test that stamps are reset when the generation would overflow."""
+        pathfinder = Pathfinder(graph, flights=SingleFlight())
+        expected = pathfinder.find_shortest_path("W0", "W150")
+        workspace = pathfinder.workspace(0)
+        workspace.generation = BFSWorkspace.MAX_GENERATION - 1
+        
+        assert pathfinder.find_shortest_path("W0", "W150") == expected
+        assert workspace.generation == 1
+    
+    def test_threads_get_own_workspaces(self, graph):
+        """Test that each thread searches in its own workspace."""
+        pathfinder = Pathfinder(graph, flights=SingleFlight())
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            other = executor.submit(pathfinder.workspace, 10).result()
+        assert pathfinder.workspace(10) is not other
+    
+    def test_new_edges_are_seen(self):
+        """Test that the indexed view is rebuilt after the graph grows."""
+        graph = WordGraph(MemoryStorage())
+        for word in ("A", "B", "C"):
+            graph.add_word(word)
+        graph.add_connection("A", "B")
+        pathfinder = Pathfinder(graph, flights=SingleFlight())
+        assert pathfinder.find_shortest_path("A", "C") is None
+        
+        graph.add_connection("B", "C")
+        assert pathfinder.find_shortest_path("A", "C") == ["A", "B", "C"]
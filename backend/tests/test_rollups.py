@@ -0,0 +1,101 @@
+"""
+Tests for time-bucketed stats rollups.
+"""
+
+import pytest
+from app.routes import stats_routes
+from app.services.game_engine import GameEngine
+from app.services.rollups import StatsRollups
+
+
+def add_game(db, completed_at, score, player_length=3):
+    """Insert a game row directly."""
+    db.insert(
+        """
+        INSERT INTO games (start_word, end_word, player_path, optimal_path,
+                           player_length, optimal_length, score, completed_at)
+        VALUES ('CAT', 'DOG', 'X', 'X', ?, 3, ?, ?)
+        """,
+        (player_length, score, completed_at)
+    )
+
+
+class TestStatsRollups:
+    """Test rollup compaction and time-series reads."""
+
+    @pytest.fixture
+    def rollups(self, temp_db):
+        """Create rollups over a database with games across two days."""
+        add_game(temp_db, "2024-01-01 09:15:00", 100, 3)
+        add_game(temp_db, "2024-01-01 09:45:00", 80, 5)
+        add_game(temp_db, "2024-01-01 17:00:00", 0, -1)
+        add_game(temp_db, "2024-01-02 08:00:00", 90, 4)
+        return StatsRollups(temp_db)
+
+    def test_daily_buckets(self, rollups):
+        """Test daily aggregates."""
+        assert rollups.compact() == 4
+
+        points = rollups.timeseries("day")
+        assert [p["bucket"] for p in points] == ["2024-01-01", "2024-01-02"]
+        first = points[0]
+        assert first["games"] == 3
+        assert first["average_score"] == 60.0
+        assert first["perfect_games"] == 1
+        assert first["failed_games"] == 1
+        assert first["average_path_length"] == 4.0
+
+    def test_hourly_buckets(self, rollups):
+        """Test hourly aggregates and range filters."""
+        rollups.compact()
+
+        points = rollups.timeseries("hour", since="2024-01-01 09", until="2024-01-01 23")
+        assert [(p["bucket"], p["games"]) for p in points] == [
+            ("2024-01-01 09:00:00", 2),
+            ("2024-01-01 17:00:00", 1),
+        ]
+
+    def test_compaction_is_incremental(self, rollups, temp_db):
+        """Test that only games after the watermark are folded in."""
+        rollups.compact()
+        assert rollups.compact() == 0
+
+        add_game(temp_db, "2024-01-02 10:00:00", 70, 6)
+        assert rollups.compact() == 1
+
+        latest = rollups.timeseries("day", limit=1)
+        assert len(latest) == 1
+        assert latest[0]["games"] == 2
+        assert latest[0]["average_score"] == 80.0
+
+    def test_compaction_batches(self, rollups, monkeypatch):
+        """Test that compaction crosses batch boundaries without loss."""
+        monkeypatch.setattr(StatsRollups, "BATCH_SIZE", 3)
+
+        assert rollups.compact() == 4
+        assert sum(p["games"] for p in rollups.timeseries("hour")) == 4
+
+    def test_unknown_granularity(self, rollups):
+        """Test granularity validation."""
+        with pytest.raises(ValueError):
+            rollups.timeseries("week")
+
+    def test_endpoint_rejects_malformed_limit(self, rollups, client, temp_db, monkeypatch):
+        """Test that a bad limit is a 400, as on the ASGI app."""
+        engine = GameEngine(db_path=str(temp_db.db_path))
+        engine.rollups.compact()
+        monkeypatch.setattr(stats_routes, "get_engine", lambda: engine)
+
+        response = client.get("/api/stats/timeseries?limit=abc")
+        assert response.status_code == 400
+        assert response.get_json() == {"error": "limit must be an integer"}
+
+        response = client.get("/api/stats/timeseries?limit=1")
+        assert [p["games"] for p in response.get_json()["points"]] == [1]
+
+    def test_background_job(self, rollups):
+        """Test that the background thread compacts and stops."""
+        rollups.start(interval=60)
+        rollups.stop()
+
+        assert sum(p["games"] for p in rollups.timeseries("day")) == 4
@@ -0,0 +1,193 @@
+"""
+Tests for server-side game sessions.
+
+Covers the bounded session store and the engine's session-backed moves.
+"""
+
+import pytest
+from unittest.mock import patch
+from app.models.memory import MemoryStorage
+from app.models.word_graph import WordGraph
+from app.services.game_engine import GameEngine, Puzzle
+from app.services.sessions import GameSession, SessionNotFound, SessionStore
+
+
+def make_session(puzzle_id: str) -> GameSession:
+    """Create a small standalone session."""
+    return GameSession(
+        puzzle_id=puzzle_id,
+        start_word="A",
+        end_word="C",
+        difficulty="easy",
+        optimal_path=["A", "B", "C"],
+        distance_to_end={"C": 0, "B": 1, "A": 2},
+        graph_version=0,
+        used={"A"},
+    )
+
+
+class TestSessionStore:
+    """Test LRU eviction, TTL expiry and the SQLite spill."""
+
+    def test_lru_eviction(self):
+        """Test that the least recently used session is dropped."""
+        store = SessionStore(max_sessions=2)
+        for puzzle_id in ("p1", "p2"):
+            store.put(make_session(puzzle_id))
+        store.get("p1")
+        store.put(make_session("p3"))
+
+        assert len(store) == 2
+        assert store.get("p1").puzzle_id == "p1"
+        with pytest.raises(SessionNotFound):
+            store.get("p2")
+
+    def test_ttl_expiry(self):
+        """Test that idle sessions expire and used ones do not."""
+        store = SessionStore(ttl=10)
+        with patch("app.services.sessions.time.time", return_value=1000.0):
+            store.put(make_session("p1"))
+            store.put(make_session("p2"))
+        with patch("app.services.sessions.time.time", return_value=1008.0):
+            store.get("p1")
+        with patch("app.services.sessions.time.time", return_value=1015.0):
+            assert store.get("p1").puzzle_id == "p1"
+            with pytest.raises(SessionNotFound):
+                store.get("p2")
+
+    def test_spill_round_trip(self, tmp_path):
+        """Test that evicted sessions reload from the spill file."""
+        store = SessionStore(max_sessions=1, spill_path=str(tmp_path / "sessions.db"))
+        first = make_session("p1")
+        first.chain.append("B")
+        first.used.add("B")
+        store.put(first)
+        store.put(make_session("p2"))
+
+        assert len(store) == 1
+        restored = store.get("p1")
+        assert restored.chain == ["B"]
+        assert restored.used == {"A", "B"}
+        assert restored.distance_to_end == first.distance_to_end
+
+        store.pop("p1")
+        store.pop("p2")
+        with pytest.raises(SessionNotFound):
+            store.get("p2")
+
+
+class TestEngineSessions:
+    """Test session-backed validation, undo, hints and submission."""
+
+    @pytest.fixture
+    def engine(self):
+        """Create engine over A-B-C-D-E plus a shortcut A-X-E."""
+        adjacency = {
+            "A": ["B", "X"],
+            "B": ["A", "C"],
+            "C": ["B", "D"],
+            "D": ["C", "E"],
+            "E": ["D", "X"],
+            "X": ["A", "E"],
+        }
+        graph = WordGraph.from_snapshot((list(adjacency), adjacency))
+        return GameEngine(graph=graph, storage=MemoryStorage())
+
+    def test_generate_opens_session(self, engine):
+        """Test that new puzzles carry a live puzzle_id."""
+        puzzle = engine.generate_puzzle("easy", seed=3)
+        session = engine.sessions.get(puzzle.puzzle_id)
+
+        assert (session.start_word, session.end_word) == (puzzle.start_word, puzzle.end_word)
+        assert len(session.optimal_path) - 1 == puzzle.optimal_length
+        assert puzzle.to_dict()["puzzle_id"] == puzzle.puzzle_id
+
+    def test_moves_and_undo(self, engine):
+        """Test that valid moves extend the chain and undo shrinks it."""
+        puzzle = Puzzle("B", "E", 3, "easy")
+        engine._open_session(puzzle)
+
+        assert engine.validate_move(puzzle.puzzle_id, "c")["valid"] is True
+        assert engine.validate_move(puzzle.puzzle_id, "B")["error"] == "duplicate_word"
+        assert engine.validate_move(puzzle.puzzle_id, "X")["error"] == "not_connected"
+        assert engine.undo_move(puzzle.puzzle_id) == {"removed": "C", "chain": []}
+        assert engine.undo_move(puzzle.puzzle_id) == {"removed": None, "chain": []}
+        assert engine.validate_move(puzzle.puzzle_id, "A")["valid"] is True
+
+    def test_replay_adopts_valid_prefix(self, engine):
+        """Test that a replayed chain restores the session up to its first error."""
+        puzzle = Puzzle("B", "E", 3, "easy")
+        engine._open_session(puzzle)
+
+        report = engine.replay_chain(puzzle.puzzle_id, ["C", "D", "X", "A"])
+
+        assert report["valid_length"] == 2
+        assert report["positions"][3]["error"] == "not_connected"
+        session = engine.sessions.get(puzzle.puzzle_id)
+        assert session.chain == ["C", "D"]
+        assert session.used == {"B", "C", "D"}
+        assert engine.validate_move(puzzle.puzzle_id, "E")["valid"] is True
+
+    def test_hints_read_the_session(self, engine):
+        """Test that hints follow the stored distances without a search."""
+        puzzle = Puzzle("B", "E", 3, "easy")
+        engine._open_session(puzzle)
+
+        with patch.object(engine.pathfinder, "find_shortest_path") as search:
+            hint = engine.session_hint(puzzle.puzzle_id, hint_level=3)
+            search.assert_not_called()
+
+        # B-A-X-E and B-C-D-E tie; A comes first
+        assert hint["steps_remaining"] == 3
+        assert hint["revealed_letters"] == "A"
+        assert hint["fully_revealed"] is True
+
+    def test_submit_scores_chain_and_closes(self, engine):
+        """Test that submission uses the stored optimal path."""
+        puzzle = Puzzle("B", "E", 3, "easy")
+        engine._open_session(puzzle)
+        for word in ("C", "D"):
+            engine.validate_move(puzzle.puzzle_id, word)
+
+        with patch.object(engine.pathfinder, "find_shortest_path") as search:
+            result = engine.submit_session(puzzle.puzzle_id)
+            search.assert_not_called()
+
+        assert result.player_path == ["C", "D"]
+        assert result.optimal_path == ["B", "A", "X", "E"]
+        assert result.score == 100
+        assert engine.get_total_games() == 1
+        with pytest.raises(SessionNotFound):
+            engine.sessions.get(puzzle.puzzle_id)
+
+    def test_score_then_record_session(self, engine):
+        """Test the two-step path the async front end uses."""
+        puzzle = Puzzle("B", "E", 3, "easy")
+        engine._open_session(puzzle)
+        for word in ("C", "D"):
+            engine.validate_move(puzzle.puzzle_id, word)
+
+        result = engine.score_session(puzzle.puzzle_id)
+        assert engine.get_total_games() == 0
+        engine.sessions.get(puzzle.puzzle_id)
+
+        engine.record_session(puzzle.puzzle_id, result)
+        assert engine.get_total_games() == 1
+        with pytest.raises(SessionNotFound):
+            engine.sessions.get(puzzle.puzzle_id)
+
+    def test_local_edit_remeasures_session(self):
+        """Test that a graph edit made in this process refreshes the session."""
+        storage = MemoryStorage()
+        graph = WordGraph(storage)
+        for word in ("A", "B", "C", "D"):
+            graph.add_word(word)
+        for word1, word2 in (("A", "B"), ("B", "C"), ("C", "D")):
+            graph.add_connection(word1, word2)
+        engine = GameEngine(graph=graph, storage=storage)
+        puzzle = Puzzle("A", "D", 3, "easy")
+        engine._open_session(puzzle)
+
+        graph.add_connection("A", "D")
+
+        assert engine._session(puzzle.puzzle_id).optimal_path == ["A", "D"]
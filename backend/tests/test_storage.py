@@ -0,0 +1,445 @@
+"""
+Contract tests for the storage backends.
+
+SQLite and the in-memory fake always run. PostgreSQL runs when
+TEST_POSTGRES_DSN points at a disposable database.
+"""
+
+import os
+import sqlite3
+import time
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+from app.models.database import Database, DatabaseInUse
+from app.models.memory import MemoryStorage
+from app.models.postgres import HAS_POSTGRES, PostgresStorage
+from app.models.word_graph import WordGraph
+from app.services.checkpoints import DatabaseCheckpoints
+from app.services.game_engine import GameEngine
+
+POSTGRES_DSN = os.environ.get("TEST_POSTGRES_DSN")
+
+
+@pytest.fixture(params=["sqlite", "memory", "postgres"])
+def storage(request, temp_db):
+    """Yield each available backend with an empty schema."""
+    if request.param == "sqlite":
+        yield temp_db
+    elif request.param == "memory":
+        yield MemoryStorage()
+    else:
+        if not (HAS_POSTGRES and POSTGRES_DSN):
+            pytest.skip("TEST_POSTGRES_DSN not set or psycopg2 missing")
+        storage = PostgresStorage(POSTGRES_DSN)
+        with storage.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("DROP SCHEMA public CASCADE; CREATE SCHEMA public")
+        storage.init_schema()
+        yield storage
+        storage.close()
+
+
+def save(storage, start="CAT", end="DOG", score=100, player_length=2, top_n=100):
+    """Save a game with defaults for the fields a test does not care about."""
+    return storage.save_game(
+        start, end, ["PET"], ["CAT", "PET", "DOG"], player_length, 2, score, top_n
+    )
+
+
+class TestGraphStorage:
+    """Test word graph persistence."""
+
+    def test_words_and_connections(self, storage):
+        """Test adding and loading the graph."""
+        assert storage.add_word("CAT")
+        assert storage.add_word("DOG")
+        assert not storage.add_word("CAT")
+        assert storage.add_connection("CAT", "DOG")
+        assert not storage.add_connection("CAT", "DOG")
+        assert not storage.add_connection("CAT", "MISSING")
+        assert not storage.add_connection("DOG", "CAT")
+        assert not storage.add_connection("CAT", "CAT")
+
+        assert sorted(storage.load_words()) == ["CAT", "DOG"]
+        assert storage.load_connections() == [("CAT", "DOG")]
+
+    def test_change_log(self, storage):
+        """Test that mutations are logged in order."""
+        assert storage.graph_version() == 0
+        storage.add_word("CAT")
+        storage.add_word("DOG")
+        storage.add_connection("CAT", "DOG", 0.5)
+
+        changes = storage.graph_changes_since(1)
+        assert [c["kind"] for c in changes] == ["word", "connection"]
+        assert changes[-1]["strength"] == 0.5
+        assert storage.graph_version() == changes[-1]["id"]
+
+    def test_word_graph_on_backend(self, storage):
+        """Test that WordGraph loads through the interface."""
+        writer = WordGraph(storage)
+        writer.add_word("cat")
+        writer.add_word("dog")
+        writer.add_connection("cat", "dog")
+
+        reader = WordGraph(storage)
+        assert reader.are_connected("DOG", "CAT")
+        assert reader.version == storage.graph_version()
+
+    def test_graph_metrics(self, storage):
+        """Test that an analytics run replaces the previous one."""
+        assert storage.load_graph_metrics() is None
+
+        storage.save_graph_metrics(1, {"hubs": []}, [("CAT", 2.0, 3), ("DOG", 1.0, None)])
+        storage.save_graph_metrics(2, {"hubs": [{"word": "PET"}]}, [("PET", 4.5, 2)])
+
+        run = storage.load_graph_metrics()
+        assert run["version"] == 2
+        assert run["summary"] == {"hubs": [{"word": "PET"}]}
+        assert run["words"] == {"PET": {"betweenness": 4.5, "eccentricity": 2}}
+        assert isinstance(run["computed_at"], str)
+
+
+class TestPackedPathStorage:
+    """Test the packed-path dictionary and BLOB columns."""
+
+    def test_dictionary_ids_are_stable(self, storage):
+        """Test that words keep their ids and duplicates are ignored."""
+        storage.add_path_words(["CAT", "DOG"])
+        added = storage.add_path_words(["DOG", "PET"])
+
+        entries = storage.load_path_words()
+        assert [word for _, word in entries] == ["CAT", "DOG", "PET"]
+        assert sorted(added) == entries[1:]
+        assert storage.load_path_words(entries[1][0]) == entries[2:]
+
+    def test_packed_rows_round_trip(self, storage):
+        """Test that BLOB paths are stored apart from text ones and can replace them."""
+        text_id = save(storage)
+        packed_id = storage.save_game("CAT", "DOG", b"\x01\x03", b"\x01\x01\x03\x02", 2, 2, 100, 10)
+
+        games = {g["id"]: g for g in storage.game_history(10)}
+        assert games[packed_id]["player_path"] is None
+        assert bytes(games[packed_id]["player_ids"]) == b"\x01\x03"
+        assert games[text_id]["player_ids"] is None
+        assert [g["id"] for g in storage.text_path_games(0, 10)] == [text_id]
+
+        storage.set_packed_paths([(text_id, b"\x01\x03", b"\x01\x01\x03\x02")])
+        assert storage.text_path_games(0, 10) == []
+        games = {g["id"]: g for g in storage.game_history(10)}
+        assert games[text_id]["optimal_path"] is None
+        assert bytes(games[text_id]["optimal_ids"]) == b"\x01\x01\x03\x02"
+
+
+class TestSchemaMigration:
+    """Test SQLite upgrades of legacy schemas."""
+
+    def test_legacy_table_is_canonicalized(self, tmp_path):
+        """Test that duplicated directions and self-loops collapse to one edge per pair."""
+        path = tmp_path / "legacy.db"
+        conn = sqlite3.connect(path)
+        conn.executescript("""
+            CREATE TABLE words (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                word TEXT UNIQUE NOT NULL,
+                category TEXT
+            );
+            CREATE TABLE connections (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                word1_id INTEGER NOT NULL,
+                word2_id INTEGER NOT NULL,
+                strength REAL DEFAULT 1.0,
+                UNIQUE(word1_id, word2_id)
+            );
+            CREATE INDEX idx_words_word ON words(word);
+            CREATE INDEX idx_conn_word1 ON connections(word1_id);
+            CREATE INDEX idx_conn_word2 ON connections(word2_id);
+            INSERT INTO words (word) VALUES ('CAT'), ('DOG'), ('PET');
+            INSERT INTO connections (word1_id, word2_id, strength) VALUES
+                (2, 1, 0.5), (1, 2, 1.0), (1, 3, 1.0), (3, 1, 1.0), (2, 2, 1.0);
+        """)
+        conn.close()
+
+        db = Database(str(path))
+        db.init_schema()
+        db.init_schema()  # Idempotent
+
+        assert sorted(db.load_connections()) == [("CAT", "DOG"), ("CAT", "PET")]
+        assert db.execute("SELECT strength FROM connections WHERE word2_id = 2") == [
+            {"strength": 0.5}
+        ]
+        indexes = {
+            row["name"] for row in db.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+        }
+        assert not indexes & {"idx_words_word", "idx_conn_word1", "idx_conn_word2"}
+        assert WordGraph(db).connection_count() == 2
+
+    def test_games_gain_packed_columns(self, tmp_path):
+        """Test that games tables from before packed paths get their columns."""
+        path = tmp_path / "legacy.db"
+        conn = sqlite3.connect(path)
+        conn.execute("""
+            CREATE TABLE games (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                start_word TEXT NOT NULL,
+                end_word TEXT NOT NULL,
+                player_path TEXT,
+                optimal_path TEXT,
+                player_length INTEGER,
+                optimal_length INTEGER,
+                score INTEGER,
+                completed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        conn.close()
+
+        db = Database(str(path))
+        db.init_schema()
+
+        columns = {row["name"] for row in db.execute("PRAGMA table_info(games)")}
+        assert {"player_ids", "optimal_ids"} <= columns
+
+    def test_histograms_backfilled_on_upgrade(self, tmp_path):
+        """Test that games saved before the histograms existed are counted once."""
+        path = tmp_path / "legacy.db"
+        conn = sqlite3.connect(path)
+        conn.execute("""
+            CREATE TABLE games (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                start_word TEXT NOT NULL,
+                end_word TEXT NOT NULL,
+                player_path TEXT,
+                optimal_path TEXT,
+                player_length INTEGER,
+                optimal_length INTEGER,
+                score INTEGER,
+                completed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        conn.executemany(
+            "INSERT INTO games (start_word, end_word, player_path, optimal_path,"
+            " player_length, optimal_length, score) VALUES ('CAT', 'DOG', 'PET', 'CAT,PET,DOG', ?, 2, ?)",
+            [(1, 100), (2, 75), (0, 0)]
+        )
+        conn.commit()
+        conn.close()
+
+        db = Database(str(path))
+        db.init_schema()
+        db.init_schema()
+
+        engine = GameEngine(storage=db)
+        assert engine.get_total_games() == 3
+        assert db.score_histogram("CAT", "DOG") == {100: 1, 75: 1, 0: 1}
+        assert [row["score"] for row in db.top_games(10)] == [100, 75]
+
+
+class TestInMemoryDatabase:
+    """Test the shared in-memory SQLite mode and its checkpoints."""
+
+    @pytest.fixture
+    def snapshot(self, tmp_path):
+        """Write a snapshot file holding two words."""
+        path = tmp_path / "snapshot.db"
+        db = Database(str(path))
+        db.init_schema()
+        db.add_word("CAT")
+        db.add_word("DOG")
+        return str(path)
+
+    def test_hydrate_share_and_checkpoint(self, snapshot, tmp_path):
+        """Test that instances share one copy that reaches disk only on checkpoint."""
+        path = tmp_path / "live.db"
+        first = Database(str(path), in_memory=True, snapshot=snapshot)
+        second = Database(str(path), in_memory=True)
+        assert sorted(second.load_words()) == ["CAT", "DOG"]
+
+        first.add_word("PET")
+        assert "PET" in second.load_words()
+        assert not path.exists()
+        assert not first.ARCHIVABLE
+        # Other processes would read the lagging file
+        assert first.location() is None
+
+        first.checkpoint()
+        assert sorted(Database(str(path), read_only=True).load_words()) == ["CAT", "DOG", "PET"]
+
+        # The last close drops the copy; the next open resumes from the checkpoint
+        first.close()
+        second.close()
+        reopened = Database(str(path), in_memory=True, snapshot=snapshot)
+        assert sorted(reopened.load_words()) == ["CAT", "DOG", "PET"]
+        reopened.close()
+
+    def test_concurrent_writes(self, snapshot, tmp_path):
+        """Test that threads writing through shared cache never hit table locks."""
+        db = Database(str(tmp_path / "live.db"), in_memory=True, snapshot=snapshot)
+
+        def play(_):
+            for _ in range(25):
+                save(db)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(play, range(8)))
+
+        assert db.score_histogram("*", "*") == {100: 200}
+        db.close()
+
+    def test_background_checkpoints(self, snapshot, tmp_path):
+        """Test that stopping the job writes a final checkpoint."""
+        path = tmp_path / "live.db"
+        db = Database(str(path), in_memory=True, snapshot=snapshot)
+        checkpoints = DatabaseCheckpoints(db)
+        checkpoints.start(interval=3600)
+        save(db)
+        checkpoints.stop()
+
+        assert Database(str(path), read_only=True).score_histogram("*", "*") == {100: 1}
+        db.close()
+
+    def test_single_writer_process(self, snapshot, tmp_path):
+        """Test that disk writers are refused while the file is served from memory."""
+        path = tmp_path / "live.db"
+        db = Database(str(path), in_memory=True, snapshot=snapshot)
+        db.checkpoint()
+
+        with pytest.raises(DatabaseInUse):
+            Database(str(path))
+        db.close()
+        assert sorted(Database(str(path)).load_words()) == ["CAT", "DOG"]
+
+    def test_forked_copy_is_refused(self, snapshot, tmp_path):
+        """Test that a copy inherited by a forked worker cannot be used."""
+        db = Database(str(tmp_path / "live.db"), in_memory=True, snapshot=snapshot)
+        with patch("app.models.database.os.getpid", return_value=-1):
+            with pytest.raises(DatabaseInUse):
+                db.load_words()
+        db.close()
+
+
+class TestGameStorage:
+    """Test games, histograms, leaderboard and rollups."""
+
+    def test_save_updates_histograms_and_leaderboard(self, storage):
+        """Test that a save updates every derived table."""
+        first = save(storage, score=100)
+        save(storage, score=90, player_length=3)
+        save(storage, score=0, player_length=-1)
+
+        assert storage.score_histogram("CAT", "DOG") == {100: 1, 90: 1, 0: 1}
+        assert storage.score_histogram("*", "*") == {100: 1, 90: 1, 0: 1}
+        top = storage.top_games(10)
+        assert [row["score"] for row in top] == [100, 90]
+        assert top[0]["game_id"] == first
+
+    def test_puzzle_results(self, storage):
+        """Test per-puzzle game and solve counts."""
+        save(storage, end="DOG", score=100)
+        save(storage, end="DOG", score=0, player_length=-1)
+        # Partial credit for a broken path is not a solve
+        save(storage, end="DOG", score=30, player_length=-1)
+        save(storage, end="FISH", score=80)
+
+        assert storage.puzzle_results("CAT") == {"DOG": (3, 1), "FISH": (1, 1)}
+        assert storage.puzzle_results("DOG") == {}
+
+    def test_leaderboard_is_bounded(self, storage):
+        """Test top-N trimming and rebuild."""
+        for score in (50, 90, 70, 100):
+            save(storage, score=score, top_n=2)
+        assert [row["score"] for row in storage.top_games(10)] == [100, 90]
+
+        storage.rebuild_leaderboard(3)
+        assert [row["score"] for row in storage.top_games(10)] == [100, 90, 70]
+        assert sum(storage.score_histogram("*", "*").values()) == 4
+
+    def test_history_keyset(self, storage):
+        """Test newest-first keyset pages and filters."""
+        ids = [save(storage, end="DOG" if i % 2 else "FISH", score=i * 10) for i in range(5)]
+
+        rows = storage.game_history(10)
+        assert [row["id"] for row in rows] == ids[::-1]
+        assert isinstance(rows[0]["completed_at"], str)
+
+        key = (rows[1]["completed_at"], rows[1]["id"])
+        assert [r["id"] for r in storage.game_history(10, before=key)] == ids[:3][::-1]
+        assert [r["id"] for r in storage.game_history(10, word="FISH")] == ids[::2][::-1]
+        assert [r["id"] for r in storage.game_history(10, min_score=20, max_score=30)] == [
+            ids[3], ids[2]
+        ]
+        assert storage.game_history(10, since="2999-01-01") == []
+
+    def test_iter_games(self, storage):
+        """Test that the export iterator streams every game oldest first, in batches."""
+        ids = [save(storage, score=i * 10) for i in range(5)]
+
+        rows = list(storage.iter_games(batch_size=2))
+        assert [row["id"] for row in rows] == ids
+        assert rows[0]["player_path"] == "PET"
+        assert [row["id"] for row in storage.iter_games(ids[1], batch_size=3)] == ids[2:]
+        assert list(storage.iter_games(ids[-1])) == []
+
+    def test_rollups(self, storage):
+        """Test incremental compaction and totals."""
+        save(storage, score=100, player_length=2)
+        save(storage, score=0, player_length=-1)
+        assert storage.path_length_totals() == (2, 1)
+
+        assert storage.compact_rollups(1) == 1
+        assert storage.compact_rollups(10) == 1
+        assert storage.compact_rollups(10) == 0
+        assert storage.rollup_watermark() == storage.game_history(1)[0]["id"]
+
+        (day,) = storage.rollup_buckets("day")
+        assert day["games"] == 2
+        assert day["perfect_count"] == 1
+        assert day["failure_count"] == 1
+        assert storage.path_length_totals() == (2, 1)
+
+    def test_rollups_wait_for_uncommitted_games(self, storage):
+        """Test that a lower id committing after a higher one is not skipped."""
+        if not isinstance(storage, PostgresStorage):
+            pytest.skip("Only PostgreSQL commits ids out of order")
+        with storage.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    "SELECT pg_advisory_xact_lock_shared(%s)", (storage.GAME_INSERT_LOCK,)
+                )
+                cursor.execute(
+                    "INSERT INTO games (start_word, end_word, player_length,"
+                    " optimal_length, score) VALUES ('CAT', 'DOG', 2, 2, 100)"
+                )
+                save(storage)  # Higher id, committed first
+                with ThreadPoolExecutor(max_workers=1) as executor:
+                    compaction = executor.submit(storage.compact_rollups, 10)
+                    time.sleep(0.2)
+                    assert not compaction.done()
+                    conn.commit()
+                    assert compaction.result(timeout=5) == 2
+
+        assert storage.compact_rollups(10) == 0
+        (day,) = storage.rollup_buckets("day")
+        assert day["games"] == 2
+
+
+class TestEngineOnMemoryStorage:
+    """Test the engine end to end without SQLite."""
+
+    def test_submit_and_stats(self):
+        """Test that scoring, stats and history run on the fake."""
+        storage = MemoryStorage()
+        graph = WordGraph(storage)
+        for word in ("CAT", "PET", "DOG"):
+            graph.add_word(word)
+        graph.add_connection("CAT", "PET")
+        graph.add_connection("PET", "DOG")
+
+        engine = GameEngine(storage=storage)
+        result = engine.submit_solution("CAT", "DOG", ["PET"])
+
+        assert result.score == 100
+        assert result.percentile == 0.0
+        assert engine.archive is None
+        assert engine.get_statistics()["total_games"] == 1
+        assert engine.get_game_history()["games"][0]["player_path"] == ["PET"]
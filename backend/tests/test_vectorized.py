@@ -0,0 +1,104 @@
+"""
+Tests for the vectorized BFS backend.
+
+Checks multi-source BFS against the pure-Python Pathfinder.
+"""
+
+import pytest
+from app.models.word_graph import WordGraph
+from app.services.pathfinder import Pathfinder
+
+np = pytest.importorskip("numpy")
+
+from app.services.vectorized import CSRGraph, UNREACHED  # noqa: E402
+
+
+@pytest.fixture
+def graph():
+    """Create a graph: A-B-C-D, B-E-F, isolated Z."""
+    adjacency = {
+        "A": ["B"],
+        "B": ["A", "C", "E"],
+        "C": ["B", "D"],
+        "D": ["C"],
+        "E": ["B", "F"],
+        "F": ["E"],
+    }
+    return WordGraph.from_snapshot((list(adjacency) + ["Z"], adjacency))
+
+
+class TestCSRGraph:
+    """Test CSR export and level-synchronous BFS."""
+    
+    def test_to_csr_round_trip(self, graph):
+        """Test that the CSR arrays describe the same edges."""
+        words, indptr, indices = graph.to_csr()
+        
+        assert len(indptr) == len(words) + 1
+        b = words.index("B")
+        assert {words[i] for i in indices[indptr[b]:indptr[b + 1]]} == {"A", "C", "E"}
+    
+    @pytest.mark.parametrize("use_scipy", [True, False])
+    def test_matches_python_bfs(self, graph, use_scipy):
+        """Test distances agree with Pathfinder.distances_from."""
+        csr = CSRGraph.from_graph(graph)
+        if not use_scipy:
+            csr.matrix = None
+        pathfinder = Pathfinder(graph)
+        sources = ["A", "D", "Z"]
+        
+        distances = csr.multi_source_distances(sources, max_depth=6)
+        
+        for row, source in enumerate(sources):
+            expected = pathfinder.distances_from(source, 6)
+            for col, word in enumerate(csr.words):
+                assert distances[row, col] == expected.get(word, UNREACHED)
+    
+    @pytest.mark.parametrize("use_scipy", [True, False])
+    def test_hub_with_256_frontier_neighbours(self, use_scipy):
+        """Test that a word reached from 256 frontier words is not dropped."""
+        leaves = [f"L{i}" for i in range(256)]
+        adjacency = {"S": leaves, "T": leaves}
+        adjacency.update({leaf: ["S", "T"] for leaf in leaves})
+        csr = CSRGraph.from_graph(WordGraph.from_snapshot((list(adjacency), adjacency)))
+        if not use_scipy:
+            csr.matrix = None
+
+        distances = csr.multi_source_distances(["S"], max_depth=3)
+
+        assert distances[0, csr.index["T"]] == 2
+
+    def test_max_depth_limits_search(self, graph):
+        """Test that levels beyond max_depth stay unreached."""
+        csr = CSRGraph.from_graph(graph)
+        
+        distances = csr.multi_source_distances(["A"], max_depth=2)
+        
+        assert distances[0, csr.index["C"]] == 2
+        assert distances[0, csr.index["D"]] == UNREACHED
+    
+    def test_distance_histogram(self, graph):
+        """Test pair counts per distance."""
+        csr = CSRGraph.from_graph(graph)
+        
+        assert csr.distance_histogram(["A"], 6) == {1: 1, 2: 2, 3: 2}
+    
+    @pytest.mark.parametrize("use_scipy", [True, False])
+    def test_path_counts(self, use_scipy):
+        """Test shortest-path counts, with and without a blocked word."""
+        # Square A-B-D, A-C-D plus tail D-E
+        adjacency = {
+            "A": ["B", "C"], "B": ["A", "D"], "C": ["A", "D"],
+            "D": ["B", "C", "E"], "E": ["D"],
+        }
+        csr = CSRGraph.from_graph(WordGraph.from_snapshot((list(adjacency), adjacency)))
+        if not use_scipy:
+            csr.matrix = None
+        
+        distances, counts, free = csr.path_counts(["A"], max_depth=6, blocked=["B"])
+        
+        e = csr.index["E"]
+        assert distances[0, e] == 3
+        assert counts[0, e] == 2
+        assert free[0, e] == 1
+        assert free[0, csr.index["B"]] == 1  # blocked words can still be endpoints
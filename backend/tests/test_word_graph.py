@@ -0,0 +1,212 @@
+"""
+Tests for the WordGraph model.
+
+Validates loading and incremental change tracking against a real database.
+"""
+
+import threading
+import pytest
+from app.models.word_graph import WordGraph
+
+
+class TestIncrementalRefresh:
+    """Test change-log driven graph refresh."""
+
+    @pytest.fixture
+    def graph(self, temp_db):
+        """Create a loaded graph with a small word set."""
+        graph = WordGraph(temp_db)
+        for word in ["OCEAN", "WAVE", "FISH"]:
+            graph.add_word(word)
+        graph.add_connection("OCEAN", "WAVE")
+        graph.load()
+        return graph
+
+    def test_load_sets_version(self, graph):
+        """Test that loading records the latest change id."""
+        assert graph.version > 0
+
+    def test_refresh_applies_remote_changes(self, graph, temp_db):
+        """Test that edits from another process are picked up."""
+        other = WordGraph(temp_db)
+        other.add_word("SHARK")
+        other.add_connection("FISH", "SHARK")
+
+        assert not graph.has_word("SHARK")
+
+        applied = graph.refresh(force=True)
+
+        assert applied == 2
+        assert graph.has_word("SHARK")
+        assert graph.are_connected("SHARK", "FISH")
+
+    def test_refresh_notifies_listeners(self, graph, temp_db):
+        """Test that listeners receive the applied deltas."""
+        received = []
+        graph.subscribe(received.extend)
+
+        WordGraph(temp_db).add_connection("OCEAN", "FISH")
+        graph.refresh(force=True)
+
+        assert [c.kind for c in received] == ["connection"]
+        assert received[0].word1 == "OCEAN"
+
+    def test_refresh_is_throttled(self, graph, temp_db):
+        """Test that unforced polls respect the refresh interval."""
+        WordGraph(temp_db).add_connection("OCEAN", "FISH")
+
+        assert graph.refresh() == 0
+        assert graph.refresh(force=True) == 1
+
+    def test_duplicate_connection_not_logged(self, graph):
+        """Test that ignored inserts do not grow the change log."""
+        version = graph.version
+        graph.add_connection("OCEAN", "WAVE")
+
+        assert graph.refresh(force=True) == 0
+        assert graph.version == version
+
+    def test_local_edits_move_version(self, graph):
+        """Test that edits through a loaded graph advance its version."""
+        version = graph.version
+        graph.add_word("SHARK")
+        assert graph.version > version
+
+        version = graph.version
+        graph.add_connection("FISH", "SHARK")
+        assert graph.version > version
+        assert graph.are_connected("FISH", "SHARK")
+        assert graph.refresh(force=True) == 0
+
+    def test_refresh_does_not_mutate_handed_out_views(self, graph, temp_db):
+        """Test that neighbour sets and member lists are copied on write."""
+        neighbors = graph.get_neighbors("OCEAN")
+        members = graph.component_members("OCEAN")
+
+        WordGraph(temp_db).add_connection("OCEAN", "FISH")
+        graph.refresh(force=True)
+
+        assert neighbors == {"WAVE"}
+        assert sorted(members) == ["OCEAN", "WAVE"]
+        assert graph.get_neighbors("OCEAN") == {"WAVE", "FISH"}
+
+    def test_concurrent_refresh_and_readers(self, graph, temp_db):
+        """Test that readers never see a graph mid-update."""
+        writer = WordGraph(temp_db)
+        words = [f"W{i}" for i in range(100)]
+        for word in words:
+            writer.add_word(word)
+        errors = []
+        done = threading.Event()
+
+        def read():
+            try:
+                while not done.is_set():
+                    graph.snapshot()
+                    indexed = graph.indexed()
+                    assert len(indexed.indptr) == len(indexed.words) + 1
+                    for word in list(graph.get_neighbors("OCEAN")):
+                        graph.get_neighbors(word)
+            except Exception as e:  # pragma: no cover - reported below
+                errors.append(e)
+
+        readers = [threading.Thread(target=read) for _ in range(3)]
+        for reader in readers:
+            reader.start()
+        for word in words:
+            writer.add_connection("OCEAN", word)
+            graph.refresh(force=True)
+        done.set()
+        for reader in readers:
+            reader.join()
+
+        assert errors == []
+        assert len(graph.get_neighbors("OCEAN")) == 101
+
+
+class TestComponents:
+    """Test connected-component labels."""
+
+    @pytest.fixture
+    def graph(self, temp_db):
+        """Create a loaded graph with components {OCEAN, WAVE} and {FISH}."""
+        graph = WordGraph(temp_db)
+        for word in ["OCEAN", "WAVE", "FISH"]:
+            graph.add_word(word)
+        graph.add_connection("OCEAN", "WAVE")
+        return WordGraph(temp_db)
+
+    def test_labels_at_load(self, graph):
+        """Test that loading labels every word."""
+        assert graph.same_component("ocean", "WAVE")
+        assert not graph.same_component("OCEAN", "FISH")
+        assert not graph.same_component("OCEAN", "MISSING")
+        assert sorted(graph.component_members("WAVE")) == ["OCEAN", "WAVE"]
+        assert graph.component_sizes() == [2, 1]
+
+    def test_refresh_merges_components(self, graph, temp_db):
+        """Test that remote edges merge components incrementally."""
+        graph.load()
+        other = WordGraph(temp_db)
+        other.add_word("SHARK")
+        other.add_connection("FISH", "SHARK")
+        other.add_connection("SHARK", "WAVE")
+        graph.refresh(force=True)
+
+        assert graph.same_component("FISH", "OCEAN")
+        assert graph.component_sizes() == [4]
+
+    def test_snapshot_keeps_components(self, graph):
+        """Test that detached copies are labelled too."""
+        copy = WordGraph.from_snapshot(graph.snapshot())
+
+        assert copy.same_component("OCEAN", "WAVE")
+        assert copy.component_sizes() == [2, 1]
+
+
+class TestNeighborPreview:
+    """Test precomputed neighbour previews."""
+
+    @pytest.fixture
+    def graph(self):
+        """Create a star around HUB whose leaves have different degrees."""
+        adjacency = {
+            "HUB": ["A", "B", "C"],
+            "A": ["HUB", "X", "Y"],
+            "B": ["HUB", "X"],
+            "C": ["HUB"],
+            "X": ["A", "B"],
+            "Y": ["A"],
+        }
+        return WordGraph.from_snapshot((list(adjacency), adjacency))
+
+    def test_ranked_by_degree(self, graph):
+        """Test that the best-connected neighbours come first."""
+        assert graph.neighbor_preview("hub") == ("A", "B", "C")
+        assert graph.neighbor_preview("Y") == ("A",)
+        assert graph.neighbor_preview("MISSING") == ()
+
+    def test_preview_is_bounded_and_cached(self, graph):
+        """Test the size limit and that repeated calls share one tuple."""
+        graph.PREVIEW_SIZE = 2
+        graph._build_previews()
+
+        assert graph.neighbor_preview("HUB") == ("A", "B")
+        assert graph.neighbor_preview("HUB") is graph.neighbor_preview("HUB")
+
+    def test_new_edges_rerank(self, temp_db):
+        """Test that previews follow degree changes from refresh()."""
+        writer = WordGraph(temp_db)
+        for word in ["OCEAN", "WAVE", "FISH", "SHARK"]:
+            writer.add_word(word)
+        writer.add_connection("OCEAN", "WAVE")
+        writer.add_connection("OCEAN", "FISH")
+
+        graph = WordGraph(temp_db)
+        assert graph.neighbor_preview("OCEAN") == ("FISH", "WAVE")
+
+        writer.add_connection("WAVE", "SHARK")
+        graph.refresh(force=True)
+
+        assert graph.neighbor_preview("OCEAN") == ("WAVE", "FISH")
+        assert graph.neighbor_preview("SHARK") == ("WAVE",)
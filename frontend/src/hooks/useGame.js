@@ -51,7 +51,11 @@ export function useGame() {
     const currentChain = [puzzle.start_word, ...chain]
     
     try {
-      const validation = await gameAPI.validateWord(word.trim(), currentChain)
+      const validation = await gameAPI.validateWord(
+        word.trim(),
+        currentChain,
+        puzzle.puzzle_id
+      )
       
       if (validation.valid) {
         setChain(prev => [...prev, validation.word])
@@ -75,7 +79,12 @@ export function useGame() {
   const removeLastWord = useCallback(() => {
     setChain(prev => prev.slice(0, -1))
     setError(null)
-  }, [])
+    
+    // Keep the server session in step (submit sends the chain anyway)
+    if (puzzle?.puzzle_id) {
+      gameAPI.undoWord(puzzle.puzzle_id).catch(() => {})
+    }
+  }, [puzzle])
 
   /**
    * Submit the current solution.
@@ -90,7 +99,8 @@ export function useGame() {
       const gameResult = await gameAPI.submitSolution(
         puzzle.start_word,
         puzzle.end_word,
-        chain
+        chain,
+        puzzle.puzzle_id
       )
       setResult(gameResult)
       setGameState('results')
@@ -132,7 +142,8 @@ export function useGame() {
         puzzle.start_word,
         puzzle.end_word,
         chain,
-        nextHintLevel
+        nextHintLevel,
+        puzzle.puzzle_id
       )
       setHint(hintData)
       setHintsUsed(prev => prev + 1)
@@ -49,12 +49,46 @@ export const gameAPI = {
    * Validate a word addition to the chain.
    * @param {string} word - Word to validate
    * @param {string[]} chain - Current chain of words
+   * @param {string} [puzzleId] - Server session; chain is the fallback
    * @returns {Promise<{valid: boolean, error?: string, message?: string}>}
    */
-  async validateWord(word, chain) {
+  async validateWord(word, chain, puzzleId) {
     return fetchAPI('/game/validate', {
       method: 'POST',
-      body: JSON.stringify({ word, chain }),
+      body: JSON.stringify({ word, chain, puzzle_id: puzzleId }),
+    })
+  },
+
+  /**
+   * Validate a whole chain in one request (e.g. after reconnecting).
+   * With a live session, its chain becomes the chain's valid prefix.
+   * @param {string} startWord - Puzzle start word
+   * @param {string} endWord - Puzzle end word
+   * @param {string[]} chain - Player's chain (excluding start/end)
+   * @param {string} [puzzleId] - Server session to restore
+   * @returns {Promise<{valid: boolean, complete: boolean, valid_length: number, positions: object[]}>}
+   */
+  async validateChain(startWord, endWord, chain, puzzleId) {
+    return fetchAPI('/game/validate-chain', {
+      method: 'POST',
+      body: JSON.stringify({
+        start_word: startWord,
+        end_word: endWord,
+        chain,
+        puzzle_id: puzzleId,
+      }),
+    })
+  },
+
+  /**
+   * Remove the last word from the server session's chain.
+   * @param {string} puzzleId - Server session
+   * @returns {Promise<{removed: string|null, chain: string[]}>}
+   */
+  async undoWord(puzzleId) {
+    return fetchAPI('/game/undo', {
+      method: 'POST',
+      body: JSON.stringify({ puzzle_id: puzzleId }),
     })
   },
 
@@ -63,15 +97,17 @@ export const gameAPI = {
    * @param {string} startWord - Puzzle start word
    * @param {string} endWord - Puzzle end word
    * @param {string[]} path - Player's word chain
+   * @param {string} [puzzleId] - Server session, closed on submit
    * @returns {Promise<GameResult>}
    */
-  async submitSolution(startWord, endWord, path) {
+  async submitSolution(startWord, endWord, path, puzzleId) {
     return fetchAPI('/game/submit', {
       method: 'POST',
       body: JSON.stringify({
         start_word: startWord,
         end_word: endWord,
         path,
+        puzzle_id: puzzleId,
       }),
     })
   },
@@ -83,9 +119,10 @@ export const gameAPI = {
    * @param {string} endWord - Puzzle end word
    * @param {string[]} chain - Current chain
    * @param {number} hintLevel - How many hints used (reveals that many letters)
+   * @param {string} [puzzleId] - Server session; the other fields are the fallback
    * @returns {Promise<{type: string, hint: string, masked_word: string}>}
    */
-  async getHint(startWord, endWord, chain, hintLevel = 1) {
+  async getHint(startWord, endWord, chain, hintLevel = 1, puzzleId) {
     return fetchAPI('/game/hint', {
       method: 'POST',
       body: JSON.stringify({
@@ -93,6 +130,7 @@ export const gameAPI = {
         end_word: endWord,
         chain,
         hint_level: hintLevel,
+        puzzle_id: puzzleId,
       }),
     })
   },